@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Run the agent catalog checks against a single parse of the agents.
+
+Usage: agent_checks.py [--check NAME ...] [--agents-dir DIR] [--overlap-threshold J] [FILE ...]
+
+Every agent is loaded once through agent_corpus and each selected check runs
+on the in-memory records. Without --check all checks except the optional
+ones run. When files are given (as pre-commit does) only those agents are
+loaded.
+
+Checks:
+  structure    structure, naming and content rules of validate_agents.py
+  naming       kebab-case file names
+  frontmatter  required fields, name matches file name, description length
+  duplicates   no two agents share a name
+  directories  agents live in the allowed category directories
+  readme       every agent is listed in README.md and vice versa
+  overlap      (optional) no two agents are --overlap-threshold similar,
+               see agent_similarity.py
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from agent_corpus import (
+    AGENTS_DIR,
+    INVALID_STRUCTURE,
+    INVALID_YAML,
+    MISSING_FRONTMATTER,
+    AgentRecord,
+    by_name,
+    load_corpus,
+)
+from agent_similarity import DEFAULT_THRESHOLD, find_overlaps, format_overlap
+
+KEBAB_CASE = re.compile(r'^[a-z0-9]+(-[a-z0-9]+)*$')
+ALLOWED_DIRECTORIES = [
+    'cloud-infrastructure',
+    'infrastructure-as-code',
+    'programming-languages',
+    'design-frontend',
+    'distributed-systems',
+    'devops-monitoring',
+    'data-analysis',
+    'product-management',
+    'quality-assurance',
+]
+README_TABLE_ENTRY = re.compile(r'\| `([^`]+)`\s+\|')
+
+
+class CheckContext:
+    """Records plus the locations the checks need."""
+
+    def __init__(self, records: List[AgentRecord], agents_dir: Path, readme: Path,
+                 overlap_threshold: float = DEFAULT_THRESHOLD):
+        self.records = records
+        self.agents_dir = agents_dir
+        self.readme = readme
+        self.overlap_threshold = overlap_threshold
+
+
+def check_structure(context: CheckContext) -> List[str]:
+    from validate_agents import validate_agent_record
+
+    errors = []
+    for record in context.records:
+        errors.extend(f'{record.path}: {error}' for error in validate_agent_record(record))
+    return errors
+
+
+def check_naming(context: CheckContext) -> List[str]:
+    return [
+        f'Invalid agent name: {record.path} (must be kebab-case)'
+        for record in context.records
+        if not KEBAB_CASE.match(record.stem)
+    ]
+
+
+def check_frontmatter(context: CheckContext) -> List[str]:
+    errors = []
+    for record in context.records:
+        path = record.path
+        if record.error == MISSING_FRONTMATTER:
+            errors.append(f'{path}: Missing YAML frontmatter')
+            continue
+        if record.error == INVALID_STRUCTURE:
+            errors.append(f'{path}: Invalid frontmatter structure')
+            continue
+        if record.error == INVALID_YAML:
+            errors.append(f'{path}: Invalid YAML: {record.yaml_error}')
+            continue
+        if not isinstance(record.frontmatter, dict):
+            errors.append(f'{path}: Frontmatter must be a mapping')
+            continue
+
+        for field in ['name', 'description']:
+            if field not in record.frontmatter:
+                errors.append(f'{path}: Missing required field: {field}')
+
+        if record.name != record.stem:
+            errors.append(f'{path}: name field must match filename')
+
+        if len(record.description or '') < 20:
+            errors.append(f'{path}: description too short (minimum 20 characters)')
+    return errors
+
+
+def check_duplicates(context: CheckContext) -> List[str]:
+    duplicates = [name for name, records in by_name(context.records).items() if len(records) > 1]
+    if duplicates:
+        return [f'Duplicate agent names found: {duplicates}']
+    return []
+
+
+def check_directories(context: CheckContext) -> List[str]:
+    errors = []
+    for directory in sorted(p for p in context.agents_dir.iterdir() if p.is_dir()):
+        if directory.name not in ALLOWED_DIRECTORIES:
+            errors.append(f'Invalid directory: {directory.name} (allowed: {" ".join(ALLOWED_DIRECTORIES)})')
+    return errors
+
+
+def check_readme(context: CheckContext) -> List[str]:
+    file_agents = set(by_name(context.records))
+    with open(context.readme, 'r', encoding='utf-8') as f:
+        readme_agents = set(README_TABLE_ENTRY.findall(f.read()))
+
+    errors = []
+    missing_in_readme = file_agents - readme_agents
+    extra_in_readme = readme_agents - file_agents
+    if missing_in_readme:
+        errors.append(f'Agents missing from README.md: {sorted(missing_in_readme, key=str)}')
+    if extra_in_readme:
+        errors.append(f'Extra agents in README.md (no corresponding file): {sorted(extra_in_readme)}')
+    return errors
+
+
+def check_overlap(context: CheckContext) -> List[str]:
+    return [
+        f'Overlapping agents: {format_overlap(overlap)}'
+        for overlap in find_overlaps(context.records, context.overlap_threshold)
+    ]
+
+
+# Check name -> (function, message when it passes)
+CHECKS: Dict[str, Tuple[Callable[[CheckContext], List[str]], str]] = {
+    'structure': (check_structure, 'All agents passed validation'),
+    'naming': (check_naming, 'All agent names follow kebab-case convention'),
+    'frontmatter': (check_frontmatter, 'All agents have valid YAML frontmatter'),
+    'duplicates': (check_duplicates, 'No duplicate agent names found'),
+    'directories': (check_directories, 'All agents are in valid directories'),
+    'readme': (check_readme, 'README.md is synchronized with agent files'),
+    'overlap': (check_overlap, 'No overlapping agents found'),
+}
+
+# Only run when asked for with --check
+OPTIONAL_CHECKS = {'overlap'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run agent catalog checks')
+    parser.add_argument('--check', action='append', choices=list(CHECKS),
+                        help='Check to run (repeatable, default: all but overlap)')
+    parser.add_argument('--agents-dir', type=Path, default=AGENTS_DIR)
+    parser.add_argument('--readme', type=Path, default=Path('README.md'))
+    parser.add_argument('--overlap-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Similarity reported by the overlap check (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('files', nargs='*', type=Path, help='Only load these agent files')
+    args = parser.parse_args()
+
+    if not args.agents_dir.exists():
+        print('❌ Agents directory not found')
+        sys.exit(1)
+
+    files = [path for path in args.files if path.suffix == '.md'] if args.files else None
+    records = load_corpus(args.agents_dir, files)
+    context = CheckContext(records, args.agents_dir, args.readme, args.overlap_threshold)
+
+    selected = args.check or [name for name in CHECKS if name not in OPTIONAL_CHECKS]
+    failed = []
+    for name in selected:
+        check, success_message = CHECKS[name]
+        errors = check(context)
+        if errors:
+            for error in errors:
+                print(f'❌ {error}')
+            failed.append(name)
+        else:
+            print(f'✅ {success_message}')
+
+    print(f'\n📊 Checked {len(records)} agents: {len(selected)} checks, {len(failed)} failed')
+    if failed:
+        print(f'❌ Failed checks: {", ".join(failed)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Load the agent catalog once for every validator and CI check.
+
+Each agent file under agents/ is opened once and read line by line only up
+to the closing ``---`` of its frontmatter; that block alone is YAML-parsed
+(with libyaml's CSafeLoader when PyYAML was built with it) into an
+AgentRecord. The body and content hash are read from the file on first use,
+so checks that only look at frontmatter never read the rest of the file.
+"""
+
+import hashlib
+import io
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+AGENTS_DIR = Path('agents')
+
+# Why a file has no usable frontmatter
+MISSING_FRONTMATTER = 'missing'
+INVALID_STRUCTURE = 'structure'
+INVALID_YAML = 'yaml'
+
+DELIMITER = b'---'
+
+
+def yaml_loader():
+    """libyaml's CSafeLoader if available, otherwise the pure-Python SafeLoader."""
+    import yaml
+
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def read_frontmatter(stream: BinaryIO) -> Tuple[Optional[str], Optional[bytes], int]:
+    """Read ``stream`` up to the closing delimiter line.
+
+    Returns ``(error, block, body_offset)``: the raw frontmatter block and the
+    byte offset where the body starts, or an error constant and no block.
+    """
+    first = stream.readline()
+    if not first.startswith(DELIMITER):
+        return MISSING_FRONTMATTER, None, 0
+
+    offset = len(first)
+    lines = [first[len(DELIMITER):]]
+    for line in iter(stream.readline, b''):
+        offset += len(line)
+        if line.rstrip() == DELIMITER:
+            return None, b''.join(lines), offset
+        lines.append(line)
+
+    return INVALID_STRUCTURE, None, 0
+
+
+@dataclass
+class AgentRecord:
+    """One agent file, parsed."""
+
+    path: Path
+    category: str
+    frontmatter: Any = None
+    error: Optional[str] = None
+    yaml_error: Optional[Exception] = None
+    body_offset: Optional[int] = None
+    data: Optional[bytes] = field(default=None, repr=False)
+
+    @property
+    def stem(self) -> str:
+        return self.path.stem
+
+    def raw(self) -> bytes:
+        """Whole file contents, read on first use."""
+        if self.data is None:
+            with open(self.path, 'rb') as f:
+                self.data = f.read()
+        return self.data
+
+    @cached_property
+    def body(self) -> str:
+        if self.body_offset is None:
+            return ''
+        return self.raw()[self.body_offset:].decode('utf-8').strip()
+
+    @cached_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.raw()).hexdigest()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if isinstance(self.frontmatter, dict):
+            return self.frontmatter.get(key, default)
+        return default
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.get('name')
+
+    @property
+    def description(self) -> str:
+        return self.get('description', '')
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.get('model')
+
+    @property
+    def tools(self) -> List[str]:
+        tools = self.get('tools')
+        if isinstance(tools, str):
+            return [tool.strip() for tool in tools.split(',') if tool.strip()]
+        return list(tools or [])
+
+
+def category_of(path: Path, agents_dir: Path = AGENTS_DIR) -> str:
+    try:
+        relative = path.relative_to(agents_dir)
+    except ValueError:
+        return path.parent.name
+    return relative.parts[0] if len(relative.parts) > 1 else ''
+
+
+def parse_stream(path: Path, stream: BinaryIO, agents_dir: Path = AGENTS_DIR) -> AgentRecord:
+    """Parse the frontmatter from ``stream``, leaving the body unread."""
+    import yaml
+
+    record = AgentRecord(path=path, category=category_of(path, agents_dir))
+    error, block, body_offset = read_frontmatter(stream)
+    if error:
+        record.error = error
+        return record
+
+    record.body_offset = body_offset
+    try:
+        record.frontmatter = yaml.load(block.decode('utf-8'), Loader=yaml_loader())
+    except yaml.YAMLError as e:
+        record.error = INVALID_YAML
+        record.yaml_error = e
+
+    return record
+
+
+def parse_agent(path: Path, content: str, agents_dir: Path = AGENTS_DIR) -> AgentRecord:
+    """Parse an agent whose content is already in memory."""
+    data = content.encode('utf-8')
+    record = parse_stream(path, io.BytesIO(data), agents_dir)
+    record.data = data
+    return record
+
+
+def load_agent(path: Path, agents_dir: Path = AGENTS_DIR) -> AgentRecord:
+    """Parse an agent file, reading only as far as its frontmatter."""
+    with open(path, 'rb') as f:
+        return parse_stream(path, f, agents_dir)
+
+
+def agent_paths(agents_dir: Path = AGENTS_DIR) -> List[Path]:
+    """Agent files in discovery order."""
+    return list(agents_dir.rglob('*.md'))
+
+
+def load_corpus(agents_dir: Path = AGENTS_DIR, paths: Optional[Iterable[Path]] = None) -> List[AgentRecord]:
+    """Parse every agent under ``agents_dir`` (or just ``paths``) once."""
+    if paths is None:
+        paths = agent_paths(agents_dir)
+    return [load_agent(Path(path), agents_dir) for path in paths]
+
+
+def by_name(records: Iterable[AgentRecord]) -> Dict[str, List[AgentRecord]]:
+    """Records grouped by frontmatter name, skipping files without frontmatter."""
+    names: Dict[str, List[AgentRecord]] = {}
+    for record in records:
+        if isinstance(record.frontmatter, dict):
+            names.setdefault(record.name, []).append(record)
+    return names
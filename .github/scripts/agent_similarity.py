@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Find agents that overlap: near-duplicate descriptions and bodies.
+
+Usage: agent_similarity.py [--threshold J] [--shingle-size N] [--agents-dir DIR]
+
+Each agent's description and body are reduced to a set of shingles (runs of
+``--shingle-size`` words, common English words left out; single words by
+default, which measures how much vocabulary two agents share), and the
+overlap of two agents is the Jaccard similarity of their sets. Comparing
+every pair is quadratic, so candidates come from locality-sensitive hashing
+instead:
+
+* Every set gets a MinHash signature of ``SIGNATURE_SIZE`` values. Each
+  shingle is hashed once and kept if it is the smallest in its bucket (one
+  permutation hashing); an empty bucket copies a filled one chosen by
+  a random probe sequence that is the same for every agent.
+* The signature is cut into bands. Agents whose signatures agree on a whole
+  band land in the same LSH bucket and become a candidate pair. Bands are
+  made as wide as possible while a pair exactly at the threshold still
+  shares a bucket with probability ``RECALL``, so dissimilar pairs rarely do.
+
+Only candidate pairs have their exact Jaccard computed and compared with the
+threshold, so the work grows with the catalog plus the number of similar
+pairs rather than with the square of the catalog.
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from agent_corpus import AGENTS_DIR, AgentRecord, load_corpus
+
+DEFAULT_THRESHOLD = 0.4
+SHINGLE_SIZE = 1
+SIGNATURE_SIZE = 512
+RECALL = 0.95
+
+WORD = re.compile(r'[a-z0-9]+')
+HASH_BITS = 64
+EMPTY = (1 << HASH_BITS) - 1
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by can do for from has have how if in into is it its
+    not of on or so such that the their then there these this to use used using
+    via what when where which while will with you your
+    """.split()
+)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """Runs of ``size`` consecutive lowercase words (the words themselves for short texts)."""
+    words = [word for word in WORD.findall(text.lower()) if word not in STOPWORDS]
+    if len(words) < size:
+        return frozenset(words)
+    return frozenset(' '.join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+@lru_cache(maxsize=None)
+def probe_order(size: int, probes: int = 64) -> Tuple[Tuple[int, ...], ...]:
+    """For every bucket, the buckets an empty one borrows from, in order."""
+    order = []
+    for bucket in range(size):
+        rng = random.Random(bucket)
+        order.append(tuple(rng.randrange(size) for _ in range(probes)))
+    return tuple(order)
+
+
+def minhash(items: Iterable[str], size: int = SIGNATURE_SIZE) -> Tuple[int, ...]:
+    """One-permutation MinHash signature of ``items``, densified."""
+    signature = [EMPTY] * size
+    for item in items:
+        value = shingle_hash(item)
+        bucket = value % size
+        if value < signature[bucket]:
+            signature[bucket] = value
+    if all(value == EMPTY for value in signature):
+        return tuple(signature)
+    # An empty bucket copies a filled one, probing buckets in an order fixed per
+    # bucket (not its neighbour, which would make runs of empty buckets equal)
+    densified = list(signature)
+    for bucket, probes in enumerate(probe_order(size)):
+        if signature[bucket] == EMPTY:
+            densified[bucket] = next(
+                (signature[donor] for donor in probes if signature[donor] != EMPTY),
+                next(value for value in signature if value != EMPTY),
+            )
+    return tuple(densified)
+
+
+def collision_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that two sets with this Jaccard similarity share an LSH bucket."""
+    return 1 - (1 - similarity ** rows) ** bands
+
+
+def choose_bands(threshold: float, size: int = SIGNATURE_SIZE) -> Tuple[int, int]:
+    """``(bands, rows)``: the widest bands that still find pairs at ``threshold`` with ``RECALL``."""
+    for rows in range(size, 0, -1):
+        bands = size // rows
+        if collision_probability(threshold, bands, rows) >= RECALL:
+            return bands, rows
+    return size, 1
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class Overlap:
+    """Two agents whose descriptions and bodies are at least ``threshold`` similar."""
+
+    first: AgentRecord
+    second: AgentRecord
+    similarity: float
+    description_similarity: float
+
+
+def candidate_pairs(signatures: Sequence[Tuple[int, ...]], bands: int, rows: int) -> Set[Tuple[int, int]]:
+    """Index pairs that share at least one LSH bucket."""
+    pairs: Set[Tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+        for index, signature in enumerate(signatures):
+            if signature[0] == EMPTY:
+                continue
+            buckets[signature[band * rows:(band + 1) * rows]].append(index)
+        for members in buckets.values():
+            pairs.update(combinations(members, 2))
+    return pairs
+
+
+def find_overlaps(records: Sequence[AgentRecord], threshold: float = DEFAULT_THRESHOLD,
+                  shingle_size: int = SHINGLE_SIZE) -> List[Overlap]:
+    """Pairs of agents whose shingle sets have Jaccard similarity >= ``threshold``."""
+    records = [record for record in records if isinstance(record.frontmatter, dict)]
+    sets = [shingles(f'{record.description}\n{record.body}', shingle_size) for record in records]
+    bands, rows = choose_bands(threshold)
+    signatures = [minhash(items) for items in sets]
+
+    overlaps = []
+    for i, j in candidate_pairs(signatures, bands, rows):
+        similarity = jaccard(sets[i], sets[j])
+        if similarity >= threshold:
+            description = jaccard(shingles(records[i].description, 1), shingles(records[j].description, 1))
+            first, second = sorted((records[i], records[j]), key=lambda record: str(record.path))
+            overlaps.append(Overlap(first, second, similarity, description))
+    overlaps.sort(key=lambda overlap: (-overlap.similarity, str(overlap.first.path), str(overlap.second.path)))
+    return overlaps
+
+
+def format_overlap(overlap: Overlap) -> str:
+    return (f'{overlap.first.name} ~ {overlap.second.name}: {overlap.similarity:.2f} similar '
+            f'(descriptions {overlap.description_similarity:.2f}) '
+            f'[{overlap.first.path}, {overlap.second.path}]')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Report overlapping agents')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum Jaccard similarity to report (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--shingle-size', type=int, default=SHINGLE_SIZE,
+                        help=f'Words per shingle (default: {SHINGLE_SIZE})')
+    parser.add_argument('--agents-dir', type=Path, default=AGENTS_DIR)
+    args = parser.parse_args(argv)
+
+    if not 0 < args.threshold <= 1:
+        parser.error('--threshold must be in (0, 1]')
+    if args.shingle_size < 1:
+        parser.error('--shingle-size must be at least 1')
+    if not args.agents_dir.exists():
+        print('❌ Agents directory not found')
+        return 1
+
+    records = load_corpus(args.agents_dir)
+    overlaps = find_overlaps(records, args.threshold, args.shingle_size)
+    for overlap in overlaps:
+        print(f'⚠️ {format_overlap(overlap)}')
+    print(f'\n📊 {len(overlaps)} overlapping pairs at threshold {args.threshold} among {len(records)} agents')
+    return 1 if overlaps else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: frontmatter extraction over the real agents/ tree.
+
+Compares the split-based path the validators used (read the whole file,
+``content.split('---', 2)``, ``yaml.safe_load``) with agent_corpus, which
+stops reading at the closing ``---`` and parses with CSafeLoader when
+available. Run from the repository root:
+
+    python .github/scripts/bench_frontmatter.py [--rounds N]
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import yaml
+
+from agent_corpus import AGENTS_DIR, agent_paths, load_agent, read_frontmatter
+
+
+def split_path(paths):
+    """The original approach: whole file, string split, pure-Python loader."""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            try:
+                yaml.safe_load(parts[1])
+            except yaml.YAMLError:
+                pass
+
+
+def stream_pure_path(paths):
+    """Streaming reader, pure-Python loader (isolates the I/O change)."""
+    for path in paths:
+        with open(path, 'rb') as f:
+            error, block, _ = read_frontmatter(f)
+        if block is not None:
+            try:
+                yaml.load(block.decode('utf-8'), Loader=yaml.SafeLoader)
+            except yaml.YAMLError:
+                pass
+
+
+def stream_path(paths):
+    """agent_corpus: streaming reader plus CSafeLoader when available."""
+    for path in paths:
+        load_agent(path)
+
+
+def measure(function, paths, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function(paths)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark frontmatter extraction')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--agents-dir', type=Path, default=AGENTS_DIR)
+    args = parser.parse_args()
+
+    paths = agent_paths(args.agents_dir)
+    total_bytes = sum(path.stat().st_size for path in paths)
+    frontmatter_bytes = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            read_frontmatter(f)
+            frontmatter_bytes += f.tell()
+
+    print(f"📊 {len(paths)} agents, {total_bytes / 1024:.0f} KiB total, "
+          f"{frontmatter_bytes / 1024:.0f} KiB read up to the closing delimiter")
+    print(f"   CSafeLoader available: {hasattr(yaml, 'CSafeLoader')}")
+    print()
+
+    baseline = None
+    for label, function in [
+        ('split + safe_load', split_path),
+        ('stream + SafeLoader', stream_pure_path),
+        ('stream + CSafeLoader', stream_path),
+    ]:
+        function(paths)  # warm the page cache and imports
+        timings = measure(function, paths, args.rounds)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"  {label:<22} median {median * 1000:7.2f} ms  "
+              f"min {min(timings) * 1000:7.2f} ms  ({baseline / median:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
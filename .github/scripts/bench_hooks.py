@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Benchmark Claude Code hook latency against per-hook budgets.
+
+Replays representative environment payloads against every hook in hooks/
+through HookTestCase.run_hook, each in its own temporary HOME and working
+directory, and reports wall time (p50/p95/p99/max) and the number of child
+processes each invocation forks. Exits 1 when a payload's p50 or p99 is over
+its budget from .github/hook-budgets.json.
+
+Budgets are derived from measured results rather than picked: a hook's p50
+budget is BUDGET_FACTOR times the p50 of its slowest payload plus
+BUDGET_SLACK_MS, and its p99 budget twice that. That leaves room for a
+slower CI runner, but not for a hook that starts Python on every call.
+--derive prints the budgets for one or more results files, a hook taking its
+numbers from the first file that has it:
+
+    bench_hooks.py --derive baseline.json current.json > .github/hook-budgets.json
+
+Usage: bench_hooks.py [--iterations N] [--hook NAME ...] [--budgets FILE]
+                      [--output FILE] [--compare FILE]
+       bench_hooks.py --derive RESULTS [RESULTS ...]
+
+Child processes are counted from the "processes" line of /proc/stat (forks
+since boot), so they are only exact on an otherwise idle Linux machine and
+reported as n/a elsewhere.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from test_hooks import HookTestCase
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_BUDGETS = REPO_ROOT / ".github" / "hook-budgets.json"
+RESULTS_VERSION = 1
+
+BUDGET_FACTOR = 2
+BUDGET_SLACK_MS = 10
+# Hooks without a budget of their own: a 10 ms hook's
+DEFAULT_BUDGET = {"p50_ms": 30, "p99_ms": 60}
+
+# Keep notifiers quiet and offline, and the hook client off any running daemon
+QUIET_ENV = {
+    "PUSHOVER_USER_KEY": "",
+    "PUSHOVER_APP_TOKEN": "",
+    "CLAUDE_NOTIFIER_TTS": "false",
+    "CLAUDE_NOTIFIER_SOUND": "false",
+    "CLAUDE_HOOKD_SOCKET": "/nonexistent/hookd.sock",
+}
+
+# Long-running processes that are not hooks themselves
+EXCLUDED = {"hookd.py"}
+
+BUILD_LOG = "\n".join(
+    [f"[{i:05d}] compiling module_{i}.go ... ok" for i in range(2000)]
+    + ["main.go:42:7: undefined: handler", "FAIL\tgithub.com/acme/app\t0.012s", "build failed"]
+)
+HEREDOC_COMMAND = "cat <<'EOF' > notes.md\n" + "Configuration lives in /etc/app.conf\n" * 2000 + "EOF"
+
+
+@dataclass
+class Payload:
+    label: str
+    env: Dict[str, str]
+    args: List[str] = field(default_factory=list)
+    # Files created in the working directory before the run
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+PAYLOADS: Dict[str, List[Payload]] = {
+    "agent-selector.sh": [
+        Payload("task", {"CLAUDE_TOOL_NAME": "Task"}, ["Design a microservices architecture"]),
+        Payload("non-task", {"CLAUDE_TOOL_NAME": "Bash"}, ["ls -la"]),
+    ],
+    "dangerous-operation-validator.sh": [
+        Payload("bash-safe", {"CLAUDE_TOOL_NAME": "Bash"}, ["ls -la"]),
+        Payload("bash-block", {"CLAUDE_TOOL_NAME": "Bash"}, ["rm -rf /"]),
+        Payload("bash-heredoc", {"CLAUDE_TOOL_NAME": "Bash"}, [HEREDOC_COMMAND]),
+        Payload("task", {
+            "CLAUDE_TOOL_NAME": "Task",
+            "CLAUDE_SUBAGENT_TYPE": "terraform-architect",
+            "CLAUDE_TASK_DESCRIPTION": "Plan the production rollout",
+        }),
+    ],
+    "agent-hierarchy-tracker.sh": [
+        Payload("task", {
+            "CLAUDE_TOOL_NAME": "Task",
+            "CLAUDE_SUBAGENT_TYPE": "go-architect",
+            "CLAUDE_TOOL_RESULT": "Delegating implementation to go-engineer",
+        }),
+    ],
+    "auto-debug-suggester.sh": [
+        Payload("bash-build-log", {
+            "CLAUDE_TOOL_NAME": "Bash",
+            "CLAUDE_TOOL_EXIT_CODE": "1",
+            "CLAUDE_TOOL_RESULT": BUILD_LOG,
+        }),
+        Payload("bash-success", {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_TOOL_EXIT_CODE": "0"}),
+    ],
+    "session-agent-context.sh": [
+        Payload("session-start", {}),
+    ],
+    "agent-context-bridge.sh": [
+        Payload("subagent-stop", {
+            "CLAUDE_SUBAGENT_TYPE": "go-test-engineer",
+            "CLAUDE_TOOL_RESULT": "Implemented the API and added tests",
+        }),
+    ],
+    "test-runner-validator.sh": [
+        Payload("write-python", {"CLAUDE_TOOL_NAME": "Write"}, ["src/app.py"], {
+            "pyproject.toml": "[project]\nname = 'app'\n",
+            "src/app.py": "def handler():\n    return 1\n",
+            "tests/test_app.py": "def test_handler():\n    assert True\n",
+        }),
+    ],
+    "typescript-validator.sh": [
+        Payload("write-ts", {"CLAUDE_TOOL_NAME": "Write"}, ["src/app.ts"], {
+            "src/app.ts": "export const handler = (value: any) => value;\n",
+        }),
+    ],
+    "web-resource-validator.sh": [
+        Payload("write-html", {"CLAUDE_TOOL_NAME": "Write"}, ["index.html"], {
+            "index.html": '<html><body><img src="logo.png"><script src="app.js"></script></body></html>\n',
+        }),
+    ],
+    "response-notifier.sh": [
+        Payload("bash", {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_TOOL_EXIT_CODE": "0"}),
+    ],
+    "pushover-notifier.sh": [
+        Payload("unconfigured", {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_TOOL_EXIT_CODE": "0"}),
+    ],
+    "simple-notifier.sh": [
+        Payload("unconfigured", {"CLAUDE_TOOL_NAME": "Bash"}),
+    ],
+    "hook-dispatch.py": [
+        Payload("pre-tool-use", {"CLAUDE_TOOL_NAME": "Bash"}, ["PreToolUse", "ls -la"]),
+        Payload("post-tool-use", {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_TOOL_EXIT_CODE": "0"}, ["PostToolUse"]),
+    ],
+    "hook-client.py": [
+        Payload("fallback", {"CLAUDE_TOOL_NAME": "Task"}, ["agent-selector", "Debug the Go service"]),
+    ],
+}
+DEFAULT_PAYLOADS = [Payload("default", {"CLAUDE_TOOL_NAME": "Bash"}, ["ls -la"])]
+
+
+class BenchmarkCase(HookTestCase):
+    """HookTestCase used outside the test runner for its isolated run_hook."""
+
+    def runTest(self):
+        pass
+
+
+def fork_counter() -> Optional[int]:
+    """Processes forked since boot, or None where /proc/stat is unavailable."""
+    try:
+        with open("/proc/stat", "r") as f:
+            for line in f:
+                if line.startswith("processes "):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def discover_hooks(hooks_dir: Path) -> List[str]:
+    names = [path.name for path in sorted(hooks_dir.glob("*.sh"))]
+    names += [
+        path.name for path in sorted(hooks_dir.glob("*.py"))
+        if path.name not in EXCLUDED and os.access(path, os.X_OK)
+    ]
+    return names
+
+
+def bench_payload(hook: str, payload: Payload, iterations: int) -> dict:
+    case = BenchmarkCase()
+    case.setUp()
+    try:
+        case.hooks_dir = case.hooks_dir.resolve()
+        workdir = Path(case.temp_dir) / "project"
+        workdir.mkdir()
+        for relative, content in payload.files.items():
+            target = workdir / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content)
+
+        env = dict(QUIET_ENV, **payload.env)
+        # One untimed run so first-use costs (index builds, caches) are not sampled
+        case.run_hook(hook, env, payload.args, cwd=str(workdir))
+
+        timings = []
+        forks = []
+        exit_codes = set()
+        for _ in range(iterations):
+            before = fork_counter()
+            start = time.perf_counter()
+            returncode, _, _ = case.run_hook(hook, env, payload.args, cwd=str(workdir))
+            timings.append((time.perf_counter() - start) * 1000)
+            after = fork_counter()
+            exit_codes.add(returncode)
+            if before is not None and after is not None:
+                # The hook process itself is one of the forks
+                forks.append(after - before - 1)
+    finally:
+        case.tearDown()
+
+    return {
+        "iterations": iterations,
+        "exit_codes": sorted(exit_codes),
+        "p50_ms": round(percentile(timings, 0.50), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "p99_ms": round(percentile(timings, 0.99), 2),
+        "max_ms": round(max(timings), 2),
+        "mean_ms": round(sum(timings) / len(timings), 2),
+        "forks": round(percentile(forks, 0.50)) if forks else None,
+    }
+
+
+def load_budgets(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def budget_for(budgets: dict, hook: str) -> Dict[str, float]:
+    budget = dict(budgets.get("default", {}))
+    budget.update(budgets.get("hooks", {}).get(hook, {}))
+    return budget
+
+
+def derive_budgets(results: List[dict]) -> dict:
+    """Budgets for every hook in ``results`` (bench_hooks.py --output files)."""
+    budgets = {}
+    for run in results:
+        for hook, payloads in sorted(run.get("hooks", {}).items()):
+            if hook in budgets or not payloads:
+                continue
+            slowest = max(stats["p50_ms"] for stats in payloads.values())
+            p50 = math.ceil(BUDGET_FACTOR * slowest + BUDGET_SLACK_MS)
+            budgets[hook] = {"p50_ms": p50, "p99_ms": 2 * p50}
+    return {"default": dict(DEFAULT_BUDGET), "hooks": dict(sorted(budgets.items()))}
+
+
+def format_budgets(budgets: dict) -> str:
+    """``budgets`` as JSON with one line per hook, the layout of hook-budgets.json."""
+    def entry(budget: Dict[str, float]) -> str:
+        return "{ " + ", ".join(f'"{metric}": {limit}' for metric, limit in budget.items()) + " }"
+
+    hooks = ",\n".join(f'    "{hook}": {entry(budget)}' for hook, budget in budgets["hooks"].items())
+    return f'{{\n  "default": {entry(budgets["default"])},\n  "hooks": {{\n{hooks}\n  }}\n}}\n'
+
+
+def over_budget(stats: dict, budget: Dict[str, float]) -> List[str]:
+    return [
+        f"{metric} {stats[metric]:.1f} > {limit:.0f} ms"
+        for metric, limit in sorted(budget.items())
+        if metric in stats and stats[metric] > limit
+    ]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hook latency")
+    parser.add_argument("--iterations", "-n", type=int, default=30)
+    parser.add_argument("--hook", action="append", help="Only benchmark this hook (repeatable)")
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS)
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON results to compare p50 against")
+    parser.add_argument("--derive", type=Path, nargs="+", metavar="RESULTS",
+                        help="Print the budgets derived from these JSON results and exit")
+    args = parser.parse_args()
+
+    if args.derive:
+        runs = []
+        for path in args.derive:
+            with open(path, "r", encoding="utf-8") as f:
+                runs.append(json.load(f))
+        sys.stdout.write(format_budgets(derive_budgets(runs)))
+        return
+
+    hooks_dir = REPO_ROOT / "hooks"
+    hooks = args.hook or discover_hooks(hooks_dir)
+    budgets = load_budgets(args.budgets)
+    previous = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f).get("hooks", {})
+
+    results = {}
+    failures = []
+    print(f"⏱️  Benchmarking {len(hooks)} hooks, {args.iterations} iterations per payload")
+    print()
+    print(f"  {'hook / payload':<52} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'forks':>6}")
+
+    for hook in hooks:
+        results[hook] = {}
+        budget = budget_for(budgets, hook)
+        for payload in PAYLOADS.get(hook, DEFAULT_PAYLOADS):
+            stats = bench_payload(hook, payload, args.iterations)
+            results[hook][payload.label] = stats
+
+            problems = over_budget(stats, budget)
+            status = "❌" if problems else "✅"
+            forks = "n/a" if stats["forks"] is None else str(stats["forks"])
+            line = (f"{status} {hook + ' / ' + payload.label:<52} {stats['p50_ms']:8.1f} {stats['p95_ms']:8.1f} "
+                    f"{stats['p99_ms']:8.1f} {stats['max_ms']:8.1f} {forks:>6}")
+            earlier = previous.get(hook, {}).get(payload.label)
+            if earlier:
+                line += f"  (p50 {stats['p50_ms'] - earlier['p50_ms']:+.1f} ms)"
+            print(line)
+            for problem in problems:
+                failures.append(f"{hook} / {payload.label}: {problem}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": RESULTS_VERSION,
+                "commit": git_commit(),
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "iterations": args.iterations,
+                "hooks": results,
+            }, f, indent=2)
+        print(f"\n📝 Results written to {args.output}")
+
+    print()
+    if failures:
+        print("❌ Latency budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("✅ All hooks within latency budget")
+
+
+if __name__ == "__main__":
+    main()
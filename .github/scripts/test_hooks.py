@@ -4,14 +4,20 @@ Test Claude Code hooks functionality by simulating hook execution scenarios.
 """
 
 import os
+import shutil
 import sys
 import subprocess
 import tempfile
 import json
+import threading
+import time
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 import unittest
 
+# Make the in-process hook package (hooks/claude_hooks) importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "hooks"))
+
 
 class HookTestCase(unittest.TestCase):
     """Base test case for hook testing."""
@@ -29,8 +35,9 @@ class HookTestCase(unittest.TestCase):
         # Clean up temp directory
         subprocess.run(["rm", "-rf", self.temp_dir], check=False)
 
-    def run_hook(self, hook_name: str, env: Dict[str, str] = None, args: List[str] = None) -> Tuple[int, str, str]:
-        """Run a hook script with given environment and arguments."""
+    def run_hook(self, hook_name: str, env: Dict[str, str] = None, args: List[str] = None,
+                 cwd: str = None, hook_input: Dict[str, Any] = None) -> Tuple[int, str, str]:
+        """Run a hook script with given environment and arguments (and hook input JSON on stdin)."""
         hook_path = self.hooks_dir / hook_name
 
         if not hook_path.exists():
@@ -48,9 +55,38 @@ class HookTestCase(unittest.TestCase):
         if args:
             cmd.extend(args)
 
+        # Hooks read their input from stdin; never the test runner's own
         result = subprocess.run(
             cmd,
             env=test_env,
+            cwd=cwd,
+            input=None if hook_input is None else json.dumps(hook_input),
+            stdin=subprocess.DEVNULL if hook_input is None else None,
+            capture_output=True,
+            text=True
+        )
+
+        return result.returncode, result.stdout, result.stderr
+
+    def handler_command(self, hook_name: str) -> List[str]:
+        """Command running the in-process handler the hook daemon serves for a script."""
+        from claude_hooks.registry import HANDLERS, normalize_hook_name
+
+        return [sys.executable, "-m", "claude_hooks." + HANDLERS[normalize_hook_name(hook_name)]]
+
+    def run_handler(self, hook_name: str, env: Dict[str, str] = None, args: List[str] = None,
+                    cwd: str = None) -> Tuple[int, str, str]:
+        """Run the in-process handler for a hook script, as the daemon would."""
+        test_env = os.environ.copy()
+        test_env["HOME"] = self.temp_dir
+        test_env["PYTHONPATH"] = str(self.hooks_dir.resolve())
+        if env:
+            test_env.update(env)
+
+        result = subprocess.run(
+            self.handler_command(hook_name) + (args or []),
+            env=test_env,
+            cwd=cwd,
             capture_output=True,
             text=True
         )
@@ -98,6 +134,146 @@ class TestAgentSelector(HookTestCase):
         self.assertNotIn("Consider", stdout, "Should not suggest agents for non-Task tools")
 
 
+class TestAgentIndex(HookTestCase):
+    """Test the agent keyword index used by agent-selector.sh."""
+
+    def setUp(self):
+        super().setUp()
+        self.agents_dir = Path(self.temp_dir) / "agents"
+        self.agents_dir.mkdir()
+        self.index_path = Path(self.temp_dir) / "agent-index.json"
+        self.write_agent("go-debugger", "Debugging Go applications, panics and goroutine leaks")
+        self.write_agent("terraform-architect", "Designs Terraform modules and cloud infrastructure")
+        self.write_agent("python-test-engineer", "Writes pytest suites and improves test coverage")
+
+    def write_agent(self, name: str, description: str):
+        path = self.agents_dir / f"{name}.md"
+        path.write_text(f"---\nname: {name}\ndescription: {description}\n---\n\nBody\n")
+        return path
+
+    def load(self):
+        from claude_hooks import agent_index
+        agent_index._LOADED.clear()
+        return agent_index.load_index(self.agents_dir, self.index_path)
+
+    def test_ranking(self):
+        """Test that the most specific agent is ranked first."""
+        index = self.load()
+
+        self.assertEqual(index.search("Debug a goroutine leak in my Go service")[0][0], "go-debugger")
+        self.assertEqual(index.search("Improve test coverage")[0][0], "python-test-engineer")
+        self.assertEqual(index.search("zzz qqq"), [])
+
+    def test_touch_does_not_rebuild(self):
+        """Test that an unchanged file with a new mtime reuses the index."""
+        built_at = self.load().data["built_at"]
+        path = self.agents_dir / "go-debugger.md"
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+
+        self.assertEqual(self.load().data["built_at"], built_at, "Index should not be rebuilt")
+
+    def test_new_agent_is_indexed(self):
+        """Test that an added agent file triggers a rebuild."""
+        self.load()
+        self.write_agent("kafka-engineer", "Kafka streaming pipelines and consumer groups")
+
+        self.assertEqual(self.load().search("kafka consumer lag")[0][0], "kafka-engineer")
+
+    def test_selector_uses_catalog(self):
+        """Test that the agent-selector handler suggests agents from CLAUDE_AGENTS_DIR."""
+        env = {"CLAUDE_TOOL_NAME": "Task", "CLAUDE_AGENTS_DIR": str(self.agents_dir)}
+
+        returncode, stdout, stderr = self.run_handler("agent-selector.sh", env, ["Provision cloud infrastructure with Terraform"])
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("terraform-architect", stdout)
+        self.assertNotIn("go-debugger", stdout)
+
+    def test_selector_script_uses_keyword_table(self):
+        """Test that agent-selector.sh without the daemon suggests from its keyword table."""
+        env = {"CLAUDE_TOOL_NAME": "Task", "CLAUDE_AGENTS_DIR": str(self.agents_dir)}
+
+        returncode, stdout, stderr = self.run_hook("agent-selector.sh", env, ["Deploy the Terraform modules"])
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("terraform-architect", stdout)
+        self.assertNotIn("go-debugger", stdout)
+
+
+class TestAgentManifest(HookTestCase):
+    """Test the compiled agent manifest."""
+
+    def setUp(self):
+        super().setUp()
+        self.agents_dir = Path(self.temp_dir) / "agents"
+        (self.agents_dir / "programming-languages").mkdir(parents=True)
+        self.manifest_path = Path(self.temp_dir) / "agent-manifest.bin"
+        self.write_agent("go-debugger", "Debugging Go applications", "programming-languages/")
+        self.write_agent("ddd-expert", "Domain-driven design")
+
+    def write_agent(self, name: str, description: str, category: str = "", body: str = "Body\n"):
+        path = self.agents_dir / f"{category}{name}.md"
+        path.write_text(f"---\nname: {name}\ndescription: {description}\nmodel: sonnet\n"
+                        f"tools: Read, Grep\n---\n\n{body}")
+        return path
+
+    def load(self):
+        from claude_hooks import agent_manifest
+        agent_manifest._LOADED.clear()
+        return agent_manifest.load_manifest(self.agents_dir, self.manifest_path)
+
+    def test_entries_and_bodies(self):
+        """Test that the header carries the frontmatter and bodies are read from the map."""
+        manifest = self.load()
+
+        agent = manifest.get("go-debugger")
+        self.assertEqual(agent.category, "programming-languages")
+        self.assertEqual(agent.model, "sonnet")
+        self.assertEqual(agent.tools, ("Read", "Grep"))
+        self.assertEqual(manifest.get("ddd-expert").category, "")
+        self.assertEqual(manifest.body(agent), "\nBody\n")
+
+    def test_changed_agent_rebuilds(self):
+        """Test that editing an agent rebuilds the manifest."""
+        digest = self.load().digest
+        self.write_agent("ddd-expert", "Domain-driven design", body="Bounded contexts\n")
+
+        manifest = self.load()
+        self.assertNotEqual(manifest.digest, digest)
+        self.assertEqual(manifest.body(manifest.get("ddd-expert")), "\nBounded contexts\n")
+
+    def test_touch_does_not_rebuild(self):
+        """Test that an unchanged file with a new mtime keeps the manifest."""
+        built_at = self.load().header["built_at"]
+        path = self.agents_dir / "ddd-expert.md"
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+
+        manifest = self.load()
+        self.assertEqual(manifest.header["built_at"], built_at, "Manifest should not be rebuilt")
+        self.assertEqual(manifest.header["files"]["ddd-expert.md"]["mtime_ns"], path.stat().st_mtime_ns)
+        self.assertEqual(manifest.body(manifest.get("go-debugger")), "\nBody\n")
+
+    def test_session_guide_follows_catalog(self):
+        """Test that the handler's selection guide only names installed agents."""
+        env = {"CLAUDE_AGENTS_DIR": str(self.agents_dir)}
+
+        returncode, stdout, stderr = self.run_handler("session-agent-context.sh", env)
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("• Debugging: go-debugger\n", stdout)
+        self.assertNotIn("Full-Stack", stdout)
+
+    def test_session_guide_script_is_fixed(self):
+        """Test that session-agent-context.sh without the daemon prints its fixed guide."""
+        env = {"CLAUDE_AGENTS_DIR": str(self.agents_dir)}
+
+        returncode, stdout, stderr = self.run_hook("session-agent-context.sh", env)
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("• Debugging: go-debugger, rust-debugger", stdout)
+        self.assertIn("• Full-Stack: fullstack-nextjs-go", stdout)
+
+
 class TestDangerousOperationValidator(HookTestCase):
     """Test dangerous-operation-validator.sh hook."""
 
@@ -134,6 +310,146 @@ class TestDangerousOperationValidator(HookTestCase):
         self.assertEqual(returncode, 0, "Should allow safe commands")
         self.assertNotIn("BLOCKED", stdout, "Should not block safe commands")
 
+    def test_blocks_rm_of_system_directories(self):
+        """Test that the bash checks block recursive rm of / and top-level system directories."""
+        env = {"CLAUDE_TOOL_NAME": "Bash"}
+
+        for command in ["rm -rf /etc", "rm -rf /usr", "rm -rf /home/user", "rm -rf /var/lib",
+                        "rm -r -f /", "sudo rm -fR /*", "rm --recursive //bin/", "bash -c 'rm -rf /'"]:
+            with self.subTest(command=command):
+                returncode, stdout, stderr = self.run_hook("dangerous-operation-validator.sh", env, [command])
+
+                self.assertEqual(returncode, 1, "Should block dangerous rm command")
+                self.assertIn("BLOCKED", stdout)
+
+        for command in ["rm -rf /tmp/build", "rm -rf ./etc", "rm -rf node_modules", "rm -f /etc/motd"]:
+            with self.subTest(command=command):
+                returncode, stdout, stderr = self.run_hook("dangerous-operation-validator.sh", env, [command])
+
+                self.assertEqual(returncode, 0, "Should allow the command")
+
+    def test_warns_on_system_directories(self):
+        """Test that the bash checks warn about /etc, /sys and /proc, with or without a trailing path."""
+        env = {"CLAUDE_TOOL_NAME": "Bash"}
+
+        for command, warns in [("cp -r conf /etc", True), ("cat /proc/cpuinfo", True),
+                               ("ls ./etc", False), ("ls /etcetera", False)]:
+            with self.subTest(command=command):
+                returncode, stdout, stderr = self.run_hook("dangerous-operation-validator.sh", env, [command])
+
+                self.assertEqual(returncode, 0, "Should not block")
+                self.assertEqual("Modifying system directories" in stdout, warns)
+
+    def test_ignores_comments_and_quoted_text(self):
+        """Test that the bash checks skip paths in comments, messages and echoed text."""
+        env = {"CLAUDE_TOOL_NAME": "Bash"}
+
+        for command in ['echo "/etc/hosts"', 'git commit -m "fix /etc/ parsing"', "ls # look in /etc/",
+                        "echo 'rm -rf /'", 'echo "chmod 777 /tmp/x"']:
+            with self.subTest(command=command):
+                returncode, stdout, stderr = self.run_hook("dangerous-operation-validator.sh", env, [command])
+
+                self.assertEqual(returncode, 0, "Should allow the command")
+                self.assertEqual(stdout, "", "Should not warn")
+
+    def test_matches_command_rules(self):
+        """Test that the bash checks agree with the command-rules.json handler."""
+        env = {"CLAUDE_TOOL_NAME": "Bash"}
+
+        for command in ["rm -rf /", 'rm -rf "/etc"', "rm -r -f /", "sudo rm -fR /*", "bash -c 'rm -rf /usr'",
+                        "eval 'rm -rf /'", "rm -rf /tmp/build", "rm /etc/motd", "rm -rf ./etc",
+                        'cat "/etc/hosts"', "echo 127.0.0.1 host >> /etc/hosts", "cp -r conf /etc",
+                        'git commit -m "/etc"', 'git commit -m "fix /etc/ parsing"', "ls # rm -rf /",
+                        "ls /etcetera", "chmod 777 /tmp/test", "chmod 777 build", 'echo "$PASSWORD"',
+                        "ls # password", "echo 'sh -c x' && ls /proc"]:
+            with self.subTest(command=command):
+                self.assertEqual(self.run_hook("dangerous-operation-validator.sh", env, [command])[:2],
+                                 self.run_handler("dangerous-operation-validator.sh", env, [command])[:2])
+
+
+class TestCommandRules(HookTestCase):
+    """Test the command tokenizer and rule file used by dangerous-operation-validator.sh."""
+
+    def validate(self, command: str) -> Tuple[int, str, str]:
+        return self.run_hook("dangerous-operation-validator.sh", {"CLAUDE_TOOL_NAME": "Bash"}, [command])
+
+    def validate_handler(self, command: str) -> Tuple[int, str, str]:
+        return self.run_handler("dangerous-operation-validator.sh", {"CLAUDE_TOOL_NAME": "Bash"}, [command])
+
+    def test_blocks_rm_variants(self):
+        """Test that spacing, split flags and wrappers do not hide rm -rf /."""
+        for command in ["rm -rf  /", "rm -r -f /", "sudo rm -fR /*", "ls && bash -c 'rm -rf /'"]:
+            for validate in (self.validate, self.validate_handler):
+                with self.subTest(command=command, validate=validate.__name__):
+                    returncode, stdout, stderr = validate(command)
+
+                    self.assertEqual(returncode, 1, "Should block dangerous rm command")
+                    self.assertIn("BLOCKED", stdout)
+
+    def test_blocks_rm_of_system_directories(self):
+        """Test that recursive rm of a top-level system directory is blocked."""
+        from claude_hooks.command_rules import load_rules
+
+        for command in ["rm -rf /etc", "rm -rf /usr", "rm -rf /home/user", "rm -rf /var/lib", "sudo rm -r //bin/"]:
+            for validate in (self.validate, self.validate_handler):
+                with self.subTest(command=command, validate=validate.__name__):
+                    returncode, stdout, stderr = validate(command)
+
+                    self.assertEqual(returncode, 1, "Should block dangerous rm command")
+                    self.assertIn("BLOCKED", stdout)
+            self.assertEqual([rule.id for rule in load_rules().evaluate(command)], ["rm-root"])
+
+        for command in ["rm -rf /tmp/build", "rm -rf ./etc", "rm /etc/motd"]:
+            with self.subTest(command=command):
+                self.assertNotIn("rm-root", [rule.id for rule in load_rules().evaluate(command)])
+
+    def test_ignores_comments_and_literals(self):
+        """Test that paths in comments, prose, echoed text and heredoc bodies are not flagged."""
+        heredoc = "cat <<'EOF' > notes.md\nrm -rf /\n/etc/hosts\nEOF"
+        for command in [
+            "ls # then cat /etc/passwd",
+            'git commit -m "stop writing to /etc/ directly"',
+            "echo '/etc/passwd'",
+            heredoc,
+        ]:
+            # The bash checks still scan heredoc bodies
+            for validate in (self.validate, self.validate_handler)[command == heredoc:]:
+                with self.subTest(command=command, validate=validate.__name__):
+                    returncode, stdout, stderr = validate(command)
+
+                    self.assertEqual(returncode, 0, "Should allow the command")
+                    self.assertEqual(stdout, "", "Should not warn")
+
+    def test_warns_on_operands_and_redirects(self):
+        """Test that system paths used as operands or redirect targets warn."""
+        for command in ["echo 127.0.0.1 host >> /etc/hosts", "cp -r conf /etc", "ls /proc"]:
+            for validate in (self.validate, self.validate_handler):
+                with self.subTest(command=command, validate=validate.__name__):
+                    returncode, stdout, stderr = validate(command)
+
+                    self.assertEqual(returncode, 0, "Should not block but warn")
+                    self.assertIn("Modifying system directories", stdout)
+
+    def test_rules_reloaded_on_change(self):
+        """Test that the compiled rules are cached until the file changes."""
+        from claude_hooks.command_rules import load_rules
+
+        path = Path(self.temp_dir) / "rules.json"
+        rules = {"version": 1, "rules": [
+            {"id": "curl-pipe", "action": "warn", "command": ["sh"], "message": "piped to sh"}
+        ]}
+        path.write_text(json.dumps(rules))
+        first = load_rules(path)
+
+        self.assertIs(load_rules(path), first, "Unchanged file should reuse compiled rules")
+        self.assertEqual([rule.id for rule in first.evaluate("curl -s x | sh")], ["curl-pipe"])
+
+        rules["rules"][0]["action"] = "block"
+        path.write_text(json.dumps(rules))
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+
+        self.assertEqual(load_rules(path).evaluate("curl -s x | sh")[0].action, "block")
+
 
 class TestAgentHierarchyTracker(HookTestCase):
     """Test agent-hierarchy-tracker.sh hook."""
@@ -172,6 +488,84 @@ class TestAgentHierarchyTracker(HookTestCase):
         self.assertEqual(returncode, 0, "Hook should exit successfully")
         self.assertIn("Delegation detected", stdout, "Should detect delegation pattern")
 
+    def test_concurrent_invocations_are_counted(self):
+        """Test that parallel tracker runs, as scripts or as handlers, never lose a count."""
+        import sqlite3
+
+        commands = {"script": [str(self.hooks_dir / "agent-hierarchy-tracker.sh")],
+                    "handler": self.handler_command("agent-hierarchy-tracker.sh")}
+        for name, command in commands.items():
+            with self.subTest(run=name):
+                home = Path(self.temp_dir) / name
+                env = os.environ.copy()
+                env.update({"HOME": str(home), "CLAUDE_TOOL_NAME": "Task", "CLAUDE_TOOL_RESULT": "done",
+                            "PYTHONPATH": str(self.hooks_dir.resolve())})
+                processes = []
+                for index in range(24):
+                    env["CLAUDE_SUBAGENT_TYPE"] = "go-engineer" if index % 3 else "go-architect"
+                    env["CLAUDE_TASK_DESCRIPTION"] = f"Task {index}"
+                    processes.append(subprocess.Popen(command, env=dict(env),
+                                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+                for process in processes:
+                    self.assertEqual(process.wait(timeout=60), 0)
+
+                db = sqlite3.connect(home / ".claude-code" / "agent-stats.db")
+                try:
+                    uses = dict(db.execute("SELECT name, uses FROM agents"))
+                    tasks = db.execute("SELECT COUNT(DISTINCT task) FROM invocations").fetchone()[0]
+                finally:
+                    db.close()
+                self.assertEqual(uses, {"go-engineer": 16, "go-architect": 8})
+                self.assertEqual(tasks, 24)
+
+    def test_concurrent_shell_runs_keep_the_log_count(self):
+        """Test that parallel bash tracker runs count every logged line."""
+        env = os.environ.copy()
+        env.update({"HOME": self.temp_dir, "CLAUDE_TOOL_NAME": "Task", "CLAUDE_SUBAGENT_TYPE": "go-engineer"})
+        processes = [
+            subprocess.Popen([str(self.hooks_dir / "agent-hierarchy-tracker.sh")],
+                             env={**env, "CLAUDE_TASK_DESCRIPTION": f"Task {index}"},
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for index in range(16)
+        ]
+        for process in processes:
+            self.assertEqual(process.wait(timeout=60), 0)
+
+        log = Path(self.temp_dir) / ".claude-code" / "agent-usage.log"
+        self.assertEqual(len(log.read_text().splitlines()), 16)
+        self.assertEqual(log.with_name("agent-usage.log.count").read_text(), "16")
+
+    def test_reports_top_agents_every_tenth_invocation(self):
+        """Test that the tenth invocation prints the most used agents."""
+        from claude_hooks import hierarchy_tracker
+        from claude_hooks.event import HookEvent
+
+        outputs = []
+        for index in range(10):
+            agent = "rust-debugger" if index < 6 else "go-engineer"
+            event = HookEvent(env={"HOME": self.temp_dir, "CLAUDE_TOOL_NAME": "Task",
+                                   "CLAUDE_SUBAGENT_TYPE": agent})
+            outputs.append(hierarchy_tracker.run(event).output)
+
+        self.assertNotIn("Top agents", "".join(outputs[:9]))
+        self.assertIn("📊 Top agents by usage:\n   rust-debugger: 6 invocations\n"
+                      "   go-engineer: 4 invocations\n", outputs[9])
+
+    def test_imports_legacy_stats(self):
+        """Test that counts from agent-stats.json carry over to the store."""
+        for run in (self.run_hook, self.run_handler):
+            with self.subTest(run=run.__name__):
+                home = Path(self.temp_dir) / run.__name__
+                data_dir = home / ".claude-code"
+                data_dir.mkdir(parents=True)
+                (data_dir / "agent-stats.json").write_text(json.dumps({"go-architect": 7, "go-debugger": 2}))
+
+                returncode, stdout, stderr = run("session-agent-context.sh", {"HOME": str(home)})
+
+                self.assertEqual(returncode, 0, "Hook should exit successfully")
+                self.assertIn("• go-architect: 7 uses\n   • go-debugger: 2 uses", stdout)
+                self.assertTrue((data_dir / "agent-stats.db").exists())
+
 
 class TestAutoDebugSuggester(HookTestCase):
     """Test auto-debug-suggester.sh hook."""
@@ -216,6 +610,562 @@ class TestAutoDebugSuggester(HookTestCase):
         self.assertNotIn("debugger", stdout.lower(), "Should not suggest debugger on success")
 
 
+class TestErrorSignatures(HookTestCase):
+    """Test the error signature matcher used by auto-debug-suggester.sh."""
+
+    def test_match_across_chunks(self):
+        """Test that a literal split across chunk boundaries is found."""
+        from claude_hooks.error_signatures import load_matcher
+
+        output = "ok\n" * 10 + "Traceback (most recent call last):\n  ValueError\n"
+        hits = load_matcher().scan(output, chunk_size=5).hits()
+
+        self.assertEqual([hit.signature.id for hit in hits], ["python"])
+        self.assertEqual(hits[0].location.line, 11)
+
+    def test_all_literals_of_rule_required(self):
+        """Test that a multi-literal rule only hits when every literal occurs."""
+        from claude_hooks.error_signatures import load_matcher
+
+        matcher = load_matcher()
+
+        self.assertEqual(matcher.scan("undefined: x").hits(), [])
+        self.assertEqual([hit.signature.id for hit in matcher.scan("main.go:3: undefined: x").hits()], ["go"])
+
+    def test_signatures_from_data_file(self):
+        """Test that a new signature needs only a data file entry."""
+        from claude_hooks.error_signatures import load_matcher
+
+        path = Path(self.temp_dir) / "signatures.json"
+        path.write_text(json.dumps({
+            "version": 1,
+            "signatures": [{"id": "elixir", "match": [["** (", "Error)"]], "message": ["💧 Elixir error"]}]
+        }))
+        hits = load_matcher(path).scan("** (ArgumentError) bad argument").hits()
+
+        self.assertEqual([hit.signature.message for hit in hits], [("💧 Elixir error",)])
+
+    def test_script_matches_handler(self):
+        """Test that the script and the daemon's handler print the same suggestions."""
+        output = "error[E0502]: cannot borrow\nFAIL src/app.test.js\nTypeError: x is undefined\nbuild failed"
+        env = {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_TOOL_EXIT_CODE": "1", "CLAUDE_TOOL_RESULT": output}
+
+        returncode, stdout, stderr = self.run_hook("auto-debug-suggester.sh", env)
+        handler_returncode, handler_stdout, handler_stderr = self.run_handler("auto-debug-suggester.sh", env)
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("rust-debugger", stdout)
+        self.assertEqual(stdout, handler_stdout, "Suggestions should match the handler's")
+
+    def test_script_reads_signatures_file(self):
+        """Test that the script picks up a signature added to error-signatures.json."""
+        self.hooks_dir = Path(shutil.copytree(self.hooks_dir, Path(self.temp_dir) / "hooks"))
+        path = self.hooks_dir / "error-signatures.json"
+        data = json.loads(path.read_text())
+        data["signatures"].append({"id": "elixir", "match": [["** (", "Error)"]], "message": ["💧 Elixir error"]})
+        path.write_text(json.dumps(data))
+        env = {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_TOOL_EXIT_CODE": "1",
+               "CLAUDE_TOOL_RESULT": "** (ArgumentError) bad argument"}
+
+        returncode, stdout, stderr = self.run_hook("auto-debug-suggester.sh", env)
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertTrue(stdout.startswith("💧 Elixir error\n"), "Should print the new signature's message")
+
+
+class TestSegmentedLog(HookTestCase):
+    """Test rotated log segments and their counter sidecar."""
+
+    def open_log(self, **options):
+        from claude_hooks.segment_log import SegmentedLog
+
+        return SegmentedLog(Path(self.temp_dir) / "agent-usage.log", **options)
+
+    def logged_lines(self, log) -> int:
+        return log.summary()["lines"] + sum(
+            len(path.read_text().splitlines()) for path in log.segments()
+        )
+
+    def test_rotation_keeps_totals(self):
+        """Test that rotation and compaction bound the files but keep every count."""
+        log = self.open_log(max_bytes=256, max_segments=2)
+        for index in range(60):
+            agent = "go-engineer" if index % 2 else "go-architect"
+            count = log.append(f"[2026-01-01T00:00:{index:02d}Z] Agent: {agent}, Task: task {index}")
+
+        self.assertEqual(count, 60)
+        self.assertEqual(log.count(), 60)
+        self.assertLessEqual(log.rotated(), 2)
+        self.assertEqual(self.logged_lines(log), 60)
+        self.assertEqual(log.tail(2)[-1], "[2026-01-01T00:00:59Z] Agent: go-engineer, Task: task 59")
+
+        summary = log.compact(keep=0)
+        self.assertEqual(log.rotated(), 0)
+        self.assertEqual(summary["first"], "2026-01-01T00:00:00Z")
+        self.assertEqual(sum(summary["keys"].values()), summary["lines"])
+        self.assertEqual(self.logged_lines(log), 60)
+
+    def test_counter_starts_from_existing_log(self):
+        """Test that a log written before counters existed is counted once."""
+        log = self.open_log()
+        log.path.write_text("".join(f"[t] Agent: a{index}, Task: x\n" for index in range(7)))
+
+        self.assertEqual(log.append("[t] Agent: a7, Task: x"), 8)
+        self.assertEqual(log.count_path.read_text(), "8")
+
+    def test_concurrent_appends(self):
+        """Test that concurrent writers rotate safely without losing lines."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        log = self.open_log(max_bytes=512, max_segments=3)
+
+        def write(worker):
+            for index in range(50):
+                self.open_log(max_bytes=512, max_segments=3).append(
+                    f"[t] Agent: worker-{worker}, Task: {index}")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(write, range(8)))
+
+        self.assertEqual(log.count(), 400)
+        self.assertEqual(self.logged_lines(log), 400)
+
+    def test_shell_hooks_append_segments(self):
+        """Test that shell-only hooks log through the segmented writer."""
+        project = Path(self.temp_dir) / "project"
+        project.mkdir()
+        (project / "go.mod").write_text("module test")
+        source = project / "main_test.go"
+        source.write_text("package main")
+
+        env = {"CLAUDE_TOOL_NAME": "Write"}
+        self.hooks_dir = self.hooks_dir.resolve()
+        returncode, stdout, stderr = self.run_hook("test-runner-validator.sh", env, [str(source)],
+                                                   cwd=str(project))
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        count_file = Path(self.temp_dir) / ".claude-code" / "test-runs.log.count"
+        self.assertEqual(count_file.read_text(), "1")
+
+    def shell_append(self, log, lines: int, prefix: str = "b"):
+        """Append ``lines`` lines to ``log`` with lib/log.sh."""
+        script = f'source "$HOOK_DIR/lib/log.sh"; for i in $(seq {lines}); do log_line "$1" "{prefix} $i"; done'
+        subprocess.run(["bash", "-c", script, "log", str(log.path)], check=True,
+                       env={**os.environ, "HOOK_DIR": str(self.hooks_dir.resolve())})
+
+    def test_shell_and_python_appends_share_the_lock(self):
+        """Test that bash and Python writers appending at once never lose a count."""
+        log = self.open_log()
+        writer = subprocess.Popen(
+            [sys.executable, "-c", "import sys\n"
+             "from claude_hooks.segment_log import SegmentedLog\n"
+             "log = SegmentedLog(sys.argv[1])\n"
+             "for index in range(100): log.append(f'p {index}')", str(log.path)],
+            env={**os.environ, "PYTHONPATH": str(self.hooks_dir.resolve())})
+        self.shell_append(log, 100)
+        self.assertEqual(writer.wait(timeout=60), 0)
+
+        self.assertEqual(log.count(), 200)
+        self.assertEqual(self.logged_lines(log), 200)
+
+    def test_shell_append_continues_the_count(self):
+        """Test that bash appends count an existing log once, then keep counting."""
+        log = self.open_log()
+        log.path.write_text("".join(f"[t] Agent: a{index}, Task: x\n" for index in range(7)))
+
+        self.shell_append(log, 3)
+
+        self.assertEqual(log.count_path.read_text(), "10")
+        self.assertEqual(log.tail(1), ["b 3"])
+
+    def test_shell_append_rotates_through_python(self):
+        """Test that a bash append filling the active segment rotates it."""
+        from claude_hooks.segment_log import MAX_BYTES
+
+        log = self.open_log()
+        log.append("x" * (MAX_BYTES - 64))
+        # The size is checked every 16 lines, at the 16th bash line here
+        self.shell_append(log, 17)
+
+        self.assertEqual(log.rotated(), 1)
+        self.assertEqual(log.count(), 18)
+        self.assertEqual(log.tail(2), ["b 16", "b 17"])
+        self.assertEqual(log.path.read_text(), "b 17\n")
+
+
+class TestToolResultIntake(HookTestCase):
+    """Test the shared tool result intake layer."""
+
+    def big_log(self) -> str:
+        filler = "".join(f"step {index}: compiling module é{index}\n" for index in range(20000))
+        return filler + "panic: runtime error: index out of range\n" + filler
+
+    def test_window_and_stream(self):
+        """Test that the window holds head and tail while chunks cover everything."""
+        from claude_hooks.intake import ToolResult
+
+        text = self.big_log()
+        view = ToolResult.from_text(text, window=1024)
+
+        self.assertTrue(view.truncated)
+        self.assertNotIn("panic:", view)
+        self.assertIn("step 0:", view)
+        self.assertIn("step 19999:", view)
+        self.assertEqual("".join(view.chunks(chunk_size=1000)), text)
+
+    def test_spooled_file_is_scanned_in_full(self):
+        """Test that a hook reads CLAUDE_TOOL_RESULT_FILE instead of the environment."""
+        result_file = Path(self.temp_dir) / "result.log"
+        result_file.write_text(self.big_log())
+        env = {
+            "CLAUDE_TOOL_NAME": "Bash",
+            "CLAUDE_TOOL_EXIT_CODE": "1",
+            "CLAUDE_TOOL_RESULT": "",
+            "CLAUDE_TOOL_RESULT_FILE": str(result_file),
+        }
+
+        for run in (self.run_hook, self.run_handler):
+            with self.subTest(run=run.__name__):
+                returncode, stdout, stderr = run("auto-debug-suggester.sh", env)
+
+                self.assertEqual(returncode, 0, "Hook should exit successfully")
+                self.assertIn("go-debugger", stdout, "Should find the panic in the middle of the file")
+
+    def test_reads_hook_input_from_stdin(self):
+        """Test that CLAUDE_HOOK_INPUT=stdin takes the result from the hook input JSON."""
+        env = os.environ.copy()
+        env.update({"HOME": self.temp_dir, "CLAUDE_HOOK_INPUT": "stdin", "CLAUDE_TOOL_EXIT_CODE": "1",
+                    "PYTHONPATH": str(self.hooks_dir.resolve())})
+        env.pop("CLAUDE_TOOL_NAME", None)
+        env.pop("CLAUDE_TOOL_RESULT", None)
+        payload = {"tool_name": "Bash", "tool_response": {"stdout": "", "stderr": "panic: boom"}}
+
+        completed = subprocess.run(
+            [sys.executable, "-m", "claude_hooks.debug_suggester"],
+            input=json.dumps(payload), env=env, capture_output=True, text=True, timeout=30,
+        )
+
+        self.assertEqual(completed.returncode, 0)
+        self.assertIn("go-debugger", completed.stdout)
+
+    def test_handoff_spools_once(self):
+        """Test that large results are handed to child hooks as a file plus a window."""
+        from claude_hooks.intake import Handoff
+
+        text = self.big_log()
+        with Handoff({"CLAUDE_TOOL_RESULT": text, "CLAUDE_TOOL_RESULT_WINDOW": "512"}) as handoff:
+            env = handoff.env()
+            self.assertIs(handoff.env(), env)
+            path = env["CLAUDE_TOOL_RESULT_FILE"]
+            self.assertEqual(Path(path).read_text(), text)
+            self.assertLess(len(env["CLAUDE_TOOL_RESULT"]), 2000)
+            self.assertIn("bytes omitted", env["CLAUDE_TOOL_RESULT"])
+        self.assertFalse(os.path.exists(path))
+
+
+class TestTestRunnerValidator(HookTestCase):
+    """Test the test runner validator and its source-to-test index."""
+
+    def make_project(self) -> Path:
+        project = Path(self.temp_dir) / "project"
+        for path in ("src/foo.ts", "src/foo.test.ts", "src/__tests__/foo.spec.tsx",
+                     "src/test/foo-test.js", "tests/test_foo.py", "src/bar.ts"):
+            (project / path).parent.mkdir(parents=True, exist_ok=True)
+            (project / path).write_text("")
+        (project / "package.json").write_text('{"devDependencies": {"jest": "^29"}}')
+        return project
+
+    def test_matches_shell_lookup(self):
+        """Test that indexed lookups list the same files as the shell probing."""
+        from claude_hooks.test_index import TestIndex
+
+        project = self.make_project()
+        legacy = subprocess.run(
+            ["bash", "-c",
+             'source <(sed -n "/^find_test_files()/,/^}/p" "$0"); find_test_files "$1"',
+             str(self.hooks_dir.resolve() / "test-runner-validator.sh"), "src/foo.ts"],
+            capture_output=True, text=True, cwd=str(project)
+        ).stdout.split()
+
+        index = TestIndex(str(project), Path(self.temp_dir) / "index.json")
+        # The shell list probes "${base_name}.test" twice
+        self.assertEqual(index.find("src/foo.ts", str(project)), list(dict.fromkeys(legacy)))
+        self.assertEqual(index.find("src/bar.ts", str(project)), [])
+        self.assertEqual(index.framework(str(project)), "jest")
+
+    def test_index_refreshes_changed_directories(self):
+        """Test that a new test file and a framework change are picked up."""
+        project = self.make_project()
+        env = {"CLAUDE_TOOL_NAME": "Edit"}
+        self.hooks_dir = self.hooks_dir.resolve()
+
+        returncode, stdout, stderr = self.run_handler("test-runner-validator.sh", env, ["src/bar.ts"],
+                                                      cwd=str(project))
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("No test files found for: src/bar.ts", stdout)
+        self.assertTrue(list((Path(self.temp_dir) / ".claude-code" / "test-index").glob("*.json")),
+                        "Index should be stored under ~/.claude-code")
+
+        (project / "src" / "__tests__" / "bar.test.ts").write_text("")
+        (project / "package.json").write_text('{"devDependencies": {"vitest": "^1"}}')
+        returncode, stdout, stderr = self.run_handler("test-runner-validator.sh", env, ["src/bar.ts"],
+                                                      cwd=str(project))
+        self.assertIn("• src/__tests__/bar.test.ts", stdout)
+        self.assertIn("npm test -- src/__tests__/bar.test.ts", stdout)
+        self.assertNotIn("--coverage", stdout, "Framework should be redetected")
+
+    def test_script_probes_changed_directories(self):
+        """Test that the script without the daemon finds a new test file without an index."""
+        project = self.make_project()
+        env = {"CLAUDE_TOOL_NAME": "Edit"}
+        self.hooks_dir = self.hooks_dir.resolve()
+
+        returncode, stdout, stderr = self.run_hook("test-runner-validator.sh", env, ["src/bar.ts"],
+                                                   cwd=str(project))
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("No test files found for: src/bar.ts", stdout)
+
+        (project / "src" / "__tests__" / "bar.test.ts").write_text("")
+        (project / "package.json").write_text('{"devDependencies": {"vitest": "^1"}}')
+        returncode, stdout, stderr = self.run_hook("test-runner-validator.sh", env, ["src/bar.ts"],
+                                                   cwd=str(project))
+        self.assertIn("• src/__tests__/bar.test.ts", stdout)
+        self.assertIn("npm test -- src/__tests__/bar.test.ts", stdout)
+        self.assertNotIn("--coverage", stdout, "Framework should be redetected")
+        self.assertFalse((Path(self.temp_dir) / ".claude-code" / "test-index").exists(),
+                         "Only the daemon keeps the index")
+
+    def test_unchanged_directories_are_not_rescanned(self):
+        """Test that lookups in an unchanged tree reuse the cached listings."""
+        from claude_hooks import test_index
+
+        project = self.make_project()
+        path = Path(self.temp_dir) / "index.json"
+        later = lambda: time.time() + 60
+        first = test_index.TestIndex(str(project), path, clock=later)
+        expected = first.find("src/foo.ts", str(project))
+        first.save()
+
+        scanned = []
+        original = test_index._scan
+        test_index._scan = lambda directory: scanned.append(directory) or original(directory)
+        try:
+            second = test_index.TestIndex(str(project), path, clock=later)
+            self.assertEqual(second.find("src/foo.ts", str(project)), expected)
+        finally:
+            test_index._scan = original
+        self.assertEqual(scanned, [], "Unchanged directories should come from the index")
+        self.assertFalse(second.dirty)
+
+    def test_background_executor_batches_and_cancels(self):
+        """Test that queued targets are merged and a stale run is cancelled."""
+        from claude_hooks.test_executor import TestQueue, work
+
+        queue = TestQueue(Path(self.temp_dir) / ".claude-code", "repo")
+        calls = []
+
+        def command(framework, targets):
+            calls.append(list(targets))
+            script = "import time; time.sleep(30)" if len(calls) == 1 else "pass"
+            return [sys.executable, "-c", script]
+
+        queue.requeue([{"cwd": self.temp_dir, "framework": "python", "targets": ["a.py"]},
+                       {"cwd": self.temp_dir, "framework": "python", "targets": ["b.py", "a.py"]}])
+        worker = threading.Thread(target=work, args=(queue, 0.1, command))
+        worker.start()
+        deadline = time.time() + 10
+        while not calls and time.time() < deadline:
+            time.sleep(0.05)
+        time.sleep(0.3)
+        queue.requeue([{"cwd": self.temp_dir, "framework": "python", "targets": ["c.py"]}])
+        worker.join(20)
+
+        self.assertFalse(worker.is_alive(), "Worker should exit once the queue is empty")
+        self.assertEqual(calls, [["a.py", "b.py"], ["a.py", "b.py", "c.py"]])
+        runs = (Path(self.temp_dir) / ".claude-code" / "test-runs.log").read_text().splitlines()
+        self.assertIn("File: a.py b.py, Framework: python, Result: cancelled", runs[0])
+        self.assertIn("File: a.py b.py c.py, Framework: python, Result: passed", runs[1])
+
+    def test_background_executor_is_opt_in(self):
+        """Test that the hook returns at once and the run is logged later, as a script or a handler."""
+        self.hooks_dir = self.hooks_dir.resolve()
+        for run in (self.run_hook, self.run_handler):
+            with self.subTest(run=run.__name__):
+                home = Path(self.temp_dir) / run.__name__
+                project = home / "project"
+                (project / "tests").mkdir(parents=True)
+                (project / "requirements.txt").write_text("")
+                (project / "calc.py").write_text("def add(a, b):\n    return a + b\n")
+                (project / "tests" / "test_calc.py").write_text(
+                    "import sys\nsys.path.insert(0, '.')\nfrom calc import add\n\n"
+                    "def test_add():\n    assert add(1, 2) == 3\n")
+                executor_dir = home / ".claude-code" / "test-executor"
+
+                run("test-runner-validator.sh", {"CLAUDE_TOOL_NAME": "Edit", "HOME": str(home)}, ["calc.py"],
+                    cwd=str(project))
+                self.assertFalse(executor_dir.exists(), "Background runs should be off by default")
+
+                env = {"CLAUDE_TOOL_NAME": "Edit", "CLAUDE_TEST_EXECUTOR": "true", "CLAUDE_TEST_DEBOUNCE": "0.2",
+                       "HOME": str(home)}
+                started = time.time()
+                returncode, stdout, stderr = run("test-runner-validator.sh", env, ["calc.py"], cwd=str(project))
+                self.assertLess(time.time() - started, 5, "Hook should not wait for the tests")
+                self.assertIn("Queued for a background run", stdout)
+
+                log = home / ".claude-code" / "test-runs.log"
+                deadline = time.time() + 60
+                while "Result:" not in (log.read_text() if log.exists() else "") and time.time() < deadline:
+                    time.sleep(0.2)
+                self.assertIn("File: ./tests/test_calc.py, Framework: python, Result: passed", log.read_text())
+
+
+class TestTypeScriptValidator(HookTestCase):
+    """Test the TypeScript validator's persistent watch mode."""
+
+    # Stands in for `tsc --watch --pretty false`: one cycle per change under src/
+    FAKE_TSC = """
+import glob, os, sys, time
+seen, first = None, True
+while True:
+    snapshot = {path: os.stat(path).st_mtime_ns for path in glob.glob("src/*.ts")}
+    if snapshot != seen:
+        seen = snapshot
+        print("1:00:00 PM - " + ("Starting compilation in watch mode..." if first
+              else "File change detected. Starting incremental compilation..."), flush=True)
+        first = False
+        for path in sorted(snapshot):
+            if "BROKEN" in open(path).read():
+                print(path + "(1,7): error TS2322: Type 'string' is not assignable to type 'number'.", flush=True)
+        print("1:00:01 PM - Found 0 errors. Watching for file changes.", flush=True)
+    time.sleep(0.05)
+"""
+
+    def test_watch_mode_reports_incremental_diagnostics(self):
+        """Test that edits are checked by the running watcher and errors get suggestions."""
+        project = Path(self.temp_dir) / "project"
+        (project / "src").mkdir(parents=True)
+        (project / "tsconfig.json").write_text("{}")
+        tsc = project / "node_modules" / ".bin" / "tsc"
+        tsc.parent.mkdir(parents=True)
+        tsc.write_text(f"#!{sys.executable}\n{self.FAKE_TSC}")
+        tsc.chmod(0o755)
+        source = project / "src" / "app.ts"
+        source.write_text("const total: number = 1;\n")
+
+        env = {"CLAUDE_TOOL_NAME": "Edit", "CLAUDE_TSC_MODE": "watch"}
+        self.hooks_dir = self.hooks_dir.resolve()
+        try:
+            returncode, stdout, stderr = self.run_hook("typescript-validator.sh", env, ["src/app.ts"],
+                                                       cwd=str(project))
+            self.assertEqual(returncode, 0, "Hook should exit successfully")
+            self.assertIn("Running TypeScript validation on: src/app.ts", stdout)
+            self.assertNotIn("TypeScript errors found", stdout)
+
+            time.sleep(0.05)
+            source.write_text("const total: number = 'BROKEN';\n")
+            returncode, stdout, stderr = self.run_hook("typescript-validator.sh", env, ["src/app.ts"],
+                                                       cwd=str(project))
+            self.assertIn("❌ TypeScript errors found:", stdout)
+            self.assertIn("src/app.ts(1,7): error TS2322", stdout)
+            self.assertIn("Review type compatibility", stdout)
+            state = next((Path(self.temp_dir) / ".claude-code" / "tsc").glob("*.json"))
+            self.assertEqual(len(json.loads(state.read_text())["cycles"]), 2,
+                             "Both checks should be served by one watcher")
+        finally:
+            subprocess.run([sys.executable, "-m", "claude_hooks.tsc_watch", "stop"], cwd=str(project),
+                           env={**os.environ, "HOME": self.temp_dir, "PYTHONPATH": str(self.hooks_dir)})
+
+
+    def test_watch_mode_from_a_nested_directory(self):
+        """Test that checks from below the project root share the tsconfig.json directory's watcher."""
+        project = Path(self.temp_dir) / "project"
+        (project / "src").mkdir(parents=True)
+        (project / "tsconfig.json").write_text("{}")
+        tsc = project / "node_modules" / ".bin" / "tsc"
+        tsc.parent.mkdir(parents=True)
+        tsc.write_text(f"#!{sys.executable}\n{self.FAKE_TSC}")
+        tsc.chmod(0o755)
+        source = project / "src" / "app.ts"
+        source.write_text("const total: number = 'BROKEN';\n")
+
+        env = {"CLAUDE_TOOL_NAME": "Edit", "CLAUDE_TSC_MODE": "watch"}
+        self.hooks_dir = self.hooks_dir.resolve()
+        try:
+            returncode, stdout, stderr = self.run_hook("typescript-validator.sh", env, ["app.ts"],
+                                                       cwd=str(project / "src"))
+            self.assertIn("Running TypeScript validation on: app.ts", stdout)
+            self.assertIn("src/app.ts(1,7): error TS2322", stdout)
+
+            returncode, stdout, stderr = self.run_hook("typescript-validator.sh", env, ["src/app.ts"],
+                                                       cwd=str(project))
+            self.assertIn("src/app.ts(1,7): error TS2322", stdout)
+            [state] = (Path(self.temp_dir) / ".claude-code" / "tsc").glob("*.json")
+            self.assertEqual(json.loads(state.read_text())["project"], str(project))
+        finally:
+            subprocess.run([sys.executable, "-m", "claude_hooks.tsc_watch", "stop"], cwd=str(project / "src"),
+                           env={**os.environ, "HOME": self.temp_dir, "PYTHONPATH": str(self.hooks_dir)})
+
+class TestWebResourceValidator(HookTestCase):
+    """Test the cached module resolver behind web-resource-validator."""
+
+    def make_project(self) -> Path:
+        project = Path(self.temp_dir) / "project"
+        for path in ("src/components/Button.tsx", "src/lib/index.ts", "src/util.js", "src/styles.css"):
+            (project / path).parent.mkdir(parents=True, exist_ok=True)
+            (project / path).write_text("")
+        return project
+
+    def check(self, project: Path, *files: str) -> Tuple[int, str]:
+        result = subprocess.run(
+            [sys.executable, "-m", "claude_hooks.module_resolver", "check", *files],
+            cwd=str(project), capture_output=True, text=True,
+            env={**os.environ, "HOME": self.temp_dir, "PYTHONPATH": str(self.hooks_dir.resolve())})
+        return result.returncode, result.stdout
+
+    def test_matches_shell_resolution(self):
+        """Test that relative and root imports are reported like the shell probing."""
+        project = self.make_project()
+        (project / "src" / "page.tsx").write_text(
+            "import React from 'react'\n"
+            "import Button from './components/Button'\n"
+            "import lib from './lib'\n"
+            "import util from '/src/util.js'\n"
+            "import Gone from './components/Gone'\n"
+            "import data from './data.json'\n"
+        )
+        legacy = subprocess.run(
+            ["bash", "-c",
+             'source <(sed -n "/^validate_imports()/,/^}/p" "$0"); validate_imports "$1"',
+             str(self.hooks_dir.resolve() / "web-resource-validator.sh"), "src/page.tsx"],
+            cwd=str(project), capture_output=True, text=True
+        )
+
+        returncode, stdout = self.check(project, "src/page.tsx")
+        self.assertEqual((returncode, stdout), (legacy.returncode, legacy.stdout))
+        self.assertIn("Resolved to: src/./components/Gone (not found)", stdout)
+
+    def test_tsconfig_paths_and_batches(self):
+        """Test path aliases, multi-line imports, batches and cache invalidation."""
+        project = self.make_project()
+        (project / "tsconfig.json").write_text(
+            '{\n  // Next.js style alias\n  "compilerOptions": {"paths": {"@/*": ["./src/*"],},},\n}')
+        (project / "src" / "a.tsx").write_text(
+            "import {\n  Button,\n} from '@/components/Button'\nimport Card from '@/components/Card'\n")
+        (project / "src" / "b.ts").write_text("import lib from '@/lib'\nimport x from 'lodash'\n")
+
+        returncode, stdout = self.check(project, "src/a.tsx", "src/b.ts")
+        self.assertEqual(returncode, 1)
+        self.assertEqual(stdout.splitlines()[:2], [
+            "⚠️ Missing import: '@/components/Card' in src/a.tsx",
+            "   Resolved to: src/components/Card (not found)",
+        ])
+        self.assertNotIn("b.ts", stdout, "Aliased directory imports and packages should resolve")
+
+        (project / "src" / "components" / "Card.tsx").write_text("")
+        returncode, stdout = self.check(project, "src/a.tsx", "src/b.ts")
+        self.assertEqual((returncode, stdout), (0, ""), "A new file should invalidate the cached listing")
+
+
 class TestSessionAgentContext(HookTestCase):
     """Test session-agent-context.sh hook."""
 
@@ -256,16 +1206,24 @@ class TestAgentContextBridge(HookTestCase):
             "CLAUDE_TOOL_RESULT": "Designed microservices structure with event-driven pattern"
         }
 
-        returncode, stdout, stderr = self.run_hook("agent-context-bridge.sh", env)
-
-        self.assertEqual(returncode, 0, "Hook should exit successfully")
-
-        # Check if context file was created
-        context_file = Path(self.temp_dir) / ".claude-code" / "agent-context.json"
-        if context_file.exists():
-            with open(context_file) as f:
-                context = json.load(f)
-                self.assertIn("go-architect", context, "Should store agent findings")
+        for run in (self.run_hook, self.run_handler):
+            with self.subTest(run=run.__name__):
+                home = Path(self.temp_dir) / run.__name__
+                home.mkdir()
+                returncode, stdout, stderr = run("agent-context-bridge.sh", dict(env, HOME=str(home)))
+
+                self.assertEqual(returncode, 0, "Hook should exit successfully")
+
+                # Check that the finding was stored; agent-context.json is only
+                # kept by the script's jq fallback, where there is no Python
+                context_file = home / ".claude-code" / "agent-context-store.json"
+                with open(context_file) as f:
+                    context = json.load(f)
+                self.assertIn("go-architect", context["findings"], "Should store agent findings")
+                legacy_file = home / ".claude-code" / "agent-context.json"
+                if legacy_file.exists():
+                    with open(legacy_file) as f:
+                        self.assertIn("go-architect", json.load(f), "Should store agent findings")
 
     def test_suggests_next_agent(self):
         """Test that next agent in chain is suggested."""
@@ -279,6 +1237,44 @@ class TestAgentContextBridge(HookTestCase):
         self.assertEqual(returncode, 0, "Hook should exit successfully")
         self.assertIn("engineer", stdout.lower(), "Should suggest engineer as next step")
 
+    def test_detects_chains_incrementally(self):
+        """Test chain detection across completions and the bounded chain display."""
+        for run in (self.run_hook, self.run_handler):
+            with self.subTest(run=run.__name__):
+                home = Path(self.temp_dir) / run.__name__
+                home.mkdir()
+                outputs = []
+                for agent in ["go-architect", "go-engineer", "go-test-engineer", "go-debugger"]:
+                    env = {"CLAUDE_SUBAGENT_TYPE": agent, "CLAUDE_TOOL_RESULT": "done", "HOME": str(home)}
+                    returncode, stdout, stderr = run("agent-context-bridge.sh", env)
+                    self.assertEqual(returncode, 0, "Hook should exit successfully")
+                    outputs.append(stdout)
+
+                self.assertNotIn("Complete development chain", outputs[1])
+                self.assertIn("Complete development chain detected", outputs[2])
+                self.assertIn("Test-Debug cycle detected", outputs[3])
+                chain = outputs[3].split("🔗 Current agent chain:\n", 1)[1].splitlines()
+                self.assertEqual([line.split("] ", 1)[1] for line in chain],
+                                 ["go-engineer", "go-test-engineer", "go-debugger"])
+
+    def test_findings_expire(self):
+        """Test that findings past their TTL are evicted and the ring buffer stays bounded."""
+        from claude_hooks.context_store import CAPACITY, FINDING_TTL, ContextStore
+
+        clock = [1000.0]
+        store = ContextStore(Path(self.temp_dir), clock=lambda: clock[0])
+        with store.update() as context:
+            context.add_finding("go-test-engineer", "testing", "Tests executed")
+            for index in range(CAPACITY + 5):
+                context.record(f"agent-{index}", "t")
+
+        self.assertTrue(store.load().mentions("testing"))
+        self.assertEqual(len(store.load().state["entries"]), CAPACITY)
+        self.assertEqual(store.load().recent(1), [("t", f"agent-{CAPACITY + 4}")])
+
+        clock[0] += FINDING_TTL + 1
+        self.assertFalse(store.load().mentions("testing"))
+
 
 class TestResponseNotifier(HookTestCase):
     """Test response-notifier.sh hook."""
@@ -323,6 +1319,205 @@ class TestResponseNotifier(HookTestCase):
         self.assertEqual(returncode, 0, "Hook should exit successfully")
 
 
+class TestToolTimer(HookTestCase):
+    """Test tool-timer.sh and the timing ledger the notifiers read."""
+
+    def ledger(self, clock):
+        from claude_hooks.timing_ledger import TimingLedger
+        return TimingLedger(Path(self.temp_dir), "session-1", clock=clock)
+
+    def test_finish_is_idempotent(self):
+        """Test that every PostToolUse hook gets the same duration and the call counts once."""
+        now = [100.0]
+        ledger = self.ledger(lambda: now[0])
+
+        ledger.start("toolu_1", "WebFetch")
+        ledger.start("toolu_2", "WebFetch")
+        now[0] = 103.0
+        self.assertEqual(ledger.finish("toolu_1", "WebFetch"), 3.0)
+        now[0] = 110.0
+        self.assertEqual(ledger.finish("toolu_1", "WebFetch"), 3.0)
+        self.assertEqual(ledger.finish("toolu_2", "WebFetch"), 10.0)
+        self.assertIsNone(ledger.finish("toolu_3", "WebFetch"))
+
+        histogram = ledger.histograms()["WebFetch"]
+        self.assertEqual(histogram["count"], 2)
+        self.assertEqual(histogram["total"], 13.0)
+
+    def test_notifier_gates_on_ledger_duration(self):
+        """Test that response-notifier.sh measures the call that tool-timer.sh started."""
+        env = {"CLAUDE_TOOL_NAME": "WebFetch", "CLAUDE_SESSION_ID": "s1", "CLAUDE_TOOL_USE_ID": "toolu_1",
+               "CLAUDE_NOTIFIER_TTS": "false", "CLAUDE_NOTIFIER_MIN_TIME": "5"}
+        log = Path(self.temp_dir) / ".claude-code" / "notifications.log"
+
+        self.run_hook("tool-timer.sh", dict(env, CLAUDE_HOOK_EVENT="PreToolUse"))
+        ledger_file = Path(self.temp_dir) / ".claude-code" / "timing" / "s1.log"
+        kind, call, tool, micros = ledger_file.read_text().split()
+        ledger_file.write_text(f"{kind} {call} {tool} {int(micros) - 30_000_000}\n")
+
+        post = dict(env, CLAUDE_HOOK_EVENT="PostToolUse", CLAUDE_TOOL_RESULT="Fetch complete")
+        self.run_hook("tool-timer.sh", post)
+        returncode, stdout, stderr = self.run_hook("response-notifier.sh", post)
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("Web search complete", log.read_text(), "A 30s call should notify")
+
+        # A quick call of the same kind stays quiet
+        log.unlink()
+        quick = dict(env, CLAUDE_TOOL_USE_ID="toolu_2")
+        self.run_hook("tool-timer.sh", dict(quick, CLAUDE_HOOK_EVENT="PreToolUse"))
+        self.run_hook("response-notifier.sh", dict(quick, CLAUDE_TOOL_RESULT="Fetch complete"))
+        self.assertFalse(log.exists(), "A quick call should not notify")
+
+    def test_notifier_records_start_only_on_pre_tool_use(self):
+        """Test that a PostToolUse with empty output never records a start for the notifiers."""
+        env = {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_SESSION_ID": "s3", "CLAUDE_TOOL_USE_ID": "toolu_1",
+               "CLAUDE_NOTIFIER_TTS": "false"}
+
+        self.run_hook("response-notifier.sh", dict(env, CLAUDE_HOOK_EVENT="PreToolUse"))
+        self.run_hook("response-notifier.sh", dict(env, CLAUDE_HOOK_EVENT="PostToolUse"))
+        self.run_hook("pushover-notifier.sh", dict(env, CLAUDE_HOOK_EVENT="PostToolUse", PUSHOVER_ENABLED="false"))
+
+        lines = (Path(self.temp_dir) / ".claude-code" / "timing" / "s3.log").read_text().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ["start"])
+
+    def test_keys_calls_from_hook_input(self):
+        """Test that tool-timer.sh keys overlapping calls of one tool by the IDs in the hook input."""
+        from claude_hooks.timing_ledger import TimingLedger
+
+        hook_path = str(self.hooks_dir / "tool-timer.sh")
+        env = os.environ.copy()
+        env["HOME"] = self.temp_dir
+        for name in ("CLAUDE_TOOL_NAME", "CLAUDE_TOOL_USE_ID", "CLAUDE_SESSION_ID", "CLAUDE_HOOK_EVENT"):
+            env.pop(name, None)
+
+        def step(event: str, call: str):
+            # A tool input quoting the field comes first and must not match
+            payload = {"tool_input": {"command": 'echo "\\"tool_use_id\\": \\"toolu_x\\""'},
+                       "session_id": "s2", "hook_event_name": event, "tool_name": "Bash", "tool_use_id": call}
+            subprocess.run([hook_path], input=json.dumps(payload), env=env, text=True, check=True)
+
+        step("PreToolUse", "toolu_a")
+        step("PreToolUse", "toolu_b")
+        step("PostToolUse", "toolu_b")
+        step("PostToolUse", "toolu_a")
+        step("PostToolUse", "toolu_a")
+
+        lines = (Path(self.temp_dir) / ".claude-code" / "timing" / "s2.log").read_text().splitlines()
+        self.assertEqual([line.split()[:3] for line in lines], [
+            ["start", "toolu_a", "Bash"], ["start", "toolu_b", "Bash"], ["finish", "toolu_b", "Bash"],
+            ["finish", "toolu_a", "Bash"], ["finish", "toolu_a", "Bash"],
+        ])
+        self.assertEqual(TimingLedger(Path(self.temp_dir) / ".claude-code").histograms()["Bash"]["count"], 2,
+                         "A call finished twice counts once")
+
+    def test_report(self):
+        """Test that the report lists per-tool latency."""
+        from claude_hooks.timing_ledger import report
+
+        now = [0.0]
+        ledger = self.ledger(lambda: now[0])
+        for seconds in (0.2, 0.3, 12.0):
+            ledger.start("call", "Bash")
+            now[0] += seconds
+            ledger.finish("call", "Bash")
+
+        lines = report(ledger.histograms())
+        self.assertTrue(lines[1].startswith("Bash"))
+        self.assertIn("3", lines[1].split()[1])
+        self.assertTrue(any("≤30s" in line for line in lines))
+
+
+class TestHookTrace(HookTestCase):
+    """Test the trace spans hooks record and the overhead report."""
+
+    def spans(self):
+        from claude_hooks.trace import read_spans
+        return list(read_spans(Path(self.temp_dir) / ".claude-code"))
+
+    def test_dispatcher_records_span_per_check(self):
+        """Test that the dispatcher writes one span per check it ran, flagging the block."""
+        env = {"CLAUDE_TOOL_NAME": "Bash"}
+
+        returncode, stdout, stderr = self.run_hook("hook-dispatch.py", env, ["PreToolUse", "rm -rf /"])
+
+        self.assertEqual(returncode, 1, "Should block dangerous rm command")
+        spans = {span.hook: span for span in self.spans()}
+        self.assertEqual(sorted(spans), ["dangerous-operation-validator", "tool-timer"])
+        validator = spans["dangerous-operation-validator"]
+        self.assertEqual((validator.event, validator.tool, validator.exit), ("PreToolUse", "Bash", 1))
+        self.assertTrue(validator.blocked)
+        self.assertFalse(spans["tool-timer"].blocked)
+        self.assertEqual(validator.forks, 0)
+
+    def test_standalone_hooks_trace_themselves(self):
+        """Test that scripts run directly write their own span, and none under the dispatcher."""
+        (Path(self.temp_dir) / ".claude-code").mkdir()
+        self.run_hook("agent-selector.sh", {"CLAUDE_TOOL_NAME": "Task"}, ["Debug the failing Go tests"])
+        self.run_handler("agent-selector.sh", {"CLAUDE_TOOL_NAME": "Task"}, ["Debug the failing Go tests"])
+        self.run_hook("typescript-validator.sh", {"CLAUDE_TOOL_NAME": "Edit"}, ["notes.txt"])
+        self.run_hook("typescript-validator.sh", {"CLAUDE_TOOL_NAME": "Edit", "CLAUDE_HOOK_TRACED": "1"},
+                      ["notes.txt"])
+        self.run_hook("typescript-validator.sh", {"CLAUDE_TOOL_NAME": "Edit", "CLAUDE_HOOK_TRACE": "0"},
+                      ["notes.txt"])
+
+        spans = self.spans()
+        self.assertEqual([span.hook for span in spans], ["agent-selector", "agent-selector", "typescript-validator"])
+        self.assertEqual([span.tool for span in spans[:2]], ["Task", "Task"])
+        self.assertIsNone(spans[2].forks, "Shell hooks cannot count their forks")
+        self.assertGreaterEqual(spans[2].duration, 0)
+
+    def test_shell_spans_fall_back_to_the_registered_event(self):
+        """Test that shell spans without CLAUDE_HOOK_EVENT carry the script's event."""
+        self.run_hook("dangerous-operation-validator.sh", {"CLAUDE_TOOL_NAME": "Bash"}, ["rm -rf /"])
+        self.run_hook("typescript-validator.sh", {"CLAUDE_TOOL_NAME": "Edit"}, ["notes.txt"])
+
+        spans = self.spans()
+        self.assertEqual([(span.hook, span.event) for span in spans],
+                         [("dangerous-operation-validator", "PreToolUse"), ("typescript-validator", "PostToolUse")])
+        self.assertTrue(spans[0].blocked)
+        count = Path(self.temp_dir) / ".claude-code" / "hook-trace.jsonl.count"
+        self.assertEqual(count.read_text(), "2")
+
+    def test_shell_spans_for_runs_that_match_nothing(self):
+        """Test that scripts trace the runs their checks skip."""
+        self.run_hook("auto-debug-suggester.sh", {"CLAUDE_TOOL_NAME": "Read", "CLAUDE_TOOL_EXIT_CODE": "1"})
+        self.run_hook("agent-context-bridge.sh", {"CLAUDE_TOOL_NAME": "Task"})
+
+        self.assertEqual([(span.hook, span.event, span.exit) for span in self.spans()],
+                         [("auto-debug-suggester", "PostToolUse", 0), ("agent-context-bridge", "SubagentStop", 0)])
+
+    def test_shell_spans_escape_fields(self):
+        """Test that quotes, backslashes and control characters in a shell span stay valid JSON."""
+        tool = 'Edit"\\x\ty\x01'
+        self.run_hook("typescript-validator.sh", {"CLAUDE_TOOL_NAME": tool, "CLAUDE_HOOK_EVENT": "Post\nToolUse"},
+                      ["notes.txt"])
+
+        [span] = self.spans()
+        self.assertEqual((span.tool, span.event), (tool, "Post\nToolUse"))
+
+    def test_report(self):
+        """Test that the report ranks hooks and tools by overhead and lists the slowest runs."""
+        from claude_hooks.trace import Span, percentile, report
+
+        spans = [Span(ts=1760000000.0 + i, hook="typescript-validator", event="PostToolUse", tool="Edit",
+                      duration=0.1 * (i + 1), forks=1, exit=0, blocked=False) for i in range(10)]
+        spans.append(Span(ts=1760000011.0, hook="dangerous-operation-validator", event="PreToolUse",
+                          tool="Bash", duration=0.01, forks=0, exit=1, blocked=True))
+
+        self.assertEqual(percentile([0.1, 0.2, 0.3, 0.4], 0.5), 0.2)
+        self.assertEqual(percentile([0.1, 0.2, 0.3, 0.4], 0.99), 0.4)
+
+        lines = report(spans, {"Edit": 11.0}, top=3)
+        per_hook = lines.index("Per hook:")
+        self.assertTrue(lines[per_hook + 2].startswith("typescript-validator"))
+        self.assertTrue(lines[per_hook + 3].split()[-1] == "1", "Blocked runs are counted")
+        edit = next(line for line in lines if line.startswith("Edit "))
+        self.assertIn("50.0%", edit, "5.5s of hooks on 11s of Edit")
+        slowest = lines[lines.index("Top 3 slowest runs:") + 1]
+        self.assertIn("1000.0ms", slowest)
+
+
 class TestPushoverNotifier(HookTestCase):
     """Test pushover-notifier.sh hook."""
 
@@ -368,26 +1563,584 @@ class TestPushoverNotifier(HookTestCase):
 
         self.assertEqual(returncode, 0, "Hook should exit successfully")
 
+    def start_api(self, responses=None):
+        """A local stand-in for the Pushover API; returns its URL and the requests it saw."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs
+
+        requests = []
+        responses = list(responses or [])
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                fields = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+                requests.append((self.client_address[1], fields))
+                status, headers = responses.pop(0) if responses else (200, {})
+                body = b'{"status":1,"request":"test"}' if status == 200 else b'{"status":0}'
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}/1/messages.json", requests
+
+    def sender(self, url, clock=time.time):
+        from claude_hooks.pushover_outbox import Client, Outbox, Sender
+        return Sender(Outbox(Path(self.temp_dir)), Client(url), window=0, clock=clock)
+
+    def queue(self, sender, *titles, priority=0):
+        sender.outbox.append([
+            {"queued": sender.clock(), "token": "app", "user": "me", "title": title, "message": f"{title} done",
+             "priority": priority}
+            for title in titles
+        ])
+
+    def test_outbox_merges_burst_over_one_connection(self):
+        """Test that a burst becomes one message and later sends reuse the connection."""
+        url, requests = self.start_api()
+        sender = self.sender(url)
+
+        self.queue(sender, "Build", "Tests", "Lint")
+        sender.flush()
+        self.queue(sender, "Deploy", priority=1)
+        sender.flush()
+        sender.client.close()
+
+        self.assertEqual(len(requests), 2)
+        self.assertIn("3 updates", requests[0][1]["message"])
+        self.assertIn("Lint: Lint done", requests[0][1]["message"])
+        self.assertEqual(requests[1][1]["priority"], "1")
+        self.assertEqual(requests[0][0], requests[1][0], "Should reuse one keep-alive connection")
+
+    def test_rate_limit_holds_until_reset(self):
+        """Test that a 429 keeps the notification queued until the limit resets."""
+        now = [1000.0]
+        url, requests = self.start_api([(429, {"X-Limit-App-Reset": "1060"})])
+        sender = self.sender(url, clock=lambda: now[0])
+
+        self.queue(sender, "Build")
+        sender.flush()
+        self.assertEqual(len(requests), 1)
+        self.assertFalse(sender.due(sender.outbox.peek()), "Should hold while rate limited")
+
+        now[0] = 1061.0
+        self.assertTrue(sender.due(sender.outbox.peek()))
+        sender.flush()
+        sender.client.close()
+
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1][1]["title"], "Build")
+        self.assertEqual(sender.outbox.peek(), [])
+
+    def test_hook_queues_for_background_sender(self):
+        """Test that the hook returns at once and the sender delivers to PUSHOVER_API_URL."""
+        url, requests = self.start_api()
+        env = {
+            "CLAUDE_TOOL_NAME": "Bash",
+            "CLAUDE_TOOL_EXIT_CODE": "0",
+            "CLAUDE_TOOL_RESULT": "Build complete",
+            "PUSHOVER_USER_KEY": "me",
+            "PUSHOVER_APP_TOKEN": "app",
+            "PUSHOVER_API_URL": url,
+            "PUSHOVER_BATCH_WINDOW": "0",
+            "PUSHOVER_SENDER_IDLE": "0.5",
+        }
 
-def run_tests():
-    """Run all hook tests."""
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
+        returncode, stdout, stderr = self.run_hook("pushover-notifier.sh", env)
 
-    # Add all test cases
-    suite.addTests(loader.loadTestsFromTestCase(TestAgentSelector))
-    suite.addTests(loader.loadTestsFromTestCase(TestDangerousOperationValidator))
-    suite.addTests(loader.loadTestsFromTestCase(TestAgentHierarchyTracker))
-    suite.addTests(loader.loadTestsFromTestCase(TestAutoDebugSuggester))
-    suite.addTests(loader.loadTestsFromTestCase(TestSessionAgentContext))
-    suite.addTests(loader.loadTestsFromTestCase(TestAgentContextBridge))
-    suite.addTests(loader.loadTestsFromTestCase(TestResponseNotifier))
-    suite.addTests(loader.loadTestsFromTestCase(TestPushoverNotifier))
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        deadline = time.time() + 10
+        while not requests and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(len(requests), 1, "Sender should deliver the queued notification")
+        self.assertEqual(requests[0][1]["title"], "Claude Code - Ready")
+        self.assertEqual(requests[0][1]["token"], "app")
+
+
+class TestHookSettings(HookTestCase):
+    """Test the hook declarations and the settings generated from them."""
+
+    def test_examples_are_generated(self):
+        """Test that the example settings are what the declarations generate."""
+        from claude_hooks.hook_settings import build_settings, declarations
+        from claude_hooks.registry import HANDLERS
+
+        declared = declarations(self.hooks_dir)
+        with open(self.hooks_dir / "settings.example.json") as f:
+            self.assertEqual(json.load(f), build_settings(declared))
+        with open(self.hooks_dir / "settings.daemon.example.json") as f:
+            daemon = json.load(f)
+        self.assertEqual(daemon["hooks"], build_settings(declared, client=HANDLERS)["hooks"])
+
+    def test_matchers_follow_declarations(self):
+        """Test that hooks are grouped by matcher and skipped tools fall back to *."""
+        from claude_hooks.hook_settings import Declaration, build_settings
+
+        declared = {
+            "notifier": Declaration("notifier", ("PostToolUse",), None, ("Read", "Grep")),
+            "linter": Declaration("linter", ("PostToolUse",), ("Write", "Edit")),
+            "checker": Declaration("checker", ("PostToolUse",), ("Write", "Edit")),
+            "context": Declaration("context", ("SessionStart",)),
+        }
 
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+        settings = build_settings(declared, command="/opt/hooks/{name}.sh")["hooks"]
+        post = {entry["matcher"]: [hook["command"] for hook in entry["hooks"]] for entry in settings["PostToolUse"]}
+        self.assertEqual(post, {
+            "*": ["/opt/hooks/notifier.sh"],
+            "Write|Edit": ["/opt/hooks/checker.sh", "/opt/hooks/linter.sh"],
+        })
+        self.assertEqual(settings["SessionStart"][0]["matcher"], "*")
+        self.assertFalse(declared["notifier"].handles("Grep"))
+        self.assertTrue(declared["notifier"].handles("Bash"))
+
+    def test_reads_header_declaration(self):
+        """Test parsing the Events/Tools lines and rejecting a malformed one."""
+        from claude_hooks.hook_settings import read_declaration
+
+        hook = Path(self.temp_dir) / "my-hook.sh"
+        hook.write_text("#!/bin/bash\n# PostToolUse hook: test\n# Events: PreToolUse, PostToolUse\n"
+                        "# Tools: * except Read, LS\nexit 0\n")
+        declaration = read_declaration(hook)
+        self.assertEqual(declaration.name, "my-hook")
+        self.assertEqual(declaration.events, ("PreToolUse", "PostToolUse"))
+        self.assertIsNone(declaration.tools)
+        self.assertEqual(declaration.skip_tools, ("Read", "LS"))
+
+        hook.write_text("#!/bin/bash\n# Events: PostToolUse\n# Tools: * but Read\nexit 0\n")
+        with self.assertRaises(ValueError):
+            read_declaration(hook)
+
+        hook.write_text("#!/bin/bash\n# Simple hook\nexit 0\n")
+        self.assertIsNone(read_declaration(hook))
+
+
+class TestHookDaemon(HookTestCase):
+    """Test hookd.py and the hook-client.py thin client."""
+
+    PARITY_CASES = [
+        ("agent-selector", {"CLAUDE_TOOL_NAME": "Bash"}, ["ls -la"]),
+        ("dangerous-operation-validator", {"CLAUDE_TOOL_NAME": "Bash"}, ["rm -rf /"]),
+        ("dangerous-operation-validator", {"CLAUDE_TOOL_NAME": "Bash"}, ["chmod 777 /etc/passwd"]),
+        ("dangerous-operation-validator", {"CLAUDE_TOOL_NAME": "Write"}, [".env.local"]),
+        ("dangerous-operation-validator", {
+            "CLAUDE_TOOL_NAME": "Task",
+            "CLAUDE_SUBAGENT_TYPE": "terraform-architect",
+            "CLAUDE_TASK_DESCRIPTION": "destroy the prod stack"
+        }, []),
+        ("agent-hierarchy-tracker", {
+            "CLAUDE_TOOL_NAME": "Task",
+            "CLAUDE_SUBAGENT_TYPE": "go-architect",
+            "CLAUDE_TOOL_RESULT": "Delegating to go-engineer, architect approved"
+        }, []),
+        ("auto-debug-suggester", {
+            "CLAUDE_TOOL_NAME": "Bash",
+            "CLAUDE_TOOL_EXIT_CODE": "1",
+            "CLAUDE_TOOL_RESULT": "error[E0502]: cannot borrow\nFAIL src/app.test.js\nTypeError: x is undefined"
+        }, []),
+    ]
+    # The daemon ranks agents from their frontmatter, where the script without
+    # it keeps its keyword table
+    HANDLER_PARITY_CASES = PARITY_CASES + [
+        ("agent-selector", {"CLAUDE_TOOL_NAME": "Task"}, ["Design and test a full-stack app"]),
+    ]
+
+    def setUp(self):
+        super().setUp()
+        from claude_hooks.daemon import HookServer
+
+        self.socket_path = os.path.join(self.temp_dir, "hookd.sock")
+        self.server = HookServer(self.socket_path)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_daemon_matches_scripts(self):
+        """Test that the daemon produces the same output and exit code as the scripts."""
+        self.assert_daemon_matches(self.PARITY_CASES, self.run_hook)
+
+    def test_daemon_matches_handlers(self):
+        """Test that the daemon produces the same output and exit code as the handlers run alone."""
+        self.assert_daemon_matches(self.HANDLER_PARITY_CASES, self.run_handler)
+
+    def assert_daemon_matches(self, cases, run):
+        for index, (hook, env, args) in enumerate(cases):
+            with self.subTest(hook=hook, case=index):
+                daemon_home = os.path.join(self.temp_dir, f"daemon-{index}")
+                script_home = os.path.join(self.temp_dir, f"script-{index}")
+                os.makedirs(daemon_home)
+                os.makedirs(script_home)
+
+                client_env = dict(env, HOME=daemon_home, CLAUDE_HOOKD_SOCKET=self.socket_path)
+                expected = run(f"{hook}.sh", dict(env, HOME=script_home), args)
+                actual = self.run_hook("hook-client.py", client_env, [hook] + args)
+
+                self.assertEqual(actual[0], expected[0], "Exit codes should match")
+                self.assertEqual(actual[1], expected[1], "Output should match")
+
+    def test_scripts_forward_to_daemon(self):
+        """Test that a script hands its call to a running daemon and runs its bash checks without one."""
+        env = {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_HOOKD_SOCKET": self.socket_path}
+        command = "cat <<'EOF' > notes.md\nrm -rf /\nEOF"
+
+        forwarded = self.run_hook("dangerous-operation-validator.sh", env, [command])
+        self.assertEqual(forwarded[:2], self.run_handler("dangerous-operation-validator.sh", env, [command])[:2])
+        self.assertEqual(forwarded[0], 0, "The daemon tokenizes the command and skips the heredoc body")
+
+        env["CLAUDE_HOOKD_SOCKET"] = os.path.join(self.temp_dir, "missing.sock")
+        returncode, stdout, stderr = self.run_hook("dangerous-operation-validator.sh", env, [command])
+        self.assertEqual(returncode, 1, "The bash checks scan heredoc bodies as commands")
+        self.assertIn("BLOCKED", stdout)
+
+    def test_agent_stats_agree_with_and_without_daemon(self):
+        """Test that tracker runs through the daemon and as scripts count into one store."""
+        missing = os.path.join(self.temp_dir, "missing.sock")
+        outputs = []
+        for index in range(10):
+            env = {
+                "CLAUDE_TOOL_NAME": "Task",
+                "CLAUDE_SUBAGENT_TYPE": "go-engineer" if index % 3 else "rust-debugger",
+                "CLAUDE_TASK_DESCRIPTION": f"Task {index}",
+                "CLAUDE_HOOKD_SOCKET": self.socket_path if index % 2 else missing,
+            }
+            returncode, stdout, stderr = self.run_hook("agent-hierarchy-tracker.sh", env)
+            self.assertEqual(returncode, 0, stderr)
+            outputs.append(stdout)
+
+        self.assertNotIn("Top agents", "".join(outputs[:9]))
+        self.assertIn("📊 Top agents by usage:\n   go-engineer: 6 invocations\n"
+                      "   rust-debugger: 4 invocations\n", outputs[9])
+
+        contexts = [self.run_hook("session-agent-context.sh", {"CLAUDE_HOOKD_SOCKET": socket})[1]
+                    for socket in (self.socket_path, missing)]
+        self.assertEqual(contexts[0], contexts[1])
+        self.assertIn("• go-engineer: 6 uses\n   • rust-debugger: 4 uses", contexts[0])
+
+    def test_agent_context_is_shared_with_and_without_daemon(self):
+        """Test that context bridge runs through the daemon and as scripts see each other's context."""
+        missing = os.path.join(self.temp_dir, "missing.sock")
+        outputs = []
+        for agent, result, socket_path in [("go-architect", "Defined the structure", missing),
+                                           ("go-tester", "All tests passed", self.socket_path),
+                                           ("go-engineer", "implemented the handler", missing)]:
+            env = {"CLAUDE_SUBAGENT_TYPE": agent, "CLAUDE_TOOL_RESULT": result, "CLAUDE_HOOKD_SOCKET": socket_path}
+            returncode, stdout, stderr = self.run_hook("agent-context-bridge.sh", env)
+            self.assertEqual(returncode, 0, stderr)
+            outputs.append(stdout)
+
+        self.assertNotIn("Consider a test engineer", outputs[2], "The script should see the daemon's test finding")
+        chain = outputs[2].split("🔗 Current agent chain:\n", 1)[1].splitlines()
+        self.assertEqual([line.split("] ", 1)[1] for line in chain],
+                         ["go-architect", "go-tester", "go-engineer"])
+        store = json.loads((Path(self.temp_dir) / ".claude-code" / "agent-context-store.json").read_text())
+        self.assertEqual(sorted(store["findings"]), ["go-architect", "go-engineer", "go-tester"])
+        self.assertFalse((Path(self.temp_dir) / ".claude-code" / "agent-context.json").exists())
+
+    def test_client_times_calls_for_the_notifiers(self):
+        """Test that tool-timer through the client keys a call by its hook input for response-notifier.sh."""
+        env = {"CLAUDE_NOTIFIER_TTS": "false", "CLAUDE_NOTIFIER_MIN_TIME": "5"}
+        data_dir = Path(self.temp_dir) / ".claude-code"
+        for socket_path in (self.socket_path, os.path.join(self.temp_dir, "missing.sock")):
+            with self.subTest(daemon=socket_path == self.socket_path):
+                hook_input = {"session_id": "s1", "tool_use_id": "toolu_1", "tool_name": "WebFetch"}
+                self.run_hook("hook-client.py", dict(env, CLAUDE_HOOKD_SOCKET=socket_path), ["tool-timer"],
+                              hook_input=dict(hook_input, hook_event_name="PreToolUse"))
+                ledger_file = data_dir / "timing" / "s1.log"
+                kind, call, tool, micros = ledger_file.read_text().split()
+                self.assertEqual((kind, call, tool), ("start", "toolu_1", "WebFetch"))
+                ledger_file.write_text(f"{kind} {call} {tool} {int(micros) - 30_000_000}\n")
+
+                returncode, stdout, stderr = self.run_hook(
+                    "response-notifier.sh", dict(env, CLAUDE_TOOL_RESULT="Fetch complete"),
+                    hook_input=dict(hook_input, hook_event_name="PostToolUse"))
+
+                self.assertEqual(returncode, 0, "Hook should exit successfully")
+                self.assertIn("Web search complete", (data_dir / "notifications.log").read_text(),
+                              "The notifier should find the start the client recorded")
+                shutil.rmtree(data_dir)
+
+    def test_client_falls_back_without_daemon(self):
+        """Test that the client runs the script when no daemon is listening."""
+        env = {
+            "CLAUDE_TOOL_NAME": "Bash",
+            "CLAUDE_HOOKD_SOCKET": os.path.join(self.temp_dir, "missing.sock")
+        }
+
+        returncode, stdout, stderr = self.run_hook(
+            "hook-client.py", env, ["dangerous-operation-validator", "rm -rf /"]
+        )
+
+        self.assertEqual(returncode, 1, "Fallback script should still block")
+        self.assertIn("BLOCKED", stdout, "Should show blocking message")
+
+    def test_client_spools_large_results(self):
+        """Test that a large tool result reaches the daemon through a spool file."""
+        filler = "x" * 50000 + "\n"
+        env = {
+            "CLAUDE_HOOKD_SOCKET": self.socket_path,
+            "CLAUDE_TOOL_NAME": "Bash",
+            "CLAUDE_TOOL_EXIT_CODE": "1",
+            "CLAUDE_TOOL_RESULT": filler + "panic: runtime error\n" + filler,
+            "TMPDIR": self.temp_dir,
+        }
+
+        returncode, stdout, stderr = self.run_hook("hook-client.py", env, ["auto-debug-suggester"])
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("go-debugger", stdout, "Daemon should scan the spooled result in full")
+        self.assertEqual(list(Path(self.temp_dir).glob("claude-tool-result-*")), [],
+                         "Client should remove its spool file")
+
+    def test_unknown_hook_falls_back(self):
+        """Test that hooks the daemon does not serve run as scripts."""
+        env = {
+            "CLAUDE_HOOKD_SOCKET": self.socket_path,
+            "CLAUDE_TOOL_NAME": "Task",
+            "CLAUDE_TASK_DESCRIPTION": "build the react frontend"
+        }
+
+        returncode, stdout, stderr = self.run_hook("hook-client.py", env, ["web-resource-validator"])
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+        self.assertIn("Web development task completed", stdout, "Should run web-resource-validator.sh")
+
+    def test_event_dispatch(self):
+        """Test that the daemon runs every hook for an event."""
+        env = {"CLAUDE_HOOKD_SOCKET": self.socket_path, "CLAUDE_TOOL_NAME": "Bash"}
+
+        returncode, stdout, stderr = self.run_hook("hook-client.py", env, ["--event", "PreToolUse", "rm -rf /"])
+
+        self.assertEqual(returncode, 1, "Should block dangerous rm command")
+        self.assertIn("BLOCKED", stdout, "Should show blocking message")
+
+
+class TestHookDispatcher(HookTestCase):
+    """Test hook-dispatch.py."""
+
+    def test_blocks_like_validator(self):
+        """Test that a blocking check keeps its exit code."""
+        env = {"CLAUDE_TOOL_NAME": "Bash"}
+
+        returncode, stdout, stderr = self.run_hook("hook-dispatch.py", env, ["PreToolUse", "rm -rf /"])
+
+        self.assertEqual(returncode, 1, "Should block dangerous rm command")
+        self.assertIn("BLOCKED", stdout, "Should show blocking message")
+
+    def test_merges_output_in_order(self):
+        """Test that output from several hooks is merged deterministically."""
+        env = {
+            "CLAUDE_TOOL_NAME": "Task",
+            "CLAUDE_SUBAGENT_TYPE": "terraform-architect",
+            "CLAUDE_TASK_DESCRIPTION": "Design and deploy the prod cluster"
+        }
+
+        returncode, stdout, stderr = self.run_hook(
+            "hook-dispatch.py", env, ["PreToolUse", "Design and deploy the prod cluster"]
+        )
+
+        self.assertEqual(returncode, 0, "Should not block")
+        selector = stdout.index("Consider these agents")
+        validator = stdout.index("Production deployment detected")
+        self.assertLess(selector, validator, "agent-selector output should come first")
+
+    def test_disable_list(self):
+        """Test that disabled hooks do not run."""
+        env = {"CLAUDE_TOOL_NAME": "Bash", "CLAUDE_HOOKS_DISABLE": "dangerous-operation-validator"}
+
+        returncode, stdout, stderr = self.run_hook("hook-dispatch.py", env, ["PreToolUse", "rm -rf /"])
+
+        self.assertEqual(returncode, 0, "Disabled validator should not block")
+        self.assertNotIn("BLOCKED", stdout)
+
+    def test_session_start_matches_script(self):
+        """Test that the in-process session context matches the script."""
+        expected = self.run_hook("session-agent-context.sh")
+        actual = self.run_hook("hook-dispatch.py", args=["SessionStart"])
+
+        self.assertEqual(actual, expected)
+
+    def test_unknown_event_never_blocks(self):
+        """Test that a misconfigured event name exits successfully."""
+        returncode, stdout, stderr = self.run_hook("hook-dispatch.py", args=["NotAnEvent"])
+
+        self.assertEqual(returncode, 0, "Hook should exit successfully")
+
+
+TEST_CASES = [
+    TestAgentSelector,
+    TestAgentIndex,
+    TestAgentManifest,
+    TestDangerousOperationValidator,
+    TestCommandRules,
+    TestAgentHierarchyTracker,
+    TestAutoDebugSuggester,
+    TestErrorSignatures,
+    TestSegmentedLog,
+    TestToolResultIntake,
+    TestTestRunnerValidator,
+    TestTypeScriptValidator,
+    TestWebResourceValidator,
+    TestSessionAgentContext,
+    TestAgentContextBridge,
+    TestResponseNotifier,
+    TestToolTimer,
+    TestHookTrace,
+    TestPushoverNotifier,
+    TestHookSettings,
+    TestHookDaemon,
+    TestHookDispatcher,
+]
+
+
+def build_suite() -> unittest.TestSuite:
+    """All hook tests in reporting order."""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for case in TEST_CASES:
+        suite.addTests(loader.loadTestsFromTestCase(case))
+    return suite
+
+
+class _OutcomeResult(unittest.TestResult):
+    """Records a test's outcomes as picklable (kind, detail) pairs."""
+
+    def __init__(self):
+        super().__init__()
+        self.outcomes: List[Tuple[str, Any]] = []
+
+    def addSuccess(self, test):
+        self.outcomes.append(("success", ""))
+
+    def addError(self, test, err):
+        self.outcomes.append(("error", self._exc_info_to_string(err, test)))
+
+    def addFailure(self, test, err):
+        self.outcomes.append(("failure", self._exc_info_to_string(err, test)))
+
+    def addSkip(self, test, reason):
+        self.outcomes.append(("skip", reason))
+
+    def addExpectedFailure(self, test, err):
+        self.outcomes.append(("expected_failure", self._exc_info_to_string(err, test)))
+
+    def addUnexpectedSuccess(self, test):
+        self.outcomes.append(("unexpected_success", ""))
+
+    def addSubTest(self, test, subtest, err):
+        if err is not None:
+            kind = "subtest_failure" if issubclass(err[0], test.failureException) else "subtest_error"
+            self.outcomes.append((kind, (subtest._subDescription(), self._exc_info_to_string(err, test))))
+
+
+def _run_one(class_name: str, method_name: str) -> List[Tuple[str, Any]]:
+    """Run a single test in a worker process and return its outcomes."""
+    result = _OutcomeResult()
+    globals()[class_name](method_name).run(result)
+    return result.outcomes
+
+
+class _ReplayedSubTest(unittest.case._SubTest):
+    """A subtest of ``test`` that ran in a worker, described as it was there."""
+
+    def __init__(self, test, description: str):
+        super().__init__(test, None, {})
+        self._description = description
+
+    def _subDescription(self):
+        return self._description
+
+
+class _ReplayResult(unittest.TextTestResult):
+    """TextTestResult that accepts pre-formatted tracebacks from workers."""
+
+    def _exc_info_to_string(self, err, test):
+        if isinstance(err, str):
+            return err
+        if isinstance(err[1], str):
+            # (exception type, traceback text) of a subtest replayed from a worker
+            return err[1]
+        return super()._exc_info_to_string(err, test)
+
+    def replay(self, test, outcomes: List[Tuple[str, Any]]):
+        self.startTest(test)
+        for kind, detail in outcomes:
+            if kind == "success":
+                self.addSuccess(test)
+            elif kind == "failure":
+                self.addFailure(test, detail)
+            elif kind == "error":
+                self.addError(test, detail)
+            elif kind == "skip":
+                self.addSkip(test, detail)
+            elif kind == "expected_failure":
+                self.addExpectedFailure(test, detail)
+            elif kind == "unexpected_success":
+                self.addUnexpectedSuccess(test)
+            elif kind in ("subtest_failure", "subtest_error"):
+                description, traceback = detail
+                exception = test.failureException if kind == "subtest_failure" else Exception
+                self.addSubTest(test, _ReplayedSubTest(test, description), (exception, traceback, None))
+        if not outcomes:
+            # Only subtests ran and all of them passed
+            self.addSuccess(test)
+        self.stopTest(test)
+
+
+class ParallelSuite:
+    """Runs each test in a pool of worker processes.
+
+    Every test still gets its own setUp/tearDown, temp HOME and process-local
+    state; results are replayed into the runner in suite order as soon as the
+    tests ahead of them have finished, so the report reads the same as a
+    sequential run.
+    """
+
+    def __init__(self, suite: unittest.TestSuite, jobs: int):
+        self.tests = list(suite)
+        self.jobs = jobs
+
+    def __call__(self, result: _ReplayResult):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [
+                pool.submit(_run_one, type(test).__name__, test._testMethodName)
+                for test in self.tests
+            ]
+            for test, future in zip(self.tests, futures):
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    outcomes = [("error", f"Worker failed: {e!r}\n")]
+                result.replay(test, outcomes)
+        return result
+
+
+def run_tests(jobs: int = 1):
+    """Run all hook tests, in ``jobs`` worker processes when more than one."""
+    suite = build_suite()
+
+    if jobs > 1:
+        runner = unittest.TextTestRunner(verbosity=2, resultclass=_ReplayResult)
+        result = runner.run(ParallelSuite(suite, jobs))
+    else:
+        runner = unittest.TextTestRunner(verbosity=2)
+        result = runner.run(suite)
 
     # Return exit code
     return 0 if result.wasSuccessful() else 1
@@ -395,6 +2148,14 @@ def run_tests():
 
 def main():
     """Main test runner."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Test hook functionality")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes to run tests in (0 = one per CPU, default: 1)")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+
     print("=" * 60)
     print("HOOK FUNCTIONALITY TESTS")
     print("=" * 60)
@@ -410,7 +2171,7 @@ def main():
         sys.exit(1)
 
     # Run tests
-    exit_code = run_tests()
+    exit_code = run_tests(jobs)
 
     print()
     print("=" * 60)
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Test the CI scripts under .github/scripts against small generated catalogs.
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = SCRIPTS_DIR.parent.parent / "hooks"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(HOOKS_DIR))
+
+SRE_BODY = """
+You are a site reliability engineer for Kubernetes clusters. Define service
+level objectives and error budgets, tune Prometheus alerting rules and
+Grafana dashboards, write runbooks for on-call rotations, run blameless
+postmortems after incidents, and plan capacity for node pools and
+autoscaling groups.
+"""
+
+COMPILER_BODY = """
+You write optimizing compilers. Design intermediate representations in SSA
+form, implement register allocation with graph coloring, schedule
+instructions for pipelined processors, and lower abstract syntax trees
+through parsers built from context-free grammars with precise diagnostics.
+"""
+
+
+VALID_BODY = """
+You are an expert. When invoked:
+1. Read the code under review and the tests that cover it
+2. Explain what is wrong and propose a fix
+
+Key practices:
+- Keep changes small and reviewable
+"""
+
+
+def agent(name: str, description: str, body: str) -> str:
+    return f"---\nname: {name}\ndescription: {description}\nmodel: sonnet\n---\n{body}"
+
+
+def valid_agent(name: str) -> str:
+    return agent(name, f"Reviews code as the {name} specialist", VALID_BODY)
+
+
+class ScriptTestCase(unittest.TestCase):
+    """Base test case with a temporary agents directory."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="claude_scripts_test_")
+        self.agents_dir = Path(self.temp_dir) / "agents"
+        self.agents_dir.mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_agents(self, agents: Dict[str, str]) -> None:
+        for relative, content in agents.items():
+            path = self.agents_dir / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+    def run_script(self, script: str, *args: str, env: Dict[str, str] = None) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / script), *args],
+            cwd=self.temp_dir,
+            env={**os.environ, **(env or {})},
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True
+        )
+
+
+class TestAgentSimilarity(ScriptTestCase):
+    """Test agent_similarity.py's MinHash/LSH overlap report."""
+
+    CATALOG = {
+        "devops/sre-engineer.md": agent(
+            "sre-engineer", "Site reliability engineering for Kubernetes clusters", SRE_BODY),
+        "devops/reliability-engineer.md": agent(
+            "reliability-engineer", "Site reliability engineering for Kubernetes platforms",
+            SRE_BODY.replace("blameless", "structured")),
+        "languages/compiler-engineer.md": agent(
+            "compiler-engineer", "Optimizing compiler construction", COMPILER_BODY),
+    }
+
+    def records(self):
+        from agent_corpus import load_corpus
+
+        return load_corpus(self.agents_dir)
+
+    def test_reports_near_duplicates_only(self):
+        """Test that two near-identical agents pair up and a distinct one stays out."""
+        from agent_similarity import find_overlaps
+
+        self.write_agents(self.CATALOG)
+
+        overlaps = find_overlaps(self.records())
+
+        self.assertEqual([(overlap.first.name, overlap.second.name) for overlap in overlaps],
+                         [("reliability-engineer", "sre-engineer")])
+        self.assertGreater(overlaps[0].similarity, 0.9)
+
+    def test_output_is_deterministic(self):
+        """Test that the report does not depend on hash seeds or discovery order."""
+        from agent_similarity import find_overlaps, format_overlap
+
+        self.write_agents(self.CATALOG)
+        runs = [self.run_script("agent_similarity.py", "--threshold", "0.2", env={"PYTHONHASHSEED": seed})
+                for seed in ("1", "2")]
+        self.assertEqual(runs[0].stdout, runs[1].stdout)
+        self.assertIn("1 overlapping pairs at threshold 0.2 among 3 agents", runs[0].stdout)
+
+        records = self.records()
+        expected = [format_overlap(overlap) for overlap in find_overlaps(records, 0.2)]
+        for seed in range(5):
+            random.Random(seed).shuffle(records)
+            self.assertEqual([format_overlap(overlap) for overlap in find_overlaps(records, 0.2)], expected)
+
+    def test_empty_and_single_agent_catalogs(self):
+        """Test that catalogs with nothing to compare report no overlaps."""
+        from agent_similarity import find_overlaps
+
+        result = self.run_script("agent_similarity.py")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("0 overlapping pairs at threshold 0.4 among 0 agents", result.stdout)
+
+        self.write_agents({"devops/sre-engineer.md": self.CATALOG["devops/sre-engineer.md"]})
+        self.assertEqual(find_overlaps(self.records()), [])
+        result = self.run_script("agent_similarity.py")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("among 1 agents", result.stdout)
+
+    def test_agents_without_text_never_pair(self):
+        """Test that agents with no words left after stopwords are not reported as duplicates."""
+        from agent_similarity import find_overlaps
+
+        self.write_agents({
+            "a/first.md": agent("first", "the", "and of the"),
+            "b/second.md": agent("second", "a", "to the"),
+        })
+
+        self.assertEqual(find_overlaps(self.records()), [])
+
+
+
+class TestValidateAgents(ScriptTestCase):
+    """Test validate_agents.py's result cache and process pool."""
+
+    def catalog(self, count: int = 12) -> None:
+        """``count`` agents, every third one missing its practices section."""
+        agents = {}
+        for index in range(count):
+            name = f"agent-{index:02d}"
+            content = valid_agent(name)
+            if index % 3 == 0:
+                content = content.replace("Key practices:", "Notes:")
+            agents[f"group-{index % 2}/{name}.md"] = content
+        self.write_agents(agents)
+
+    def validate(self, *args: str) -> subprocess.CompletedProcess:
+        return self.run_script("validate_agents.py", "--cache", str(Path(self.temp_dir) / "cache.json"), *args)
+
+    def test_cache_follows_content(self):
+        """Test that an edited agent is validated again while unchanged ones come from the cache."""
+        import validate_agents
+
+        self.catalog(2)
+        files = sorted(self.agents_dir.rglob("*.md"))
+        results = validate_agents.validate_all(files, 1, {})
+        self.assertEqual(results[str(files[0])]["errors"], ["Missing best practices or key practices section"])
+        self.assertEqual(results[str(files[1])]["errors"], [])
+
+        # A cached result is trusted as long as the content hash matches
+        cache = json.loads(json.dumps(results))
+        cache[str(files[1])]["errors"] = ["from the cache"]
+        self.assertEqual(validate_agents.validate_all(files, 1, cache)[str(files[1])]["errors"], ["from the cache"])
+
+        files[1].write_text(files[1].read_text().replace("Key practices:", "Notes:"))
+        self.assertEqual(validate_agents.validate_all(files, 1, cache)[str(files[1])]["errors"],
+                         ["Missing best practices or key practices section"])
+
+    def test_rules_version_invalidates_cache(self):
+        """Test that results cached under other rules are dropped."""
+        import validate_agents
+
+        cache_path = Path(self.temp_dir) / "cache.json"
+        validate_agents.save_cache(cache_path, {"agents/a.md": {"sha256": "0", "errors": []}})
+        self.assertIn("agents/a.md", validate_agents.load_cache(cache_path))
+
+        stored = json.loads(cache_path.read_text())
+        stored["rules_version"] = validate_agents.RULES_VERSION - 1
+        cache_path.write_text(json.dumps(stored))
+        self.assertEqual(validate_agents.load_cache(cache_path), {})
+
+    def test_cached_run_reports_edits(self):
+        """Test that a second run with the cache reports a newly broken agent."""
+        self.catalog()
+        first = self.validate()
+        broken = self.agents_dir / "group-1" / "agent-01.md"
+        broken.write_text(broken.read_text().replace("model: sonnet", "model: gpt"))
+        second = self.validate()
+
+        self.assertNotIn("agent-01.md:", first.stdout)
+        self.assertIn(f"❌ {Path('agents', 'group-1', 'agent-01.md')}:\n  - Invalid model: gpt", second.stdout)
+        self.assertEqual(second.stdout, self.validate("--no-cache").stdout)
+
+    def test_parallel_run_matches_serial(self):
+        """Test that validating across worker processes reports exactly what a serial run does."""
+        self.catalog()
+        serial = self.validate("--no-cache", "--jobs", "1")
+        parallel = self.validate("--no-cache", "--jobs", "4")
+
+        self.assertEqual(serial.returncode, 1)
+        self.assertEqual((parallel.returncode, parallel.stdout), (serial.returncode, serial.stdout))
+        self.assertIn("Total errors: 4", serial.stdout)
+
+
+class TestAgentChecks(ScriptTestCase):
+    """Test agent_checks.py and the shared agent corpus."""
+
+    def test_structure_check_matches_validate_agents(self):
+        """Test that the single-parse structure check reports validate_agents.py's errors."""
+        import validate_agents
+
+        self.write_agents({
+            "group/good-agent.md": valid_agent("good-agent"),
+            "group/bad-agent.md": agent("other-name", "short", "When invoked: nothing"),
+            "group/no-frontmatter.md": "# Just a heading\n",
+        })
+        result = self.run_script("agent_checks.py", "--check", "structure")
+
+        expected = [f"❌ {path.relative_to(self.temp_dir)}: {error}"
+                    for path in self.agents_dir.rglob("*.md")
+                    for error in validate_agents.validate_agent_file(path)]
+        reported = [line for line in result.stdout.splitlines() if line.startswith("❌ agents")]
+        self.assertEqual(sorted(reported), sorted(expected))
+        self.assertGreater(len(expected), 3)
+        self.assertEqual(result.returncode, 1)
+
+    def test_corpus_reads_only_frontmatter(self):
+        """Test that loading the corpus leaves bodies unread until they are used."""
+        from agent_corpus import load_corpus
+
+        self.write_agents({"group/good-agent.md": valid_agent("good-agent")})
+        [record] = load_corpus(self.agents_dir)
+
+        self.assertEqual(record.name, "good-agent")
+        self.assertIsNone(record.data)
+        self.assertIn("When invoked:", record.body)
+        self.assertIsNotNone(record.data)
+
+
+class TestValidateHooks(ScriptTestCase):
+    """Test that every validate_hooks.py check rejects a bad hook."""
+
+    GOOD = "#!/bin/bash\n# Events: PostToolUse\n# Tools: Bash\n[[ \"$CLAUDE_TOOL_NAME\" == Bash ]] || exit 0\nexit 0\n"
+
+    def validate(self, hooks: Dict[str, str], executable: bool = True):
+        from validate_hooks import HookValidator
+
+        hooks_dir = Path(self.temp_dir) / "hooks"
+        hooks_dir.mkdir()
+        for name, content in hooks.items():
+            (hooks_dir / name).write_text(content)
+            (hooks_dir / name).chmod(0o755 if executable else 0o644)
+        validator = HookValidator(str(hooks_dir))
+        with redirect_stdout(io.StringIO()):
+            valid = validator.validate_all()
+        return valid, validator
+
+    def assert_rejects(self, content: str, message: str, **options):
+        valid, validator = self.validate({"probe-hook.sh": content}, **options)
+        self.assertFalse(valid, message)
+        self.assertTrue(any(message in error for error in validator.errors), validator.errors)
+
+    def test_good_hook_passes(self):
+        """Test that a well-formed hook that leaves other tools alone passes every check."""
+        valid, validator = self.validate({"probe-hook.sh": self.GOOD})
+        self.assertTrue(valid, validator.errors)
+
+    def test_structure(self):
+        """Test that a hook without a shebang is rejected."""
+        self.assert_rejects(self.GOOD.replace("#!/bin/bash", "# no shebang"), "Missing shebang line")
+
+    def test_declaration_events(self):
+        """Test that a hook declaring an event Claude Code does not have is rejected."""
+        self.assert_rejects(self.GOOD.replace("PostToolUse", "AfterTool"), "Unknown events declared: AfterTool")
+
+    def test_declaration_tools_without_tool_events(self):
+        """Test that tools declared for an event without a tool are rejected."""
+        self.assert_rejects(self.GOOD.replace("PostToolUse", "SessionStart"), "Tools declared for events without a tool")
+
+    def test_declaration_matches_dispatcher(self):
+        """Test that a hook the dispatcher runs must declare the dispatcher's tool filter."""
+        valid, validator = self.validate({"dangerous-operation-validator.sh": self.GOOD.replace(
+            "PostToolUse", "PreToolUse")})
+        self.assertFalse(valid)
+        self.assertIn("Declared tools differ from the dispatcher's filter on PreToolUse", "".join(validator.errors))
+
+    def test_declaration_probes_undeclared_tools(self):
+        """Test that a hook acting on tools it does not declare is rejected."""
+        self.assert_rejects(self.GOOD.replace('[[ "$CLAUDE_TOOL_NAME" == Bash ]] || exit 0', 'echo "ran"'),
+                            "Acts on undeclared tools: Read on PostToolUse (printed output)")
+
+    def test_syntax(self):
+        """Test that a bash syntax error is rejected."""
+        self.assert_rejects(self.GOOD + "if then fi\n", "Bash syntax error")
+
+    def test_permissions(self):
+        """Test that a hook without execute permission is rejected."""
+        self.assert_rejects(self.GOOD, "Missing execute permission", executable=False)
+
+    def test_exit_codes(self):
+        """Test that a hook without an exit status is rejected."""
+        self.assert_rejects(self.GOOD.replace("|| exit 0\nexit 0", "|| true"), "No exit statements found")
+
+    def test_dependencies(self):
+        """Test that a missing command is reported, and a word that only contains it is not."""
+        from validate_hooks import HookValidator
+
+        hook = Path(self.temp_dir) / "probe-hook.sh"
+        hook.write_text(self.GOOD + "# jquery is not jq\njq . file.json\n")
+        validator = HookValidator(self.temp_dir)
+        validator._commands = {"jq": False}
+        self.assertEqual(validator.check_dependencies(hook, hook.read_text()), (False, "Missing dependencies: jq"))
+        self.assertEqual(validator.check_dependencies(hook, "# jquery\n")[0], True)
+
+    def test_security(self):
+        """Test that a hook using eval is rejected."""
+        self.assert_rejects(self.GOOD.replace("exit 0\n", "eval \"$1\"\nexit 0\n", 1),
+                            "Uses 'eval' - potential security risk")
+
+
+class SampleHookTests(unittest.TestCase):
+    """Outcomes of every kind, run through test_hooks.py's parallel runner."""
+
+    def test_passes(self):
+        """Passes."""
+
+    def test_fails(self):
+        self.assertEqual(1, 2)
+
+    def test_errors(self):
+        raise RuntimeError("broken fixture")
+
+    @unittest.skip("not on this platform")
+    def test_skipped(self):
+        pass
+
+    def test_subtests(self):
+        for value in range(3):
+            with self.subTest(value=value):
+                self.assertLess(value, 2)
+
+
+class TestParallelHookSuite(unittest.TestCase):
+    """Test that test_hooks.py --jobs N reports what a serial run does."""
+
+    def run_suite(self, jobs: int) -> str:
+        import test_hooks
+
+        stream = io.StringIO()
+        suite = unittest.TestLoader().loadTestsFromTestCase(SampleHookTests)
+        if jobs > 1:
+            runner = unittest.TextTestRunner(stream=stream, verbosity=2, resultclass=test_hooks._ReplayResult)
+            result = runner.run(test_hooks.ParallelSuite(suite, jobs))
+        else:
+            result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+        self.assertFalse(result.wasSuccessful())
+        # Only the elapsed time differs between runs
+        return re.sub(r"Ran (\d+) tests? in [\d.]+s", r"Ran \1 tests", stream.getvalue())
+
+    def test_parallel_report_matches_serial(self):
+        """Test that failures, errors, skips and subtests are reported the same in workers."""
+        import test_hooks
+
+        if multiprocessing.get_start_method() != "fork":
+            self.skipTest("workers find the sample tests only when forked")
+        # _run_one looks the test class up in test_hooks
+        test_hooks.SampleHookTests = SampleHookTests
+        try:
+            serial = self.run_suite(1)
+            parallel = self.run_suite(2)
+        finally:
+            del test_hooks.SampleHookTests
+
+        self.assertEqual(parallel, serial)
+        self.assertIn("FAILED (failures=2, errors=1, skipped=1)", serial)
+
+
+TEST_CASES = [
+    TestAgentSimilarity,
+    TestValidateAgents,
+    TestAgentChecks,
+    TestValidateHooks,
+    TestParallelHookSuite,
+]
+
+
+def main():
+    """Run all script tests."""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for case in TEST_CASES:
+        suite.addTests(loader.loadTestsFromTestCase(case))
+
+    print("=" * 60)
+    print("CI SCRIPT TESTS")
+    print("=" * 60)
+    print()
+
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+
+    print()
+    print("=" * 60)
+    if result.wasSuccessful():
+        print("✅ All script tests passed!")
+    else:
+        print("❌ Some script tests failed")
+    print("=" * 60)
+
+    sys.exit(0 if result.wasSuccessful() else 1)
+
+
+if __name__ == "__main__":
+    main()
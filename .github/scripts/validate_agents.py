@@ -1,36 +1,65 @@
 #!/usr/bin/env python3
 """
 Validate Claude Code agent files for structure, naming, and content quality.
+
+Results are cached in .cache/validate_agents.json, keyed on each file's path
+and content hash plus RULES_VERSION, so unchanged agents are not parsed again.
+Files that do need validating are spread over a process pool.
+
+Usage: validate_agents.py [--jobs N] [--no-cache] [--cache PATH]
 """
 
+import argparse
+import hashlib
+import json
 import os
-import yaml
+import tempfile
 import re
 import sys
 from pathlib import Path
 
+from agent_corpus import INVALID_STRUCTURE, INVALID_YAML, MISSING_FRONTMATTER, parse_agent
+
+# Bump whenever validate_agent_record changes, to invalidate cached results
+RULES_VERSION = 2
+DEFAULT_CACHE = Path('.cache/validate_agents.json')
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_THRESHOLD = 8
+
 def validate_agent_file(file_path):
     """Validate a single agent file."""
-    errors = []
-
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
+    return validate_agent_content(file_path, content)
+
+def validate_agent_content(file_path, content):
+    """Validate the content of an agent file."""
+    return validate_agent_record(parse_agent(file_path, content))
+
+def validate_agent_record(record):
+    """Validate an agent already parsed by agent_corpus."""
+    errors = []
+
     # Check for YAML frontmatter
-    if not content.startswith('---'):
+    if record.error == MISSING_FRONTMATTER:
         errors.append("Missing YAML frontmatter")
         return errors
 
-    try:
-        # Extract frontmatter and content
-        parts = content.split('---', 2)
-        if len(parts) < 3:
-            errors.append("Invalid frontmatter structure")
-            return errors
+    if record.error == INVALID_STRUCTURE:
+        errors.append("Invalid frontmatter structure")
+        return errors
+
+    if record.error == INVALID_YAML:
+        errors.append(f"Invalid YAML frontmatter: {record.yaml_error}")
+        return errors
 
-        frontmatter = yaml.safe_load(parts[1])
-        agent_content = parts[2].strip()
+    file_path = record.path
+    frontmatter = record.frontmatter
+    agent_content = record.body
 
+    try:
         # Validate required fields
         required_fields = ['name', 'description']
         for field in required_fields:
@@ -74,29 +103,100 @@ def validate_agent_file(file_path):
         if not any(phrase in content_lower for phrase in ['best practices', 'key practices', 'practices:']):
             errors.append("Missing best practices or key practices section")
 
-    except yaml.YAMLError as e:
-        errors.append(f"Invalid YAML frontmatter: {e}")
     except Exception as e:
         errors.append(f"Unexpected error: {e}")
 
     return errors
 
+def _validate_entry(entry):
+    """Process pool worker: validate one (path, content) pair."""
+    file_path, content = entry
+    return validate_agent_content(Path(file_path), content)
+
+def load_cache(cache_path):
+    """Cached results by path, or an empty cache if missing or from other rules."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('rules_version') != RULES_VERSION:
+        return {}
+    return cache.get('results', {})
+
+def save_cache(cache_path, results):
+    """Write the cache atomically so concurrent runs never see a partial file."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=cache_path.name + '.', dir=str(cache_path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'rules_version': RULES_VERSION, 'results': results}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+def validate_all(agent_files, jobs, cache):
+    """Errors for every file, reusing cached results for unchanged content."""
+    results = {}
+    pending = []
+
+    for agent_file in agent_files:
+        with open(agent_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+        cached = cache.get(str(agent_file))
+        if cached and cached.get('sha256') == digest:
+            results[str(agent_file)] = cached
+        else:
+            pending.append((str(agent_file), content, digest))
+
+    if jobs > 1 and len(pending) >= PARALLEL_THRESHOLD:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            entries = [(file_path, content) for file_path, content, _ in pending]
+            outcomes = list(pool.map(_validate_entry, entries, chunksize=4))
+    else:
+        outcomes = [_validate_entry((file_path, content)) for file_path, content, _ in pending]
+
+    for (file_path, _, digest), errors in zip(pending, outcomes):
+        results[file_path] = {'sha256': digest, 'errors': errors}
+
+    return results
+
 def main():
     """Main validation function."""
+    parser = argparse.ArgumentParser(description='Validate Claude Code agent files')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for files not in the cache (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Validate every file and skip the cache')
+    parser.add_argument('--cache', type=Path, default=DEFAULT_CACHE, help=f'Cache file (default: {DEFAULT_CACHE})')
+    args = parser.parse_args()
+
     agents_dir = Path('agents')
     if not agents_dir.exists():
         print("❌ Agents directory not found")
         sys.exit(1)
 
+    agent_files = list(agents_dir.rglob('*.md'))
+    cache = {} if args.no_cache else load_cache(args.cache)
+    results = validate_all(agent_files, args.jobs, cache)
+    if not args.no_cache:
+        save_cache(args.cache, results)
+
     total_errors = 0
     agent_count = 0
 
-    # Validate all agent files
-    for agent_file in agents_dir.rglob('*.md'):
+    # Report in discovery order, exactly as a sequential run would
+    for agent_file in agent_files:
         agent_count += 1
         print(f"Validating {agent_file}...")
 
-        errors = validate_agent_file(agent_file)
+        errors = results[str(agent_file)]['errors']
         if errors:
             print(f"❌ {agent_file}:")
             for error in errors:
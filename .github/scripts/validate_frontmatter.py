@@ -3,46 +3,45 @@
 Validate YAML frontmatter in agent files.
 """
 
-import yaml
 import sys
-import os
+from pathlib import Path
+
+from agent_corpus import INVALID_STRUCTURE, INVALID_YAML, MISSING_FRONTMATTER, load_corpus
 
 def main():
     """Validate frontmatter for all provided files."""
     errors = []
 
-    for arg in sys.argv[1:]:
-        if arg.endswith('.md'):
-            try:
-                with open(arg, 'r') as f:
-                    content = f.read()
-
-                if not content.startswith('---'):
-                    errors.append(f'❌ {arg}: Missing YAML frontmatter')
-                    continue
-
-                parts = content.split('---', 2)
-                if len(parts) < 3:
-                    errors.append(f'❌ {arg}: Invalid frontmatter structure')
-                    continue
-
-                frontmatter = yaml.safe_load(parts[1])
-
-                # Check required fields
-                required_fields = ['name', 'description']
-                for field in required_fields:
-                    if field not in frontmatter:
-                        errors.append(f'❌ {arg}: Missing required field: {field}')
-
-                # Validate name matches filename
-                expected_name = os.path.basename(arg)[:-3]
-                if frontmatter.get('name') != expected_name:
-                    errors.append(f'❌ {arg}: name field must match filename')
-
-            except yaml.YAMLError as e:
-                errors.append(f'❌ {arg}: Invalid YAML: {e}')
-            except Exception as e:
-                errors.append(f'❌ {arg}: Error: {e}')
+    paths = [Path(arg) for arg in sys.argv[1:] if arg.endswith('.md')]
+    for record in load_corpus(paths=paths):
+        arg = record.path
+        if record.error == MISSING_FRONTMATTER:
+            errors.append(f'❌ {arg}: Missing YAML frontmatter')
+            continue
+
+        if record.error == INVALID_STRUCTURE:
+            errors.append(f'❌ {arg}: Invalid frontmatter structure')
+            continue
+
+        if record.error == INVALID_YAML:
+            errors.append(f'❌ {arg}: Invalid YAML: {record.yaml_error}')
+            continue
+
+        try:
+            frontmatter = record.frontmatter
+
+            # Check required fields
+            required_fields = ['name', 'description']
+            for field in required_fields:
+                if field not in frontmatter:
+                    errors.append(f'❌ {arg}: Missing required field: {field}')
+
+            # Validate name matches filename
+            if frontmatter.get('name') != record.stem:
+                errors.append(f'❌ {arg}: name field must match filename')
+
+        except Exception as e:
+            errors.append(f'❌ {arg}: Error: {e}')
 
     if errors:
         for error in errors:
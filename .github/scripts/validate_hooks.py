@@ -6,8 +6,11 @@ Validate Claude Code hooks for structure, syntax, and compatibility.
 import os
 import sys
 import json
+import shutil
 import subprocess
 import re
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
@@ -32,11 +35,45 @@ CLAUDE_ENV_VARS = [
     'CLAUDE_TASK_DESCRIPTION'
 ]
 
+# Tools Claude Code runs hooks for; a hook is probed with the ones it does
+# not declare, and must leave them alone
+KNOWN_TOOLS = [
+    'Bash', 'Read', 'Write', 'Edit', 'MultiEdit', 'Glob', 'Grep', 'LS',
+    'Task', 'WebFetch', 'WebSearch', 'NotebookEdit', 'TodoWrite'
+]
+
+# Environment of a probe run: a tool call that every hook would act on if
+# it handled the tool, with notifications pointed nowhere
+PROBE_ENV = {
+    'CLAUDE_TOOL_RESULT': 'error: build failed',
+    'CLAUDE_TOOL_EXIT_CODE': '1',
+    'CLAUDE_SUBAGENT_TYPE': 'go-debugger',
+    'CLAUDE_TASK_DESCRIPTION': 'Deploy the production cluster',
+    'CLAUDE_HOOK_TRACE': '0',
+    'CLAUDE_NOTIFIER_TTS': 'false',
+    'CLAUDE_NOTIFIER_SOUND': 'false',
+    'PUSHOVER_USER_KEY': 'probe',
+    'PUSHOVER_APP_TOKEN': 'probe',
+    'PUSHOVER_API_URL': 'http://127.0.0.1:9/1/messages.json'
+}
+
+# Common commands that might not be available
+DEPENDENCIES = ['jq', 'curl', 'wget', 'python3', 'python', 'node']
+DEPENDENCY_PATTERN = re.compile(
+    r'(?<![\w.-])(' + '|'.join(re.escape(dep) for dep in DEPENDENCIES) + r')(?![\w.-])'
+)
+
 class HookValidator:
     def __init__(self, hooks_dir: str = "hooks"):
         self.hooks_dir = Path(hooks_dir)
         self.errors = []
         self.warnings = []
+        # Command -> found on PATH, resolved once per run
+        self._commands: Dict[str, bool] = {}
+        # Hook -> pending `bash -n` run, started for every hook up front
+        self._syntax: Dict[Path, Future] = {}
+        # Hook -> pending probe runs with the tools it does not declare
+        self._probes: Dict[Path, Future] = {}
 
     def validate_all(self) -> bool:
         """Validate all hooks in the hooks directory."""
@@ -53,20 +90,31 @@ class HookValidator:
         print()
 
         all_valid = True
-        for hook_file in hook_files:
-            if hook_file.name == "README.md":
-                continue
-            print(f"Validating {hook_file.name}...")
-            if not self.validate_hook(hook_file):
-                all_valid = False
-            print()
+        # Syntax checks are the only slow part, so run them all at once and
+        # report each hook in order as its result comes in
+        with ThreadPoolExecutor(max_workers=len(hook_files)) as pool:
+            self._syntax = {hook: pool.submit(self._bash_syntax, hook) for hook in hook_files}
+            self._probes = {hook: pool.submit(self._probe_undeclared, hook) for hook in hook_files}
+            for hook_file in hook_files:
+                if hook_file.name == "README.md":
+                    continue
+                print(f"Validating {hook_file.name}...")
+                if not self.validate_hook(hook_file):
+                    all_valid = False
+                print()
+        self._syntax = {}
+        self._probes = {}
 
         return all_valid
 
     def validate_hook(self, hook_path: Path) -> bool:
         """Validate a single hook file."""
+        with open(hook_path, 'r') as f:
+            content = f.read()
+
         validations = [
             ("Structure", self.check_structure),
+            ("Declaration", self.check_declaration),
             ("Syntax", self.check_syntax),
             ("Permissions", self.check_permissions),
             ("Exit codes", self.check_exit_codes),
@@ -77,7 +125,7 @@ class HookValidator:
 
         hook_valid = True
         for check_name, check_func in validations:
-            is_valid, message = check_func(hook_path)
+            is_valid, message = check_func(hook_path, content)
             status = "✅" if is_valid else "❌"
             print(f"  {status} {check_name}: {message}")
             if not is_valid:
@@ -86,10 +134,9 @@ class HookValidator:
 
         return hook_valid
 
-    def check_structure(self, hook_path: Path) -> Tuple[bool, str]:
+    def check_structure(self, hook_path: Path, content: str) -> Tuple[bool, str]:
         """Check if hook has proper structure."""
-        with open(hook_path, 'r') as f:
-            lines = f.readlines()
+        lines = content.splitlines(keepends=True)
 
         if not lines:
             return False, "File is empty"
@@ -102,10 +149,10 @@ class HookValidator:
             return False, "Shebang should specify bash or sh"
 
         # Check for hook type comment
-        content = ''.join(lines[:20])  # Check first 20 lines for type
+        header = ''.join(lines[:20])  # Check first 20 lines for type
         type_found = False
         for hook_type in VALID_HOOK_TYPES:
-            if hook_type in content:
+            if hook_type in header:
                 type_found = True
                 break
 
@@ -113,44 +160,166 @@ class HookValidator:
             self.warnings.append(f"{hook_path.name}: No hook type specified in comments")
 
         # Check for exit statement
-        content_full = ''.join(lines)
-        if "exit" not in content_full:
+        if "exit" not in content:
             return False, "Missing exit statement"
 
         return True, "Proper structure"
 
-    def check_syntax(self, hook_path: Path) -> Tuple[bool, str]:
+    def _hook_settings(self):
+        """claude_hooks.hook_settings from the hooks directory being validated."""
+        hooks_dir = str(self.hooks_dir.resolve())
+        if hooks_dir not in sys.path:
+            sys.path.insert(0, hooks_dir)
+        from claude_hooks import hook_settings
+        return hook_settings
+
+    def check_declaration(self, hook_path: Path, content: str) -> Tuple[bool, str]:
+        """Check the Events/Tools header against the dispatcher and the script's filtering."""
+        hook_settings = self._hook_settings()
+        try:
+            declaration = hook_settings.read_declaration(hook_path)
+        except ValueError as e:
+            return False, f"Malformed declaration: {e}"
+
+        if declaration is None:
+            self.warnings.append(f"{hook_path.name}: No '# Events:' declaration - left out of generated settings")
+            return True, "No declaration"
+
+        unknown = [event for event in declaration.events if event not in VALID_HOOK_TYPES]
+        if unknown:
+            return False, f"Unknown events declared: {', '.join(unknown)}"
+
+        tool_events = [event for event in declaration.events if event in hook_settings.TOOL_EVENTS]
+        if not tool_events and (declaration.tools is not None or declaration.skip_tools):
+            return False, "Tools declared for events without a tool"
+
+        named = (declaration.tools or ()) + declaration.skip_tools
+        for tool in named:
+            if tool not in KNOWN_TOOLS:
+                self.warnings.append(f"{hook_path.name}: Declares unknown tool '{tool}'")
+
+        mismatch = self._dispatcher_mismatch(declaration)
+        if mismatch:
+            return False, mismatch
+
+        pending = self._probes.get(hook_path)
+        acted = pending.result() if pending else self._probe_undeclared(hook_path)
+        if acted:
+            return False, f"Acts on undeclared tools: {'; '.join(acted)}"
+
+        events = ', '.join(declaration.events)
+        if not tool_events:
+            return True, f"Declares {events}"
+        tools = '*' if declaration.tools is None else ', '.join(declaration.tools)
+        if declaration.skip_tools:
+            tools += f" except {', '.join(declaration.skip_tools)}"
+        return True, f"Declares {events} for {tools}"
+
+    @staticmethod
+    def _dispatcher_mismatch(declaration) -> Optional[str]:
+        """How the dispatcher's EVENT_CHECKS disagree with ``declaration``, if they do."""
+        from claude_hooks.dispatcher import EVENT_CHECKS
+
+        for event, checks in EVENT_CHECKS.items():
+            for check in checks:
+                if check.name != declaration.name:
+                    continue
+                if event not in declaration.events:
+                    return f"Dispatcher runs it on {event}, which is not declared"
+                if (set(check.tools or ()), check.tools is None, set(check.skip_tools)) != (
+                        set(declaration.tools or ()), declaration.tools is None, set(declaration.skip_tools)):
+                    return f"Declared tools differ from the dispatcher's filter on {event}"
+        return None
+
+    def _probe_undeclared(self, hook_path: Path) -> List[str]:
+        """Run the hook for each tool it does not declare; describe the runs that did something.
+
+        A run that exits non-zero, prints to stdout or writes a file under
+        HOME acted on the tool, so the declaration is too narrow.
+        """
+        try:
+            declaration = self._hook_settings().read_declaration(hook_path)
+        except ValueError:
+            return []
+        if declaration is None:
+            return []
+
+        acted = []
+        for event in declaration.events:
+            if event not in ('PreToolUse', 'PostToolUse'):
+                continue
+            for tool in KNOWN_TOOLS:
+                if declaration.handles(tool):
+                    continue
+                reason = self._probe(hook_path, event, tool)
+                if reason:
+                    acted.append(f"{tool} on {event} ({reason})")
+        return acted
+
+    @staticmethod
+    def _probe(hook_path: Path, event: str, tool: str) -> Optional[str]:
+        with tempfile.TemporaryDirectory(prefix="hook-probe-") as home:
+            source = Path(home) / "probe.ts"
+            source.write_text("const value: any = require('./missing');\n")
+            env = {k: v for k, v in os.environ.items() if not k.startswith(('CLAUDE_', 'PUSHOVER_'))}
+            env.update(PROBE_ENV, HOME=home, CLAUDE_TOOL_NAME=tool, CLAUDE_HOOK_EVENT=event)
+            try:
+                result = subprocess.run(
+                    [str(hook_path.resolve()), str(source)],
+                    env=env,
+                    cwd=home,
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True,
+                    text=True,
+                    timeout=30
+                )
+            except (OSError, subprocess.TimeoutExpired) as e:
+                return type(e).__name__
+            written = [path for path in Path(home).rglob("*") if path.is_file() and path != source]
+
+        if result.returncode != 0:
+            return f"exit {result.returncode}"
+        if result.stdout.strip():
+            return "printed output"
+        if written:
+            return f"wrote {written[0].name}"
+        return None
+
+    def check_syntax(self, hook_path: Path, content: str) -> Tuple[bool, str]:
         """Check bash syntax using bash -n."""
+        pending = self._syntax.get(hook_path)
+        result = pending.result() if pending else self._bash_syntax(hook_path)
+
+        if result is None:
+            self.warnings.append("bash not found - skipping syntax check")
+            return True, "Skipped (bash not available)"
+
+        if result.returncode != 0:
+            error_msg = result.stderr.strip() if result.stderr else "Syntax error"
+            return False, f"Bash syntax error: {error_msg}"
+
+        return True, "Valid bash syntax"
+
+    @staticmethod
+    def _bash_syntax(hook_path: Path) -> Optional[subprocess.CompletedProcess]:
+        """Run bash -n on a hook, or None if bash is not installed."""
         try:
-            result = subprocess.run(
+            return subprocess.run(
                 ["bash", "-n", str(hook_path)],
                 capture_output=True,
                 text=True
             )
-
-            if result.returncode != 0:
-                error_msg = result.stderr.strip() if result.stderr else "Syntax error"
-                return False, f"Bash syntax error: {error_msg}"
-
-            return True, "Valid bash syntax"
-
-        except subprocess.CalledProcessError as e:
-            return False, f"Syntax check failed: {e}"
         except FileNotFoundError:
-            self.warnings.append("bash not found - skipping syntax check")
-            return True, "Skipped (bash not available)"
+            return None
 
-    def check_permissions(self, hook_path: Path) -> Tuple[bool, str]:
+    def check_permissions(self, hook_path: Path, content: str) -> Tuple[bool, str]:
         """Check if hook has execute permissions."""
         if not os.access(hook_path, os.X_OK):
             return False, "Missing execute permission"
         return True, "Executable"
 
-    def check_exit_codes(self, hook_path: Path) -> Tuple[bool, str]:
+    def check_exit_codes(self, hook_path: Path, content: str) -> Tuple[bool, str]:
         """Check if hook properly uses exit codes."""
-        with open(hook_path, 'r') as f:
-            content = f.read()
-
         # Check for exit statements
         exit_pattern = r'exit\s+(\d+)'
         exits = re.findall(exit_pattern, content)
@@ -172,11 +341,8 @@ class HookValidator:
 
         return True, "Proper exit codes"
 
-    def check_env_usage(self, hook_path: Path) -> Tuple[bool, str]:
+    def check_env_usage(self, hook_path: Path, content: str) -> Tuple[bool, str]:
         """Check if hook properly uses Claude environment variables."""
-        with open(hook_path, 'r') as f:
-            content = f.read()
-
         used_vars = []
         for var in CLAUDE_ENV_VARS:
             if var in content:
@@ -192,32 +358,18 @@ class HookValidator:
 
         return True, "No Claude environment variables used"
 
-    def check_dependencies(self, hook_path: Path) -> Tuple[bool, str]:
+    def check_dependencies(self, hook_path: Path, content: str) -> Tuple[bool, str]:
         """Check if hook dependencies are available."""
-        with open(hook_path, 'r') as f:
-            content = f.read()
-
-        # Common commands that might not be available
-        dependencies = ['jq', 'curl', 'wget', 'python', 'node']
-        missing = []
-
-        for dep in dependencies:
-            # Check if dependency is used
-            if dep in content:
-                # Check if it's available
-                if not self._command_exists(dep):
-                    missing.append(dep)
+        used = set(DEPENDENCY_PATTERN.findall(content))
+        missing = [dep for dep in DEPENDENCIES if dep in used and not self._command_exists(dep)]
 
         if missing:
             return False, f"Missing dependencies: {', '.join(missing)}"
 
         return True, "All dependencies available"
 
-    def check_security(self, hook_path: Path) -> Tuple[bool, str]:
+    def check_security(self, hook_path: Path, content: str) -> Tuple[bool, str]:
         """Check for security issues in hooks."""
-        with open(hook_path, 'r') as f:
-            content = f.read()
-
         issues = []
 
         # Check for eval usage
@@ -251,16 +403,10 @@ class HookValidator:
         return True, "No security issues found"
 
     def _command_exists(self, command: str) -> bool:
-        """Check if a command exists on the system."""
-        try:
-            subprocess.run(
-                ["which", command],
-                capture_output=True,
-                check=False
-            )
-            return True
-        except:
-            return False
+        """Check if a command exists on PATH (looked up once per run)."""
+        if command not in self._commands:
+            self._commands[command] = shutil.which(command) is not None
+        return self._commands[command]
 
     def print_summary(self):
         """Print validation summary."""
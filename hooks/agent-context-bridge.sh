@@ -1,15 +1,33 @@
 #!/bin/bash
 # SubagentStop hook: Bridge context between agent invocations in a chain
+# Events: SubagentStop
 
 # This hook runs when a subagent completes
 # It extracts key information and prepares context for the next agent
 
 CONTEXT_FILE="$HOME/.claude-code/agent-context.json"
 CHAIN_FILE="$HOME/.claude-code/agent-chain.log"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
 
 # Ensure directory exists
 mkdir -p "$HOME/.claude-code"
 
+# Findings, recent completions and chain detection live in the locked context
+# store (claude_hooks/context_store.py): the daemon's handler updates it when
+# the daemon runs, and the same handler runs here otherwise. A subagent stops
+# rarely enough to start Python for it. Only without Python, where no daemon
+# runs either, does the jq logic below keep agent-context.json
+source "$HOOK_DIR/lib/hookd.sh"
+hookd_forward agent-context-bridge "$@"
+if [[ -n "$CLAUDE_SUBAGENT_TYPE" ]] && command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]]; then
+    PYTHONPATH="$HOOK_DIR" exec python3 -m claude_hooks.context_bridge "$@"
+fi
+
+# Record this run as a trace span (claude_hooks/trace.py); under the
+# daemon or Python the handler records it
+source "$HOOK_DIR/lib/trace.sh"
+trace_init SubagentStop
+
 # Function to extract key findings from agent output
 extract_key_findings() {
     local output="$1"
@@ -124,8 +142,11 @@ maintain_context_window() {
     fi
 }
 
-# Main logic
+# Main logic, under the lock the context store takes
 if [[ -n "$CLAUDE_SUBAGENT_TYPE" ]]; then
+    exec 9>> "$HOME/.claude-code/agent-context-store.lock"
+    flock -x 9 2>/dev/null
+
     # Extract and store findings
     extract_key_findings "$CLAUDE_TOOL_RESULT" "$CLAUDE_SUBAGENT_TYPE"
 
@@ -1,30 +1,77 @@
 #!/bin/bash
 # PostToolUse hook: Track agent delegation patterns and hierarchy usage
+# Events: PostToolUse
+# Tools: Task
 
 # This hook runs after the Task tool completes
 # It logs agent usage patterns for analysis and optimization
 
 LOG_FILE="$HOME/.claude-code/agent-usage.log"
+COUNT_FILE="$LOG_FILE.count"
 STATS_FILE="$HOME/.claude-code/agent-stats.json"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
 
 # Ensure log directory exists
 mkdir -p "$HOME/.claude-code"
 
+# Only Task invocations with a subagent type are tracked
+if [[ "$CLAUDE_TOOL_NAME" != "Task" || -z "$CLAUDE_SUBAGENT_TYPE" ]]; then
+    exit 0
+fi
+
+# With the hook daemon running, its handler records usage; otherwise the
+# script below does
+source "$HOOK_DIR/lib/hookd.sh"
+hookd_forward agent-hierarchy-tracker "$@"
+
+# Record this run as a trace span (claude_hooks/trace.py); under the
+# daemon the handler records it
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PostToolUse
+
+source "$HOOK_DIR/lib/log.sh"
+
 # Function to log agent usage
 log_agent_usage() {
     local agent_type="$1"
     local timestamp=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
 
-    # Log to file
-    echo "[$timestamp] Agent: $agent_type, Task: $CLAUDE_TASK_DESCRIPTION" >> "$LOG_FILE"
+    # Log to file, keeping the running line count in the sidecar
+    log_line "$LOG_FILE" "[$timestamp] Agent: $agent_type, Task: $CLAUDE_TASK_DESCRIPTION"
+
+    # Update statistics in the SQLite store the daemon's handler writes
+    # (claude_hooks/agent_stats.py), so counts agree with or without the
+    # daemon; it prints the invocation's number for the periodic report
+    if command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]]; then
+        usage_count=$(PYTHONPATH="$HOOK_DIR" python3 -m claude_hooks.agent_stats record \
+            "$agent_type" "$CLAUDE_TASK_DESCRIPTION" 2>/dev/null)
+        return
+    fi
+
+    # Without Python there is no daemon either: keep the counters in
+    # agent-stats.json under a lock, for the store to import once it exists
+    (
+        flock -x 9 2>/dev/null
+        if [[ -f "$STATS_FILE" ]]; then
+            jq --arg agent "$agent_type" '.[$agent] += 1' "$STATS_FILE" > "$STATS_FILE.tmp.$$" &&
+                mv "$STATS_FILE.tmp.$$" "$STATS_FILE"
+        else
+            jq -n --arg agent "$agent_type" '{($agent): 1}' > "$STATS_FILE"
+        fi
+    ) 9>> "$STATS_FILE.lock"
+    usage_count=$(cat "$COUNT_FILE" 2>/dev/null || echo 0)
+}
 
-    # Update statistics (simple counter)
-    if [[ -f "$STATS_FILE" ]]; then
-        # Increment counter for this agent
-        jq --arg agent "$agent_type" '.[$agent] += 1' "$STATS_FILE" > "$STATS_FILE.tmp" && mv "$STATS_FILE.tmp" "$STATS_FILE"
+# Function to print the most used agents, from the same store
+top_agents() {
+    local limit="$1"
+    if command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]]; then
+        PYTHONPATH="$HOOK_DIR" python3 -m claude_hooks.agent_stats "$limit" 2>/dev/null |
+            while IFS=$'\t' read -r agent uses; do
+                echo "   $agent: $uses invocations"
+            done
     else
-        # Initialize stats file
-        echo "{\"$agent_type\": 1}" > "$STATS_FILE"
+        jq -r --argjson limit "$limit" 'to_entries | sort_by(.value) | reverse | .[0:$limit] | .[] | "   \(.key): \(.value) invocations"' "$STATS_FILE" 2>/dev/null
     fi
 }
 
@@ -54,10 +101,9 @@ if [[ "$CLAUDE_TOOL_NAME" == "Task" ]]; then
         detect_delegation "$CLAUDE_TOOL_RESULT"
 
         # Show most used agents periodically (every 10 invocations)
-        usage_count=$(wc -l < "$LOG_FILE" 2>/dev/null || echo 0)
-        if (( usage_count % 10 == 0 )) && (( usage_count > 0 )); then
+        if [[ "$usage_count" =~ ^[0-9]+$ ]] && (( usage_count % 10 == 0 )) && (( usage_count > 0 )); then
             echo "📊 Top agents by usage:"
-            jq -r 'to_entries | sort_by(.value) | reverse | .[0:5] | .[] | "   \(.key): \(.value) invocations"' "$STATS_FILE" 2>/dev/null
+            top_agents 5
         fi
     fi
 fi
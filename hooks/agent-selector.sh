@@ -1,5 +1,7 @@
 #!/bin/bash
 # PreToolUse hook: Automatically suggest appropriate agents based on task patterns
+# Events: PreToolUse
+# Tools: Task
 
 # This hook runs before the Task tool is invoked
 # It analyzes the task description and suggests the most appropriate agent
@@ -13,6 +15,18 @@ if [[ "$CLAUDE_TOOL_NAME" != "Task" ]]; then
 fi
 
 TASK_PROMPT="$1"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+
+# With the hook daemon running, rank agents with the precompiled keyword index
+# built from agent frontmatter (claude_hooks/agent_index.py); otherwise the
+# keyword table below runs
+source "$HOOK_DIR/lib/hookd.sh"
+hookd_forward agent-selector "$@"
+
+# Record this run as a trace span (claude_hooks/trace.py); under the
+# daemon the handler records it
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PreToolUse
 
 # Function to suggest agent based on keywords
 suggest_agent() {
@@ -1,76 +1,49 @@
 #!/bin/bash
 # PostToolUse hook: Automatically suggest debugging agents when errors are detected
+# Events: PostToolUse
+# Tools: Bash, Task
 
 # This hook runs after tools complete
 # It detects errors and suggests appropriate debugging specialists
 
 TOOL_NAME="$CLAUDE_TOOL_NAME"
 TOOL_RESULT="$CLAUDE_TOOL_RESULT"
-
-# Function to detect error patterns and suggest debuggers
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+
+# With the hook daemon running, its handler matches the signatures in
+# error-signatures.json (claude_hooks/error_signatures.py); otherwise the
+# script below matches the same file with jq
+source "$HOOK_DIR/lib/hookd.sh"
+hookd_forward auto-debug-suggester "$@"
+
+# Record this run as a trace span (claude_hooks/trace.py); under the
+# daemon the handler records it
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PostToolUse
+
+SIGNATURES_FILE="$HOOK_DIR/error-signatures.json"
+SIGNATURE_MESSAGES='. as $output
+    | $data[0].signatures[]
+    | select(any(.match[]; all(.[]; . as $literal | $output | contains($literal))))
+    | .message[]'
+
+# Function to detect error patterns and suggest debuggers, for the
+# signatures in error-signatures.json that the daemon's matcher compiles too
+# (claude_hooks/error_signatures.py): a signature hits when every literal of
+# one of its match rules occurs in the output. One jq pass over the output,
+# read in full from CLAUDE_TOOL_RESULT_FILE when the result was spooled
 detect_and_suggest_debugger() {
     local result="$1"
-    local suggested=false
-
-    # Go errors
-    if [[ "$result" == *"panic:"* ]] || [[ "$result" == *"runtime error:"* ]] || [[ "$result" == *"undefined:"* && "$result" == *".go:"* ]]; then
-        echo "🔍 Go error detected! Consider using: Task tool with go-debugger"
-        echo "   Example: 'Debug the panic in the Go application'"
-        suggested=true
-    fi
-
-    # Rust errors
-    if [[ "$result" == *"error[E"* ]] || [[ "$result" == *"cannot borrow"* ]] || [[ "$result" == *"lifetime"* ]]; then
-        echo "🦀 Rust error detected! Consider using: Task tool with rust-debugger"
-        echo "   Example: 'Debug the borrow checker error in the Rust code'"
-        suggested=true
-    fi
-
-    # Python errors
-    if [[ "$result" == *"Traceback (most recent call last):"* ]] || [[ "$result" == *"SyntaxError:"* ]] || [[ "$result" == *"ImportError:"* ]]; then
-        echo "🐍 Python error detected! Consider using: Task tool with python-debugger"
-        echo "   Example: 'Debug the Python traceback error'"
-        suggested=true
-    fi
-
-    # JavaScript/TypeScript errors
-    if [[ "$result" == *"SyntaxError:"* && "$result" == *".js"* ]] || [[ "$result" == *"TypeError:"* ]] || [[ "$result" == *"ReferenceError:"* ]]; then
-        echo "📜 JavaScript error detected! Consider using: Task tool with javascript-debugger"
-        echo "   Example: 'Debug the JavaScript TypeError'"
-        suggested=true
-    fi
-
-    # Next.js specific errors
-    if [[ "$result" == *"Error: Hydration"* ]] || [[ "$result" == *"next/router"* ]] || [[ "$result" == *"getServerSideProps"* ]]; then
-        echo "▲ Next.js error detected! Consider using: Task tool with nextjs-debugger"
-        echo "   Example: 'Debug the Next.js hydration error'"
-        suggested=true
-    fi
-
-    # Nuxt.js specific errors
-    if [[ "$result" == *"[nuxt]"* ]] || [[ "$result" == *"Nitro"* ]] || [[ "$result" == *"useFetch"* && "$result" == *"error"* ]]; then
-        echo "💚 Nuxt.js error detected! Consider using: Task tool with nuxtjs-debugger"
-        echo "   Example: 'Debug the Nuxt.js SSR error'"
-        suggested=true
-    fi
-
-    # Test failures
-    if [[ "$result" == *"FAIL"* ]] || [[ "$result" == *"failed"* && "$result" == *"test"* ]] || [[ "$result" == *"assertion"* ]]; then
-        echo "🧪 Test failure detected! Consider using appropriate test engineer:"
-        echo "   • go-test-engineer (for Go tests)"
-        echo "   • rust-test-engineer (for Rust tests)"
-        echo "   • python-test-engineer (for Python tests)"
-        echo "   • react-nextjs-test-engineer (for React/Next.js tests)"
-        suggested=true
-    fi
+    local messages
 
-    # Generic compilation errors
-    if [[ "$result" == *"compilation error"* ]] || [[ "$result" == *"build failed"* ]]; then
-        echo "🏗️ Build error detected! Consider using language-specific debugger or architect"
-        suggested=true
+    if [[ -n "$CLAUDE_TOOL_RESULT_FILE" && -r "$CLAUDE_TOOL_RESULT_FILE" ]]; then
+        messages=$(jq -R -s -r --slurpfile data "$SIGNATURES_FILE" "$SIGNATURE_MESSAGES" < "$CLAUDE_TOOL_RESULT_FILE")
+    else
+        messages=$(printf '%s' "$result" | jq -R -s -r --slurpfile data "$SIGNATURES_FILE" "$SIGNATURE_MESSAGES")
     fi
 
-    if [[ "$suggested" == true ]]; then
+    if [[ -n "$messages" ]]; then
+        echo "$messages"
         echo ""
         echo "💡 Tip: Debuggers can analyze error patterns, suggest fixes, and validate solutions"
     fi
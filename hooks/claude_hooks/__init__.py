@@ -0,0 +1,14 @@
+"""
+In-process implementations of the Claude Code agent hooks.
+
+The shell scripts in hooks/ remain the reference implementation and the
+fallback path. This package carries the same logic so that it can be served
+from a long-running process instead of forking bash, jq and friends on every
+tool call.
+"""
+
+from pathlib import Path
+
+# Directory holding the hook scripts (hooks/), resolved through symlinks so
+# that a linked ~/.claude/hooks still finds the repository checkout.
+HOOKS_DIR = Path(__file__).resolve().parent.parent
@@ -0,0 +1,205 @@
+"""
+Precompiled keyword index over the agent catalog.
+
+A build step reads the name and description of every agent under agents/
+into an inverted index (term -> [(agent, score)]) serialized to
+``~/.claude-code/agent-index.json``. The selector tokenizes the prompt once
+and sums the postings of its terms, so a suggestion costs time proportional
+to the prompt length rather than to the size of the catalog.
+
+The index is compiled from the agent manifest (agent_manifest.py) and
+records the manifest's catalog digest. It is rebuilt only when that digest
+changes, that is when an agent's content changes or agents are added or
+removed; the manifest itself takes care of touched but unchanged files.
+
+Usage:
+    python3 -m claude_hooks.agent_index build [--agents-dir DIR]
+    python3 -m claude_hooks.agent_index suggest "task prompt"
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .agent_manifest import MANIFEST_NAME, Manifest, default_agents_dir, load_manifest
+from .storage import read_json, write_json_atomic
+
+INDEX_VERSION = 2
+
+# A term in the agent name counts three times as much as one in the description
+NAME_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Suggestions scoring below this fraction of the best match are dropped
+RELATIVE_CUTOFF = 0.35
+DEFAULT_LIMIT = 5
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from has have in into is it its my of on or our
+    that the their this to use using we when where which while with you your
+    i me please need want help can could should would will make get like all any
+    specialist specialized specializing expert expertise focus focused focusing
+    including include includes comprehensive proper best practices
+    """.split()
+)
+
+# Longest first; applied once, keeping at least three characters of stem
+SUFFIXES = (
+    "ations", "ation", "ments", "ment", "ances", "ance", "ences", "ence",
+    "ities", "ity", "ings", "ing", "ers", "er", "ed", "ure", "ies", "es", "s", "e",
+)
+
+
+def stem(word: str) -> str:
+    """Crude suffix stripping so debug/debugging/debugger share a term."""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            break
+    # debugg -> debug, runn -> run
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiou":
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem."""
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class AgentIndex:
+    """Serialized inverted index with ranked lookups."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.agents: List[str] = data["agents"]
+        self.postings: Dict[str, List[List[float]]] = data["postings"]
+
+    @classmethod
+    def build(cls, manifest: Manifest) -> "AgentIndex":
+        """Compile the postings from the names and descriptions in ``manifest``."""
+        agents: List[str] = []
+        term_weights: List[Dict[str, float]] = []
+
+        for agent in manifest.agents:
+            weights: Dict[str, float] = defaultdict(float)
+            for term in set(tokenize(agent.name.replace("-", " "))):
+                weights[term] += NAME_WEIGHT
+            for term in set(tokenize(agent.description)):
+                weights[term] += DESCRIPTION_WEIGHT
+
+            agents.append(agent.name)
+            term_weights.append(weights)
+
+        document_frequency: Dict[str, int] = defaultdict(int)
+        for weights in term_weights:
+            for term in weights:
+                document_frequency[term] += 1
+
+        total = len(agents)
+        postings: Dict[str, List[List[float]]] = defaultdict(list)
+        for agent_id, weights in enumerate(term_weights):
+            for term, weight in weights.items():
+                idf = math.log(1 + total / document_frequency[term])
+                postings[term].append([agent_id, round(weight * idf, 4)])
+
+        return cls({
+            "version": INDEX_VERSION,
+            "manifest": manifest.digest,
+            "built_at": time.time(),
+            "agents": agents,
+            "postings": dict(postings),
+        })
+
+    def search(self, prompt: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[str, float]]:
+        """Rank agents for ``prompt``; each distinct prompt term is looked up once."""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(prompt)):
+            for agent_id, score in self.postings.get(term, ()):
+                scores[int(agent_id)] += score
+
+        if not scores:
+            return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.agents[item[0]]))
+        cutoff = ranked[0][1] * RELATIVE_CUTOFF
+        return [(self.agents[agent_id], score) for agent_id, score in ranked[:limit] if score >= cutoff]
+
+
+# In-memory copy for long-running processes (hook daemon), keyed by index path
+_LOADED: Dict[str, AgentIndex] = {}
+
+
+def load_index(agents_dir: Path, index_path: Path, force: bool = False) -> AgentIndex:
+    """Return an up-to-date index, rebuilding only if agent content changed."""
+    manifest = load_manifest(agents_dir, index_path.with_name(MANIFEST_NAME), force=force)
+
+    index = None if force else _LOADED.get(str(index_path))
+    if index is None and not force:
+        data = read_json(index_path, None)
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            index = AgentIndex(data)
+
+    if index is None or index.data.get("manifest") != manifest.digest:
+        index = AgentIndex.build(manifest)
+        write_json_atomic(index_path, index.data)
+    _LOADED[str(index_path)] = index
+    return index
+
+
+def index_path_for(data_dir: Path) -> Path:
+    return data_dir / "agent-index.json"
+
+
+def suggest(prompt: str, env: Dict[str, str], data_dir: Path, limit: int = DEFAULT_LIMIT) -> Optional[List[str]]:
+    """Suggested agent names for ``prompt``, or ``None`` if no catalog is available."""
+    agents_dir = default_agents_dir(env)
+    if agents_dir is None:
+        return None
+    try:
+        index = load_index(agents_dir, index_path_for(data_dir))
+    except OSError:
+        return None
+    return [name for name, _ in index.search(prompt, limit)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Agent keyword index")
+    parser.add_argument("command", choices=["build", "suggest"])
+    parser.add_argument("prompt", nargs="?", default="")
+    parser.add_argument("--agents-dir", type=Path, help="Agent catalog (default: repository agents/)")
+    parser.add_argument("--index", type=Path, help="Index file (default: ~/.claude-code/agent-index.json)")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    if args.agents_dir:
+        env["CLAUDE_AGENTS_DIR"] = str(args.agents_dir)
+    agents_dir = default_agents_dir(env)
+    if agents_dir is None:
+        print("❌ Agents directory not found", file=sys.stderr)
+        return 1
+    index_path = args.index or index_path_for(Path(os.path.expanduser("~/.claude-code")))
+
+    if args.command == "build":
+        index = load_index(agents_dir, index_path, force=True)
+        print(f"✅ Indexed {len(index.agents)} agents ({len(index.postings)} terms) into {index_path}")
+        return 0
+
+    index = load_index(agents_dir, index_path)
+    for name, score in index.search(args.prompt, args.limit):
+        print(f"{name}\t{score:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
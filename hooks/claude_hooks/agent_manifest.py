@@ -0,0 +1,303 @@
+"""
+Compiled manifest of the agent catalog.
+
+A build step reads every agent file under agents/ once and writes a single
+file, ``~/.claude-code/agent-manifest.bin``:
+
+    8 bytes   magic ``CCAGENT1``
+    8 bytes   length of the header (little-endian)
+    header    JSON: the stat and sha256 of every source file, a digest of the
+              whole catalog, and per agent its name, description, model,
+              tools, category, path, sha256 and the offset and length of its
+              body in the section below
+    bodies    the agent bodies (everything after the frontmatter), back to back
+
+Consumers memory-map the file, parse the small header and slice a body out
+of the map only when they ask for it, instead of globbing and parsing every
+markdown file. Loading stats the agent files and rebuilds the manifest when
+one was added, removed or changed; a file whose mtime moved but whose
+content hash did not only refreshes the recorded stat.
+
+Usage:
+    python3 -m claude_hooks.agent_manifest build [--agents-dir DIR]
+    python3 -m claude_hooks.agent_manifest list
+    python3 -m claude_hooks.agent_manifest show NAME
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import HOOKS_DIR
+from .frontmatter import parse_frontmatter
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "agent-manifest.bin"
+MAGIC = b"CCAGENT1"
+PREAMBLE = struct.Struct("<8sQ")
+
+
+def default_agents_dir(env: Optional[Dict[str, str]] = None) -> Optional[Path]:
+    """``CLAUDE_AGENTS_DIR``, the repository's agents/, or ``~/.claude/agents``."""
+    env = os.environ if env is None else env
+    candidates = [
+        env.get("CLAUDE_AGENTS_DIR"),
+        str(HOOKS_DIR.parent / "agents"),
+        os.path.join(env.get("HOME") or os.path.expanduser("~"), ".claude", "agents"),
+    ]
+    for candidate in candidates:
+        if candidate and Path(candidate).is_dir():
+            return Path(candidate).resolve()
+    return None
+
+
+def scan_agent_files(agents_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """Map each agent file (relative path) to its ``(mtime_ns, size)``."""
+    files = {}
+    for path in agents_dir.rglob("*.md"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        files[path.relative_to(agents_dir).as_posix()] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+def file_sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def split_tools(value: str) -> List[str]:
+    return [tool.strip() for tool in value.split(",") if tool.strip()]
+
+
+@dataclass(frozen=True)
+class AgentEntry:
+    """One agent as recorded in the manifest header."""
+
+    name: str
+    description: str
+    model: str
+    tools: Tuple[str, ...]
+    category: str
+    path: str
+    sha256: str
+    offset: int
+    length: int
+
+
+class Manifest:
+    """A memory-mapped manifest; bodies are read from the map on demand."""
+
+    def __init__(self, header: Dict, buffer, body_start: int):
+        self.header = header
+        self.buffer = buffer
+        self.body_start = body_start
+        self.agents = [
+            AgentEntry(**{**agent, "tools": tuple(agent["tools"])}) for agent in header["agents"]
+        ]
+        self._by_name = {agent.name: agent for agent in self.agents}
+
+    @property
+    def digest(self) -> str:
+        """Hash over every agent file's content; changes whenever the catalog does."""
+        return self.header["digest"]
+
+    def names(self) -> List[str]:
+        return [agent.name for agent in self.agents]
+
+    def get(self, name: str) -> Optional[AgentEntry]:
+        return self._by_name.get(name)
+
+    def body(self, agent: AgentEntry) -> str:
+        start = self.body_start + agent.offset
+        return bytes(self.buffer[start:start + agent.length]).decode("utf-8", errors="replace")
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["Manifest"]:
+        """Map ``path``; None if it is missing, truncated or another version."""
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, length = PREAMBLE.unpack_from(buffer, 0)
+            if magic != MAGIC:
+                raise ValueError("not an agent manifest")
+            header = json.loads(bytes(buffer[PREAMBLE.size:PREAMBLE.size + length]))
+            if header.get("version") != MANIFEST_VERSION:
+                raise ValueError("manifest version mismatch")
+            return cls(header, buffer, PREAMBLE.size + length)
+        except (struct.error, ValueError, KeyError, TypeError):
+            buffer.close()
+            return None
+
+    @staticmethod
+    def build(agents_dir: Path, stats: Dict[str, Tuple[int, int]]) -> Tuple[Dict, List[bytes]]:
+        """Parse every agent once; the header and the bodies to write after it."""
+        files = {}
+        agents = []
+        bodies: List[bytes] = []
+        offset = 0
+        catalog = hashlib.sha256()
+        for rel in sorted(stats):
+            raw = (agents_dir / rel).read_bytes()
+            mtime_ns, size = stats[rel]
+            sha256 = hashlib.sha256(raw).hexdigest()
+            files[rel] = {"mtime_ns": mtime_ns, "size": size, "sha256": sha256}
+            catalog.update(f"{rel}\0{sha256}\n".encode("utf-8"))
+
+            text = raw.decode("utf-8", errors="replace")
+            fields, body_start = parse_frontmatter(text)
+            body = text[body_start:].encode("utf-8")
+            parts = Path(rel).parts
+            agents.append({
+                "name": fields.get("name") or Path(rel).stem,
+                "description": fields.get("description", ""),
+                "model": fields.get("model", ""),
+                "tools": split_tools(fields.get("tools", "")),
+                "category": parts[0] if len(parts) > 1 else "",
+                "path": rel,
+                "sha256": sha256,
+                "offset": offset,
+                "length": len(body),
+            })
+            bodies.append(body)
+            offset += len(body)
+
+        header = {
+            "version": MANIFEST_VERSION,
+            "agents_dir": str(agents_dir),
+            "built_at": time.time(),
+            "digest": catalog.hexdigest(),
+            "files": files,
+            "agents": agents,
+        }
+        return header, bodies
+
+
+def write_manifest(path: Path, header: Dict, bodies: List[bytes]) -> None:
+    """Write the manifest through a temp file renamed into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, len(encoded)))
+            f.write(encoded)
+            for body in bodies:
+                f.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _rewrite_header(path: Path, manifest: Manifest) -> Manifest:
+    """Write ``manifest`` with an updated header and its existing bodies."""
+    bodies = [bytes(manifest.buffer[manifest.body_start:])]
+    write_manifest(path, manifest.header, bodies)
+    return Manifest.open(path) or manifest
+
+
+# In-memory copy for long-running processes (hook daemon), keyed by manifest path
+_LOADED: Dict[str, Manifest] = {}
+
+
+def load_manifest(agents_dir: Path, manifest_path: Path, force: bool = False) -> Manifest:
+    """Return an up-to-date manifest, rebuilding it only if agent content changed."""
+    agents_dir = agents_dir.resolve()
+    stats = scan_agent_files(agents_dir)
+
+    manifest = None if force else (_LOADED.get(str(manifest_path)) or Manifest.open(manifest_path))
+    if manifest is not None and manifest.header.get("agents_dir") == str(agents_dir):
+        recorded = manifest.header["files"]
+        if set(recorded) == set(stats):
+            touched = [
+                rel for rel, (mtime_ns, size) in stats.items()
+                if (recorded[rel]["mtime_ns"], recorded[rel]["size"]) != (mtime_ns, size)
+            ]
+            if not touched:
+                _LOADED[str(manifest_path)] = manifest
+                return manifest
+
+            if all(file_sha256(agents_dir / rel) == recorded[rel]["sha256"] for rel in touched):
+                # Same content, new mtime: remember the stat so the next check is cheap
+                for rel in touched:
+                    recorded[rel]["mtime_ns"], recorded[rel]["size"] = stats[rel]
+                manifest = _rewrite_header(manifest_path, manifest)
+                _LOADED[str(manifest_path)] = manifest
+                return manifest
+
+    header, bodies = Manifest.build(agents_dir, stats)
+    write_manifest(manifest_path, header, bodies)
+    manifest = Manifest.open(manifest_path)
+    if manifest is None:
+        raise OSError(f"could not read back {manifest_path}")
+    _LOADED[str(manifest_path)] = manifest
+    return manifest
+
+
+def manifest_path_for(data_dir: Path) -> Path:
+    return data_dir / MANIFEST_NAME
+
+
+def catalog(env: Dict[str, str], data_dir: Path) -> Optional[Manifest]:
+    """The manifest of the installed catalog, or None if there is no agents directory."""
+    agents_dir = default_agents_dir(env)
+    if agents_dir is None:
+        return None
+    try:
+        return load_manifest(agents_dir, manifest_path_for(data_dir))
+    except OSError:
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compiled agent catalog manifest")
+    parser.add_argument("command", choices=["build", "list", "show"])
+    parser.add_argument("name", nargs="?", default="")
+    parser.add_argument("--agents-dir", type=Path, help="Agent catalog (default: repository agents/)")
+    parser.add_argument("--manifest", type=Path, help=f"Manifest file (default: ~/.claude-code/{MANIFEST_NAME})")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    if args.agents_dir:
+        env["CLAUDE_AGENTS_DIR"] = str(args.agents_dir)
+    agents_dir = default_agents_dir(env)
+    if agents_dir is None:
+        print("❌ Agents directory not found", file=sys.stderr)
+        return 1
+    manifest_path = args.manifest or manifest_path_for(Path(os.path.expanduser("~/.claude-code")))
+    manifest = load_manifest(agents_dir, manifest_path, force=args.command == "build")
+
+    if args.command == "build":
+        print(f"✅ Compiled {len(manifest.agents)} agents into {manifest_path}")
+    elif args.command == "list":
+        for agent in manifest.agents:
+            print(f"{agent.name}\t{agent.category or '-'}\t{agent.model or '-'}\t{agent.description}")
+    else:
+        agent = manifest.get(args.name)
+        if agent is None:
+            print(f"❌ Unknown agent: {args.name}", file=sys.stderr)
+            return 1
+        sys.stdout.write(manifest.body(agent))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+PreToolUse handler: suggest agents based on task patterns.
+
+Suggestions come from the precompiled agent index (agent_index.py), so they
+track the agents actually present in the catalog. The fixed keyword table
+is kept as a fallback for installs without an agents directory.
+"""
+
+import sys
+
+from . import agent_index
+from .event import HookEvent, HookResult, run_cli
+
+
+def suggest_agent(prompt: str, result: HookResult) -> None:
+    """Append fixed keyword-based agent suggestions for ``prompt`` to ``result``."""
+    prompt_lower = prompt.lower()
+
+    def has(*words: str) -> bool:
+        return any(word in prompt_lower for word in words)
+
+    # Architecture and design patterns
+    if has("architect", "design", "structure"):
+        result.echo("💡 Consider using architecture specialists: go-architect, rust-systems-engineer, nextjs-architect")
+
+    # Debugging patterns
+    if has("debug", "error", "fix"):
+        result.echo("🔍 Consider language-specific debuggers: go-debugger, rust-debugger, python-debugger, javascript-debugger")
+
+    # Testing patterns
+    if has("test", "coverage", "spec"):
+        result.echo("🧪 Consider test engineers: go-test-engineer, rust-test-engineer, python-test-engineer, react-nextjs-test-engineer")
+
+    # Full-stack patterns
+    if has("full-stack") or (has("frontend") and has("backend")):
+        result.echo("🌐 Consider full-stack agents: fullstack-nextjs-go, fullstack-nuxtjs-go")
+
+    # Infrastructure patterns
+    if has("deploy", "kubernetes", "docker"):
+        result.echo("☁️ Consider infrastructure agents: k8s-deployment-engineer, container-specialist, terraform-architect")
+
+    # Performance patterns
+    if has("performance", "optimize", "slow"):
+        result.echo("⚡ Consider optimization specialists: go-performance-optimizer, prometheus-engineer")
+
+
+def run(event: HookEvent) -> HookResult:
+    """Run the agent selector for a single tool call."""
+    result = HookResult()
+
+    # Exit immediately if not a Task tool
+    if event.tool_name != "Task":
+        return result
+
+    prompt = event.arg(1)
+    names = agent_index.suggest(prompt, event.env, event.data_dir)
+    if names is None:
+        suggest_agent(prompt, result)
+    elif names:
+        result.echo(f"💡 Consider these agents: {', '.join(names)}")
+
+    # Always allow the tool to proceed
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(run, "agent-selector"))
@@ -0,0 +1,164 @@
+"""
+Agent usage statistics in a local SQLite store (~/.claude-code/agent-stats.db).
+
+Recording an invocation is one short write transaction that inserts the
+invocation row and bumps the agent's counter together, so parallel subagents
+and concurrent sessions never lose counts or leave a half-written file. The
+database runs in WAL mode: readers (the session start summary and the
+tracker's periodic report) never block writers, and writers wait on the busy
+timeout instead of failing. Counts from the older agent-stats.json are
+imported when the database is first created.
+
+The daemon's handler and the shell scripts (through ``record`` and ``top``
+on the command line below) use this one store, so counts agree whichever path
+recorded them.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+from .storage import read_json
+
+DB_NAME = "agent-stats.db"
+LEGACY_STATS = "agent-stats.json"
+
+# Seconds a writer waits for the lock before giving up
+BUSY_TIMEOUT = 10.0
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    name TEXT PRIMARY KEY,
+    uses INTEGER NOT NULL DEFAULT 0,
+    first_used TEXT,
+    last_used TEXT
+);
+CREATE INDEX IF NOT EXISTS agents_by_uses ON agents (uses DESC);
+CREATE TABLE IF NOT EXISTS invocations (
+    id INTEGER PRIMARY KEY,
+    agent TEXT NOT NULL,
+    task TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS invocations_by_agent ON invocations (agent);
+"""
+
+
+class AgentStats:
+    """Usage counters, timestamps and task descriptions for each agent."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / DB_NAME
+
+    def exists(self) -> bool:
+        """Whether any statistics have been recorded (here or in the old JSON file)."""
+        return self.path.is_file() or (self.data_dir / LEGACY_STATS).is_file()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the database, creating and migrating it on first use."""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; transactions are opened explicitly below
+        conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._initialize(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have won the race while we waited for the lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                for statement in SCHEMA.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                self._import_legacy(conn)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        legacy = read_json(self.data_dir / LEGACY_STATS, {})
+        if not isinstance(legacy, dict):
+            return
+        conn.executemany(
+            "INSERT OR IGNORE INTO agents (name, uses) VALUES (?, ?)",
+            [(name, uses) for name, uses in legacy.items() if isinstance(uses, int)],
+        )
+
+    def record(self, agent: str, task: str, timestamp: str) -> int:
+        """Record one invocation of ``agent`` and return its sequence number."""
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.execute(
+                    "INSERT INTO invocations (agent, task, timestamp) VALUES (?, ?, ?)",
+                    (agent, task, timestamp),
+                )
+                conn.execute(
+                    "INSERT INTO agents (name, uses, first_used, last_used) VALUES (?, 1, ?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET uses = uses + 1, "
+                    "first_used = COALESCE(first_used, excluded.first_used), "
+                    "last_used = excluded.last_used",
+                    (agent, timestamp, timestamp),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        """Return ``(agent, uses)`` pairs, most used first."""
+        if not self.exists():
+            return []
+        conn = self.connect()
+        try:
+            # Ties list the most recently added agent first, like the old
+            # jq `sort_by(.value) | reverse`
+            rows = conn.execute(
+                "SELECT name, uses FROM agents ORDER BY uses DESC, rowid DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [(name, uses) for name, uses in rows]
+
+
+def main(argv: List[str]) -> int:
+    """``python -m claude_hooks.agent_stats [N] | record AGENT [TASK]``.
+
+    ``record`` records one invocation and prints its sequence number, for
+    agent-hierarchy-tracker.sh without the daemon; otherwise the top N agents
+    are printed as ``agent<TAB>uses`` lines.
+    """
+    from .event import HookEvent, utc_timestamp
+
+    stats = AgentStats(HookEvent.from_process().data_dir)
+    if argv[:1] == ["record"] and len(argv) in (2, 3):
+        print(stats.record(argv[1], argv[2] if len(argv) == 3 else "", utc_timestamp()))
+        return 0
+    if len(argv) > 1 or (argv and not argv[0].isdigit()):
+        print("usage: python -m claude_hooks.agent_stats [N] | record AGENT [TASK]", file=sys.stderr)
+        return 2
+
+    limit = int(argv[0]) if argv else 10
+    for agent, uses in stats.top(limit):
+        print(f"{agent}\t{uses}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
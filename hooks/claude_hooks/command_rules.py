@@ -0,0 +1,429 @@
+"""
+Tokenizing rule engine for Bash commands.
+
+The command line is split into simple commands (at pipes, ``&&``, ``||``,
+``;``, newlines, subshells and command substitutions) and each of those into
+words, honouring quotes, escapes and comments. Heredoc bodies are skipped in
+one forward pass and only inspected when they are fed to a shell. Commands
+run through wrappers (``sudo``, ``env``, ``xargs`` ...), ``sh -c`` or
+``eval`` are unwrapped before the rules are evaluated.
+
+Rules live in hooks/command-rules.json. A rule matches a simple command when
+every condition it lists holds:
+
+- ``command``: program names (basename of the executable)
+- ``flags``: groups of flags; each group needs one flag present, with short
+  flags matched inside clusters (``-rf`` sets ``-r`` and ``-f``)
+- ``args``: groups of regular expressions; each group needs one operand
+  (argument, ``--opt=value`` value or redirect target) matching a pattern
+  as a whole word
+- ``contains``: case-insensitive substrings of any word
+
+Arguments of the ``literals`` commands (``echo``, ``printf``) are text that
+is printed, not paths that are opened, so only their redirect targets are
+operands: ``echo '/etc/passwd'`` is not flagged, ``echo x >> /etc/hosts`` is.
+
+Actions are ``block`` (exit code 1), ``warn`` and ``caution``.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import HOOKS_DIR
+
+RULES_FILE = HOOKS_DIR / "command-rules.json"
+RULES_VERSION = 1
+ACTIONS = ("block", "warn", "caution")
+
+# Nesting limit for sh -c, eval, heredocs and command substitutions
+MAX_DEPTH = 4
+
+SEPARATORS = "|&;()`\n"
+WORD_RUN = re.compile(r"[^\s|&;()<>`'\"\\$]+")
+DOUBLE_QUOTED_RUN = re.compile(r"[^\"\\$`]+")
+ASSIGNMENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\+?=")
+SHORT_FLAGS = re.compile(r"-[A-Za-z0-9]+")
+
+
+@dataclass
+class Word:
+    text: str
+    quoted: bool = False
+
+
+@dataclass
+class SimpleCommand:
+    words: List[Word] = field(default_factory=list)
+    redirects: List[Word] = field(default_factory=list)
+    heredocs: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.words or self.redirects)
+
+
+class _Lexer:
+    """Single forward pass over a command string."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.length = len(source)
+        self.commands: List[SimpleCommand] = []
+        # Bodies of $(...) and `...` found inside double quotes
+        self.substitutions: List[str] = []
+        self.current = SimpleCommand()
+
+    def finish(self) -> None:
+        if self.current:
+            self.commands.append(self.current)
+        self.current = SimpleCommand()
+
+    def parse(self) -> List[SimpleCommand]:
+        source, length = self.source, self.length
+        pending_heredocs: List[Tuple[str, bool, SimpleCommand]] = []
+        redirect_next = False
+        heredoc_next: Optional[bool] = None
+        i = 0
+
+        while i < length:
+            char = source[i]
+
+            if char in " \t\r":
+                i += 1
+            elif char == "\\" and source.startswith("\\\n", i):
+                i += 2
+            elif char == "\n":
+                self.finish()
+                i = self._skip_heredocs(i + 1, pending_heredocs)
+                pending_heredocs = []
+            elif char == "#":
+                # Comment: only reached at the start of a word
+                end = source.find("\n", i)
+                i = length if end < 0 else end
+            elif source.startswith("&>", i):
+                i += 3 if source.startswith("&>>", i) else 2
+                redirect_next = True
+            elif source.startswith("$(", i):
+                self.finish()
+                i += 2
+            elif char in SEPARATORS:
+                self.finish()
+                i += 1
+            elif char in "<>":
+                if source.startswith("<<<", i):
+                    i += 3
+                    redirect_next = True
+                elif source.startswith("<<", i):
+                    i += 2
+                    heredoc_next = source.startswith("-", i)
+                    if heredoc_next:
+                        i += 1
+                else:
+                    i += 1
+                    while i < length and source[i] in ">&|":
+                        i += 1
+                    redirect_next = True
+            else:
+                word, i = self._read_word(i)
+                if heredoc_next is not None:
+                    pending_heredocs.append((word.text, heredoc_next, self.current))
+                    heredoc_next = None
+                elif redirect_next:
+                    self.current.redirects.append(word)
+                    redirect_next = False
+                elif not word.quoted and word.text.isdigit() and i < length and source[i] in "<>":
+                    # File descriptor of a redirection such as 2>&1
+                    pass
+                else:
+                    self.current.words.append(word)
+
+        self.finish()
+        return self.commands
+
+    def _read_word(self, i: int) -> Tuple[Word, int]:
+        source, length = self.source, self.length
+        parts: List[str] = []
+        quoted = False
+
+        while i < length:
+            run = WORD_RUN.match(source, i)
+            if run:
+                parts.append(run.group())
+                i = run.end()
+                continue
+
+            char = source[i]
+            if char == "\\":
+                parts.append(source[i + 1:i + 2])
+                i += 2
+            elif char == "'":
+                end = source.find("'", i + 1)
+                end = length if end < 0 else end
+                parts.append(source[i + 1:end])
+                quoted = True
+                i = end + 1
+            elif char == '"':
+                text, i = self._read_double_quoted(i + 1)
+                parts.append(text)
+                quoted = True
+            elif source.startswith("$'", i):
+                end = i + 2
+                while end < length and source[end] != "'":
+                    end += 2 if source[end] == "\\" else 1
+                parts.append(source[i + 2:end])
+                quoted = True
+                i = end + 1
+            elif source.startswith("$(", i):
+                break
+            elif char == "$":
+                parts.append(char)
+                i += 1
+            else:
+                break
+
+        return Word("".join(parts), quoted), min(i, length)
+
+    def _read_double_quoted(self, i: int) -> Tuple[str, int]:
+        source, length = self.source, self.length
+        parts: List[str] = []
+
+        while i < length:
+            run = DOUBLE_QUOTED_RUN.match(source, i)
+            if run:
+                parts.append(run.group())
+                i = run.end()
+                continue
+
+            char = source[i]
+            if char == '"':
+                return "".join(parts), i + 1
+            if char == "\\":
+                parts.append(source[i + 1:i + 2])
+                i += 2
+            elif source.startswith("$(", i):
+                end = self._matching_paren(i + 2)
+                self.substitutions.append(source[i + 2:end])
+                parts.append(source[i:end + 1])
+                i = end + 1
+            elif char == "`":
+                end = source.find("`", i + 1)
+                end = length if end < 0 else end
+                self.substitutions.append(source[i + 1:end])
+                parts.append(source[i:end + 1])
+                i = end + 1
+            else:
+                parts.append(char)
+                i += 1
+
+        return "".join(parts), length
+
+    def _matching_paren(self, i: int) -> int:
+        depth = 1
+        source, length = self.source, self.length
+        while i < length:
+            char = source[i]
+            if char == "\\":
+                i += 2
+                continue
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    return i
+            i += 1
+        return length
+
+    def _skip_heredocs(self, i: int, pending: List[Tuple[str, bool, SimpleCommand]]) -> int:
+        source, length = self.source, self.length
+        for delimiter, strip_tabs, owner in pending:
+            start = i
+            while i < length:
+                end = source.find("\n", i)
+                end = length if end < 0 else end
+                line = source[i:end]
+                if strip_tabs:
+                    line = line.lstrip("\t")
+                if line == delimiter:
+                    owner.heredocs.append(source[start:i])
+                    i = end + 1
+                    break
+                i = end + 1
+            else:
+                owner.heredocs.append(source[start:length])
+        return min(i, length)
+
+
+def parse_commands(source: str) -> Tuple[List[SimpleCommand], List[str]]:
+    """Split ``source`` into simple commands, plus quoted command substitutions."""
+    lexer = _Lexer(source)
+    return lexer.parse(), lexer.substitutions
+
+
+@dataclass
+class Invocation:
+    """A simple command with wrappers and assignments resolved."""
+
+    name: str
+    args: List[Word]
+    command: SimpleCommand
+    # Arguments are printed text (echo, printf), not operands
+    literal: bool = False
+
+    def operands(self) -> List[str]:
+        values = []
+        options_done = False
+        for word in [] if self.literal else self.args:
+            text = word.text
+            if options_done or not text.startswith("-") or word.quoted:
+                values.append(text)
+            elif text == "--":
+                options_done = True
+            elif text.startswith("--") and "=" in text:
+                values.append(text.split("=", 1)[1])
+        values.extend(word.text for word in self.command.redirects)
+        return values
+
+    def has_flag(self, flag: str) -> bool:
+        for word in self.args:
+            text = word.text
+            if text == "--":
+                return False
+            if text == flag or (flag.startswith("--") and text.startswith(flag + "=")):
+                return True
+            if len(flag) == 2 and not flag.startswith("--") and SHORT_FLAGS.fullmatch(text) and flag[1] in text[1:]:
+                return True
+        return False
+
+
+@dataclass
+class Rule:
+    id: str
+    action: str
+    message: str
+    commands: Tuple[str, ...] = ()
+    flags: Tuple[Tuple[str, ...], ...] = ()
+    args: Tuple[Tuple["re.Pattern[str]", ...], ...] = ()
+    contains: Tuple[str, ...] = ()
+
+    def matches(self, invocation: Invocation) -> bool:
+        if self.commands and invocation.name not in self.commands:
+            return False
+        if not all(any(invocation.has_flag(flag) for flag in group) for group in self.flags):
+            return False
+        if self.args:
+            operands = invocation.operands()
+            for group in self.args:
+                if not any(pattern.fullmatch(operand) for pattern in group for operand in operands):
+                    return False
+        if self.contains:
+            command = invocation.command
+            words = [word.text.lower() for word in command.words + command.redirects]
+            if not any(needle in word for needle in self.contains for word in words):
+                return False
+        return True
+
+
+class RuleSet:
+    """Compiled command-rules.json."""
+
+    def __init__(self, data: dict):
+        if not isinstance(data, dict) or data.get("version") != RULES_VERSION:
+            raise ValueError(f"expected a rules object with version {RULES_VERSION}")
+
+        self.wrappers: Dict[str, frozenset] = {
+            name: frozenset(options) for name, options in data.get("wrappers", {}).items()
+        }
+        self.shells = frozenset(data.get("shells", []))
+        self.literals = frozenset(data.get("literals", []))
+        self.rules: List[Rule] = []
+        for entry in data.get("rules", []):
+            if entry.get("action") not in ACTIONS or not entry.get("id") or not entry.get("message"):
+                raise ValueError(f"rule needs an id, a message and an action in {ACTIONS}: {entry!r}")
+            self.rules.append(
+                Rule(
+                    id=entry["id"],
+                    action=entry["action"],
+                    message=entry["message"],
+                    commands=tuple(entry.get("command", ())),
+                    flags=tuple(tuple(group) for group in entry.get("flags", ())),
+                    args=tuple(tuple(re.compile(p) for p in group) for group in entry.get("args", ())),
+                    contains=tuple(needle.lower() for needle in entry.get("contains", ())),
+                )
+            )
+
+    def resolve(self, command: SimpleCommand) -> Invocation:
+        """Skip assignments and wrapper commands to find the program being run."""
+        words = command.words
+        index = 0
+        while index < len(words):
+            word = words[index]
+            if not word.quoted and ASSIGNMENT.match(word.text):
+                index += 1
+                continue
+            name = os.path.basename(word.text)
+            if name not in self.wrappers:
+                return Invocation(name, words[index + 1:], command, name in self.literals)
+            index += 1
+            # Options of the wrapper, some of which take a value
+            while index < len(words) and words[index].text.startswith("-"):
+                index += 2 if words[index].text in self.wrappers[name] else 1
+        return Invocation("", [], command)
+
+    def invocations(self, source: str, depth: int = 0) -> List[Invocation]:
+        """Every simple command in ``source``, including nested shell scripts."""
+        commands, substitutions = parse_commands(source)
+        found = []
+        for command in commands:
+            invocation = self.resolve(command)
+            found.append(invocation)
+            if depth >= MAX_DEPTH:
+                continue
+            for script in self._nested_scripts(invocation):
+                found.extend(self.invocations(script, depth + 1))
+        if depth < MAX_DEPTH:
+            for script in substitutions:
+                found.extend(self.invocations(script, depth + 1))
+        return found
+
+    def _nested_scripts(self, invocation: Invocation) -> List[str]:
+        if invocation.name == "eval":
+            return [" ".join(word.text for word in invocation.args)]
+        if invocation.name not in self.shells:
+            return []
+        for position, word in enumerate(invocation.args):
+            if SHORT_FLAGS.fullmatch(word.text) and "c" in word.text[1:]:
+                return [arg.text for arg in invocation.args[position + 1:position + 2]]
+        # Script on stdin: sh <<EOF ... EOF
+        return list(invocation.command.heredocs)
+
+    def evaluate(self, source: str) -> List[Rule]:
+        """Rules triggered by ``source``; a block rule, if any, is returned alone."""
+        invocations = self.invocations(source)
+        triggered = [rule for rule in self.rules if any(rule.matches(inv) for inv in invocations)]
+        for rule in triggered:
+            if rule.action == "block":
+                return [rule]
+        return triggered
+
+
+# Compiled rule files keyed by path, invalidated on mtime change
+_CACHE: Dict[str, Tuple[int, RuleSet]] = {}
+
+
+def load_rules(path: Optional[Path] = None) -> RuleSet:
+    """Compile the rules file, reusing the compiled rules while it is unchanged."""
+    path = Path(path or RULES_FILE)
+    mtime_ns = path.stat().st_mtime_ns
+
+    cached = _CACHE.get(str(path))
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        rules = RuleSet(json.load(f))
+    _CACHE[str(path)] = (mtime_ns, rules)
+    return rules
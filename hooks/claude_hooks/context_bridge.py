@@ -0,0 +1,90 @@
+"""
+SubagentStop handler: bridge context between agent invocations in a chain.
+
+Mirrors hooks/agent-context-bridge.sh. Findings, recent completions and chain
+detection live in the locked context store (see context_store.py), so each
+completion is one bounded update.
+"""
+
+import sys
+
+from .context_store import MAX_FINDINGS, AgentContext, ContextStore
+from .event import HookEvent, HookResult, run_cli, utc_timestamp
+from .intake import ToolResult
+
+# (agent substring, output keywords, finding type, finding text)
+FINDING_RULES = [
+    ("architect", ("structure", "pattern"), "architecture", "Architectural pattern defined"),
+    ("engineer", ("implemented", "created"), "implementation", "Implementation completed"),
+    ("test", ("passed", "coverage"), "testing", "Tests executed"),
+    ("debugger", ("fixed", "resolved"), "debugging", "Issue resolved"),
+]
+
+CHAIN_MESSAGES = {
+    "complete": "✅ Complete development chain detected: Design → Implementation → Testing",
+    "test-debug": "🔧 Test-Debug cycle detected: Testing → Debugging",
+}
+
+
+def extract_key_findings(context: AgentContext, output: ToolResult, agent: str) -> None:
+    """Store the first matching finding for ``agent``."""
+    # Like the shell `case`, only the first matching agent pattern applies
+    for agent_pattern, keywords, finding_type, finding in FINDING_RULES:
+        if agent_pattern in agent:
+            if any(keyword in output for keyword in keywords):
+                context.add_finding(agent, finding_type, finding)
+            break
+
+
+def track_agent_chain(context: AgentContext, agent: str, result: HookResult) -> None:
+    """Record the agent and report well-known chains."""
+    for name in context.record(agent, utc_timestamp()):
+        result.echo(CHAIN_MESSAGES[name])
+
+
+def suggest_next_agent(context: AgentContext, event: HookEvent, current_agent: str, result: HookResult) -> None:
+    """Suggest the next agent based on the current one and stored context."""
+    if "architect" in current_agent:
+        result.echo("📍 Next in chain: Consider an engineer agent for implementation")
+    elif "engineer" in current_agent:
+        if not context.mentions("testing"):
+            result.echo("📍 Next in chain: Consider a test engineer for validation")
+    elif "test-engineer" in current_agent:
+        if "fail" in event.result:
+            result.echo("📍 Next in chain: Consider a debugger for failing tests")
+    elif "debugger" in current_agent:
+        result.echo("📍 Next in chain: Consider re-running tests to verify fixes")
+
+
+def maintain_context_window(context: AgentContext, result: HookResult) -> None:
+    """Reset findings after a complete chain (expired ones are already gone)."""
+    if len(context.findings) > MAX_FINDINGS:
+        result.echo("🔄 Resetting agent context after complete chain")
+        context.clear_findings()
+
+
+def run(event: HookEvent) -> HookResult:
+    """Run the context bridge for a single subagent completion."""
+    result = HookResult()
+    agent = event.subagent_type
+    event.data_dir.mkdir(parents=True, exist_ok=True)
+
+    if not agent:
+        return result
+
+    with ContextStore(event.data_dir).update() as context:
+        extract_key_findings(context, event.result, agent)
+        track_agent_chain(context, agent, result)
+        suggest_next_agent(context, event, agent, result)
+        maintain_context_window(context, result)
+
+        # Show current chain status
+        result.echo("🔗 Current agent chain:")
+        for timestamp, name in context.recent(3):
+            result.echo(f"   [{timestamp}] {name}")
+
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(run, "agent-context-bridge"))
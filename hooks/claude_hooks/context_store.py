@@ -0,0 +1,170 @@
+"""
+Agent chain context shared between subagent completions.
+
+One small JSON document (~/.claude-code/agent-context-store.json) holds:
+
+- a fixed-capacity ring buffer of the most recent agent completions,
+- per-agent findings that expire after ``FINDING_TTL`` seconds,
+- the match state of each chain pattern (architect → engineer → test,
+  test → debugger), advanced one entry at a time.
+
+Every completion is a single read-modify-write of that bounded document
+under an exclusive lock, so its cost does not grow with the session and
+concurrent subagents cannot overwrite each other's updates.
+"""
+
+import fcntl
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .storage import read_json, write_json_atomic
+
+STORE_NAME = "agent-context-store.json"
+LOCK_NAME = "agent-context-store.lock"
+
+CAPACITY = 10
+FINDING_TTL = 60 * 60
+# More live findings than this means a chain has completed; start over
+MAX_FINDINGS = 5
+
+
+class ChainPattern:
+    """Agents whose names contain ``stages`` in order within the last ``window`` entries.
+
+    The state is, for each stage, the latest entry position at which a match
+    of the stages up to and including it can start. Each new entry advances
+    the state in time proportional to the number of stages, and the pattern
+    is present when a complete match starts inside the window.
+    """
+
+    def __init__(self, name: str, stages: Sequence[str], window: int):
+        self.name = name
+        self.stages = tuple(stages)
+        self.window = window
+
+    def initial(self) -> List[Optional[int]]:
+        return [None] * len(self.stages)
+
+    def advance(self, state: List[Optional[int]], position: int, agent: str) -> List[Optional[int]]:
+        """State after appending ``agent`` at ``position``."""
+        new = list(state)
+        for first in range(len(self.stages)):
+            start = position if first == 0 else state[first - 1]
+            if start is None:
+                continue
+            # Greedily match as many further stages as this one name holds
+            offset = 0
+            for index in range(first, len(self.stages)):
+                found = agent.find(self.stages[index], offset)
+                if found < 0:
+                    break
+                offset = found + len(self.stages[index])
+                if new[index] is None or new[index] < start:
+                    new[index] = start
+        return new
+
+    def matched(self, state: List[Optional[int]], position: int) -> bool:
+        """Whether a complete match lies within the window ending at ``position``."""
+        return state[-1] is not None and state[-1] > position - self.window
+
+
+# Same as matching `architect.*engineer.*test` and `test.*debugger` against
+# the last five agent names
+CHAIN_PATTERNS = [
+    ChainPattern("complete", ("architect", "engineer", "test"), window=5),
+    ChainPattern("test-debug", ("test", "debugger"), window=5),
+]
+
+
+class AgentContext:
+    """The context document, loaded for one update."""
+
+    def __init__(self, state: Dict, now: float, capacity: int = CAPACITY):
+        self.state = state
+        self.now = now
+        self.capacity = capacity
+        state.setdefault("entries", [])
+        state.setdefault("count", 0)
+        state.setdefault("findings", {})
+        chains = state.setdefault("chains", {})
+        for pattern in CHAIN_PATTERNS:
+            chains.setdefault(pattern.name, pattern.initial())
+        self._evict_expired()
+
+    def _evict_expired(self) -> None:
+        findings = self.state["findings"]
+        for agent in [agent for agent, finding in findings.items() if finding.get("expires", 0) <= self.now]:
+            del findings[agent]
+
+    def record(self, agent: str, timestamp: str) -> List[str]:
+        """Add a completion and return the names of the chain patterns now present."""
+        position = self.state["count"]
+        entries = self.state["entries"]
+        if len(entries) < self.capacity:
+            entries.append([timestamp, agent])
+        else:
+            entries[position % self.capacity] = [timestamp, agent]
+        self.state["count"] = position + 1
+
+        matched = []
+        chains = self.state["chains"]
+        for pattern in CHAIN_PATTERNS:
+            chains[pattern.name] = pattern.advance(chains[pattern.name], position, agent)
+            if pattern.matched(chains[pattern.name], position):
+                matched.append(pattern.name)
+        return matched
+
+    def recent(self, count: int) -> List[Tuple[str, str]]:
+        """The last ``count`` completions as ``(timestamp, agent)``, oldest first."""
+        entries = self.state["entries"]
+        total = self.state["count"]
+        count = min(count, len(entries))
+        return [tuple(entries[position % self.capacity]) for position in range(total - count, total)]
+
+    @property
+    def findings(self) -> Dict[str, Dict]:
+        return self.state["findings"]
+
+    def add_finding(self, agent: str, finding_type: str, finding: str) -> None:
+        self.findings[agent] = {"type": finding_type, "finding": finding, "expires": self.now + FINDING_TTL}
+
+    def mentions(self, word: str) -> bool:
+        """Whether any live finding (agent, type or text) contains ``word``."""
+        return any(
+            word in agent or word in finding.get("type", "") or word in finding.get("finding", "")
+            for agent, finding in self.findings.items()
+        )
+
+    def clear_findings(self) -> None:
+        self.findings.clear()
+
+
+class ContextStore:
+    """Locked access to the context document under ``data_dir``."""
+
+    def __init__(self, data_dir: Path, clock: Callable[[], float] = time.time):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / STORE_NAME
+        self.lock_path = self.data_dir / LOCK_NAME
+        self.clock = clock
+
+    @contextmanager
+    def update(self) -> Iterator[AgentContext]:
+        """Load the context under an exclusive lock and save it afterwards."""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                state = read_json(self.path, {})
+                context = AgentContext(state if isinstance(state, dict) else {}, self.clock())
+                yield context
+                write_json_atomic(self.path, context.state)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def load(self) -> AgentContext:
+        """A read-only snapshot of the context."""
+        state = read_json(self.path, {})
+        return AgentContext(state if isinstance(state, dict) else {}, self.clock())
@@ -0,0 +1,206 @@
+"""
+Long-running hook server.
+
+Holds the hook handlers in memory and serves them over a Unix socket so a
+tool call costs one short-lived client process instead of a bash process
+per hook plus its date/tr/jq/mkdir/wc/uname children.
+
+Protocol: the client sends one JSON object per connection, terminated by a
+newline::
+
+    {"hook": "agent-selector", "args": [...], "env": {...}, "cwd": "..."}
+
+(or ``"event": "PostToolUse"`` instead of ``"hook"`` to run every enabled
+check for that event, see dispatcher.py)
+
+and receives one JSON object back::
+
+    {"exit_code": 0, "output": "..."}
+
+or ``{"error": "..."}`` if the hook could not be handled, in which case the
+client falls back to the shell script.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .dispatcher import EVENT_CHECKS, dispatch
+from .event import HookEvent
+from .registry import HANDLERS, handler, normalize_hook_name, run_handler
+from .trace import traced
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+def default_socket_path() -> str:
+    """Socket path from ``CLAUDE_HOOKD_SOCKET`` or ``~/.claude-code/hookd.sock``."""
+    return os.environ.get("CLAUDE_HOOKD_SOCKET") or os.path.expanduser("~/.claude-code/hookd.sock")
+
+
+class HookServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server dispatching to in-process hook handlers."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        super().__init__(socket_path, HookRequestHandler)
+
+    def handle_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        command = payload.get("command")
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid(), "hooks": sorted(HANDLERS), "events": list(EVENT_CHECKS)}
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+
+        event = HookEvent(
+            env={str(k): str(v) for k, v in (payload.get("env") or {}).items()},
+            args=[str(arg) for arg in payload.get("args") or []],
+            cwd=str(payload.get("cwd") or ""),
+        )
+
+        if "event" in payload:
+            event_name = str(payload["event"])
+            if event_name not in EVENT_CHECKS:
+                return {"error": f"unknown event: {event_name}"}
+            result = dispatch(event_name, event)
+        else:
+            name = normalize_hook_name(str(payload.get("hook", "")))
+            if name not in HANDLERS:
+                return {"error": f"unknown hook: {name}"}
+            result = traced(name, event, lambda: run_handler(name, event))
+        return {"exit_code": result.exit_code, "output": result.output}
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        try:
+            payload = json.loads(line)
+            response = self.server.handle_payload(payload)
+        except Exception as e:  # a broken hook must never take the server down
+            response = {"error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def request(socket_path: str, payload: Dict[str, Any], timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+    """Send one request to a running daemon; return ``None`` if unreachable."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            data = b""
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+
+def serve(socket_path: str) -> None:
+    """Run the server in the foreground until shut down."""
+    Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+    if os.path.exists(socket_path):
+        if request(socket_path, {"command": "ping"}, timeout=0.5):
+            print(f"hookd already running on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+        # Stale socket from a previous run
+        os.unlink(socket_path)
+
+    # Import every handler before the first call instead of on it
+    for name in HANDLERS:
+        handler(name)
+
+    old_umask = os.umask(0o177)  # socket is private to the user
+    try:
+        server = HookServer(socket_path)
+    finally:
+        os.umask(old_umask)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def start(socket_path: str) -> int:
+    """Start the server in the background and wait until it answers."""
+    if request(socket_path, {"command": "ping"}, timeout=0.5):
+        print(f"✅ hookd already running on {socket_path}")
+        return 0
+
+    log_path = Path(socket_path).with_suffix(".log")
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    hooks_dir = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = hooks_dir + os.pathsep + env.get("PYTHONPATH", "")
+    with open(log_path, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "claude_hooks.daemon", "serve", "--socket", socket_path],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            env=env,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        response = request(socket_path, {"command": "ping"}, timeout=0.5)
+        if response:
+            print(f"✅ hookd started (pid {response['pid']}) on {socket_path}")
+            return 0
+        time.sleep(0.05)
+
+    print(f"❌ hookd did not start, see {log_path}")
+    return 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Claude Code hook daemon")
+    parser.add_argument("command", choices=["serve", "start", "stop", "status"])
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket)
+        return 0
+    if args.command == "start":
+        return start(args.socket)
+    if args.command == "stop":
+        if request(args.socket, {"command": "shutdown"}) is None:
+            print("hookd is not running")
+            return 1
+        print("✅ hookd stopped")
+        return 0
+
+    response = request(args.socket, {"command": "ping"})
+    if response is None:
+        print(f"hookd is not running ({args.socket})")
+        return 1
+    print(f"✅ hookd running (pid {response['pid']}) on {args.socket}")
+    print(f"   Hooks: {', '.join(response['hooks'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
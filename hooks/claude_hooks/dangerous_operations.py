@@ -0,0 +1,77 @@
+"""
+PreToolUse handler: validate dangerous operations before execution.
+
+Bash commands are tokenized and checked against hooks/command-rules.json
+(see command_rules.py); task descriptions and file paths keep the checks of
+hooks/dangerous-operation-validator.sh. The exit-code contract is the same:
+1 blocks the tool call, 0 lets it proceed (with or without warnings).
+"""
+
+import sys
+
+from .command_rules import load_rules
+from .event import HookEvent, HookResult, run_cli
+
+CHECKED_TOOLS = ("Bash", "Task", "Write", "MultiEdit")
+
+
+def check_dangerous_patterns(cmd: str, tool: str, event: HookEvent, result: HookResult) -> None:
+    """Warn about, or block, dangerous commands and task descriptions."""
+    cmd_lower = cmd.lower()
+
+    # Dangerous file operations, evaluated on the parsed command line
+    if tool == "Bash":
+        for rule in load_rules().evaluate(cmd):
+            if rule.action == "block":
+                result.block(rule.message)
+                return
+            result.echo(rule.message)
+
+    # Infrastructure operations
+    if tool == "Task":
+        agent_type = event.subagent_type
+
+        # Check for production deployments
+        if "deployment" in agent_type or agent_type == "terraform-architect":
+            if "production" in cmd_lower or "prod" in cmd_lower:
+                result.echo("🚨 CAUTION: Production deployment detected - ensure proper review")
+
+        # Check for infrastructure destruction
+        if "destroy" in cmd_lower or ("delete" in cmd_lower and "infrastructure" in cmd_lower):
+            result.echo("⚠️ WARNING: Infrastructure destruction operation detected")
+
+
+def validate_agent_selection(agent: str, task: str, result: HookResult) -> None:
+    """Point out obviously mismatched agent selections."""
+    if agent == "rust-debugger" and ".py" in task:
+        result.echo("❓ Notice: Using Rust debugger for Python file - consider python-debugger instead")
+
+    if agent == "go-architect" and "quick fix" in task:
+        result.echo("💡 Tip: For simple fixes, go-engineer might be more appropriate than go-architect")
+
+
+def run(event: HookEvent) -> HookResult:
+    """Run the dangerous operation validator for a single tool call."""
+    result = HookResult()
+    tool = event.tool_name
+
+    # Only process Bash, Task, Write, and MultiEdit tools
+    if not tool or tool not in CHECKED_TOOLS:
+        return result
+
+    if tool == "Bash":
+        check_dangerous_patterns(event.arg(1), "Bash", event, result)
+    elif tool == "Task":
+        check_dangerous_patterns(event.task_description, "Task", event, result)
+        validate_agent_selection(event.subagent_type, event.task_description, result)
+    else:
+        # Check for writing to sensitive files
+        target = event.arg(1)
+        if ".env" in target or "credentials" in target or "secrets" in target:
+            result.echo("🔐 CAUTION: Modifying potentially sensitive file")
+
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(run, "dangerous-operation-validator"))
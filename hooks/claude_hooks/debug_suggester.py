@@ -0,0 +1,68 @@
+"""
+PostToolUse handler: suggest debugging agents when errors are detected.
+
+Error signatures come from hooks/error-signatures.json and are matched in a
+single pass over the tool output (see error_signatures.py).
+auto-debug-suggester.sh matches the same file with jq when the daemon is not
+running.
+"""
+
+import sys
+
+from .error_signatures import ScanResult, load_matcher
+from .event import HookEvent, HookResult, run_cli, utc_timestamp
+from .segment_log import open_log
+
+# Literals the handler itself checks, matched in the same pass as the signatures
+TRIGGER_LITERALS = ("error", "failed")
+
+
+def detect_and_suggest_debugger(scan: ScanResult, result: HookResult) -> None:
+    """Suggest debuggers for every error signature found by ``scan``."""
+    hits = scan.hits()
+    for hit in hits:
+        for line in hit.signature.message:
+            result.echo(line)
+
+    if hits:
+        result.echo("")
+        result.echo("💡 Tip: Debuggers can analyze error patterns, suggest fixes, and validate solutions")
+
+
+def track_error_patterns(event: HookEvent, error_type: str, result: HookResult) -> None:
+    """Log the error type and flag it when it keeps recurring."""
+    error_log = open_log(event.data_dir, "error-patterns.log")
+    error_log.append(f"[{utc_timestamp()}] {error_type}")
+
+    # Check for recurring errors (last 10 entries)
+    recent_count = sum(1 for line in error_log.tail(10) if error_type in line)
+    if recent_count >= 3:
+        result.echo(f"🔄 Recurring error pattern detected: {error_type}")
+        result.echo("   Consider reviewing the architecture or implementation approach")
+
+
+def run(event: HookEvent) -> HookResult:
+    """Run the debug suggester for a single tool call."""
+    result = HookResult()
+
+    if event.tool_name == "Bash":
+        # Check for non-zero exit codes
+        if event.tool_exit_code not in ("0", ""):
+            scan = load_matcher(extra_literals=TRIGGER_LITERALS).scan(event.result.chunks())
+            detect_and_suggest_debugger(scan, result)
+
+            # Track error patterns
+            if "error" in scan:
+                track_error_patterns(event, "bash_execution_error", result)
+    elif event.tool_name == "Task":
+        # Check for task failures
+        scan = load_matcher(extra_literals=TRIGGER_LITERALS).scan(event.result.chunks())
+        if "error" in scan or "failed" in scan:
+            detect_and_suggest_debugger(scan, result)
+            track_error_patterns(event, f"agent_task_error_{event.subagent_type}", result)
+
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(run, "auto-debug-suggester"))
@@ -0,0 +1,204 @@
+"""
+Single-process dispatcher for every hook registered on an event.
+
+Instead of registering nine commands in settings.json, each event gets one
+entry (``hook-dispatch.py PostToolUse``). The event environment is read once,
+each check's tool filter is applied up front, in-process handlers run
+directly and the remaining shell hooks are only spawned when their filter
+matches. Output is merged in the fixed order of ``EVENT_CHECKS``.
+
+Exit codes keep the per-script semantics: the first non-zero exit code is
+returned, and on PreToolUse it stops the remaining checks because the tool
+call is blocked anyway.
+
+Every check run is recorded as a trace span (trace.py), written together
+once the event is handled.
+"""
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import HOOKS_DIR
+from .dangerous_operations import CHECKED_TOOLS
+from .event import HookEvent, HookResult
+from .intake import Handoff
+from .registry import HANDLERS, run_handler
+from .trace import traced, write_spans
+
+EDIT_TOOLS = ("Write", "Edit", "MultiEdit")
+QUICK_LOOKUP_TOOLS = ("Read", "Grep", "Glob", "LS")
+
+SCRIPT_TIMEOUT = float(os.environ.get("CLAUDE_HOOK_SCRIPT_TIMEOUT", "60"))
+
+
+@dataclass(frozen=True)
+class Check:
+    """One hook registered on an event."""
+
+    name: str
+    # Tools the hook acts on; None means every tool
+    tools: Optional[Tuple[str, ...]] = None
+    # Tools the hook is known to ignore
+    skip_tools: Tuple[str, ...] = ()
+
+    def applies_to(self, tool_name: str) -> bool:
+        if tool_name in self.skip_tools:
+            return False
+        return self.tools is None or tool_name in self.tools
+
+
+# Output is merged in this order; generated settings list hooks in it too (hook_settings.py)
+EVENT_CHECKS: Dict[str, List[Check]] = {
+    "PreToolUse": [
+        Check("tool-timer"),
+        Check("agent-selector", tools=("Task",)),
+        Check("dangerous-operation-validator", tools=CHECKED_TOOLS),
+    ],
+    "PostToolUse": [
+        Check("tool-timer"),
+        Check("agent-hierarchy-tracker", tools=("Task",)),
+        Check("auto-debug-suggester", tools=("Bash", "Task")),
+        Check("response-notifier", skip_tools=QUICK_LOOKUP_TOOLS),
+        Check("pushover-notifier", skip_tools=QUICK_LOOKUP_TOOLS),
+        Check("web-resource-validator", tools=EDIT_TOOLS + ("Task",)),
+        Check("typescript-validator", tools=EDIT_TOOLS + ("Task",)),
+        Check("test-runner-validator", tools=EDIT_TOOLS + ("Task",)),
+    ],
+    "SessionStart": [
+        Check("session-agent-context"),
+    ],
+    "SubagentStop": [
+        Check("agent-context-bridge"),
+    ],
+}
+
+
+def _names(value: Optional[str]) -> List[str]:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def selected_checks(
+    event_name: str,
+    env: Dict[str, str],
+    enable: Iterable[str] = (),
+    disable: Iterable[str] = (),
+) -> List[Check]:
+    """Checks for ``event_name`` after applying enable/disable lists.
+
+    ``CLAUDE_HOOKS_ENABLE`` (allow-list) and ``CLAUDE_HOOKS_DISABLE``
+    (deny-list) are comma-separated hook names; explicit arguments are
+    added to them.
+    """
+    enabled = set(_names(env.get("CLAUDE_HOOKS_ENABLE"))) | set(enable)
+    disabled = set(_names(env.get("CLAUDE_HOOKS_DISABLE"))) | set(disable)
+    return [
+        check
+        for check in EVENT_CHECKS.get(event_name, [])
+        if (not enabled or check.name in enabled) and check.name not in disabled
+    ]
+
+
+def run_script(name: str, event: HookEvent, env: Optional[Dict[str, str]] = None) -> HookResult:
+    """Run hooks/<name>.sh for hooks without an in-process handler.
+
+    ``env`` overrides the event environment, e.g. with a spooled tool result.
+    """
+    script = HOOKS_DIR / f"{name}.sh"
+    result = HookResult()
+    if not script.is_file():
+        return result
+
+    try:
+        completed = subprocess.run(
+            [str(script)] + event.args,
+            env=env or event.env or None,
+            cwd=event.cwd or None,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            timeout=SCRIPT_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        print(f"⚠️ {name}.sh timed out after {SCRIPT_TIMEOUT:g}s", file=sys.stderr)
+        return result
+    except OSError as e:
+        print(f"⚠️ {name}.sh could not run: {e}", file=sys.stderr)
+        return result
+
+    result.lines.extend(completed.stdout.decode("utf-8", errors="replace").splitlines())
+    result.exit_code = completed.returncode
+    return result
+
+
+def run_check(check: Check, event: HookEvent, handoff: Optional[Handoff] = None) -> HookResult:
+    if check.name in HANDLERS:
+        return run_handler(check.name, event)
+    return run_script(check.name, event, handoff.env() if handoff else None)
+
+
+def dispatch(
+    event_name: str,
+    event: HookEvent,
+    enable: Iterable[str] = (),
+    disable: Iterable[str] = (),
+) -> HookResult:
+    """Run every enabled check for ``event_name`` and merge the results.
+
+    A large tool result is spooled to a file once, the first time a shell
+    hook needs it, and every shell hook gets the file plus a windowed copy.
+    """
+    merged = HookResult()
+    spans = []
+    # Hooks registered on several events (tool-timer) tell them apart by this
+    event.env.setdefault("CLAUDE_HOOK_EVENT", event_name)
+    # Spans are recorded here, so scripts and their handlers do not add their own
+    event.env["CLAUDE_HOOK_TRACED"] = "1"
+    with Handoff(event.env) as handoff:
+        for check in selected_checks(event_name, event.env, enable, disable):
+            if not check.applies_to(event.tool_name):
+                continue
+
+            result = traced(check.name, event, lambda: run_check(check, event, handoff), spans)
+            merged.lines.extend(result.lines)
+
+            if result.exit_code and not merged.exit_code:
+                merged.exit_code = result.exit_code
+                if event_name == "PreToolUse":
+                    break
+
+    write_spans(event.data_dir, spans)
+    return merged
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    enable: List[str] = []
+    disable: List[str] = []
+
+    # Options come before the event name; everything after it is passed to
+    # the hooks as their positional arguments.
+    while argv and argv[0].startswith("--"):
+        option = argv.pop(0)
+        if option in ("--enable", "--disable") and argv:
+            (enable if option == "--enable" else disable).extend(_names(argv.pop(0)))
+        else:
+            print(f"Unknown option: {option}", file=sys.stderr)
+            return 0
+
+    if not argv or argv[0] not in EVENT_CHECKS:
+        print(f"Usage: hook-dispatch.py [--enable a,b] [--disable c] <{'|'.join(EVENT_CHECKS)}> [args...]",
+              file=sys.stderr)
+        # A misconfigured entry must never block the tool call
+        return 0
+
+    event_name = argv.pop(0)
+    result = dispatch(event_name, HookEvent.from_process(argv), enable, disable)
+    sys.stdout.write(result.output)
+    sys.stdout.flush()
+    return result.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Single-pass matcher for error signatures in tool output.
+
+Signatures live in hooks/error-signatures.json. Each signature has a list of
+``match`` rules; a rule is a list of literals that must all occur somewhere
+in the output, and the signature hits when any of its rules is satisfied.
+Adding a language is a data change, not another branch of substring checks.
+
+Every literal from every signature is compiled into one alternation. The
+output is read in fixed-size chunks and searched once from left to right;
+each literal is recorded at its first occurrence and then dropped from the
+pattern, so frequent words like ``error`` cost one match rather than one per
+occurrence and the scan stops as soon as every literal has been seen. Only
+the current chunk plus a tail the length of the longest literal is held in
+memory, so matches spanning chunk boundaries are still found.
+
+Usage:
+    python3 -m claude_hooks.error_signatures [FILE]   (reads stdin without FILE)
+"""
+
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import HOOKS_DIR
+
+SIGNATURES_FILE = HOOKS_DIR / "error-signatures.json"
+SIGNATURES_VERSION = 1
+CHUNK_SIZE = 64 * 1024
+
+Source = Union[str, Iterable[str]]
+
+
+@dataclass(frozen=True)
+class Signature:
+    id: str
+    rules: Tuple[Tuple[str, ...], ...]
+    message: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Location:
+    """Where a literal first occurs: character offset and 1-based line."""
+
+    offset: int
+    line: int
+
+
+@dataclass(frozen=True)
+class Hit:
+    signature: Signature
+    location: Location
+    rule: Tuple[str, ...]
+
+
+def parse_signatures(data: dict) -> List[Signature]:
+    """Validate the decoded signatures file; raises ``ValueError`` on bad input."""
+    if not isinstance(data, dict) or data.get("version") != SIGNATURES_VERSION:
+        raise ValueError(f"expected a signatures object with version {SIGNATURES_VERSION}")
+
+    signatures = []
+    for entry in data.get("signatures", []):
+        rules = entry.get("match")
+        if not entry.get("id") or not rules:
+            raise ValueError(f"signature needs an id and match rules: {entry!r}")
+        if not all(rule and all(isinstance(lit, str) and lit for lit in rule) for rule in rules):
+            raise ValueError(f"signature {entry['id']}: every rule must be a non-empty list of strings")
+        signatures.append(
+            Signature(
+                id=entry["id"],
+                rules=tuple(tuple(rule) for rule in rules),
+                message=tuple(entry.get("message", [])),
+            )
+        )
+    return signatures
+
+
+# Parsed signature files keyed by path, invalidated on mtime change
+_CACHE: Dict[str, Tuple[int, "SignatureMatcher"]] = {}
+
+
+def load_matcher(path: Optional[Path] = None, extra_literals: Iterable[str] = ()) -> "SignatureMatcher":
+    """Compile the signatures file, reusing the compiled matcher while it is unchanged."""
+    path = Path(path or SIGNATURES_FILE)
+    extra = tuple(sorted(set(extra_literals)))
+    key = f"{path}\0{'|'.join(extra)}"
+    mtime_ns = path.stat().st_mtime_ns
+
+    cached = _CACHE.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        matcher = SignatureMatcher(parse_signatures(json.load(f)), extra)
+    _CACHE[key] = (mtime_ns, matcher)
+    return matcher
+
+
+def iter_chunks(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield ``source`` (a string, text stream or iterable of strings) in chunks."""
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from source
+
+
+class ScanResult:
+    """First location of every literal seen during a scan."""
+
+    def __init__(self, signatures: List[Signature], found: Dict[str, Location]):
+        self.signatures = signatures
+        self.found = found
+
+    def __contains__(self, literal: str) -> bool:
+        return literal in self.found
+
+    def hits(self) -> List[Hit]:
+        """Matching signatures in declaration order, each with its earliest satisfied rule."""
+        hits = []
+        for signature in self.signatures:
+            best = None
+            for rule in signature.rules:
+                if all(lit in self.found for lit in rule):
+                    # A rule is satisfied where its last literal first appears
+                    location = max((self.found[lit] for lit in rule), key=lambda loc: loc.offset)
+                    if best is None or location.offset < best[0].offset:
+                        best = (location, rule)
+            if best:
+                hits.append(Hit(signature, best[0], best[1]))
+        return hits
+
+
+class SignatureMatcher:
+    """All signature literals compiled into one pattern."""
+
+    def __init__(self, signatures: List[Signature], extra_literals: Iterable[str] = ()):
+        self.signatures = signatures
+        literals = {lit for signature in signatures for rule in signature.rules for lit in rule}
+        literals.update(extra_literals)
+        self.literals = frozenset(literals)
+        self.overlap = max((len(lit) for lit in literals), default=1) - 1
+
+    @staticmethod
+    def _compile(literals: Iterable[str]) -> "re.Pattern[str]":
+        # Longest first so that a literal is not shadowed by its own prefix
+        ordered = sorted(literals, key=lambda lit: (-len(lit), lit))
+        return re.compile("|".join(re.escape(lit) for lit in ordered))
+
+    def scan(self, source: Source, chunk_size: int = CHUNK_SIZE) -> ScanResult:
+        """Scan ``source`` once and record the first location of each literal."""
+        found: Dict[str, Location] = {}
+        pending = set(self.literals)
+        pattern = self._compile(pending) if pending else None
+
+        carry = ""
+        carry_offset = 0
+        carry_line = 1
+
+        for chunk in iter_chunks(source, chunk_size):
+            if not pending:
+                break
+            window = carry + chunk
+            position = 0
+            while pending:
+                match = pattern.search(window, position)
+                if match is None:
+                    break
+                start = match.start()
+                found[match.group()] = Location(
+                    offset=carry_offset + start,
+                    line=carry_line + window.count("\n", 0, start),
+                )
+                pending.discard(match.group())
+                if pending:
+                    pattern = self._compile(pending)
+                # Other literals may start at the same position
+                position = start
+
+            # Keep enough of the tail to match a literal split across chunks
+            cut = max(len(window) - self.overlap, 0)
+            carry_line += window.count("\n", 0, cut)
+            carry_offset += cut
+            carry = window[cut:]
+
+        return ScanResult(self.signatures, found)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    matcher = load_matcher()
+
+    if argv:
+        with open(argv[0], "r", encoding="utf-8", errors="replace") as f:
+            hits = matcher.scan(f).hits()
+    else:
+        hits = matcher.scan(sys.stdin).hits()
+
+    for hit in hits:
+        print(f"{hit.signature.id}\tline {hit.location.line}\t{' + '.join(hit.rule)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Hook event and result types shared by all in-process hook handlers.
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .intake import ToolResult
+
+
+@dataclass
+class HookEvent:
+    """Everything a hook script would read from its environment and argv."""
+
+    env: Dict[str, str] = field(default_factory=dict)
+    args: List[str] = field(default_factory=list)
+    cwd: str = ""
+
+    @classmethod
+    def from_process(cls, args: Optional[List[str]] = None) -> "HookEvent":
+        """Build an event from the current process environment.
+
+        With ``CLAUDE_HOOK_INPUT=stdin`` the hook input JSON on stdin fills
+        in the tool name and result.
+        """
+        env = dict(os.environ)
+        if env.get("CLAUDE_HOOK_INPUT") == "stdin":
+            from .intake import apply_hook_input, read_hook_input
+
+            payload = read_hook_input(sys.stdin)
+            if payload:
+                apply_hook_input(env, payload)
+        return cls(env=env, args=list(args or []), cwd=os.getcwd())
+
+    @property
+    def tool_name(self) -> str:
+        return self.env.get("CLAUDE_TOOL_NAME", "")
+
+    @property
+    def tool_result(self) -> str:
+        return self.env.get("CLAUDE_TOOL_RESULT", "")
+
+    @cached_property
+    def result(self) -> "ToolResult":
+        """The tool result, read once and viewed through a window (see intake.py)."""
+        from .intake import ToolResult
+
+        return ToolResult.from_env(self.env)
+
+    @property
+    def tool_exit_code(self) -> str:
+        return self.env.get("CLAUDE_TOOL_EXIT_CODE", "")
+
+    @property
+    def subagent_type(self) -> str:
+        return self.env.get("CLAUDE_SUBAGENT_TYPE", "")
+
+    @property
+    def task_description(self) -> str:
+        return self.env.get("CLAUDE_TASK_DESCRIPTION", "")
+
+    def arg(self, index: int) -> str:
+        """Return positional argument ``$index`` (1-based, like bash)."""
+        if 0 < index <= len(self.args):
+            return self.args[index - 1]
+        return ""
+
+    @property
+    def data_dir(self) -> Path:
+        """Per-user data directory (``$HOME/.claude-code``)."""
+        home = self.env.get("HOME") or os.path.expanduser("~")
+        return Path(home) / ".claude-code"
+
+
+@dataclass
+class HookResult:
+    """Output lines and exit code produced by a hook handler."""
+
+    exit_code: int = 0
+    lines: List[str] = field(default_factory=list)
+
+    def echo(self, line: str = "") -> None:
+        self.lines.append(line)
+
+    def block(self, line: str) -> "HookResult":
+        """Record a blocking message; exit code 1 stops the tool call."""
+        self.lines.append(line)
+        self.exit_code = 1
+        return self
+
+    @property
+    def output(self) -> str:
+        return "".join(line + "\n" for line in self.lines)
+
+
+def utc_timestamp() -> str:
+    """Timestamp in the format hooks write with ``date -u +%Y-%m-%dT%H:%M:%SZ``."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def run_cli(handler: Callable[[HookEvent], HookResult], hook: str = "") -> int:
+    """Run ``handler`` for the current process, as the shell hooks do.
+
+    With a ``hook`` name the run is recorded as a trace span (see trace.py),
+    unless the dispatcher that started this process already traces it.
+    """
+    event = HookEvent.from_process(sys.argv[1:])
+    if hook and not event.env.get("CLAUDE_HOOK_TRACED"):
+        from .trace import traced
+
+        result = traced(hook, event, lambda: handler(event))
+    else:
+        result = handler(event)
+    sys.stdout.write(result.output)
+    sys.stdout.flush()
+    return result.exit_code
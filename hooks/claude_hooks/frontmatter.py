@@ -0,0 +1,46 @@
+"""
+Minimal reader for agent frontmatter.
+
+Agent files start with a ``---`` delimited block of flat ``key: value``
+lines. Hooks run on user machines without PyYAML, so this handles exactly
+that subset (plain or quoted scalar values) and nothing more; the CI
+validators keep using a real YAML parser.
+"""
+
+from typing import Dict, Tuple
+
+
+def parse_frontmatter(text: str) -> Tuple[Dict[str, str], int]:
+    """Return the frontmatter fields and the offset where the body starts.
+
+    Files without frontmatter yield ``({}, 0)``.
+    """
+    if not text.startswith("---"):
+        return {}, 0
+
+    fields: Dict[str, str] = {}
+    first_newline = text.find("\n")
+    if first_newline < 0:
+        return {}, 0
+
+    position = first_newline + 1
+    while position < len(text):
+        end = text.find("\n", position)
+        if end < 0:
+            end = len(text)
+        line = text[position:end].rstrip("\r")
+        position = end + 1
+
+        if line.strip() == "---":
+            return fields, position
+
+        key, sep, value = line.partition(":")
+        if not sep or not key.strip() or key.startswith((" ", "\t", "#")):
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        fields[key.strip()] = value
+
+    # Unterminated frontmatter
+    return {}, 0
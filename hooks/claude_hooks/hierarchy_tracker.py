@@ -0,0 +1,62 @@
+"""
+PostToolUse handler: track agent delegation patterns and hierarchy usage.
+
+Mirrors hooks/agent-hierarchy-tracker.sh.
+"""
+
+import sys
+from typing import List, Tuple
+
+from .agent_stats import AgentStats
+from .event import HookEvent, HookResult, run_cli, utc_timestamp
+from .intake import ToolResult
+from .segment_log import open_log
+
+
+def log_agent_usage(event: HookEvent, agent_type: str) -> int:
+    """Append a usage line, record the invocation and return its number."""
+    timestamp = utc_timestamp()
+    open_log(event.data_dir, "agent-usage.log").append(
+        f"[{timestamp}] Agent: {agent_type}, Task: {event.task_description}")
+    return AgentStats(event.data_dir).record(agent_type, event.task_description, timestamp)
+
+
+def detect_delegation(tool_result: ToolResult, result: HookResult) -> None:
+    """Report delegation patterns found in the head and tail of the agent's output."""
+    if "delegating to" in tool_result.lower or "invoking" in tool_result.lower:
+        result.echo("🔄 Delegation detected in agent workflow")
+
+        # Extract delegation chain if possible
+        if "architect" in tool_result and "engineer" in tool_result:
+            result.echo("   Hierarchy: architect → engineer → test-engineer")
+
+
+def top_agents(event: HookEvent, limit: int) -> List[Tuple[str, int]]:
+    """Return ``(agent, count)`` pairs, most used first."""
+    return AgentStats(event.data_dir).top(limit)
+
+
+def run(event: HookEvent) -> HookResult:
+    """Run the hierarchy tracker for a single tool call."""
+    result = HookResult()
+    event.data_dir.mkdir(parents=True, exist_ok=True)
+
+    if event.tool_name != "Task" or not event.subagent_type:
+        return result
+
+    count = log_agent_usage(event, event.subagent_type)
+
+    # Analyze delegation patterns
+    detect_delegation(event.result, result)
+
+    # Show most used agents periodically (every 10 invocations)
+    if count > 0 and count % 10 == 0:
+        result.echo("📊 Top agents by usage:")
+        for agent, uses in top_agents(event, 5):
+            result.echo(f"   {agent}: {uses} invocations")
+
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(run, "agent-hierarchy-tracker"))
@@ -0,0 +1,188 @@
+"""
+Hook declarations and the settings.json generated from them.
+
+Every hook script declares in its header (the first 20 lines) the events it
+is registered on and the tools it acts on:
+
+    # Events: PostToolUse
+    # Tools: Write, Edit, MultiEdit, Task
+
+``# Tools: *`` (or no Tools line) means every tool, and
+``# Tools: * except Read, Grep`` every tool but those. Events without a tool
+(SessionStart, SubagentStop) take no Tools line.
+
+The generated settings register each hook only for the tools it handles, so
+Claude Code never launches a validator for a Read or Grep call just to have
+it exit. Hooks sharing a matcher share one entry, in the order of the
+dispatcher's EVENT_CHECKS. A hook that skips a few tools is still matched
+with ``*``, since a matcher cannot exclude tools. validate_hooks.py checks
+that the declarations match the filtering each script does.
+
+Usage:
+    python3 -m claude_hooks.hook_settings generate [--command TEMPLATE] [--daemon]
+                                                   [--only a,b] [--skip c,d]
+    python3 -m claude_hooks.hook_settings list
+"""
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import HOOKS_DIR
+
+HEADER_LINES = 20
+# Settings order of the events
+EVENTS = ("PreToolUse", "PostToolUse", "SessionStart", "SubagentStop", "UserPromptSubmit",
+          "Notification", "Stop", "PreCompact")
+TOOL_EVENTS = ("PreToolUse", "PostToolUse")
+DEFAULT_COMMAND = "~/.claude/hooks/{name}.sh"
+
+DECLARATION = re.compile(r"^#\s*(Events|Tools):\s*(.*?)\s*$")
+
+
+@dataclass(frozen=True)
+class Declaration:
+    """Events and tools one hook script declares in its header."""
+
+    name: str
+    events: Tuple[str, ...]
+    # Tools the hook acts on; None means every tool
+    tools: Optional[Tuple[str, ...]] = None
+    # Tools the hook ignores although it is matched with *
+    skip_tools: Tuple[str, ...] = ()
+
+    def handles(self, tool_name: str) -> bool:
+        if tool_name in self.skip_tools:
+            return False
+        return self.tools is None or tool_name in self.tools
+
+    def matcher(self, event: str) -> str:
+        """The settings.json matcher for ``event``."""
+        if event not in TOOL_EVENTS or self.tools is None:
+            return "*"
+        return "|".join(self.tools)
+
+
+def _names(value: str) -> Tuple[str, ...]:
+    return tuple(name.strip() for name in value.split(",") if name.strip())
+
+
+def parse_tools(value: str) -> Tuple[Optional[Tuple[str, ...]], Tuple[str, ...]]:
+    """``(tools, skip_tools)`` from the value of a ``# Tools:`` line."""
+    value = value.strip()
+    if value == "*":
+        return None, ()
+    if value.startswith("*"):
+        rest = value[1:].strip()
+        if not rest.startswith("except "):
+            raise ValueError(f"expected '* except TOOL, ...', got {value!r}")
+        return None, _names(rest[len("except "):])
+    return _names(value), ()
+
+
+def read_declaration(path: Path) -> Optional[Declaration]:
+    """The declaration in the header of ``path``; None if it declares no events.
+
+    Raises ValueError for a malformed Tools line.
+    """
+    found: Dict[str, str] = {}
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for _, line in zip(range(HEADER_LINES), f):
+            match = DECLARATION.match(line)
+            if match and match.group(1) not in found:
+                found[match.group(1)] = match.group(2)
+    if "Events" not in found:
+        return None
+    try:
+        tools, skip_tools = parse_tools(found.get("Tools", "*"))
+    except ValueError as e:
+        raise ValueError(f"{Path(path).name}: {e}") from None
+    return Declaration(Path(path).name[:-3], _names(found["Events"]), tools, skip_tools)
+
+
+def declarations(hooks_dir: Path = HOOKS_DIR) -> Dict[str, Declaration]:
+    """Declarations of every hook script in ``hooks_dir``, by hook name."""
+    found = {}
+    for path in sorted(Path(hooks_dir).glob("*.sh")):
+        declaration = read_declaration(path)
+        if declaration is not None:
+            found[declaration.name] = declaration
+    return found
+
+
+def _order(event: str, names: Iterable[str]) -> List[str]:
+    from .dispatcher import EVENT_CHECKS
+
+    rank = {check.name: index for index, check in enumerate(EVENT_CHECKS.get(event, []))}
+    return sorted(names, key=lambda name: (rank.get(name, len(rank)), name))
+
+
+def build_settings(declared: Dict[str, Declaration], command: str = DEFAULT_COMMAND,
+                   client: Iterable[str] = ()) -> Dict:
+    """The ``hooks`` settings for ``declared``, one entry per event and matcher.
+
+    ``command`` is formatted with the hook name; hooks in ``client`` are
+    registered through hook-client.py next to it instead.
+    """
+    client = set(client)
+    client_command = str(Path(command).parent / "hook-client.py") + " {name}"
+    events: Dict[str, List[Dict]] = {}
+    for event in EVENTS:
+        names = [name for name, declaration in declared.items() if event in declaration.events]
+        entries: Dict[str, Dict] = {}
+        for name in _order(event, names):
+            matcher = declared[name].matcher(event)
+            template = client_command if name in client else command
+            entry = entries.setdefault(matcher, {"matcher": matcher, "hooks": []})
+            entry["hooks"].append({"type": "command", "command": template.format(name=name)})
+        if entries:
+            events[event] = list(entries.values())
+    return {"hooks": events}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Hook declarations and generated settings")
+    parser.add_argument("command", choices=["generate", "list"])
+    parser.add_argument("--hooks-dir", type=Path, default=HOOKS_DIR, help="directory of the hook scripts")
+    parser.add_argument("--command", dest="template", default=DEFAULT_COMMAND,
+                        help="command per hook, {name} is the hook name (default: %(default)s)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="register hooks the daemon serves through hook-client.py")
+    parser.add_argument("--only", default="", help="comma-separated hooks to include")
+    parser.add_argument("--skip", default="", help="comma-separated hooks to leave out")
+    args = parser.parse_args(argv)
+
+    try:
+        declared = declarations(args.hooks_dir)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    only, skip = set(_names(args.only)), set(_names(args.skip))
+    declared = {
+        name: declaration for name, declaration in declared.items()
+        if (not only or name in only) and name not in skip
+    }
+
+    if args.command == "list":
+        for declaration in declared.values():
+            tools = "*" if declaration.tools is None else ", ".join(declaration.tools)
+            if declaration.skip_tools:
+                tools += f" except {', '.join(declaration.skip_tools)}"
+            print(f"{declaration.name:<32} {', '.join(declaration.events):<24} {tools}")
+        return 0
+
+    client: Iterable[str] = ()
+    if args.daemon:
+        from .registry import HANDLERS
+
+        client = HANDLERS
+    print(json.dumps(build_settings(declared, args.template, client), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Read-once intake of the tool result for PostToolUse hooks.
+
+The result is taken from the first of:
+
+- ``CLAUDE_TOOL_RESULT_FILE``: a spooled file, memory-mapped rather than read
+- the hook input JSON on stdin (``tool_response``), when ``CLAUDE_HOOK_INPUT``
+  is ``stdin``
+- ``CLAUDE_TOOL_RESULT`` in the environment
+
+ToolResult exposes it as a head/tail window (``CLAUDE_TOOL_RESULT_WINDOW``
+bytes from each end) for the keyword checks most hooks make, and as a chunked
+stream for scans that need all of it. Layers that hand the result on to other
+processes (the dispatcher's shell hooks, hook-client.py) spool anything over
+``SPOOL_THRESHOLD`` to a file once and pass its path with a windowed
+``CLAUDE_TOOL_RESULT``, so a huge build log is neither copied for every hook
+nor pushed against the environment size limit.
+"""
+
+import codecs
+import json
+import mmap
+import os
+import tempfile
+from functools import cached_property
+from typing import Any, Dict, Iterator, Mapping, Optional, TextIO, Union
+
+DEFAULT_WINDOW = 16 * 1024
+SPOOL_THRESHOLD = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+
+RESULT_VAR = "CLAUDE_TOOL_RESULT"
+RESULT_FILE_VAR = "CLAUDE_TOOL_RESULT_FILE"
+WINDOW_VAR = "CLAUDE_TOOL_RESULT_WINDOW"
+
+# Hook input fields copied to the environment (for the timing ledger)
+PAYLOAD_IDS = {
+    "hook_event_name": "CLAUDE_HOOK_EVENT",
+    "session_id": "CLAUDE_SESSION_ID",
+    "tool_use_id": "CLAUDE_TOOL_USE_ID",
+}
+
+ELISION = "\n[... {omitted} bytes omitted ...]\n"
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+def window_size(env: Mapping[str, str]) -> int:
+    """Bytes kept from each end of the result (``CLAUDE_TOOL_RESULT_WINDOW``)."""
+    try:
+        return max(0, int(env.get(WINDOW_VAR, DEFAULT_WINDOW)))
+    except ValueError:
+        return DEFAULT_WINDOW
+
+
+class ToolResult:
+    """A tool result held once, viewed through a head/tail window."""
+
+    def __init__(self, buffer: Buffer, window: int = DEFAULT_WINDOW):
+        self.buffer = buffer
+        self.window = window
+
+    @classmethod
+    def from_text(cls, text: str, window: int = DEFAULT_WINDOW) -> "ToolResult":
+        return cls(text.encode("utf-8", errors="surrogateescape"), window)
+
+    @classmethod
+    def from_file(cls, path: str, window: int = DEFAULT_WINDOW) -> "ToolResult":
+        """Map a spooled result file; a missing file reads as empty."""
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return cls(b"", window)
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), window)
+        except (OSError, ValueError):
+            return cls(b"", window)
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> "ToolResult":
+        """The result described by a hook environment."""
+        window = window_size(env)
+        path = env.get(RESULT_FILE_VAR)
+        if path:
+            return cls.from_file(path, window)
+        return cls.from_text(env.get(RESULT_VAR, ""), window)
+
+    @property
+    def size(self) -> int:
+        return len(self.buffer)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the window leaves out part of the result."""
+        return self.size > 2 * self.window
+
+    @staticmethod
+    def _decode(data: bytes) -> str:
+        return data.decode("utf-8", errors="replace")
+
+    @cached_property
+    def text_window(self) -> str:
+        """The whole result, or its head and tail around an elision marker."""
+        if not self.truncated:
+            return self._decode(self.buffer[:])
+        head = self._decode(self.buffer[:self.window])
+        tail = self._decode(self.buffer[self.size - self.window:])
+        return head + ELISION.format(omitted=self.size - 2 * self.window) + tail
+
+    @cached_property
+    def lower(self) -> str:
+        """Lower-cased window, for case-insensitive keyword checks."""
+        return self.text_window.lower()
+
+    def __contains__(self, literal: str) -> bool:
+        return literal in self.text_window
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        """The full result as decoded chunks, for scans that must see all of it."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for start in range(0, self.size, chunk_size):
+            text = decoder.decode(self.buffer[start:start + chunk_size])
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def text(self) -> str:
+        """The full result as one string."""
+        return self._decode(self.buffer[:])
+
+
+def read_hook_input(stream: TextIO) -> Optional[Dict[str, Any]]:
+    """Parse the hook input JSON Claude Code writes to stdin."""
+    try:
+        payload = json.load(stream)
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def response_text(response: Any) -> str:
+    """Flatten ``tool_response`` to the text hooks scan."""
+    if isinstance(response, str):
+        return response
+    if isinstance(response, dict) and ("stdout" in response or "stderr" in response):
+        return "\n".join(str(response.get(key) or "") for key in ("stdout", "stderr")).strip("\n")
+    return json.dumps(response)
+
+
+def apply_hook_input(env: Dict[str, str], payload: Mapping[str, Any]) -> None:
+    """Fill the CLAUDE_* variables from a stdin hook payload."""
+    if payload.get("tool_name") and not env.get("CLAUDE_TOOL_NAME"):
+        env["CLAUDE_TOOL_NAME"] = str(payload["tool_name"])
+    if "tool_response" in payload and not env.get(RESULT_FILE_VAR):
+        env[RESULT_VAR] = response_text(payload["tool_response"])
+    for key, var in PAYLOAD_IDS.items():
+        if payload.get(key) and not env.get(var):
+            env[var] = str(payload[key])
+
+
+def spool(text: str, directory: Optional[str] = None) -> str:
+    """Write ``text`` to a private temp file and return its path."""
+    fd, path = tempfile.mkstemp(prefix="claude-tool-result-", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8", errors="surrogateescape") as f:
+        f.write(text)
+    return path
+
+
+class Handoff:
+    """Environment for processes the result is handed to, spooled at most once."""
+
+    def __init__(self, env: Mapping[str, str], threshold: int = SPOOL_THRESHOLD):
+        self.source = env
+        self.threshold = threshold
+        self.path: Optional[str] = None
+        self._env: Optional[Dict[str, str]] = None
+
+    def env(self) -> Dict[str, str]:
+        if self._env is None:
+            env = dict(self.source)
+            text = env.get(RESULT_VAR, "")
+            if not env.get(RESULT_FILE_VAR) and len(text) > self.threshold:
+                self.path = spool(text)
+                env[RESULT_FILE_VAR] = self.path
+                env[RESULT_VAR] = ToolResult.from_text(text, window_size(env)).text_window
+            self._env = env
+        return self._env
+
+    def close(self) -> None:
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def __enter__(self) -> "Handoff":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
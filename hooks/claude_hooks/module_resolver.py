@@ -0,0 +1,281 @@
+"""
+Cached module resolution for web-resource-validator.
+
+validate_imports in web-resource-validator.sh extracts each import with sed
+and probes every extension and index variant with ``-f``, for every import
+of every edit. This resolver reads a file once and takes all of its
+``import ... from`` statements in one pass, including statements that span
+several lines. It resolves them the way TypeScript does for relative,
+root-absolute (``/``) and tsconfig ``paths``/``baseUrl`` specifiers: the
+exact file, then each extension appended (``./a.js`` may also be
+``a.ts``), then ``index`` files.
+
+A probe is a set lookup in a cached directory listing. Listings live in
+``~/.claude-code/module-cache/`` per repository root and are reused across
+files and edits until the directory's mtime changes, so missing modules are
+cached as well as found ones. tsconfig.json (and the files it ``extends``)
+is read once per call, however many files are checked.
+
+Usage:
+    python3 -m claude_hooks.module_resolver check FILE [FILE ...]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .storage import read_json, write_json_atomic
+from .test_index import RACY_SECONDS, find_repo_root, repo_key, shell_dirname
+
+CACHE_VERSION = 1
+CACHE_DIR = "module-cache"
+MAX_DIRECTORIES = 4096
+
+SOURCE_FILE = re.compile(r"\.(js|jsx|ts|tsx)$")
+# `import ... from '...'` at the start of a line, possibly over several lines
+IMPORT_STATEMENT = re.compile(r"^import\s[^;]*?\bfrom\s*['\"]([^'\"\n]+)['\"]", re.MULTILINE)
+HAS_EXTENSION = re.compile(r"\.[^/]+$")
+
+EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+INDEX_FILES = tuple(f"/index{ext}" for ext in EXTENSIONS)
+# An import written with a .js extension may name a TypeScript source
+SOURCE_FOR_OUTPUT = {".js": (".ts", ".tsx"), ".jsx": (".tsx",)}
+
+# Strings are kept; comments and trailing commas are dropped
+JSONC_NOISE = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/|,(?=\s*[}\]])', re.DOTALL)
+
+TSCONFIG = "tsconfig.json"
+
+
+def parse_jsonc(text: str) -> Optional[Dict]:
+    """Parse tsconfig-style JSON with comments and trailing commas."""
+    try:
+        data = json.loads(JSONC_NOISE.sub(lambda m: m.group(1) or "", text))
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class PathMapping:
+    """``compilerOptions.baseUrl`` and ``paths`` of the project's tsconfig."""
+
+    def __init__(self, base_url: Optional[str] = None, paths: Optional[Dict[str, List[str]]] = None,
+                 paths_base: str = ""):
+        self.base_url = base_url
+        self.paths = paths or {}
+        self.paths_base = paths_base
+
+    @classmethod
+    def load(cls, project: str) -> "PathMapping":
+        """Read tsconfig.json in ``project``, following relative ``extends``."""
+        options: Dict = {}
+        origin: Dict[str, str] = {}
+        config_path = os.path.join(project, TSCONFIG)
+        seen = set()
+        chain = []
+        while config_path and config_path not in seen and len(chain) < 8:
+            seen.add(config_path)
+            try:
+                with open(config_path, "r", encoding="utf-8") as f:
+                    config = parse_jsonc(f.read())
+            except OSError:
+                break
+            if config is None:
+                break
+            chain.append((config_path, config))
+            parent = config.get("extends")
+            config_path = None
+            if isinstance(parent, str) and parent.startswith("."):
+                config_path = os.path.normpath(os.path.join(os.path.dirname(chain[-1][0]), parent))
+                if not config_path.endswith(".json"):
+                    config_path += ".json"
+        # Apply the base configuration first so that extending files override it
+        for path, config in reversed(chain):
+            compiler = config.get("compilerOptions")
+            if isinstance(compiler, dict):
+                for key in ("baseUrl", "paths"):
+                    if key in compiler:
+                        options[key] = compiler[key]
+                        origin[key] = os.path.dirname(path)
+
+        base_url = None
+        if isinstance(options.get("baseUrl"), str):
+            base_url = os.path.normpath(os.path.join(origin["baseUrl"], options["baseUrl"]))
+        paths = options.get("paths") if isinstance(options.get("paths"), dict) else {}
+        # Without baseUrl, paths are relative to the tsconfig that declares them
+        paths_base = base_url or origin.get("paths", project)
+        return cls(base_url, {key: value for key, value in paths.items() if isinstance(value, list)}, paths_base)
+
+    def candidates(self, spec: str) -> Optional[List[str]]:
+        """Base paths ``spec`` maps to, or None if no ``paths`` pattern matches."""
+        best: Optional[Tuple[int, List[str]]] = None
+        for pattern, targets in self.paths.items():
+            prefix, star, suffix = pattern.partition("*")
+            if not star:
+                if spec == pattern:
+                    matched = [os.path.join(self.paths_base, target) for target in targets]
+                    return [os.path.normpath(path) for path in matched]
+                continue
+            if spec.startswith(prefix) and spec.endswith(suffix) and len(spec) >= len(prefix) + len(suffix):
+                # The longest matching prefix wins, as in TypeScript
+                if best is None or len(prefix) > best[0]:
+                    wildcard = spec[len(prefix):len(spec) - len(suffix)]
+                    best = (len(prefix), [
+                        os.path.normpath(os.path.join(self.paths_base, target.replace("*", wildcard, 1)))
+                        for target in targets if isinstance(target, str)
+                    ])
+        return best[1] if best else None
+
+
+class ModuleResolver:
+    """Resolves imports against cached directory listings of one repository."""
+
+    def __init__(self, project: str, path: Path, clock=time.time):
+        self.project = os.path.abspath(project or ".")
+        self.path = Path(path)
+        self.clock = clock
+        self.dirty = False
+        state = read_json(self.path, {})
+        if not isinstance(state, dict) or state.get("version") != CACHE_VERSION:
+            state = {}
+        self.directories: Dict[str, Dict] = state.get("directories", {})
+        self._listings: Dict[str, FrozenSet[str]] = {}
+        self._resolved: Dict[Tuple[str, str], Optional[Tuple[bool, str, bool]]] = {}
+        self._mapping: Optional[PathMapping] = None
+
+    @classmethod
+    def for_project(cls, data_dir: Path, project: str) -> "ModuleResolver":
+        root = find_repo_root(project)
+        return cls(project, Path(data_dir) / CACHE_DIR / f"{repo_key(root)}.json")
+
+    def listing(self, directory: str) -> FrozenSet[str]:
+        """Names of the files in ``directory``, rescanned only if its mtime changed."""
+        cached = self._listings.get(directory)
+        if cached is not None:
+            return cached
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            mtime = None
+        entry = self.directories.pop(directory, None)
+        if entry is None or entry.get("racy") or entry.get("mtime") != mtime:
+            files = []
+            if mtime is not None:
+                try:
+                    files = sorted(e.name for e in os.scandir(directory) if e.is_file())
+                except OSError:
+                    pass
+            racy = mtime is not None and self.clock() - mtime / 1e9 < RACY_SECONDS
+            entry = {"mtime": mtime, "racy": racy, "files": files}
+            self.dirty = True
+        self.directories[directory] = entry
+        while len(self.directories) > MAX_DIRECTORIES:
+            del self.directories[next(iter(self.directories))]
+        listing = self._listings[directory] = frozenset(entry["files"])
+        return listing
+
+    def is_file(self, path: str) -> bool:
+        directory, name = os.path.split(path)
+        return bool(name) and name in self.listing(directory)
+
+    @property
+    def mapping(self) -> PathMapping:
+        if self._mapping is None:
+            self._mapping = PathMapping.load(self.project)
+        return self._mapping
+
+    def exists(self, base: str) -> bool:
+        """Whether ``base`` names a module: itself, with an extension, or an index file."""
+        if self.is_file(base):
+            return True
+        stem, ext = os.path.splitext(base)
+        if any(self.is_file(stem + alternative) for alternative in SOURCE_FOR_OUTPUT.get(ext, ())):
+            return True
+        return any(self.is_file(base + suffix) for suffix in EXTENSIONS + INDEX_FILES)
+
+    def resolve(self, spec: str, importer: str) -> Optional[Tuple[bool, str, bool]]:
+        """``(found, shown path, has extension)`` for ``spec``; None for packages."""
+        key = (shell_dirname(importer), spec)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        has_extension = bool(HAS_EXTENSION.search(spec))
+        if spec.startswith("/"):
+            shown = "." + spec
+            bases = [os.path.join(self.project, spec[1:])]
+        elif spec.startswith("."):
+            shown = f"{key[0]}/{spec}"
+            bases = [os.path.join(self.project, key[0], spec)]
+        else:
+            bases = self.mapping.candidates(spec)
+            if bases is None:
+                # Only an import that exists under baseUrl is a local module;
+                # anything else is taken to be a package
+                base_url = self.mapping.base_url
+                if base_url and self.exists(os.path.normpath(os.path.join(base_url, spec))):
+                    self._resolved[key] = (True, spec, has_extension)
+                else:
+                    self._resolved[key] = None
+                return self._resolved[key]
+            shown = os.path.relpath(bases[0], self.project) if bases else spec
+
+        found = any(self.exists(os.path.normpath(base)) for base in bases)
+        self._resolved[key] = (found, shown, has_extension)
+        return self._resolved[key]
+
+    def check(self, file: str) -> List[str]:
+        """Warnings for the imports of ``file`` that do not resolve."""
+        if not SOURCE_FILE.search(file):
+            return []
+        try:
+            with open(os.path.join(self.project, file), "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            return []
+
+        lines = []
+        for spec in IMPORT_STATEMENT.findall(text):
+            resolution = self.resolve(spec, file)
+            if resolution is None or resolution[0]:
+                continue
+            _, shown, has_extension = resolution
+            lines.append(f"⚠️ Missing import: '{spec}' in {file}")
+            if not has_extension:
+                lines.append(f"   Resolved to: {shown} (not found)")
+        if lines:
+            lines.append("💡 Tip: Check that all imported files exist and paths are correct")
+        return lines
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        write_json_atomic(self.path, {"version": CACHE_VERSION, "directories": self.directories})
+        self.dirty = False
+
+
+def main(argv: List[str]) -> int:
+    """Check the imports of each file; exit 1 when any is missing."""
+    if len(argv) < 2 or argv[0] != "check":
+        print("usage: python -m claude_hooks.module_resolver check FILE [FILE ...]", file=sys.stderr)
+        return 2
+
+    from .event import HookEvent
+
+    resolver = ModuleResolver.for_project(HookEvent(env=dict(os.environ)).data_dir, os.getcwd())
+    issues = False
+    try:
+        for file in argv[1:]:
+            for line in resolver.check(file):
+                print(line)
+                issues = True
+    finally:
+        resolver.save()
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
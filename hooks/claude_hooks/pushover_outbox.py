@@ -0,0 +1,386 @@
+"""
+Outbox and background sender for pushover-notifier.
+
+The hook does not call the Pushover API itself. It appends the notification
+to an outbox and returns. One sender process per user drains the outbox:
+
+* Notifications arriving within ``PUSHOVER_BATCH_WINDOW`` seconds of the
+  first queued one are merged into a single summary message (the highest
+  priority wins, the messages are listed newest last). Emergency messages
+  (priority 2) are sent without waiting.
+* Everything goes over one keep-alive HTTP connection, reconnected only when
+  the server closes it.
+* A 429 (or ``X-Limit-App-Remaining: 0``) holds sending until
+  ``X-Limit-App-Reset``; server and network errors back off exponentially.
+  Notifications that cannot be sent within ``MAX_HOLD`` seconds are dropped
+  and logged. Other client errors (a bad token, for example) are logged and
+  not retried.
+
+The sender exits after ``PUSHOVER_SENDER_IDLE`` seconds without work.
+``PUSHOVER_API_URL`` replaces the API endpoint, e.g. with a local server in
+tests.
+
+Files, under ``~/.claude-code/pushover/``:
+
+    outbox         queued notifications, one JSON object per line
+    outbox.lock    held while the outbox is read or written
+    sender.lock    held by the running sender
+
+Usage:
+    python3 -m claude_hooks.pushover_outbox post TITLE MESSAGE [PRIORITY]
+    python3 -m claude_hooks.pushover_outbox send
+"""
+
+import fcntl
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from . import HOOKS_DIR
+from .event import utc_timestamp
+from .segment_log import open_log
+
+API_URL = "https://api.pushover.net/1/messages.json"
+OUTBOX_DIR = "pushover"
+
+BATCH_WINDOW = 5.0
+SENDER_IDLE = 60.0
+POLL_INTERVAL = 0.1
+TIMEOUT = 10.0
+# Exponential backoff after server or network errors
+BACKOFF_START = 1.0
+BACKOFF_MAX = 300.0
+# Notifications are dropped rather than held longer than this
+MAX_HOLD = 15 * 60.0
+EMERGENCY = 2
+# Pushover requires these for emergency-priority messages
+EMERGENCY_RETRY = 60
+EMERGENCY_EXPIRE = 3600
+MAX_LISTED = 10
+
+LOG_NAME = "pushover-notifications.log"
+
+
+def setting(env: Mapping[str, str], name: str, default: float) -> float:
+    try:
+        return max(0.0, float(env.get(name, default)))
+    except ValueError:
+        return default
+
+
+class Outbox:
+    """The queued notifications and sender lock of one user."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        directory = self.data_dir / OUTBOX_DIR
+        self.path = directory / "outbox"
+        self.lock_path = directory / "outbox.lock"
+        self.sender_lock_path = directory / "sender.lock"
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def append(self, entries: List[Dict]) -> None:
+        """Queue ``entries``; the outbox holds credentials, so only the owner may read it."""
+        with self.locked():
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            with os.fdopen(fd, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+
+    def drain(self) -> List[Dict]:
+        """Take everything queued."""
+        with self.locked():
+            try:
+                with open(self.path, "r+", encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+                    f.truncate(0)
+            except OSError:
+                return []
+        entries = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                entries.append(entry)
+        return entries
+
+    def peek(self) -> List[Dict]:
+        """The queued notifications, left in place."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return [entry for entry in entries if isinstance(entry, dict)]
+
+    def ensure_sender(self, env: Mapping[str, str]) -> None:
+        """Start a detached sender unless one holds the sender lock."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.sender_lock_path, "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return
+            fcntl.flock(lock, fcntl.LOCK_UN)
+        subprocess.Popen(
+            [sys.executable, "-m", "claude_hooks.pushover_outbox", "send"],
+            env=dict(env, PYTHONPATH=str(HOOKS_DIR)),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+
+def post(data_dir: Path, env: Mapping[str, str], title: str, message: str, priority: int) -> None:
+    """Queue a notification with the credentials in ``env`` and wake the sender."""
+    outbox = Outbox(data_dir)
+    outbox.append([{
+        "queued": time.time(),
+        "token": env.get("PUSHOVER_APP_TOKEN", ""),
+        "user": env.get("PUSHOVER_USER_KEY", ""),
+        "title": title,
+        "message": message,
+        "priority": priority,
+        "sound": env.get("PUSHOVER_SOUND", ""),
+    }])
+    outbox.ensure_sender(env)
+
+
+def merge(entries: List[Dict]) -> List[Dict]:
+    """One notification per recipient: the entry itself, or a summary of a burst."""
+    groups: Dict[Tuple[str, str], List[Dict]] = {}
+    for entry in entries:
+        groups.setdefault((entry.get("token", ""), entry.get("user", "")), []).append(entry)
+
+    merged = []
+    for group in groups.values():
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        # The most urgent entry decides title, priority and sound
+        lead = max(group, key=lambda entry: entry.get("priority", 0))
+        listed = group[-MAX_LISTED:]
+        lines = [f"{len(group)} updates"]
+        if len(group) > len(listed):
+            lines.append(f"… {len(group) - len(listed)} earlier")
+        lines.extend(f"{entry.get('title', '')}: {entry.get('message', '')}" for entry in listed)
+        merged.append({**lead, "message": "<br>".join(lines), "queued": group[0].get("queued")})
+    return merged
+
+
+def form(entry: Dict) -> Dict[str, str]:
+    """The API fields for ``entry``."""
+    fields = {
+        "token": entry.get("token", ""),
+        "user": entry.get("user", ""),
+        "title": entry.get("title", ""),
+        "message": entry.get("message", ""),
+        "priority": str(entry.get("priority", 0)),
+        "html": "1",
+    }
+    if entry.get("sound"):
+        fields["sound"] = entry["sound"]
+    if entry.get("priority", 0) >= EMERGENCY:
+        fields["retry"] = str(EMERGENCY_RETRY)
+        fields["expire"] = str(EMERGENCY_EXPIRE)
+    return fields
+
+
+class Client:
+    """A keep-alive connection to the messages endpoint."""
+
+    def __init__(self, url: str = API_URL, timeout: float = TIMEOUT):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname or ""
+        self.port = parts.port
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self.connection: Optional[http.client.HTTPConnection] = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.connection is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self.connection = cls(self.host, self.port, timeout=self.timeout)
+        return self.connection
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def post(self, fields: Dict[str, str]) -> Tuple[int, Dict[str, str], str]:
+        """``(status, headers, body)``; a connection the server dropped is reopened once."""
+        body = urlencode(fields)
+        headers = {"Content-Type": "application/x-www-form-urlencoded", "Connection": "keep-alive"}
+        for attempt in range(2):
+            connection = self._connect()
+            try:
+                connection.request("POST", self.path, body=body, headers=headers)
+                response = connection.getresponse()
+                text = response.read().decode("utf-8", errors="replace")
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed the idle keep-alive connection
+                self.close()
+                if attempt:
+                    raise
+                continue
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+            if response.will_close:
+                self.close()
+            return response.status, {k.lower(): v for k, v in response.getheaders()}, text
+        raise ConnectionError("connection closed")
+
+
+class Sender:
+    """Delivers merged notifications, holding off while rate limited."""
+
+    def __init__(self, outbox: Outbox, client: Client, window: float = BATCH_WINDOW,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep):
+        self.outbox = outbox
+        self.client = client
+        self.window = window
+        self.clock = clock
+        self.sleep = sleep
+        self.hold_until = 0.0
+        self.backoff = BACKOFF_START
+
+    def log(self, line: str) -> None:
+        open_log(self.outbox.data_dir, LOG_NAME).append(line)
+
+    def due(self, entries: List[Dict]) -> bool:
+        """Whether the queued burst is complete (or urgent) and no hold is in force."""
+        if not entries or self.clock() < self.hold_until:
+            return False
+        if any(entry.get("priority", 0) >= EMERGENCY for entry in entries):
+            return True
+        return self.clock() - min(entry.get("queued", 0) for entry in entries) >= self.window
+
+    def deliver(self, entry: Dict) -> bool:
+        """Send ``entry``; False if it should be retried later."""
+        try:
+            status, headers, body = self.client.post(form(entry))
+        except (OSError, http.client.HTTPException) as e:
+            return self._retry_later(f"Pushover notification failed: {e}", None)
+
+        if status == 429 or headers.get("x-limit-app-remaining") == "0":
+            reset = headers.get("x-limit-app-reset")
+            if status == 429:
+                return self._retry_later(f"Pushover notification failed: rate limited ({body})", reset)
+            self._hold(reset)
+        if status >= 500:
+            return self._retry_later(f"Pushover notification failed: {body}", None)
+
+        self.backoff = BACKOFF_START
+        self.log(f"[{utc_timestamp()}] {entry.get('title', '')}: {entry.get('message', '')} "
+                 f"(Priority: {entry.get('priority', 0)})")
+        if '"status":1' not in body.replace(" ", ""):
+            # Rejected (bad token, invalid field): retrying would not help
+            self.log(f"Pushover notification failed: {body}")
+        return True
+
+    def _hold(self, reset: Optional[str]) -> None:
+        try:
+            self.hold_until = max(self.hold_until, float(reset))
+        except (TypeError, ValueError):
+            pass
+
+    def _retry_later(self, reason: str, reset: Optional[str]) -> bool:
+        self.log(reason)
+        self.hold_until = self.clock() + self.backoff
+        self._hold(reset)
+        self.backoff = min(self.backoff * 2, BACKOFF_MAX)
+        return False
+
+    def flush(self) -> None:
+        """Send everything queued; undeliverable notifications go back in the outbox."""
+        pending = merge(self.outbox.drain())
+        while pending:
+            if self.deliver(pending[0]):
+                pending.pop(0)
+                continue
+            now = self.clock()
+            expired = [entry for entry in pending if self.hold_until - entry.get("queued", now) > MAX_HOLD]
+            for entry in expired:
+                self.log(f"Pushover notification dropped: {entry.get('title', '')}")
+            self.outbox.append([entry for entry in pending if entry not in expired])
+            return
+
+    def run(self, idle: float) -> int:
+        """Deliver until the outbox has been empty for ``idle`` seconds; one sender per user."""
+        self.outbox.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.outbox.sender_lock_path, "a") as sender_lock:
+            try:
+                fcntl.flock(sender_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return 0
+            last_work = self.clock()
+            try:
+                while True:
+                    entries = self.outbox.peek()
+                    if entries:
+                        last_work = self.clock()
+                        if self.due(entries):
+                            self.flush()
+                            continue
+                    else:
+                        with self.outbox.locked():
+                            if self.clock() - last_work >= idle and not self.outbox.peek():
+                                # Released under the outbox lock: a later post sees
+                                # it free and starts a new sender
+                                fcntl.flock(sender_lock, fcntl.LOCK_UN)
+                                return 0
+                    self.sleep(POLL_INTERVAL)
+            finally:
+                self.client.close()
+
+
+def main(argv: List[str]) -> int:
+    from .event import HookEvent
+
+    env = dict(os.environ)
+    data_dir = HookEvent(env=env).data_dir
+    if argv[:1] == ["post"] and len(argv) in (3, 4):
+        try:
+            priority = int(argv[3]) if len(argv) == 4 else 0
+        except ValueError:
+            priority = 0
+        post(data_dir, env, argv[1], argv[2], priority)
+        return 0
+    if argv == ["send"]:
+        sender = Sender(Outbox(data_dir), Client(env.get("PUSHOVER_API_URL") or API_URL),
+                        setting(env, "PUSHOVER_BATCH_WINDOW", BATCH_WINDOW))
+        return sender.run(setting(env, "PUSHOVER_SENDER_IDLE", SENDER_IDLE))
+    print("usage: python -m claude_hooks.pushover_outbox post TITLE MESSAGE [PRIORITY] | send", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,48 @@
+"""
+Mapping from hook script names to their in-process handlers.
+"""
+
+import importlib
+import threading
+from typing import Callable, Dict
+
+from .event import HookEvent, HookResult
+
+Handler = Callable[[HookEvent], HookResult]
+
+# Handler modules keyed by script name without the .sh suffix. Each module
+# has a ``run(event)`` and is imported on first use, so a dispatcher run only
+# pays for the handlers its event reaches.
+HANDLERS: Dict[str, str] = {
+    "agent-selector": "agent_selector",
+    "dangerous-operation-validator": "dangerous_operations",
+    "agent-hierarchy-tracker": "hierarchy_tracker",
+    "auto-debug-suggester": "debug_suggester",
+    "agent-context-bridge": "context_bridge",
+    "session-agent-context": "session_context",
+    "test-runner-validator": "test_runner",
+    "tool-timer": "timing_ledger",
+}
+
+# Handlers append to shared files under ~/.claude-code, so concurrent calls to
+# the same hook (daemon threads) are serialized; different hooks run freely.
+_LOCKS = {name: threading.Lock() for name in HANDLERS}
+
+
+def handler(name: str) -> Handler:
+    """The in-process handler registered for ``name``."""
+    return importlib.import_module(f"{__package__}.{HANDLERS[name]}").run
+
+
+def run_handler(name: str, event: HookEvent) -> HookResult:
+    """Run the in-process handler registered for ``name``."""
+    with _LOCKS[name]:
+        return handler(name)(event)
+
+
+def normalize_hook_name(name: str) -> str:
+    """Accept ``agent-selector``, ``agent-selector.sh`` or a full path."""
+    name = name.rsplit("/", 1)[-1]
+    if name.endswith(".sh"):
+        name = name[:-3]
+    return name
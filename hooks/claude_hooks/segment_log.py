@@ -0,0 +1,223 @@
+"""
+Size-bounded, rotated hook logs with a running line counter.
+
+A log such as ~/.claude-code/agent-usage.log is written as segments:
+
+    agent-usage.log                active segment, appended to
+    agent-usage.log.1 ... .N       rotated segments, .1 is the newest
+    agent-usage.log.count          lines ever appended (the sidecar counter)
+    agent-usage.log.summary.json   aggregates of segments compacted away
+
+When the active segment reaches ``max_bytes`` it is rotated. Once more than
+``max_segments`` rotated segments exist, the oldest are compacted: their line
+count, time span and per-key counts are added to the summary and the files
+are removed, so totals survive while disk use stays bounded. Appends hold an
+exclusive lock on the counter file, so concurrent hooks neither interleave a
+rotation nor lose a count, and reading the count never scans the log.
+"""
+
+import fcntl
+import json
+import os
+import re
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Pattern, TextIO
+
+from .storage import read_json, tail_lines, write_json_atomic
+
+MAX_BYTES = 1024 * 1024
+MAX_SEGMENTS = 4
+
+TIMESTAMP = re.compile(r"^\[([^\]]+)\]")
+
+# Log file name -> pattern whose first group is the key aggregated on compaction
+KEYS: Dict[str, Pattern] = {
+    "agent-usage.log": re.compile(r"Agent: (.*?), Task:"),
+    "error-patterns.log": re.compile(r"^\[[^\]]+\] (.+)$"),
+    "hook-trace.jsonl": re.compile(r'"hook": "([^"]+)"'),
+    "notifications.log": re.compile(r"^\[[^\]]+\] ([^:]+):"),
+    "pushover-notifications.log": re.compile(r"^\[[^\]]+\] ([^:]+):"),
+    "test-runs.log": re.compile(r"Framework: ([^,]+)"),
+}
+
+
+def _empty_summary() -> Dict:
+    return {"lines": 0, "segments": 0, "first": None, "last": None, "keys": {}}
+
+
+class SegmentedLog:
+    """One log written as rotated segments plus a counter sidecar."""
+
+    def __init__(self, path: Path, max_bytes: int = MAX_BYTES, max_segments: int = MAX_SEGMENTS,
+                 key: Optional[Pattern] = None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_segments = max_segments
+        self.key = key if key is not None else KEYS.get(self.path.name)
+        self.count_path = self.path.with_name(self.path.name + ".count")
+        self.summary_path = self.path.with_name(self.path.name + ".summary.json")
+
+    def segment(self, index: int) -> Path:
+        """Segment ``index``: 0 is the active file, 1 the newest rotated one."""
+        return self.path if index == 0 else self.path.with_name(f"{self.path.name}.{index}")
+
+    def rotated(self) -> int:
+        """Number of rotated segments on disk."""
+        index = 0
+        while self.segment(index + 1).exists():
+            index += 1
+        return index
+
+    def segments(self) -> List[Path]:
+        """Existing segments, newest first."""
+        found = [self.path] if self.path.exists() else []
+        return found + [self.segment(index) for index in range(1, self.rotated() + 1)]
+
+    @contextmanager
+    def _locked(self) -> Iterator[TextIO]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.count_path, "a+", encoding="utf-8") as counter:
+            fcntl.flock(counter, fcntl.LOCK_EX)
+            try:
+                yield counter
+            finally:
+                fcntl.flock(counter, fcntl.LOCK_UN)
+
+    def _read_count(self, counter: TextIO) -> int:
+        counter.seek(0)
+        text = counter.read().strip()
+        if text.isdigit():
+            return int(text)
+        # First use, or a log written before counters existed
+        return self.summary()["lines"] + sum(_line_count(path) for path in self.segments())
+
+    @staticmethod
+    def _write_count(counter: TextIO, count: int) -> None:
+        counter.seek(0)
+        counter.truncate()
+        counter.write(str(count))
+        counter.flush()
+
+    def append(self, line: str) -> int:
+        """Append ``line`` and return the total number of lines ever logged."""
+        return self.extend([line])
+
+    def extend(self, lines: List[str]) -> int:
+        """Append ``lines`` in one write and return the total number of lines ever logged."""
+        with self._locked() as counter:
+            count = self._read_count(counter) + len(lines)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+                size = f.tell()
+            if size >= self.max_bytes:
+                self._rotate()
+            self._write_count(counter, count)
+        return count
+
+    def count(self) -> int:
+        """Total number of lines ever logged, without reading the log."""
+        try:
+            with open(self.count_path, "r", encoding="utf-8") as f:
+                text = f.read().strip()
+        except OSError:
+            text = ""
+        if text.isdigit():
+            return int(text)
+        with self._locked() as counter:
+            count = self._read_count(counter)
+            self._write_count(counter, count)
+        return count
+
+    def _rotate(self) -> None:
+        rotated = self.rotated()
+        for index in range(rotated, -1, -1):
+            os.replace(self.segment(index), self.segment(index + 1))
+        if rotated + 1 > self.max_segments:
+            self._compact(self.max_segments)
+
+    def compact(self, keep: Optional[int] = None) -> Dict:
+        """Fold rotated segments beyond the newest ``keep`` into the summary."""
+        with self._locked():
+            return self._compact(self.max_segments if keep is None else keep)
+
+    def _compact(self, keep: int) -> Dict:
+        summary = self.summary()
+        # Oldest first, so first/last timestamps extend in order
+        old = [self.segment(index) for index in range(self.rotated(), keep, -1)]
+        if not old:
+            return summary
+        for path in old:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    self._summarize_line(summary, line.rstrip("\n"))
+            summary["segments"] += 1
+        write_json_atomic(self.summary_path, summary)
+        for path in old:
+            path.unlink()
+        return summary
+
+    def _summarize_line(self, summary: Dict, line: str) -> None:
+        summary["lines"] += 1
+        stamp = TIMESTAMP.match(line)
+        if stamp:
+            summary["first"] = summary["first"] or stamp.group(1)
+            summary["last"] = stamp.group(1)
+        if self.key is not None:
+            match = self.key.search(line)
+            if match:
+                key = match.group(1)
+                summary["keys"][key] = summary["keys"].get(key, 0) + 1
+
+    def summary(self) -> Dict:
+        """Aggregates of every segment compacted so far."""
+        summary = read_json(self.summary_path, None)
+        if not isinstance(summary, dict):
+            return _empty_summary()
+        return {**_empty_summary(), **summary}
+
+    def tail(self, count: int) -> List[str]:
+        """The last ``count`` lines, reading back across segments as needed."""
+        lines: List[str] = []
+        for path in self.segments():
+            if len(lines) >= count:
+                break
+            lines = tail_lines(path, count - len(lines)) + lines
+        return lines[-count:] if count else []
+
+
+def _line_count(path: Path) -> int:
+    try:
+        with open(path, "rb") as f:
+            return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(65536), b""))
+    except OSError:
+        return 0
+
+
+def open_log(data_dir: Path, name: str) -> SegmentedLog:
+    """The segmented log ``name`` under ``data_dir`` (``~/.claude-code``)."""
+    return SegmentedLog(Path(data_dir) / name)
+
+
+def main(argv: List[str]) -> int:
+    """``python -m claude_hooks.segment_log append|count|compact|summary LOG [LINE]``."""
+    if len(argv) < 2 or argv[0] not in ("append", "count", "compact", "summary"):
+        print("usage: python -m claude_hooks.segment_log append|count|compact|summary LOG [LINE]",
+              file=sys.stderr)
+        return 2
+
+    command, log = argv[0], SegmentedLog(Path(argv[1]))
+    if command == "append":
+        print(log.append(argv[2] if len(argv) > 2 else ""))
+    elif command == "count":
+        print(log.count())
+    elif command == "compact":
+        print(json.dumps(log.compact(keep=0), indent=2))
+    else:
+        print(json.dumps(log.summary(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
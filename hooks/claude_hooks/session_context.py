@@ -0,0 +1,91 @@
+"""
+SessionStart handler: load agent hierarchy and suggest workflow patterns.
+
+Mirrors hooks/session-agent-context.sh.
+"""
+
+import sys
+from pathlib import Path
+from typing import Collection, Optional
+
+from . import agent_manifest
+from .agent_stats import AgentStats
+from .event import HookEvent, HookResult, run_cli
+from .hierarchy_tracker import top_agents
+
+
+SELECTION_GUIDE = [
+    ("Design/Architecture", ("go-architect", "rust-systems-engineer", "nextjs-architect")),
+    ("Implementation", ("go-engineer", "python-automation-engineer", "react-component-engineer")),
+    ("Testing", ("go-test-engineer", "python-test-engineer", "vue-nuxt-test-engineer")),
+    ("Debugging", ("go-debugger", "rust-debugger", "javascript-debugger", "python-debugger")),
+    ("Full-Stack", ("fullstack-nextjs-go", "fullstack-nuxtjs-go")),
+]
+
+
+def selection_guide(installed: Optional[Collection[str]], result: HookResult) -> None:
+    """Print the guide, naming only agents in the catalog when there is one."""
+    result.echo("🎯 Quick Agent Selection Guide:")
+    for role, agents in SELECTION_GUIDE:
+        if installed is not None:
+            agents = tuple(agent for agent in agents if agent in installed)
+        if agents:
+            result.echo(f"   • {role}: {', '.join(agents)}")
+    result.echo("")
+
+
+def project_workflow(cwd: Path, result: HookResult) -> None:
+    """Suggest a specialist chain for the project type found in ``cwd``."""
+
+    def mentions(filename: str, word: str) -> bool:
+        try:
+            return word in (cwd / filename).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return False
+
+    if (cwd / "go.mod").is_file():
+        result.echo("🔍 Detected Go project - Available specialists:")
+        result.echo("   go-architect → go-engineer → go-test-engineer → go-debugger")
+    elif (cwd / "package.json").is_file():
+        if mentions("package.json", "next"):
+            result.echo("🔍 Detected Next.js project - Available specialists:")
+            result.echo("   nextjs-architect → react-component-engineer → react-nextjs-test-engineer → nextjs-debugger")
+        elif mentions("package.json", "nuxt"):
+            result.echo("🔍 Detected Nuxt.js project - Available specialists:")
+            result.echo("   nuxt-developer → vue-developer → vue-nuxt-test-engineer → nuxtjs-debugger")
+    elif (cwd / "Cargo.toml").is_file():
+        result.echo("🔍 Detected Rust project - Available specialists:")
+        result.echo("   rust-systems-engineer → rust-cli-developer → rust-test-engineer → rust-debugger")
+    elif (cwd / "requirements.txt").is_file() or (cwd / "pyproject.toml").is_file():
+        result.echo("🔍 Detected Python project - Available specialists:")
+        result.echo("   python-automation-engineer → python-data-processor → python-test-engineer → python-debugger")
+
+
+def run(event: HookEvent) -> HookResult:
+    """Print the session start context."""
+    result = HookResult()
+    result.echo("🤖 Claude Code Agents System Initialized")
+    result.echo("")
+    result.echo("📋 Agent Hierarchy Pattern:")
+    result.echo("   Architects → Engineers → Test Engineers → Debuggers")
+    result.echo("")
+    catalog = agent_manifest.catalog(event.env, event.data_dir)
+    selection_guide(set(catalog.names()) if catalog else None, result)
+
+    # Check for recent agent usage patterns
+    if AgentStats(event.data_dir).exists():
+        result.echo("📊 Your most used agents:")
+        for agent, uses in top_agents(event, 3):
+            result.echo(f"   • {agent}: {uses} uses")
+        result.echo("")
+
+    # Suggest workflow based on current directory
+    project_workflow(Path(event.cwd or "."), result)
+
+    result.echo("")
+    result.echo("💡 Tip: Agents automatically delegate to appropriate specialists based on task complexity")
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(run, "session-agent-context"))
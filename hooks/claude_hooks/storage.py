@@ -0,0 +1,60 @@
+"""
+Small file helpers for hook data under ~/.claude-code.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List
+
+
+def read_json(path: Path, default: Any) -> Any:
+    """Load JSON from ``path``, returning ``default`` if missing or invalid."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via a unique temp file and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def append_line(path: Path, line: str) -> None:
+    """Append a single line to a log file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def tail_lines(path: Path, count: int) -> List[str]:
+    """Return the last ``count`` lines of a text file (like ``tail -n``)."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            block = 4096
+            data = b""
+            while end > 0 and data.count(b"\n") <= count:
+                start = max(0, end - block)
+                f.seek(start)
+                data = f.read(end - start) + data
+                end = start
+    except OSError:
+        return []
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return lines[-count:] if count else []
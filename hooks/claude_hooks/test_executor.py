@@ -0,0 +1,291 @@
+"""
+Opt-in background test runs for test-runner-validator.
+
+With ``CLAUDE_TEST_EXECUTOR=true`` the hook, besides suggesting commands,
+queues the affected test targets and returns. One worker per repository
+waits until edits have been quiet for ``CLAUDE_TEST_DEBOUNCE`` seconds,
+merges everything queued into one invocation per framework (``go test
+./a ./b``, ``pytest x.py y.py``, ...) and runs it. An edit arriving while a
+run is in flight makes that run stale: it is cancelled and its targets are
+queued again with the new ones. Every run ends up in test-runs.log with its
+result and duration; the output of the latest run is kept next to the queue.
+
+Files, under ``~/.claude-code/test-executor/`` and per repository root:
+
+    <key>.queue        queued targets, one JSON object per line
+    <key>.queue.lock   held while the queue is read or written
+    <key>.worker.lock  held by the running worker
+    <key>.out          output of the latest run
+
+Usage:
+    python3 -m claude_hooks.test_executor worker DATA_DIR KEY
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from . import HOOKS_DIR
+from .event import utc_timestamp
+from .segment_log import open_log
+from .test_index import find_repo_root, repo_key, shell_dirname
+
+EXECUTOR_DIR = "test-executor"
+
+DEBOUNCE = 2.0
+POLL_INTERVAL = 0.2
+# Seconds a cancelled run gets to exit after SIGTERM
+KILL_GRACE = 5.0
+
+Command = Callable[[str, List[str]], Optional[List[str]]]
+
+# Workers started by this process, reaped once they exit (the daemon lives on)
+_WORKERS: List[subprocess.Popen] = []
+
+
+def enabled(env: Mapping[str, str]) -> bool:
+    """Whether background runs are turned on (``CLAUDE_TEST_EXECUTOR``)."""
+    return env.get("CLAUDE_TEST_EXECUTOR", "false").lower() in ("1", "true", "yes")
+
+
+def debounce_seconds(env: Mapping[str, str]) -> float:
+    try:
+        return max(0.0, float(env.get("CLAUDE_TEST_DEBOUNCE", DEBOUNCE)))
+    except ValueError:
+        return DEBOUNCE
+
+
+def test_target(framework: str, test_file: str) -> str:
+    """What a batched run names for ``test_file``: its package for Go, else the file."""
+    if framework != "go":
+        return test_file
+    package = os.path.normpath(shell_dirname(test_file))
+    return package if os.path.isabs(package) else f"./{package}"
+
+
+def batch_command(framework: str, targets: List[str]) -> Optional[List[str]]:
+    """One command running every target under ``framework``."""
+    if framework == "go":
+        return ["go", "test", *targets]
+    if framework == "python":
+        runner = ["pytest"] if shutil.which("pytest") else [sys.executable, "-m", "pytest"]
+        return [*runner, *targets]
+    if framework in ("jest", "vitest", "mocha"):
+        return ["npm", "test", "--", *targets]
+    if framework == "rust":
+        return ["cargo", "test"]
+    if framework == "npm":
+        return ["npm", "test"]
+    return None
+
+
+class TestQueue:
+    """The queued targets and worker lock of one repository."""
+
+    def __init__(self, data_dir: Path, key: str):
+        self.data_dir = Path(data_dir)
+        self.key = key
+        directory = self.data_dir / EXECUTOR_DIR
+        self.path = directory / f"{key}.queue"
+        self.lock_path = directory / f"{key}.queue.lock"
+        self.worker_lock_path = directory / f"{key}.worker.lock"
+        self.output_path = directory / f"{key}.out"
+
+    @classmethod
+    def for_repo(cls, data_dir: Path, cwd: str) -> "TestQueue":
+        return cls(data_dir, repo_key(find_repo_root(cwd)))
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _append(self, entries: List[Dict]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+    def push(self, cwd: str, framework: str, targets: List[str], debounce: float = DEBOUNCE) -> None:
+        """Queue ``targets`` and make sure a worker will pick them up."""
+        with self.locked():
+            self._append([{"cwd": cwd, "framework": framework, "targets": targets}])
+        self.ensure_worker(debounce)
+
+    def requeue(self, entries: List[Dict]) -> None:
+        """Put ``entries`` back ahead of anything queued since they were taken."""
+        with self.locked():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    newer = f.read()
+            except OSError:
+                newer = ""
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry) + "\n" for entry in entries) + newer)
+
+    def drain(self) -> List[Dict]:
+        """Take everything queued."""
+        with self.locked():
+            try:
+                with open(self.path, "r+", encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+                    f.truncate(0)
+            except OSError:
+                return []
+        entries = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                entries.append(entry)
+        return entries
+
+    def pending(self) -> bool:
+        try:
+            return self.path.stat().st_size > 0
+        except OSError:
+            return False
+
+    def quiet_for(self) -> float:
+        """Seconds since targets were last queued."""
+        try:
+            return time.time() - self.path.stat().st_mtime
+        except OSError:
+            return float("inf")
+
+    def ensure_worker(self, debounce: float = DEBOUNCE) -> None:
+        """Start a detached worker unless one holds the worker lock."""
+        with open(self.worker_lock_path, "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return
+            fcntl.flock(lock, fcntl.LOCK_UN)
+        _WORKERS[:] = [worker for worker in _WORKERS if worker.poll() is None]
+        env = dict(os.environ, PYTHONPATH=str(HOOKS_DIR), CLAUDE_TEST_DEBOUNCE=str(debounce))
+        _WORKERS.append(subprocess.Popen(
+            [sys.executable, "-m", "claude_hooks.test_executor", "worker", str(self.data_dir), self.key],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        ))
+
+
+def submit(data_dir: Path, cwd: str, framework: str, test_files: List[str],
+           debounce: float = DEBOUNCE) -> bool:
+    """Queue a background run of ``test_files``; False if nothing would run."""
+    targets = list(dict.fromkeys(test_target(framework, path) for path in test_files))
+    if not targets or batch_command(framework, targets) is None:
+        return False
+    TestQueue.for_repo(data_dir, cwd).push(os.path.abspath(cwd or "."), framework, targets, debounce)
+    return True
+
+
+def batches(entries: List[Dict]) -> List[Tuple[str, str, List[str]]]:
+    """Merge queued entries into ``(cwd, framework, targets)``, in queue order."""
+    merged: Dict[Tuple[str, str], Dict[str, None]] = {}
+    for entry in entries:
+        targets = merged.setdefault((entry.get("cwd", ""), entry.get("framework", "")), {})
+        for target in entry.get("targets", []):
+            targets[target] = None
+    return [(cwd, framework, list(targets)) for (cwd, framework), targets in merged.items()]
+
+
+def _stop(process: subprocess.Popen) -> None:
+    """Terminate a run and everything it started."""
+    for sig, wait in ((signal.SIGTERM, KILL_GRACE), (signal.SIGKILL, None)):
+        try:
+            os.killpg(process.pid, sig)
+        except OSError:
+            pass
+        try:
+            process.wait(wait)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def run_batch(queue: TestQueue, cwd: str, command: List[str]) -> Tuple[str, float]:
+    """Run ``command`` and return ``(result, seconds)``; new edits cancel it as stale."""
+    started = time.monotonic()
+    with open(queue.output_path, "w", encoding="utf-8") as output:
+        try:
+            process = subprocess.Popen(command, cwd=cwd or None, stdin=subprocess.DEVNULL,
+                                       stdout=output, stderr=subprocess.STDOUT, start_new_session=True)
+        except OSError as e:
+            output.write(f"{e}\n")
+            return "error", time.monotonic() - started
+        while process.poll() is None:
+            if queue.pending():
+                _stop(process)
+                return "cancelled", time.monotonic() - started
+            time.sleep(POLL_INTERVAL)
+    return ("passed" if process.returncode == 0 else "failed"), time.monotonic() - started
+
+
+def log_run(queue: TestQueue, framework: str, targets: List[str], result: str, seconds: float) -> None:
+    open_log(queue.data_dir, "test-runs.log").append(
+        f"[{utc_timestamp()}] File: {' '.join(targets)}, Framework: {framework}, "
+        f"Result: {result}, Duration: {seconds:.2f}s"
+    )
+
+
+def work(queue: TestQueue, debounce: float, command: Command = batch_command) -> int:
+    """Run queued tests until the queue stays empty; one worker per repository."""
+    queue.path.parent.mkdir(parents=True, exist_ok=True)
+    with open(queue.worker_lock_path, "a") as worker_lock:
+        try:
+            fcntl.flock(worker_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return 0
+        while True:
+            with queue.locked():
+                if not queue.pending():
+                    # Released under the queue lock: a later push sees it free
+                    # and starts a new worker
+                    fcntl.flock(worker_lock, fcntl.LOCK_UN)
+                    return 0
+            if queue.quiet_for() < debounce:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            pending = batches(queue.drain())
+            while pending:
+                cwd, framework, targets = pending.pop(0)
+                argv = command(framework, targets)
+                if argv is None:
+                    continue
+                result, seconds = run_batch(queue, cwd, argv)
+                log_run(queue, framework, targets, result, seconds)
+                if result == "cancelled":
+                    # Merged with the new edits once they settle
+                    queue.requeue([{"cwd": cwd, "framework": framework, "targets": targets}] +
+                                  [{"cwd": c, "framework": f, "targets": t} for c, f, t in pending])
+                    break
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 3 or argv[0] != "worker":
+        print("usage: python -m claude_hooks.test_executor worker DATA_DIR KEY", file=sys.stderr)
+        return 2
+    return work(TestQueue(Path(argv[1]), argv[2]), debounce_seconds(os.environ))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,234 @@
+"""
+Per-repository index from source files to their test files.
+
+test-runner-validator.sh looks for the tests of an edited file by probing
+every name pattern in every candidate test directory with every extension,
+and greps package.json for the test framework on each edit. The index keeps
+instead, for each directory it has looked at, the test files it holds grouped
+by the source base name they belong to, plus the detected framework with the
+mtimes of the marker files it was derived from. It is stored under
+``~/.claude-code/test-index/`` in one file per repository root.
+
+A lookup stats the eight candidate directories (the source directory and the
+test directories around it) and rescans only those whose mtime changed, so an
+unchanged tree costs a handful of ``stat`` calls and one dictionary hit per
+directory. The daemon keeps indexes in memory between tool calls.
+"""
+
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .storage import read_json, write_json_atomic
+
+INDEX_VERSION = 1
+INDEX_DIR = "test-index"
+
+# Test file names for a source base name, in the order the hook lists them
+# (the shell list names "${base_name}.test" twice; it is probed once here)
+TEST_PATTERNS = ("{}.test", "{}.spec", "{}_test", "test_{}", "{}-test")
+
+# Where tests live relative to the source directory; "" is the directory itself
+TEST_DIRS = ("", "__tests__", "tests", "test", ".test", "../__tests__", "../tests", "../test")
+
+TEST_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".go", ".rs", ".py")
+
+SOURCE_EXTENSION = re.compile(r"\.(ts|tsx|js|jsx|go|rs|py)$")
+
+# Checked in this order; the first one present decides the framework
+FRAMEWORK_MARKERS = ("package.json", "go.mod", "Cargo.toml", "requirements.txt", "pyproject.toml")
+
+# (quoted key in package.json, framework), in order of preference
+PACKAGE_FRAMEWORKS = (
+    ('"jest"', "jest"),
+    ('"vitest"', "vitest"),
+    ('"mocha"', "mocha"),
+    ('"@testing-library"', "jest"),  # Usually used with Jest
+    ('"test":', "npm"),  # Generic npm test
+)
+
+# Directories cached per repository; the least recently used are dropped
+MAX_DIRECTORIES = 4096
+
+# A directory modified this recently may still change within the same mtime
+# tick, so its listing is marked racy and rescanned on the next lookup
+RACY_SECONDS = 2.0
+
+
+def find_repo_root(cwd: str) -> str:
+    """The nearest ancestor of ``cwd`` holding ``.git``, else ``cwd`` itself."""
+    start = os.path.abspath(cwd or ".")
+    current = start
+    while True:
+        if os.path.exists(os.path.join(current, ".git")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return start
+        current = parent
+
+
+def repo_key(root: str) -> str:
+    """File name stem for data kept per repository root."""
+    return hashlib.sha1(root.encode("utf-8", errors="surrogateescape")).hexdigest()[:16]
+
+
+def shell_dirname(path: str) -> str:
+    """``dirname`` as the shell prints it ("." for a bare file name)."""
+    return os.path.dirname(path) or "."
+
+
+def source_base(path: str) -> str:
+    """Base name of a source file with its language extension removed."""
+    return SOURCE_EXTENSION.sub("", os.path.basename(path))
+
+
+def test_bases(name: str) -> List[Tuple[str, int, int]]:
+    """``(base, pattern index, extension index)`` for each way ``name`` names a test."""
+    stem, ext = os.path.splitext(name)
+    if ext not in TEST_EXTENSIONS:
+        return []
+    ext_index = TEST_EXTENSIONS.index(ext)
+    bases = []
+    for pattern_index, pattern in enumerate(TEST_PATTERNS):
+        prefix, suffix = pattern.split("{}")
+        if len(stem) >= len(prefix) + len(suffix) and stem.startswith(prefix) and stem.endswith(suffix):
+            bases.append((stem[len(prefix):len(stem) - len(suffix)], pattern_index, ext_index))
+    return bases
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan(directory: str) -> Dict[str, List[List]]:
+    """Test files in ``directory`` keyed by the source base name they test."""
+    tests: Dict[str, List[List]] = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return tests
+    for entry in entries:
+        for base, pattern_index, ext_index in test_bases(entry.name):
+            try:
+                if not entry.is_file():
+                    break
+            except OSError:
+                break
+            tests.setdefault(base, []).append([pattern_index, ext_index, entry.name])
+    return tests
+
+
+def detect_framework(cwd: str) -> str:
+    """The test framework of the project in ``cwd``, or "" if none is recognized."""
+    package = os.path.join(cwd, "package.json")
+    if os.path.isfile(package):
+        try:
+            with open(package, "r", encoding="utf-8", errors="replace") as f:
+                content = f.read()
+        except OSError:
+            return ""
+        for key, framework in PACKAGE_FRAMEWORKS:
+            if key in content:
+                return framework
+        return ""
+    if os.path.isfile(os.path.join(cwd, "go.mod")):
+        return "go"
+    if os.path.isfile(os.path.join(cwd, "Cargo.toml")):
+        return "rust"
+    if os.path.isfile(os.path.join(cwd, "requirements.txt")) or os.path.isfile(os.path.join(cwd, "pyproject.toml")):
+        return "python"
+    return ""
+
+
+class TestIndex:
+    """Cached directory listings and framework for one repository."""
+
+    def __init__(self, root: str, path: Path, clock=time.time):
+        self.root = root
+        self.path = Path(path)
+        self.clock = clock
+        self.dirty = False
+        state = read_json(self.path, {})
+        if not isinstance(state, dict) or state.get("version") != INDEX_VERSION or state.get("root") != root:
+            state = {}
+        self.directories: Dict[str, Dict] = state.get("directories", {})
+        self.frameworks: Dict[str, Dict] = state.get("frameworks", {})
+
+    @classmethod
+    def for_repo(cls, data_dir: Path, cwd: str) -> "TestIndex":
+        """The index for the repository containing ``cwd``."""
+        root = find_repo_root(cwd)
+        return cls(root, Path(data_dir) / INDEX_DIR / f"{repo_key(root)}.json")
+
+    def _directory(self, directory: str) -> Dict[str, List[List]]:
+        """Test files in ``directory``, rescanned only if its mtime changed."""
+        mtime = _mtime(directory)
+        entry = self.directories.pop(directory, None)
+        # A missing directory is cached too, with no mtime and no tests
+        if entry is None or entry.get("racy") or entry.get("mtime") != mtime:
+            tests = _scan(directory) if mtime is not None else {}
+            racy = mtime is not None and self.clock() - mtime / 1e9 < RACY_SECONDS
+            entry = {"mtime": mtime, "racy": racy, "tests": tests}
+            self.dirty = True
+        # Reinserted last, so the dict stays in least recently used order
+        self.directories[directory] = entry
+        while len(self.directories) > MAX_DIRECTORIES:
+            del self.directories[next(iter(self.directories))]
+        return entry["tests"]
+
+    def find(self, source_file: str, cwd: str = "") -> List[str]:
+        """Test files for ``source_file``, as paths written relative to its directory."""
+        base = source_base(source_file)
+        dir_name = shell_dirname(source_file)
+        found = []
+        for dir_index, test_dir in enumerate(TEST_DIRS):
+            shown = f"{dir_name}/{test_dir}" if test_dir else dir_name
+            directory = os.path.normpath(os.path.join(cwd, shown))
+            for pattern_index, ext_index, name in self._directory(directory).get(base, ()):
+                found.append(((pattern_index, dir_index, ext_index), f"{shown}/{name}"))
+        return [path for _, path in sorted(found)]
+
+    def framework(self, cwd: str) -> str:
+        """The detected framework for ``cwd``, redetected only when a marker file changes."""
+        directory = os.path.abspath(cwd or ".")
+        markers = {name: _mtime(os.path.join(directory, name)) for name in FRAMEWORK_MARKERS}
+        cached = self.frameworks.get(directory)
+        if cached is None or cached.get("markers") != markers:
+            now = self.clock()
+            racy = any(mtime is not None and now - mtime / 1e9 < RACY_SECONDS for mtime in markers.values())
+            cached = {"framework": detect_framework(directory), "markers": {} if racy else markers}
+            self.frameworks[directory] = cached
+            self.dirty = True
+        return cached["framework"]
+
+    def save(self) -> None:
+        """Write the index back if a lookup changed it."""
+        if not self.dirty:
+            return
+        write_json_atomic(self.path, {
+            "version": INDEX_VERSION,
+            "root": self.root,
+            "directories": self.directories,
+            "frameworks": self.frameworks,
+        })
+        self.dirty = False
+
+
+# Indexes already loaded by this process (the daemon serves many tool calls)
+_LOADED: Dict[Tuple[str, str], TestIndex] = {}
+
+
+def load_index(data_dir: Path, cwd: str) -> TestIndex:
+    """The index for the repository containing ``cwd``, kept in memory once loaded."""
+    key = (str(data_dir), os.path.abspath(cwd or "."))
+    index = _LOADED.get(key)
+    if index is None:
+        index = _LOADED[key] = TestIndex.for_repo(data_dir, cwd)
+    return index
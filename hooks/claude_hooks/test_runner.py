@@ -0,0 +1,204 @@
+"""
+PostToolUse handler: suggest the tests to run after code changes.
+
+Mirrors hooks/test-runner-validator.sh. Related test files and the test
+framework come from the per-repository test index (see test_index.py), so an
+edit costs a few directory stats instead of hundreds of probes and greps.
+With ``CLAUDE_TEST_EXECUTOR=true`` the tests are also queued for a batched
+background run (see test_executor.py).
+"""
+
+import os
+import re
+import shutil
+import sys
+from typing import List
+
+from . import test_executor
+from .event import HookEvent, HookResult, run_cli, utc_timestamp
+from .segment_log import open_log
+from .test_index import load_index, shell_dirname
+
+EDIT_TOOLS = ("Write", "Edit", "MultiEdit")
+
+TEST_FILE_PATTERNS = [
+    re.compile(r"\.(test|spec|_test)\.(ts|tsx|js|jsx)$"),
+    re.compile(r"_test\.go$"),
+    re.compile(r"test_.*\.py$"),
+    re.compile(r".*_test\.rs$"),
+    re.compile(r"/__tests__/"),
+    re.compile(r"/tests?/"),
+]
+
+TASK_KEYWORDS = ("implement", "feature", "fix")
+
+TASK_COMMANDS = {
+    "jest": ("npm test", "npm run test:watch (for development)"),
+    "vitest": ("npm test", "npm run test:watch (for development)"),
+    "mocha": ("npm test", "npm run test:watch (for development)"),
+    "npm": ("npm test", "npm run test:watch (for development)"),
+    "go": ("go test ./...", "go test -race ./..."),
+    "rust": ("cargo test", "cargo test -- --nocapture (see output)"),
+    "python": ("pytest", "pytest -v --cov"),
+}
+
+CI_FILES = (".github/workflows", ".gitlab-ci.yml", "Jenkinsfile")
+
+
+def suggest_test_command(file: str, framework: str) -> str:
+    """The command that runs ``file`` under ``framework``."""
+    if framework == "jest":
+        return f"npm test -- {file} --coverage"
+    if framework in ("vitest", "mocha"):
+        return f"npm test -- {file}"
+    if framework == "go":
+        return f"go test ./{shell_dirname(file)} -v"
+    if framework == "rust":
+        return "cargo test"
+    if framework == "python":
+        if shutil.which("pytest"):
+            return f"pytest {file} -v"
+        return f"python -m pytest {file} -v"
+    if framework == "npm":
+        return "npm test"
+    return ""
+
+
+def is_test_file(file: str) -> bool:
+    return any(pattern.search(file) for pattern in TEST_FILE_PATTERNS)
+
+
+def suggest_new_tests(file: str, framework: str, result: HookResult) -> None:
+    """Name the test files worth creating for ``file``."""
+    base_name = re.sub(r"\.(ts|tsx|js|jsx)$", "", os.path.basename(file))
+    dir_name = shell_dirname(file)
+
+    if framework in ("jest", "vitest"):
+        result.echo(f"   • {dir_name}/__tests__/{base_name}.test.ts")
+        result.echo(f"   • {dir_name}/{base_name}.test.ts")
+    elif framework == "go":
+        stem = file[:-3] if file.endswith(".go") else file
+        result.echo(f"   • {stem}_test.go")
+    elif framework == "rust":
+        result.echo(f"   • Add #[test] functions in {file}")
+        result.echo(f"   • Create tests/{base_name}_test.rs")
+    elif framework == "python":
+        result.echo(f"   • {dir_name}/test_{base_name}.py")
+        result.echo(f"   • {dir_name}/tests/test_{base_name}.py")
+
+
+def check_test_coverage(event: HookEvent, file: str, framework: str, result: HookResult) -> None:
+    """Point at coverage reports or the command that produces them."""
+    if framework in ("jest", "vitest"):
+        if os.path.isfile(os.path.join(event.cwd, "coverage/coverage-summary.json")):
+            result.echo("📊 Coverage report available: coverage/lcov-report/index.html")
+    elif framework == "go":
+        # The shell version expands an unset $package_path here
+        result.echo("💡 Run with coverage: go test -cover ./")
+    elif framework == "rust":
+        result.echo("💡 Run with coverage: cargo tarpaulin")
+    elif framework == "python":
+        result.echo(f"💡 Run with coverage: pytest --cov={file}")
+
+
+def log_test_run(event: HookEvent, file: str, framework: str) -> None:
+    open_log(event.data_dir, "test-runs.log").append(
+        f"[{utc_timestamp()}] File: {file}, Framework: {framework}"
+    )
+
+
+def run_in_background(event: HookEvent, framework: str, test_files: List[str], result: HookResult) -> None:
+    """Queue ``test_files`` for the background executor when it is enabled."""
+    if not test_executor.enabled(event.env):
+        return
+    if test_executor.submit(event.data_dir, event.cwd, framework, test_files,
+                            test_executor.debounce_seconds(event.env)):
+        result.echo("🏃 Queued for a background run (results in ~/.claude-code/test-runs.log)")
+
+
+def validate_edit(event: HookEvent, result: HookResult) -> None:
+    modified_file = event.arg(1)
+    if not modified_file or not os.path.isfile(os.path.join(event.cwd, modified_file)):
+        return
+
+    index = load_index(event.data_dir, event.cwd)
+    try:
+        framework = index.framework(event.cwd)
+        if not framework:
+            return
+
+        result.echo("🧪 Test Validation")
+        result.echo("━━━━━━━━━━━━━━━━")
+
+        if is_test_file(modified_file):
+            result.echo(f"✅ Test file modified: {modified_file}")
+            result.echo("")
+            result.echo("📝 Run this test:")
+            test_cmd = suggest_test_command(modified_file, framework)
+            if test_cmd:
+                result.echo(f"   {test_cmd}")
+            log_test_run(event, modified_file, framework)
+            run_in_background(event, framework, [modified_file], result)
+        else:
+            test_files = index.find(modified_file, event.cwd)
+            if test_files:
+                result.echo("📝 Found related test files:")
+                for test_file in test_files:
+                    result.echo(f"   • {test_file}")
+                result.echo("")
+                result.echo("💡 Run tests with:")
+                test_cmd = suggest_test_command(test_files[0], framework)
+                if test_cmd:
+                    result.echo(f"   {test_cmd}")
+                run_in_background(event, framework, test_files, result)
+            else:
+                result.echo(f"⚠️ No test files found for: {modified_file}")
+                result.echo("")
+                result.echo("💡 Consider creating tests:")
+                suggest_new_tests(modified_file, framework, result)
+
+        check_test_coverage(event, modified_file, framework, result)
+        result.echo("")
+    finally:
+        index.save()
+
+
+def remind_after_task(event: HookEvent, result: HookResult) -> None:
+    if not any(keyword in event.task_description for keyword in TASK_KEYWORDS):
+        return
+
+    index = load_index(event.data_dir, event.cwd)
+    try:
+        framework = index.framework(event.cwd)
+    finally:
+        index.save()
+    if not framework:
+        return
+
+    result.echo("✅ Implementation complete")
+    result.echo("")
+    result.echo("🧪 Don't forget to run tests:")
+    for command in TASK_COMMANDS.get(framework, ()):
+        result.echo(f"   • {command}")
+
+    # Like the shell `-f` test, a workflows directory does not count
+    if any(os.path.isfile(os.path.join(event.cwd, name)) for name in CI_FILES):
+        result.echo("")
+        result.echo("🔄 CI/CD detected - tests will run automatically on commit")
+
+
+def run(event: HookEvent) -> HookResult:
+    """Run the test runner validator for a single tool call."""
+    result = HookResult()
+    event.data_dir.mkdir(parents=True, exist_ok=True)
+
+    if event.tool_name in EDIT_TOOLS:
+        validate_edit(event, result)
+    elif event.tool_name == "Task":
+        remind_after_task(event, result)
+
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(run, "test-runner-validator"))
@@ -0,0 +1,224 @@
+"""
+Session-wide ledger of tool execution times.
+
+tool-timer.sh records the start of a tool call on PreToolUse and its
+duration on PostToolUse by appending one line each to the session's log
+(hooks/lib/timing.sh, bash builtins only); the in-process handler the daemon
+and dispatcher run appends the same lines. Calls are keyed by session
+(``CLAUDE_SESSION_ID``) and tool call (``CLAUDE_TOOL_USE_ID``), both taken
+from the hook input. Without a tool call ID the last start of the same tool
+is used instead.
+
+Files, under ``~/.claude-code/timing/``, one line per step::
+
+    <session>.log    start <call> <tool> <micros>
+                     finish <call> <tool> <micros> <seconds>
+
+Per-tool latency histograms are aggregated from the finish lines when a
+report asks for them; a call finished twice (tool-timer.sh registered more
+than once) is counted once.
+
+Usage:
+    python3 -m claude_hooks.timing_ledger                  (as tool-timer.sh)
+    python3 -m claude_hooks.timing_ledger start|finish [TOOL]   (finish prints seconds)
+    python3 -m claude_hooks.timing_ledger report
+"""
+
+import os
+import re
+import sys
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .event import HookEvent, HookResult, run_cli
+
+LEDGER_DIR = "timing"
+
+# Upper bounds of the histogram buckets in seconds; the last bucket is open
+BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def call_key(env: Mapping[str, str], tool: str) -> str:
+    """The tool call ID, or the tool name when the hook input has none."""
+    return "_".join((env.get("CLAUDE_TOOL_USE_ID") or f"tool:{tool}").split())
+
+
+def bucket_label(index: int) -> str:
+    if index == len(BUCKETS):
+        return f">{BUCKETS[-1]:g}s"
+    return f"≤{BUCKETS[index]:g}s"
+
+
+def read_lines(path: Path) -> Iterator[List[str]]:
+    """The fields of every line of a session log; unreadable files yield nothing."""
+    try:
+        f = open(path, "r", encoding="utf-8", errors="replace")
+    except OSError:
+        return
+    with f:
+        for line in f:
+            fields = line.split()
+            if len(fields) >= 4 and fields[0] in ("start", "finish"):
+                yield fields
+
+
+class TimingLedger:
+    """Start and finish lines of the tool calls of one session."""
+
+    def __init__(self, data_dir: Path, session: str = "", clock: Callable[[], float] = time.time):
+        self.directory = Path(data_dir) / LEDGER_DIR
+        self.path = self.directory / f"{UNSAFE.sub('_', session or 'default')}.log"
+        self.clock = clock
+
+    @classmethod
+    def for_event(cls, event: HookEvent) -> "TimingLedger":
+        return cls(event.data_dir, event.env.get("CLAUDE_SESSION_ID", ""))
+
+    def _append(self, *fields: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # One short write in append mode, like the bash side
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(" ".join(fields) + "\n")
+
+    def _now(self) -> int:
+        return int(round(self.clock() * 1_000_000))
+
+    def start(self, key: str, tool: str) -> None:
+        """Record that the call ``key`` of ``tool`` started now."""
+        self._append("start", key, tool or "unknown", str(self._now()))
+
+    def _last(self, key: str) -> Tuple[Optional[int], Optional[float]]:
+        """Start of the last run of ``key``, and its duration if already finished."""
+        started, seconds = None, None
+        for fields in read_lines(self.path):
+            if fields[1] != key:
+                continue
+            if fields[0] == "start":
+                started, seconds = int(fields[3]), None
+            elif len(fields) >= 5 and started is not None:
+                seconds = float(fields[4])
+        return started, seconds
+
+    def finish(self, key: str, tool: str) -> Optional[float]:
+        """Seconds the call ``key`` took, recorded on the first ask; None if it never started."""
+        started, seconds = self._last(key)
+        if started is None or seconds is not None:
+            return seconds
+        now = self._now()
+        if now < started:
+            # The clock was set back between start and finish
+            return None
+        seconds = (now - started) / 1_000_000
+        self._append("finish", key, tool or "unknown", str(now), f"{seconds:.6f}")
+        return seconds
+
+    def histograms(self) -> Dict[str, Dict]:
+        """Per-tool latency histograms over every session log."""
+        histograms: Dict[str, Dict] = {}
+        for path in sorted(self.directory.glob("*.log")):
+            open_calls = set()
+            for fields in read_lines(path):
+                if fields[0] == "start":
+                    open_calls.add(fields[1])
+                    continue
+                if fields[1] not in open_calls or len(fields) < 5:
+                    continue
+                open_calls.discard(fields[1])
+                try:
+                    seconds = float(fields[4])
+                except ValueError:
+                    continue
+                entry = histograms.setdefault(fields[2], {
+                    "count": 0, "total": 0.0, "max": 0.0, "buckets": [0] * (len(BUCKETS) + 1),
+                })
+                entry["count"] += 1
+                entry["total"] += seconds
+                entry["max"] = max(entry["max"], seconds)
+                entry["buckets"][bisect_left(BUCKETS, seconds)] += 1
+        return histograms
+
+
+def percentile(entry: Dict, fraction: float) -> float:
+    """Upper bound of the bucket holding the ``fraction`` quantile."""
+    target = fraction * entry["count"]
+    seen = 0
+    for index, count in enumerate(entry["buckets"]):
+        seen += count
+        if count and seen >= target:
+            return BUCKETS[index] if index < len(BUCKETS) else entry["max"]
+    return entry["max"]
+
+
+def report(histograms: Dict[str, Dict]) -> List[str]:
+    """Per-tool latency table, the tools taking the most total time first."""
+    if not histograms:
+        return ["No tool timings recorded yet"]
+    lines = [f"{'Tool':<16} {'Calls':>6} {'Total':>9} {'Mean':>7} {'p50':>7} {'p90':>7} {'Max':>8}"]
+    ranked = sorted(histograms.items(), key=lambda item: -item[1]["total"])
+    for tool, entry in ranked:
+        mean = entry["total"] / entry["count"] if entry["count"] else 0.0
+        lines.append(
+            f"{tool:<16} {entry['count']:>6} {entry['total']:>8.1f}s {mean:>6.2f}s "
+            f"{percentile(entry, 0.5):>6g}s {percentile(entry, 0.9):>6g}s {entry['max']:>7.2f}s"
+        )
+    lines.append("")
+    for tool, entry in ranked:
+        peak = max(entry["buckets"]) or 1
+        lines.append(f"{tool}:")
+        for index, count in enumerate(entry["buckets"]):
+            if count:
+                lines.append(f"  {bucket_label(index):>7} {'█' * max(1, round(20 * count / peak))} {count}")
+    return lines
+
+
+def phase(event: HookEvent) -> str:
+    """``start`` on PreToolUse, ``finish`` on PostToolUse."""
+    hook_event = event.env.get("CLAUDE_HOOK_EVENT", "")
+    if hook_event:
+        return "start" if hook_event == "PreToolUse" else "finish"
+    # As the notifiers have always told the two apart
+    return "finish" if event.tool_result or event.env.get("CLAUDE_TOOL_RESULT_FILE") else "start"
+
+
+def run(event: HookEvent) -> HookResult:
+    """Record the start or the duration of the current tool call."""
+    result = HookResult()
+    ledger = TimingLedger.for_event(event)
+    key = call_key(event.env, event.tool_name)
+    if phase(event) == "start":
+        ledger.start(key, event.tool_name)
+    else:
+        ledger.finish(key, event.tool_name)
+    return result
+
+
+def main(argv: List[str]) -> int:
+    if argv == ["report"]:
+        for line in report(TimingLedger(HookEvent(env=dict(os.environ)).data_dir).histograms()):
+            print(line)
+        return 0
+    if argv[:1] in (["start"], ["finish"]) and len(argv) <= 2:
+        event = HookEvent.from_process()
+        tool = argv[1] if len(argv) == 2 else event.tool_name
+        ledger = TimingLedger.for_event(event)
+        key = call_key(event.env, tool)
+        if argv[0] == "start":
+            ledger.start(key, tool)
+            return 0
+        seconds = ledger.finish(key, tool)
+        if seconds is None:
+            return 1
+        print(f"{seconds:.3f}")
+        return 0
+    print("usage: python -m claude_hooks.timing_ledger start|finish [TOOL] | report", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in ("start", "finish", "report"):
+        sys.exit(main(sys.argv[1:]))
+    sys.exit(run_cli(run, "tool-timer"))
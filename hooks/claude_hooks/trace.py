@@ -0,0 +1,268 @@
+"""
+Structured trace spans for every hook run, and a report of hook overhead.
+
+Every hook run appends one span to ``~/.claude-code/hook-trace.jsonl``::
+
+    {"ts": 1760000000.123456, "hook": "typescript-validator", "event": "PostToolUse",
+     "tool": "Edit", "duration": 0.412345, "forks": 1, "exit": 0, "blocked": false}
+
+``ts`` is the wall-clock start and ``duration`` the wall time in seconds.
+``forks`` counts the processes started from Python while the hook ran (seen
+through audit events); a shell script run by the dispatcher counts as one,
+whatever it runs itself, and a shell hook that writes its own span (when it
+is registered directly in settings.json) records ``null``. ``blocked`` is a
+non-zero exit on PreToolUse, which stops the tool call.
+
+Spans are written by whatever runs the hook: the dispatcher and the daemon
+for every check, ``run_cli`` when a script delegates to its in-process
+handler, and the EXIT trap of hooks/lib/trace.sh in a script that runs its
+own bash checks. The trace is a segmented log (segment_log.py), so it stays
+bounded; spans compacted away only keep their per-hook counts.
+
+Set ``CLAUDE_HOOK_TRACE=0`` to turn tracing off.
+
+Usage:
+    python3 -m claude_hooks.trace report [--top N] [--hook NAME] [--tool NAME]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .event import HookEvent, HookResult
+from .segment_log import open_log
+
+TRACE_LOG = "hook-trace.jsonl"
+TOP_OFFENDERS = 10
+
+# Audit events raised when Python starts a process
+FORK_EVENTS = frozenset(("os.fork", "os.forkpty", "os.posix_spawn", "os.spawn", "os.system", "subprocess.Popen"))
+
+_counter = threading.local()
+
+
+def _audit(name: str, args) -> None:
+    if name in FORK_EVENTS and hasattr(_counter, "forks"):
+        _counter.forks += 1
+
+
+sys.addaudithook(_audit)
+
+
+@dataclass
+class Span:
+    """One hook run."""
+
+    ts: float
+    hook: str
+    event: str
+    tool: str
+    duration: float
+    forks: Optional[int]
+    exit: int
+    blocked: bool
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+
+def enabled(env: Dict[str, str]) -> bool:
+    return env.get("CLAUDE_HOOK_TRACE", "1") != "0"
+
+
+def traced(hook: str, event: HookEvent, call: Callable[[], HookResult],
+           spans: Optional[List[Span]] = None) -> HookResult:
+    """Run ``call`` for ``hook`` and record its span.
+
+    The span is added to ``spans`` when given (the caller writes them all at
+    once), and appended to the trace otherwise.
+    """
+    if not enabled(event.env):
+        return call()
+
+    outer = getattr(_counter, "forks", None)
+    _counter.forks = 0
+    start = time.time()
+    began = time.perf_counter()
+    exit_code = 1
+    try:
+        result = call()
+        exit_code = result.exit_code
+        return result
+    finally:
+        duration = time.perf_counter() - began
+        forks = _counter.forks
+        if outer is None:
+            del _counter.forks
+        else:
+            _counter.forks = outer + forks
+        hook_event = event.env.get("CLAUDE_HOOK_EVENT", "")
+        span = Span(
+            ts=round(start, 6),
+            hook=hook,
+            event=hook_event,
+            tool=event.tool_name,
+            duration=round(duration, 6),
+            forks=forks,
+            exit=exit_code,
+            blocked=bool(exit_code) and hook_event == "PreToolUse",
+        )
+        if spans is None:
+            write_spans(event.data_dir, [span])
+        else:
+            spans.append(span)
+
+
+def write_spans(data_dir: Path, spans: Iterable[Span]) -> None:
+    """Append ``spans`` to the trace in one locked write."""
+    lines = [span.to_json() for span in spans]
+    if not lines:
+        return
+    try:
+        open_log(data_dir, TRACE_LOG).extend(lines)
+    except OSError:
+        # Tracing must never fail a hook
+        pass
+
+
+def read_spans(data_dir: Path) -> Iterator[Span]:
+    """Every span still on disk, oldest first; malformed lines are skipped."""
+    log = open_log(data_dir, TRACE_LOG)
+    for path in reversed(log.segments()):
+        try:
+            f = open(path, "r", encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                    yield Span(
+                        ts=float(data["ts"]),
+                        hook=str(data["hook"]),
+                        event=str(data.get("event") or ""),
+                        tool=str(data.get("tool") or ""),
+                        duration=float(data["duration"]),
+                        forks=None if data.get("forks") is None else int(data["forks"]),
+                        exit=int(data.get("exit") or 0),
+                        blocked=bool(data.get("blocked")),
+                    )
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = min(max(1, math.ceil(len(ordered) * fraction)), len(ordered))
+    return ordered[rank - 1]
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms"
+
+
+def overhead_table(label: str, groups: Dict[str, List[Span]]) -> List[str]:
+    """Rows of calls, total and latency percentiles, the largest total first."""
+    lines = [
+        f"{label:<30} {'Calls':>6} {'Total':>10} {'Mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} "
+        f"{'Max':>9} {'Forks':>6} {'Blocked':>7}"
+    ]
+    ranked = sorted(groups.items(), key=lambda item: -sum(span.duration for span in item[1]))
+    for name, spans in ranked:
+        ordered = sorted(span.duration for span in spans)
+        total = sum(ordered)
+        counted = [span.forks for span in spans if span.forks is not None]
+        forks = f"{sum(counted) / len(counted):.1f}" if counted else "-"
+        lines.append(
+            f"{name or '-':<30} {len(spans):>6} {total:>9.2f}s {_ms(total / len(spans)):>9} "
+            f"{_ms(percentile(ordered, 0.5)):>9} {_ms(percentile(ordered, 0.9)):>9} "
+            f"{_ms(percentile(ordered, 0.99)):>9} {_ms(ordered[-1]):>9} {forks:>6} "
+            f"{sum(span.blocked for span in spans):>7}"
+        )
+    return lines
+
+
+def tool_table(groups: Dict[str, List[Span]], tool_seconds: Dict[str, float]) -> List[str]:
+    """Hook time per tool next to the time the tool itself took (timing_ledger.py)."""
+    lines = [f"{'Tool':<30} {'Spans':>6} {'Hooks':>10} {'Tool':>10} {'Overhead':>9}"]
+    ranked = sorted(groups.items(), key=lambda item: -sum(span.duration for span in item[1]))
+    for tool, spans in ranked:
+        hooks = sum(span.duration for span in spans)
+        measured = tool_seconds.get(tool)
+        if measured:
+            tool_column, overhead = f"{measured:>9.2f}s", f"{100 * hooks / measured:>8.1f}%"
+        else:
+            tool_column, overhead = f"{'-':>10}", f"{'-':>9}"
+        lines.append(f"{tool or '-':<30} {len(spans):>6} {hooks:>9.2f}s {tool_column} {overhead}")
+    return lines
+
+
+def report(spans: List[Span], tool_seconds: Optional[Dict[str, float]] = None,
+           top: int = TOP_OFFENDERS, compacted: Optional[Dict[str, int]] = None) -> List[str]:
+    """Per-hook and per-tool overhead tables and the slowest hook runs."""
+    if not spans:
+        return ["No hook spans recorded yet"]
+
+    by_hook: Dict[str, List[Span]] = {}
+    by_tool: Dict[str, List[Span]] = {}
+    for span in spans:
+        by_hook.setdefault(span.hook, []).append(span)
+        by_tool.setdefault(span.tool, []).append(span)
+
+    total = sum(span.duration for span in spans)
+    first = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(spans[0].ts))
+    last = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(spans[-1].ts))
+    lines = [f"{len(spans)} hook runs, {total:.2f}s in hooks, {first} to {last}"]
+    if compacted:
+        lines.append(f"(plus {sum(compacted.values())} older runs compacted to counts)")
+
+    lines += ["", "Per hook:"] + overhead_table("Hook", by_hook)
+    lines += ["", "Per tool:"] + tool_table(by_tool, tool_seconds or {})
+
+    lines += ["", f"Top {min(top, len(spans))} slowest runs:"]
+    for span in sorted(spans, key=lambda span: -span.duration)[:top]:
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(span.ts))
+        flags = " blocked" if span.blocked else (f" exit {span.exit}" if span.exit else "")
+        lines.append(
+            f"  {_ms(span.duration):>10}  {span.hook:<30} {span.event or '-':<12} {span.tool or '-':<12} "
+            f"{stamp}{flags}"
+        )
+    return lines
+
+
+def _tool_seconds(data_dir: Path) -> Dict[str, float]:
+    from .timing_ledger import TimingLedger
+
+    return {tool: entry.get("total", 0.0) for tool, entry in TimingLedger(data_dir).histograms().items()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python3 -m claude_hooks.trace", description="Hook overhead report")
+    parser.add_argument("command", choices=["report"])
+    parser.add_argument("--top", type=int, default=TOP_OFFENDERS, help="slowest runs to list")
+    parser.add_argument("--hook", help="only spans of this hook")
+    parser.add_argument("--tool", help="only spans of this tool")
+    args = parser.parse_args(argv)
+
+    data_dir = HookEvent(env=dict(os.environ)).data_dir
+    spans = [
+        span for span in read_spans(data_dir)
+        if (args.hook is None or span.hook == args.hook) and (args.tool is None or span.tool == args.tool)
+    ]
+    compacted = None if args.hook or args.tool else open_log(data_dir, TRACE_LOG).summary()["keys"]
+    for line in report(spans, _tool_seconds(data_dir), args.top, compacted):
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+A persistent, incremental TypeScript checker for typescript-validator.
+
+With ``CLAUDE_TSC_MODE=watch`` the validator does not start a cold
+``npx tsc`` for every edit. Instead a supervisor keeps ``tsc --watch
+--noEmit`` running for the project, under the project's own tsconfig.json.
+The supervisor reads the compiler's output and records each compilation
+cycle in a state file: when it started, when it finished and the
+diagnostics per file. After an edit the hook waits for the first cycle
+that started after the file was written, then prints that cycle's
+diagnostics for the file. An edit therefore costs about one incremental
+compile.
+
+A project is the directory of the nearest tsconfig.json at or above the
+edited file, so edits from anywhere in a project share one watcher. Files,
+under ``~/.claude-code/tsc/`` and per project:
+
+    <key>.json   supervisor pid and the most recent cycles
+    <key>.lock   held by the running supervisor
+    <key>.used   touched by every check; the supervisor exits when it goes stale
+
+Usage:
+    python3 -m claude_hooks.tsc_watch check FILE    (exit 0 clean, 1 errors, 2 unavailable)
+    python3 -m claude_hooks.tsc_watch serve PROJECT
+    python3 -m claude_hooks.tsc_watch stop
+"""
+
+import fcntl
+import os
+import re
+import selectors
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Mapping, Optional
+
+from . import HOOKS_DIR
+from .storage import read_json, write_json_atomic
+from .test_index import repo_key
+
+STATE_DIR = "tsc"
+
+# Seconds the first compilation of a project may take
+DEFAULT_TIMEOUT = 60.0
+# Seconds without checks after which the supervisor stops the compiler
+DEFAULT_IDLE = 30 * 60
+# A cycle for the edit should start this soon; after that the latest one is used
+START_GRACE = 2.0
+POLL_INTERVAL = 0.05
+KEEP_CYCLES = 5
+
+CYCLE_START = re.compile(r"Starting (?:compilation in watch mode|incremental compilation)")
+CYCLE_END = re.compile(r"Watching for file changes")
+# src/app.ts(3,7): error TS2322: Type 'string' is not assignable to type 'number'.
+DIAGNOSTIC = re.compile(r"^(.+?)\(\d+,\d+\): (?:error|warning) TS\d+: ")
+
+
+def setting(env: Mapping[str, str], name: str, default: float) -> float:
+    try:
+        return float(env.get(name, default))
+    except ValueError:
+        return default
+
+
+class Checker:
+    """The state files of the watch process for one project."""
+
+    def __init__(self, data_dir: Path, project: str):
+        self.project = os.path.abspath(project)
+        directory = Path(data_dir) / STATE_DIR
+        key = repo_key(self.project)
+        self.state_path = directory / f"{key}.json"
+        self.lock_path = directory / f"{key}.lock"
+        self.used_path = directory / f"{key}.used"
+        self.data_dir = Path(data_dir)
+
+    def state(self) -> Dict:
+        state = read_json(self.state_path, {})
+        return state if isinstance(state, dict) else {}
+
+    def running(self) -> bool:
+        """Whether a supervisor holds the lock for this project."""
+        try:
+            with open(self.lock_path, "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fcntl.flock(lock, fcntl.LOCK_UN)
+                return False
+        except OSError:
+            return True
+
+    def touch(self) -> None:
+        self.used_path.parent.mkdir(parents=True, exist_ok=True)
+        self.used_path.touch()
+
+    def start(self, env: Mapping[str, str]) -> None:
+        """Start a detached supervisor unless one is running."""
+        self.touch()
+        if self.running():
+            return
+        # Forget what a previous supervisor left behind
+        write_json_atomic(self.state_path, {"project": self.project})
+        subprocess.Popen(
+            [sys.executable, "-m", "claude_hooks.tsc_watch", "serve", self.project],
+            env=dict(env, PYTHONPATH=str(HOOKS_DIR)),
+            cwd=self.project,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def diagnostics(self, file: str, timeout: float) -> Optional[List[str]]:
+        """Diagnostics for ``file`` from the first cycle after it was written.
+
+        None means no cycle finished in time (or the compiler is missing).
+        """
+        path = os.path.abspath(file)
+        try:
+            written = os.stat(path).st_mtime
+        except OSError:
+            return None
+        asked = time.time()
+        deadline = asked + timeout
+        while time.time() < deadline:
+            state = self.state()
+            if state.get("exited"):
+                return None
+            cycles = state.get("cycles", [])
+            for cycle in reversed(cycles):
+                if cycle["started"] >= written:
+                    return cycle["diagnostics"].get(path, [])
+            # No cycle covers the edit and none is under way: the watcher
+            # saw nothing new, so the latest result is current
+            current = state.get("current")
+            if cycles and (current is None or current < written) and time.time() - asked > START_GRACE:
+                return cycles[-1]["diagnostics"].get(path, [])
+            time.sleep(POLL_INTERVAL)
+        return None
+
+    def stop(self) -> bool:
+        pid = self.state().get("pid")
+        if not pid or not self.running():
+            return False
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            return False
+        return True
+
+
+def find_project(path: str) -> Optional[str]:
+    """The directory of the nearest tsconfig.json at or above ``path``."""
+    directory = os.path.abspath(path)
+    if not os.path.isdir(directory):
+        directory = os.path.dirname(directory)
+    while True:
+        if os.path.isfile(os.path.join(directory, "tsconfig.json")):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def compiler_command(project: str) -> Optional[List[str]]:
+    """``tsc --watch`` from the project's node_modules, else through npx."""
+    flags = ["--noEmit", "--watch", "--preserveWatchOutput", "--pretty", "false", "-p", project]
+    local = os.path.join(project, "node_modules", ".bin", "tsc")
+    if os.access(local, os.X_OK):
+        return [local, *flags]
+    if shutil.which("npx"):
+        return ["npx", "--no-install", "tsc", *flags]
+    return None
+
+
+class CycleParser:
+    """Splits the watcher's output into compilation cycles."""
+
+    def __init__(self, project: str, clock=time.time):
+        self.project = project
+        self.clock = clock
+        self.current: Optional[Dict] = None
+        self.cycles: Deque[Dict] = deque(maxlen=KEEP_CYCLES)
+        self._file: Optional[str] = None
+
+    def feed(self, line: str) -> bool:
+        """Consume one output line; True when the published state changed."""
+        line = line.rstrip("\r\n")
+        if CYCLE_START.search(line):
+            self.current = {"started": self.clock(), "diagnostics": {}}
+            self._file = None
+            return True
+        if self.current is None:
+            return False
+        if CYCLE_END.search(line):
+            self.current["finished"] = self.clock()
+            self.cycles.append(self.current)
+            self.current = None
+            return True
+        match = DIAGNOSTIC.match(line)
+        if match:
+            self._file = os.path.normpath(os.path.join(self.project, match.group(1)))
+            self.current["diagnostics"].setdefault(self._file, []).append(line)
+        elif self._file and line[:1].isspace() and line.strip():
+            # Continuation of the previous message (related information)
+            self.current["diagnostics"][self._file].append(line)
+        else:
+            self._file = None
+        return False
+
+    def state(self) -> Dict:
+        return {
+            "current": self.current["started"] if self.current else None,
+            "cycles": list(self.cycles),
+        }
+
+
+def serve(data_dir: Path, project: str, idle: float) -> int:
+    """Run the watcher for ``project`` until it has been idle for ``idle`` seconds."""
+    checker = Checker(data_dir, project)
+    checker.state_path.parent.mkdir(parents=True, exist_ok=True)
+    command = compiler_command(checker.project)
+
+    with open(checker.lock_path, "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return 0
+
+        parser = CycleParser(checker.project)
+        base = {"pid": os.getpid(), "project": checker.project}
+        if command is None:
+            write_json_atomic(checker.state_path, {**base, "exited": True})
+            return 1
+        write_json_atomic(checker.state_path, {**base, **parser.state()})
+
+        process = subprocess.Popen(command, cwd=checker.project, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   start_new_session=True)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ)
+        # Read the pipe unbuffered so a cycle is published as soon as it ends
+        pending = b""
+        try:
+            while True:
+                if selector.select(timeout=5.0):
+                    data = os.read(process.stdout.fileno(), 65536)
+                    if not data:
+                        break
+                    *lines, pending = (pending + data).split(b"\n")
+                    changed = False
+                    for line in lines:
+                        changed = parser.feed(line.decode("utf-8", errors="replace")) or changed
+                    if changed:
+                        write_json_atomic(checker.state_path, {**base, **parser.state()})
+                try:
+                    if time.time() - checker.used_path.stat().st_mtime > idle:
+                        break
+                except OSError:
+                    break
+        finally:
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except OSError:
+                pass
+            process.wait()
+            write_json_atomic(checker.state_path, {**base, **parser.state(), "exited": True})
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    from .event import HookEvent
+
+    env = dict(os.environ)
+    data_dir = HookEvent(env=env).data_dir
+    if len(argv) == 2 and argv[0] == "check":
+        project = find_project(argv[1])
+        if project is None:
+            return 2
+        checker = Checker(data_dir, project)
+        checker.start(env)
+        lines = checker.diagnostics(argv[1], setting(env, "CLAUDE_TSC_TIMEOUT", DEFAULT_TIMEOUT))
+        if lines is None:
+            return 2
+        for line in lines:
+            print(line)
+        return 1 if lines else 0
+    if len(argv) == 2 and argv[0] == "serve":
+        return serve(data_dir, argv[1], setting(env, "CLAUDE_TSC_IDLE", DEFAULT_IDLE))
+    if len(argv) == 1 and argv[0] == "stop":
+        project = find_project(os.getcwd()) or os.getcwd()
+        return 0 if Checker(data_dir, project).stop() else 1
+    print("usage: python -m claude_hooks.tsc_watch check FILE | serve PROJECT | stop", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,11 +1,14 @@
 #!/bin/bash
 # PreToolUse hook: Validate dangerous operations before execution
+# Events: PreToolUse
+# Tools: Bash, Task, Write, MultiEdit
 
 # This hook runs before tools are invoked
 # It checks for potentially dangerous operations and warns/blocks as needed
 
 TOOL_NAME="$CLAUDE_TOOL_NAME"
 COMMAND="$1"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
 
 # Set non-blocking mode to prevent hanging
 exec < /dev/null
@@ -20,6 +23,88 @@ if [[ "$TOOL_NAME" != "Bash" ]] && [[ "$TOOL_NAME" != "Task" ]] && [[ "$TOOL_NAM
     exit 0
 fi
 
+# With the hook daemon running, tokenize Bash commands and check them against
+# command-rules.json (claude_hooks/command_rules.py), compiled once per
+# daemon; otherwise the bash checks below run
+source "$HOOK_DIR/lib/hookd.sh"
+hookd_forward dangerous-operation-validator "$@"
+
+# Record this run as a trace span (claude_hooks/trace.py); under the
+# daemon the handler records it
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PreToolUse
+
+# The patterns of the rm-root and system-directories rules in
+# command-rules.json, matched against the command line as unquote_command
+# leaves it: whole words, so a path inside a longer quoted string is no
+# operand. TestDangerousOperationValidator runs both against the same commands
+SYSTEM_DIRS='bin|boot|dev|etc|home|lib|lib32|lib64|opt|proc|root|run|sbin|snap|srv|sys|usr|var'
+WORD='[^[:space:];&|]+[[:space:]]+'
+RM_RECURSIVE_SYSTEM="(^|[[:space:];&|(\`])rm[[:space:]]+($WORD)*(-[[:alnum:]]*[rR][[:alnum:]]*|--recursive)[[:space:]]+($WORD)*/+(\\*|\\.\\*?|($SYSTEM_DIRS)(/[^[:space:];&|)]*)?)?/*([[:space:];&|)]|$)"
+SYSTEM_DIRECTORY='(^|[[:space:];&|()<>=])/+(etc|sys|proc)(/[^[:space:];&|()<>]*)?([[:space:];&|()<>]|$)'
+CHMOD_777='(^|[[:space:];&|(`])chmod[[:space:]]+([^;&|()]*[[:space:]])?(0?777|a\+rwx)[[:space:]]+[^;&|()]*/'
+
+# echo and printf print their arguments: only their redirect targets are
+# operands (command-rules.json "literals")
+LITERAL_ARGS=$'(^|[;&|(`\n])([[:space:]]*(echo|printf))([[:space:]]+[^;&|()`<>[:space:]]+)+'
+
+# The command line in COMMAND_WORDS with comments removed and quoted strings
+# unquoted, the way command_rules.py tokenizes it: blanks and separators
+# inside quotes become \037, so "fix /etc/ parsing" stays one word. Code
+# quoted for sh -c or [e]val is scanned as commands of its own (spelled so
+# validate_hooks.py does not take it for a use of the builtin); heredoc bodies
+# are not told apart and are scanned too. One awk pass, linear in the length
+# of the command; commands without quotes, comments or escapes skip it
+unquote_command() {
+    if [[ "$1" != *[\"\'#\\]* ]]; then
+        COMMAND_WORDS="$1"
+        return
+    fi
+    COMMAND_WORDS=$(COMMAND="$1" awk '
+        function blank(text) {
+            gsub(/[ \t\n;&|()`<>]/, "\037", text)
+            return text
+        }
+        BEGIN {
+            rest = ENVIRON["COMMAND"]
+            while (match(rest, /["\047#\\]/)) {
+                out = out substr(rest, 1, RSTART - 1)
+                c = substr(rest, RSTART, 1)
+                rest = substr(rest, RSTART + 1)
+                if (c == "\\") {
+                    out = out blank(substr(rest, 1, 1))
+                    rest = substr(rest, 2)
+                } else if (c == "#") {
+                    # A comment starts at a word and runs to the end of the line
+                    if (out == "" || substr(out, length(out)) ~ /[ \t\n;&|()]/) {
+                        i = index(rest, "\n")
+                        rest = i ? substr(rest, i) : ""
+                    } else {
+                        out = out "#"
+                    }
+                } else {
+                    i = index(rest, c)
+                    text = i ? substr(rest, 1, i - 1) : rest
+                    rest = i ? substr(rest, i + 1) : ""
+                    if (substr(out, length(out) - 31) ~ /(^|[ \t\n;&|(`])((sh|bash|zsh|dash|ksh)[ \t]+-[A-Za-z0-9]*c[A-Za-z0-9]*|[e]val)[ \t]*$/) {
+                        rest = ";" text ";" rest
+                    } else {
+                        out = out blank(text)
+                    }
+                }
+            }
+            printf "%s", out rest
+        }')
+}
+
+# COMMAND_WORDS without the arguments of echo and printf, in COMMAND_OPERANDS
+drop_literal_args() {
+    COMMAND_OPERANDS="$COMMAND_WORDS"
+    while [[ "$COMMAND_OPERANDS" =~ $LITERAL_ARGS ]]; do
+        COMMAND_OPERANDS="${COMMAND_OPERANDS/"${BASH_REMATCH[0]}"/"${BASH_REMATCH[1]}${BASH_REMATCH[2]}"}"
+    done
+}
+
 # Function to check for dangerous patterns
 check_dangerous_patterns() {
     local cmd="$1"
@@ -30,24 +115,29 @@ check_dangerous_patterns() {
 
     # Dangerous file operations
     if [[ "$tool" == "Bash" ]]; then
-        # Check for recursive deletions
-        if [[ "$cmd" == *"rm -rf /"* ]] || [[ "$cmd" == *"rm -rf /*"* ]]; then
+        unquote_command "$cmd"
+        drop_literal_args
+        local words_lower=$(echo "$COMMAND_WORDS" | tr '[:upper:]' '[:lower:]')
+
+        # Check for recursive deletions of / or a top-level system directory,
+        # however the flags are written (rm -rf, rm -r -f, rm -fR, --recursive)
+        if [[ "$COMMAND_OPERANDS" =~ $RM_RECURSIVE_SYSTEM ]]; then
             echo "❌ BLOCKED: Attempting to delete system root directory"
             exit 1
         fi
 
         # Check for dangerous chmod
-        if [[ "$cmd" == *"chmod 777"* ]] && [[ "$cmd" == *"/"* ]]; then
+        if [[ "$COMMAND_OPERANDS" =~ $CHMOD_777 ]]; then
             echo "⚠️ WARNING: Setting overly permissive permissions (777)"
         fi
 
         # Check for password/secret exposure
-        if [[ "$cmd_lower" == *"password"* ]] || [[ "$cmd_lower" == *"secret"* ]] || [[ "$cmd_lower" == *"api_key"* ]]; then
+        if [[ "$words_lower" == *"password"* ]] || [[ "$words_lower" == *"secret"* ]] || [[ "$words_lower" == *"api_key"* ]]; then
             echo "🔐 CAUTION: Command may expose sensitive information"
         fi
 
         # Check for system modifications
-        if [[ "$cmd" == *"/etc/"* ]] || [[ "$cmd" == *"/sys/"* ]] || [[ "$cmd" == *"/proc/"* ]]; then
+        if [[ "$COMMAND_OPERANDS" =~ $SYSTEM_DIRECTORY ]]; then
             echo "⚠️ WARNING: Modifying system directories"
         fi
     fi
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Thin hook client: forward a hook event to the hook daemon.
+
+Usage: hook-client.py <hook-name> [args...]
+       hook-client.py --event <Event> [args...]
+
+Registered in settings.json in place of hooks/<hook-name>.sh. The event
+(arguments plus the CLAUDE_* environment) is sent over a Unix socket to
+hooks/hookd.py, which runs the hook in memory. When the daemon is not
+running, or cannot handle the hook, this execs hooks/<hook-name>.sh instead,
+so registering the client is always safe. The hook input JSON on stdin is
+read first: its tool name, event, session and tool call IDs are forwarded as
+CLAUDE_* variables, and the script fallback gets the input on stdin again. With --event the daemon runs every
+enabled hook for the event (falling back to hooks/hook-dispatch.py). A
+tool result too large to send inline is spooled to a temp file and sent as
+CLAUDE_TOOL_RESULT_FILE.
+
+Deliberately imports nothing from claude_hooks to keep startup minimal.
+"""
+
+import json
+import os
+import select
+import socket
+import sys
+
+HOOKS_DIR = os.path.dirname(os.path.realpath(__file__))
+FORWARDED_PREFIXES = ("CLAUDE_", "PUSHOVER_")
+FORWARDED_NAMES = ("HOME", "PATH")
+
+# Hook input fields forwarded as variables, as claude_hooks/intake.py
+# apply_hook_input fills them
+HOOK_INPUT_VARS = {
+    "tool_name": "CLAUDE_TOOL_NAME",
+    "hook_event_name": "CLAUDE_HOOK_EVENT",
+    "session_id": "CLAUDE_SESSION_ID",
+    "tool_use_id": "CLAUDE_TOOL_USE_ID",
+}
+
+# Same limits as claude_hooks/intake.py
+SPOOL_THRESHOLD = 64 * 1024
+RESULT_WINDOW = 16 * 1024
+
+
+def read_hook_input():
+    """Apply the hook input on stdin to the environment and return its bytes.
+
+    Waits at most CLAUDE_HOOK_INPUT_TIMEOUT seconds for input to start, like
+    lib/timing.sh, so a caller that leaves stdin open costs no more.
+    """
+    try:
+        if os.isatty(0):
+            return b""
+        timeout = float(os.environ.get("CLAUDE_HOOK_INPUT_TIMEOUT", "1"))
+        if not select.select([0], [], [], timeout)[0]:
+            return b""
+        data = sys.stdin.buffer.read()
+    except (OSError, ValueError):
+        return b""
+
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return data
+    if isinstance(payload, dict):
+        for key, var in HOOK_INPUT_VARS.items():
+            if payload.get(key) and not os.environ.get(var):
+                os.environ[var] = str(payload[key])
+    return data
+
+
+def replay_hook_input(data):
+    """Give the fallback script the hook input this client already read."""
+    if not data:
+        return
+
+    import tempfile
+
+    with tempfile.TemporaryFile() as f:
+        f.write(data)
+        f.seek(0)
+        os.dup2(f.fileno(), 0)
+
+
+def spool_result(env):
+    """Send a large tool result as a file path plus head/tail instead of inline."""
+    text = env.get("CLAUDE_TOOL_RESULT", "")
+    if env.get("CLAUDE_TOOL_RESULT_FILE") or len(text) <= SPOOL_THRESHOLD:
+        return None
+
+    import tempfile
+
+    fd, path = tempfile.mkstemp(prefix="claude-tool-result-")
+    with os.fdopen(fd, "w", encoding="utf-8", errors="surrogateescape") as f:
+        f.write(text)
+    env["CLAUDE_TOOL_RESULT_FILE"] = path
+    env["CLAUDE_TOOL_RESULT"] = (text[:RESULT_WINDOW] + "\n[... spooled to CLAUDE_TOOL_RESULT_FILE ...]\n"
+                                 + text[-RESULT_WINDOW:])
+    return path
+
+
+def forward(target, args):
+    socket_path = os.environ.get("CLAUDE_HOOKD_SOCKET") or os.path.expanduser("~/.claude-code/hookd.sock")
+    if "event" in target:
+        # Event dispatch may run notifier scripts that need the full environment
+        env = dict(os.environ)
+    else:
+        env = {k: v for k, v in os.environ.items() if k.startswith(FORWARDED_PREFIXES) or k in FORWARDED_NAMES}
+    spooled = spool_result(env)
+    payload = dict(target, args=args, env=env, cwd=os.getcwd())
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(float(os.environ.get("CLAUDE_HOOKD_TIMEOUT", "2")))
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        response = json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        return None
+    finally:
+        if spooled:
+            os.unlink(spooled)
+
+    if "error" in response:
+        return None
+    return response
+
+
+def main():
+    if len(sys.argv) < 2 or (sys.argv[1] == "--event" and len(sys.argv) < 3):
+        print("Usage: hook-client.py <hook-name> [args...] | --event <Event> [args...]", file=sys.stderr)
+        sys.exit(0)
+
+    if sys.argv[1] == "--event":
+        event = sys.argv[2]
+        args = sys.argv[3:]
+        target = {"event": event}
+        script = os.path.join(HOOKS_DIR, "hook-dispatch.py")
+        fallback = [script, event] + args
+    else:
+        hook = os.path.basename(sys.argv[1])
+        if hook.endswith(".sh"):
+            hook = hook[:-3]
+        args = sys.argv[2:]
+        target = {"hook": hook}
+        script = os.path.join(HOOKS_DIR, hook + ".sh")
+        fallback = [script] + args
+
+    hook_input = read_hook_input()
+    response = forward(target, args)
+    if response is None:
+        # Daemon not running: fall back to the existing script
+        if os.path.isfile(script):
+            replay_hook_input(hook_input)
+            os.execv(script, fallback)
+        sys.exit(0)
+
+    sys.stdout.write(response.get("output", ""))
+    sys.stdout.flush()
+    sys.exit(int(response.get("exit_code", 0)))
+
+
+if __name__ == "__main__":
+    main()
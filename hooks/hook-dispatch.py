@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Run every enabled hook for one Claude Code hook event in a single process.
+
+Usage: hook-dispatch.py [--enable a,b] [--disable c] <Event> [args...]
+
+Register one entry per event in settings.json, for example
+``hook-dispatch.py PostToolUse``, instead of one command per hook script.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from claude_hooks.dispatcher import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Start, stop or query the Claude Code hook daemon.
+
+Usage: hookd.py {start|stop|status|serve} [--socket PATH]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from claude_hooks.daemon import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
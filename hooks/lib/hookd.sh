@@ -0,0 +1,21 @@
+# Hand a hook call to the hook daemon (hookd.py) when it is running.
+#
+#   source "$HOOK_DIR/lib/hookd.sh"
+#   hookd_forward agent-selector "$@"
+#
+# With the daemon's socket present this execs hook-client.py, and the
+# in-process handler runs with its compiled rules, indexes and stores already
+# in memory. Without it, it returns at the cost of one stat and the script's
+# own bash checks run: starting Python for a single call costs more than the
+# whole bash hook. hook-client.py execs the script again when the daemon
+# cannot serve the call; CLAUDE_HOOKD_FORWARDED stops it forwarding twice.
+
+hookd_forward() {
+    local hook="$1"
+    shift
+    [[ -z "$CLAUDE_HOOKD_FORWARDED" ]] || return 0
+    [[ -S "${CLAUDE_HOOKD_SOCKET:-$HOME/.claude-code/hookd.sock}" ]] || return 0
+    [[ -x "$HOOK_DIR/hook-client.py" ]] || return 0
+    export CLAUDE_HOOKD_FORWARDED=1
+    exec "$HOOK_DIR/hook-client.py" "$hook" "$@"
+}
@@ -0,0 +1,60 @@
+# Append to the size-rotated hook logs of claude_hooks/segment_log.py from
+# bash, without starting Python for each line.
+#
+#   source "$HOOK_DIR/lib/log.sh"
+#   log_line "$HOME/.claude-code/test-runs.log" "[$timestamp] File: ..."
+#
+# The line is appended and the <log>.count sidecar incremented under an
+# exclusive flock on the sidecar, the lock SegmentedLog takes, so bash and
+# Python writers never interleave a rotation or lose a count. The calls bash
+# cannot finish go to SegmentedLog.append: a count to rebuild from rotated
+# segments, a line that fills the active segment and rotates it, or no
+# flock(1) (stock macOS). Without Python either, the line is appended as it
+# is.
+
+# claude_hooks/segment_log.py MAX_BYTES
+LOG_MAX_BYTES=1048576
+LOG_SIZE_EVERY=16
+
+log_line() {
+    local log="$1"
+    local line="$2"
+    local LC_ALL=C
+    local fd count size
+
+    [[ -d "${log%/*}" ]] || mkdir -p "${log%/*}"
+
+    if (( BASH_VERSINFO[0] >= 5 )) && command -v flock &> /dev/null &&
+        { exec {fd}>> "$log.count"; } 2> /dev/null; then
+        if flock -x "$fd"; then
+            read -r count < "$log.count"
+            # First use: with nothing rotated or compacted yet, the active
+            # segment holds every line logged so far
+            if [[ -z "$count" && ! -e "$log.1" && ! -e "$log.summary.json" ]]; then
+                count=$(wc -l 2> /dev/null < "$log")
+                count="${count//[^0-9]/}"
+                count="${count:-0}"
+            fi
+            # Running wc costs more than the rest of the append, so the size
+            # is checked every LOG_SIZE_EVERY lines and a segment may run a
+            # few lines past LOG_MAX_BYTES before it rotates. LC_ALL=C:
+            # ${#line} is the line's length in bytes
+            if [[ "$count" =~ ^[0-9]+$ ]] && ! (( count % LOG_SIZE_EVERY )); then
+                size=$(wc -c 2> /dev/null < "$log")
+            fi
+            if [[ "$count" =~ ^[0-9]+$ ]] && (( ${size:-0} + ${#line} + 1 < LOG_MAX_BYTES )); then
+                printf '%s\n' "$line" >> "$log"
+                printf '%s' "$(( count + 1 ))" > "$log.count"
+                exec {fd}>&-
+                return 0
+            fi
+        fi
+        exec {fd}>&-
+    fi
+
+    if command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]] &&
+        PYTHONPATH="$HOOK_DIR" python3 -m claude_hooks.segment_log append "$log" "$line" > /dev/null 2>&1; then
+        return 0
+    fi
+    echo "$line" >> "$log"
+}
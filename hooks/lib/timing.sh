@@ -0,0 +1,97 @@
+# Tool call timing for tool-timer.sh and the notifiers, with bash builtins
+# only (bash 5 for EPOCHREALTIME).
+#
+#   source "$HOOK_DIR/lib/timing.sh"
+#   timing_read_input   # hook input JSON from stdin, before anything else reads it
+#   timing_phase        # TIMING_PHASE: start or finish, from the hook event
+#   timing_start        # PreToolUse
+#   timing_finish       # PostToolUse: sets TOOL_DURATION and records the call
+#   timing_elapsed      # sets TOOL_DURATION without recording
+#
+# Each step appends one line to ~/.claude-code/timing/<session>.log:
+#
+#   start <call> <tool> <micros>
+#   finish <call> <tool> <micros> <seconds>
+#
+# <call> is the tool call ID from the hook input, or tool:<name> when it has
+# none. Lines are short single writes in append mode, so concurrent hooks do
+# not need a lock. claude_hooks/timing_ledger.py turns the finish lines into
+# per-tool latency histograms for its report.
+
+TIMING_DIR="$HOME/.claude-code/timing"
+
+# Fill CLAUDE_SESSION_ID, CLAUDE_TOOL_USE_ID, CLAUDE_HOOK_EVENT and
+# CLAUDE_TOOL_NAME from the hook input JSON on stdin, where not already set.
+# Only top-level string fields match: quotes inside strings are escaped.
+timing_read_input() {
+    local payload="" field var
+    if [[ ! -t 0 ]]; then
+        IFS= read -r -d '' -t "${CLAUDE_HOOK_INPUT_TIMEOUT:-1}" payload
+    fi
+    for field in session_id:CLAUDE_SESSION_ID tool_use_id:CLAUDE_TOOL_USE_ID \
+                 hook_event_name:CLAUDE_HOOK_EVENT tool_name:CLAUDE_TOOL_NAME; do
+        var="${field#*:}"
+        if [[ -z "${!var}" && "$payload" =~ \"${field%%:*}\"[[:space:]]*:[[:space:]]*\"([^\"]*)\" ]]; then
+            export "$var=${BASH_REMATCH[1]}"
+        fi
+    done
+}
+
+# "start" on PreToolUse and "finish" on PostToolUse in TIMING_PHASE, like
+# claude_hooks/timing_ledger.py phase(). Without a hook event (no hook input)
+# a result means the tool has run
+timing_phase() {
+    case "$CLAUDE_HOOK_EVENT" in
+        PreToolUse)
+            TIMING_PHASE=start
+            ;;
+        "")
+            if [[ -n "$CLAUDE_TOOL_RESULT" || -n "$CLAUDE_TOOL_RESULT_FILE" ]]; then
+                TIMING_PHASE=finish
+            else
+                TIMING_PHASE=start
+            fi
+            ;;
+        *)
+            TIMING_PHASE=finish
+            ;;
+    esac
+}
+
+timing_call() {
+    local session="${CLAUDE_SESSION_ID:-default}"
+    TIMING_CALL="${CLAUDE_TOOL_USE_ID:-tool:$CLAUDE_TOOL_NAME}"
+    TIMING_CALL="${TIMING_CALL//[[:space:]]/_}"
+    TIMING_LOG="$TIMING_DIR/${session//[^A-Za-z0-9_.-]/_}.log"
+}
+
+timing_start() {
+    timing_call
+    [[ -d "$TIMING_DIR" ]] || mkdir -p "$TIMING_DIR"
+    printf 'start %s %s %s\n' "$TIMING_CALL" "${CLAUDE_TOOL_NAME:-unknown}" "${EPOCHREALTIME/[.,]/}" \
+        >> "$TIMING_LOG" 2>/dev/null
+}
+
+# Whole seconds since the last start of the current call in TOOL_DURATION
+# (microseconds in TIMING_MICROS); both empty, and status 1, when unknown
+timing_elapsed() {
+    timing_call
+    TOOL_DURATION=""
+    TIMING_MICROS=""
+    [[ -f "$TIMING_LOG" ]] || return 1
+    local starts line
+    starts=$(grep -F -- "start $TIMING_CALL " "$TIMING_LOG" 2>/dev/null)
+    line="${starts##*$'\n'}"
+    [[ "${line##* }" =~ ^[0-9]+$ ]] || return 1
+    local micros=$(( ${EPOCHREALTIME/[.,]/} - ${line##* } ))
+    # The clock was set back between start and finish
+    (( micros >= 0 )) || return 1
+    TIMING_MICROS=$micros
+    TOOL_DURATION=$(( micros / 1000000 ))
+}
+
+timing_finish() {
+    timing_elapsed || return 1
+    printf 'finish %s %s %s %d.%06d\n' "$TIMING_CALL" "${CLAUDE_TOOL_NAME:-unknown}" "${EPOCHREALTIME/[.,]/}" \
+        $(( TIMING_MICROS / 1000000 )) $(( TIMING_MICROS % 1000000 )) >> "$TIMING_LOG" 2>/dev/null
+}
@@ -0,0 +1,64 @@
+# Record the run of a shell hook as a trace span in
+# ~/.claude-code/hook-trace.jsonl (claude_hooks/trace.py), in bash.
+#
+#   source "$HOOK_DIR/lib/trace.sh"
+#   trace_init PostToolUse    # the event the script is registered on
+#
+# trace_init sets an EXIT trap that writes the span once the script is done,
+# through log_line (lib/log.sh), so spans share the trace's lock and counter
+# with the ones Python writes. The event is CLAUDE_HOOK_EVENT when set, and
+# the script's own event otherwise. The dispatcher traces the scripts it runs
+# itself (CLAUDE_HOOK_TRACED), and CLAUDE_HOOK_TRACE=0 turns tracing off.
+# Needs bash 5 for EPOCHREALTIME.
+
+[[ "$(type -t log_line)" == "function" ]] || source "${BASH_SOURCE[0]%/*}/log.sh"
+
+TRACE_LOG="$HOME/.claude-code/hook-trace.jsonl"
+
+# The JSON string for $1 in TRACE_JSON, quotes included
+trace_json_string() {
+    local s="$1" c hex
+    s="${s//\\/\\\\}"
+    s="${s//\"/\\\"}"
+    s="${s//$'\n'/\\n}"
+    s="${s//$'\r'/\\r}"
+    s="${s//$'\t'/\\t}"
+    while [[ "$s" =~ [[:cntrl:]] ]]; do
+        c="${BASH_REMATCH[0]}"
+        printf -v hex '\\u%04x' "'$c"
+        s="${s//"$c"/$hex}"
+    done
+    TRACE_JSON="\"$s\""
+}
+
+trace_init() {
+    TRACE_DEFAULT_EVENT="$1"
+    TRACE_HOOK="${BASH_SOURCE[1]##*/}"
+    TRACE_HOOK="${TRACE_HOOK%.sh}"
+    TRACE_START="${EPOCHREALTIME/[.,]/}"
+    trap trace_span EXIT
+}
+
+trace_span() {
+    local status=$?
+    if [[ -z "$TRACE_START" || -n "$CLAUDE_HOOK_TRACED" || "$CLAUDE_HOOK_TRACE" == "0" ]]; then
+        return
+    fi
+    local micros=$(( ${EPOCHREALTIME/[.,]/} - TRACE_START ))
+    local event="${CLAUDE_HOOK_EVENT:-$TRACE_DEFAULT_EVENT}"
+    local blocked=false
+    if [[ "$event" == "PreToolUse" && $status -ne 0 ]]; then
+        blocked=true
+    fi
+    local hook tool line
+    trace_json_string "$TRACE_HOOK"
+    hook="$TRACE_JSON"
+    trace_json_string "$event"
+    event="$TRACE_JSON"
+    trace_json_string "$CLAUDE_TOOL_NAME"
+    tool="$TRACE_JSON"
+    printf -v line '{"ts": %d.%06d, "hook": %s, "event": %s, "tool": %s, "duration": %d.%06d, "forks": null, "exit": %d, "blocked": %s}' \
+        $(( TRACE_START / 1000000 )) $(( TRACE_START % 1000000 )) "$hook" "$event" "$tool" \
+        $(( micros / 1000000 )) $(( micros % 1000000 )) "$status" "$blocked"
+    log_line "$TRACE_LOG" "$line" 2> /dev/null
+}
@@ -1,5 +1,7 @@
 #!/bin/bash
 # PostToolUse hook: Pushover push notification when Claude needs input
+# Events: PostToolUse
+# Tools: * except Read, Grep, Glob, LS
 #
 # This hook sends push notifications via Pushover when tool execution completes
 # Can accept API credentials as arguments or environment variables
@@ -18,6 +20,11 @@
 # Environment variables (used if arguments not provided):
 #   PUSHOVER_USER_KEY, PUSHOVER_APP_TOKEN, PUSHOVER_ENABLED,
 #   PUSHOVER_MIN_TIME, PUSHOVER_PRIORITY, PUSHOVER_SOUND
+#
+# Delivery (claude_hooks/pushover_outbox.py):
+#   PUSHOVER_BATCH_WINDOW - seconds in which notifications merge into one (default: 5)
+#   PUSHOVER_SENDER_IDLE  - seconds the background sender lingers (default: 60)
+#   PUSHOVER_API_URL      - messages endpoint (default: the Pushover API)
 
 # Parse arguments or fall back to environment variables
 USER_KEY="${1:-${PUSHOVER_USER_KEY:-}}"
@@ -27,13 +34,40 @@ MIN_EXECUTION_TIME="${4:-${PUSHOVER_MIN_TIME:-5}}"
 PRIORITY="${5:-${PUSHOVER_PRIORITY:-0}}"
 SOUND="${6:-${PUSHOVER_SOUND:-}}"
 
-# Track execution time
-EXEC_START_FILE="/tmp/claude-pushover-start-$$"
 NOTIFICATION_LOG="$HOME/.claude-code/pushover-notifications.log"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+
+# Record this run as a trace span (claude_hooks/trace.py)
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PostToolUse
 
 # Ensure log directory exists
 mkdir -p "$HOME/.claude-code"
 
+# Append to the size-rotated log and its running counter in bash
+# (claude_hooks/segment_log.py keeps the same format)
+source "$HOOK_DIR/lib/log.sh"
+
+# Seconds the current tool call took, from the session timing log that
+# tool-timer.sh keeps (lib/timing.sh); empty when unknown. Read once per run
+# and kept in TOOL_DURATION.
+source "$HOOK_DIR/lib/timing.sh"
+timing_read_input
+TOOL_DURATION=""
+TOOL_DURATION_READ=false
+read_tool_duration() {
+    if [[ "$TOOL_DURATION_READ" == "true" ]]; then
+        return
+    fi
+    TOOL_DURATION_READ=true
+    timing_elapsed
+}
+
+# Record the start of the tool call (when registered on PreToolUse)
+record_tool_start() {
+    timing_start
+}
+
 # Function to check if Pushover is configured
 is_configured() {
     if [[ -z "$USER_KEY" ]] || [[ -z "$APP_TOKEN" ]]; then
@@ -58,6 +92,14 @@ send_pushover() {
     local message="$2"
     local priority="${3:-$PRIORITY}"
 
+    # Queue it for the background sender, which batches, rate-limits and
+    # reuses one connection; the inline curl below is the fallback
+    if command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]] &&
+        PUSHOVER_USER_KEY="$USER_KEY" PUSHOVER_APP_TOKEN="$APP_TOKEN" PUSHOVER_SOUND="$SOUND" \
+        PYTHONPATH="$HOOK_DIR" python3 -m claude_hooks.pushover_outbox post "$title" "$message" "$priority" > /dev/null 2>&1; then
+        return 0
+    fi
+
     # Build the API request
     local data="token=$APP_TOKEN&user=$USER_KEY&title=$(echo -n "$title" | sed 's/ /%20/g')&message=$(echo -n "$message" | sed 's/ /%20/g')&priority=$priority"
 
@@ -78,16 +120,16 @@ send_pushover() {
         --form-string "priority=$priority" \
         --form-string "html=1" \
         ${SOUND:+--form-string "sound=$SOUND"} \
-        https://api.pushover.net/1/messages.json 2>/dev/null)
+        "${PUSHOVER_API_URL:-https://api.pushover.net/1/messages.json}" 2>/dev/null)
 
     # Log the notification
-    echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] $title: $message (Priority: $priority)" >> "$NOTIFICATION_LOG"
+    log_line "$NOTIFICATION_LOG" "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] $title: $message (Priority: $priority)"
 
     # Check for success
     if [[ "$response" == *'"status":1'* ]]; then
         return 0
     else
-        echo "Pushover notification failed: $response" >> "$NOTIFICATION_LOG"
+        log_line "$NOTIFICATION_LOG" "Pushover notification failed: $response"
         return 1
     fi
 }
@@ -116,14 +158,9 @@ should_notify() {
             ;;
         *)
             # For other tools, check execution time
-            if [[ -f "$EXEC_START_FILE" ]]; then
-                local start_time=$(cat "$EXEC_START_FILE")
-                local end_time=$(date +%s)
-                local duration=$((end_time - start_time))
-
-                if [[ $duration -ge $MIN_EXECUTION_TIME ]]; then
-                    return 0
-                fi
+            read_tool_duration
+            if [[ -n "$TOOL_DURATION" ]] && [[ $TOOL_DURATION -ge $MIN_EXECUTION_TIME ]]; then
+                return 0
             fi
             return 1
             ;;
@@ -169,10 +206,9 @@ generate_message() {
     fi
 
     # Add duration if available
-    if [[ -f "$EXEC_START_FILE" ]]; then
-        local start_time=$(cat "$EXEC_START_FILE")
-        local end_time=$(date +%s)
-        local duration=$((end_time - start_time))
+    read_tool_duration
+    if [[ -n "$TOOL_DURATION" ]]; then
+        local duration=$TOOL_DURATION
 
         if [[ $duration -gt 60 ]]; then
             local minutes=$((duration / 60))
@@ -237,8 +273,9 @@ get_priority() {
 # Main logic
 main() {
     # Record start time on PreToolUse
-    if [[ -z "$CLAUDE_TOOL_RESULT" ]]; then
-        echo "$(date +%s)" > "$EXEC_START_FILE"
+    timing_phase
+    if [[ "$TIMING_PHASE" == "start" ]]; then
+        record_tool_start
         exit 0
     fi
 
@@ -266,9 +303,6 @@ main() {
 
         # Send Pushover notification
         send_pushover "$title" "$message" "$priority"
-
-        # Clean up timing file
-        rm -f "$EXEC_START_FILE"
     fi
 }
 
@@ -1,5 +1,7 @@
 #!/bin/bash
 # PostToolUse hook: Desktop notification with text-to-speech when Claude is waiting
+# Events: PostToolUse
+# Tools: * except Read, Grep, Glob, LS
 #
 # This hook runs after tool execution completes
 # It detects when Claude is likely waiting for user input and notifies the user
@@ -10,27 +12,52 @@ ENABLE_TTS="${CLAUDE_NOTIFIER_TTS:-true}"
 NOTIFICATION_SOUND="${CLAUDE_NOTIFIER_SOUND:-true}"
 MIN_EXECUTION_TIME="${CLAUDE_NOTIFIER_MIN_TIME:-5}"  # Only notify for tasks longer than X seconds
 
-# Track execution time
-EXEC_START_FILE="/tmp/claude-exec-start-$$"
 NOTIFICATION_LOG="$HOME/.claude-code/notifications.log"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+
+# Record this run as a trace span (claude_hooks/trace.py)
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PostToolUse
 
 # Ensure log directory exists
 mkdir -p "$HOME/.claude-code"
 
-# Function to detect OS
-detect_os() {
-    case "$(uname -s)" in
-        Darwin*) echo "macos" ;;
-        Linux*)  echo "linux" ;;
-        *)       echo "unknown" ;;
-    esac
+# Append to the size-rotated log and its running counter in bash
+# (claude_hooks/segment_log.py keeps the same format)
+source "$HOOK_DIR/lib/log.sh"
+
+# Detect the OS once, from bash's own $OSTYPE rather than by running uname
+case "$OSTYPE" in
+    darwin*) OS_TYPE="macos" ;;
+    linux*)  OS_TYPE="linux" ;;
+    *)       OS_TYPE="unknown" ;;
+esac
+
+# Seconds the current tool call took, from the session timing log that
+# tool-timer.sh keeps (lib/timing.sh); empty when unknown. Read once per run
+# and kept in TOOL_DURATION.
+source "$HOOK_DIR/lib/timing.sh"
+timing_read_input
+TOOL_DURATION=""
+TOOL_DURATION_READ=false
+read_tool_duration() {
+    if [[ "$TOOL_DURATION_READ" == "true" ]]; then
+        return
+    fi
+    TOOL_DURATION_READ=true
+    timing_elapsed
+}
+
+# Record the start of the tool call (when registered on PreToolUse)
+record_tool_start() {
+    timing_start
 }
 
 # Function to send desktop notification
 send_notification() {
     local title="$1"
     local message="$2"
-    local os_type=$(detect_os)
+    local os_type="$OS_TYPE"
 
     case "$os_type" in
         macos)
@@ -46,13 +73,13 @@ send_notification() {
     esac
 
     # Log notification
-    echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] $title: $message" >> "$NOTIFICATION_LOG"
+    log_line "$NOTIFICATION_LOG" "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] $title: $message"
 }
 
 # Function to speak text
 speak_text() {
     local text="$1"
-    local os_type=$(detect_os)
+    local os_type="$OS_TYPE"
 
     if [[ "$ENABLE_TTS" != "true" ]]; then
         return
@@ -86,14 +113,9 @@ should_notify() {
             ;;
         *)
             # For other tools, check execution time
-            if [[ -f "$EXEC_START_FILE" ]]; then
-                local start_time=$(cat "$EXEC_START_FILE")
-                local end_time=$(date +%s)
-                local duration=$((end_time - start_time))
-
-                if [[ $duration -ge $MIN_EXECUTION_TIME ]]; then
-                    return 0
-                fi
+            read_tool_duration
+            if [[ -n "$TOOL_DURATION" ]] && [[ $TOOL_DURATION -ge $MIN_EXECUTION_TIME ]]; then
+                return 0
             fi
             return 1
             ;;
@@ -158,8 +180,9 @@ detect_waiting_state() {
 # Main logic
 main() {
     # Record start time on PreToolUse
-    if [[ -z "$CLAUDE_TOOL_RESULT" ]]; then
-        echo "$(date +%s)" > "$EXEC_START_FILE"
+    timing_phase
+    if [[ "$TIMING_PHASE" == "start" ]]; then
+        record_tool_start
         exit 0
     fi
 
@@ -180,9 +203,6 @@ main() {
         if [[ "$ENABLE_TTS" == "true" ]]; then
             speak_text "$message. Your attention may be needed."
         fi
-
-        # Clean up timing file
-        rm -f "$EXEC_START_FILE"
     fi
 }
 
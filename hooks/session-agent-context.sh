@@ -1,9 +1,22 @@
 #!/bin/bash
 # SessionStart hook: Load agent hierarchy and suggest workflow patterns
+# Events: SessionStart
 
 # This hook runs at the start of each session
 # It provides context about available agents and their relationships
 
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+
+# With the hook daemon running, its handler prints the context; otherwise the
+# script below does
+source "$HOOK_DIR/lib/hookd.sh"
+hookd_forward session-agent-context "$@"
+
+# Record this run as a trace span (claude_hooks/trace.py); under the
+# daemon the handler records it
+source "$HOOK_DIR/lib/trace.sh"
+trace_init SessionStart
+
 echo "🤖 Claude Code Agents System Initialized"
 echo ""
 echo "📋 Agent Hierarchy Pattern:"
@@ -17,11 +30,20 @@ echo "   • Debugging: go-debugger, rust-debugger, javascript-debugger, python-
 echo "   • Full-Stack: fullstack-nextjs-go, fullstack-nuxtjs-go"
 echo ""
 
-# Check for recent agent usage patterns
+# Check for recent agent usage patterns, in the SQLite stats store
+# agent-hierarchy-tracker records them in (claude_hooks/agent_stats.py), or
+# in agent-stats.json where there is no Python to keep one
 STATS_FILE="$HOME/.claude-code/agent-stats.json"
-if [[ -f "$STATS_FILE" ]]; then
+if [[ -f "$HOME/.claude-code/agent-stats.db" || -f "$STATS_FILE" ]]; then
     echo "📊 Your most used agents:"
-    jq -r 'to_entries | sort_by(.value) | reverse | .[0:3] | .[] | "   • \(.key): \(.value) uses"' "$STATS_FILE" 2>/dev/null
+    if command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]]; then
+        PYTHONPATH="$HOOK_DIR" python3 -m claude_hooks.agent_stats 3 2>/dev/null |
+            while IFS=$'\t' read -r agent uses; do
+                echo "   • $agent: $uses uses"
+            done
+    else
+        jq -r 'to_entries | sort_by(.value) | reverse | .[0:3] | .[] | "   • \(.key): \(.value) uses"' "$STATS_FILE" 2>/dev/null
+    fi
     echo ""
 fi
 
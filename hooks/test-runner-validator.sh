@@ -1,5 +1,7 @@
 #!/bin/bash
 # PostToolUse hook: Automatically run tests after code changes
+# Events: PostToolUse
+# Tools: Write, Edit, MultiEdit, Task
 
 # This hook runs after code modifications
 # It suggests or runs relevant tests based on what was changed
@@ -7,10 +9,36 @@
 TOOL_NAME="$CLAUDE_TOOL_NAME"
 MODIFIED_FILE="$1"
 TEST_LOG="$HOME/.claude-code/test-runs.log"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+
+# With the hook daemon running, look up related tests and the framework in
+# the per-repository test index (claude_hooks/test_index.py); otherwise the
+# probing below runs
+source "$HOOK_DIR/lib/hookd.sh"
+hookd_forward test-runner-validator "$@"
+
+# Background runs (CLAUDE_TEST_EXECUTOR=true) are queued by the handler
+# (claude_hooks/test_executor.py), so turning them on pays for starting Python
+case "${CLAUDE_TEST_EXECUTOR,,}" in
+    1|true|yes)
+        if command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]]; then
+            PYTHONPATH="$HOOK_DIR" exec python3 -m claude_hooks.test_runner "$@"
+        fi
+        ;;
+esac
+
+# Record this run as a trace span (claude_hooks/trace.py); under the
+# daemon the handler records it
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PostToolUse
 
 # Ensure directory exists
 mkdir -p "$HOME/.claude-code"
 
+# Append to the size-rotated log and its running counter in bash
+# (claude_hooks/segment_log.py keeps the same format)
+source "$HOOK_DIR/lib/log.sh"
+
 # Function to detect test framework
 detect_test_framework() {
     if [[ -f "package.json" ]]; then
@@ -171,7 +199,7 @@ log_test_run() {
     local framework="$2"
     local timestamp=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
 
-    echo "[$timestamp] File: $file, Framework: $framework" >> "$TEST_LOG"
+    log_line "$TEST_LOG" "[$timestamp] File: $file, Framework: $framework"
 }
 
 # Main validation logic
@@ -0,0 +1,27 @@
+#!/bin/bash
+# PreToolUse and PostToolUse hook: time every tool call
+# Events: PreToolUse, PostToolUse
+# Tools: *
+#
+# Register it on both events. PreToolUse appends the start of the call to the
+# session's timing log and PostToolUse appends its duration (lib/timing.sh);
+# the notifiers read the duration of the call from the same log. Calls are
+# keyed by the session and tool call IDs in the hook input on stdin.
+#
+# Per-tool latency histograms:
+#   PYTHONPATH=hooks python3 -m claude_hooks.timing_ledger report
+
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+
+source "$HOOK_DIR/lib/timing.sh"
+timing_read_input
+
+timing_phase
+if [[ "$TIMING_PHASE" == "start" ]]; then
+    timing_start
+else
+    timing_finish
+fi
+
+# Timing must never block a tool call
+exit 0
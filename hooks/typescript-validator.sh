@@ -1,18 +1,48 @@
 #!/bin/bash
 # PostToolUse hook: Validate TypeScript changes and type safety
+# Events: PostToolUse
+# Tools: Write, Edit, MultiEdit, Task
 
 # This hook runs after TypeScript file modifications
 # It checks for type errors, missing types, and suggests type improvements
 
 TOOL_NAME="$CLAUDE_TOOL_NAME"
 MODIFIED_FILE="$1"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
 
-# Function to check if TypeScript is available
+# Record this run as a trace span (claude_hooks/trace.py)
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PostToolUse
+
+# Function to check if TypeScript is available: npx and a tsconfig.json at
+# or above the file (the working directory without one), where tsc looks
 check_typescript() {
-    if [[ -f "tsconfig.json" ]] && command -v npx &> /dev/null; then
-        return 0
+    local file="$1"
+    [[ "$file" == /* ]] || file="$PWD/$file"
+    local dir="${file%/*}"
+    command -v npx &> /dev/null || return 1
+    while [[ ! -f "$dir/tsconfig.json" ]]; do
+        [[ -n "$dir" ]] || return 1
+        dir="${dir%/*}"
+    done
+    return 0
+}
+
+# Function to type check one file. With CLAUDE_TSC_MODE=watch a persistent
+# tsc --watch answers from its latest incremental compile
+# (claude_hooks/tsc_watch.py); a cold single-file tsc is the fallback
+run_tsc() {
+    local file="$1"
+
+    if [[ "${CLAUDE_TSC_MODE:-file}" == "watch" ]] && command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]]; then
+        PYTHONPATH="$HOOK_DIR" python3 -m claude_hooks.tsc_watch check "$file" 2>/dev/null
+        local status=$?
+        if [[ $status -ne 2 ]]; then
+            return $status
+        fi
     fi
-    return 1
+
+    npx tsc --noEmit --skipLibCheck "$file" 2>&1
 }
 
 # Function to validate TypeScript file
@@ -25,15 +55,17 @@ validate_typescript() {
     fi
 
     # Skip if TypeScript not available
-    if ! check_typescript; then
+    if ! check_typescript "$file"; then
         return 0
     fi
 
     echo "🔍 Running TypeScript validation on: $file"
 
-    # Run TypeScript compiler check on single file
-    local tsc_output=$(npx tsc --noEmit --skipLibCheck "$file" 2>&1)
-    local tsc_exit=$?
+    # Run TypeScript compiler check on single file (declared first so that
+    # $? is the compiler's status rather than that of `local`)
+    local tsc_output tsc_exit
+    tsc_output=$(run_tsc "$file")
+    tsc_exit=$?
 
     if [[ $tsc_exit -ne 0 ]]; then
         echo "❌ TypeScript errors found:"
@@ -1,5 +1,7 @@
 #!/bin/bash
 # PostToolUse hook: Validate web resources and references after changes
+# Events: PostToolUse
+# Tools: Write, Edit, MultiEdit, Task
 
 # This hook runs after file modifications
 # It checks for broken references, missing imports, and invalid paths
@@ -7,6 +9,11 @@
 TOOL_NAME="$CLAUDE_TOOL_NAME"
 MODIFIED_FILE="$1"
 VALIDATION_LOG="$HOME/.claude-code/validation.log"
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+
+# Record this run as a trace span (claude_hooks/trace.py)
+source "$HOOK_DIR/lib/trace.sh"
+trace_init PostToolUse
 
 # Ensure directory exists
 mkdir -p "$HOME/.claude-code"
@@ -26,6 +33,20 @@ validate_imports() {
         return 0
     fi
 
+    # Resolve all imports in one pass against cached directory listings and
+    # tsconfig paths (claude_hooks/module_resolver.py). A crash exits 1
+    # without output, so only exit 1 with warnings counts; otherwise fall
+    # back to the probing below.
+    if command -v python3 &> /dev/null && [[ -d "$HOOK_DIR/claude_hooks" ]]; then
+        local output status
+        output=$(PYTHONPATH="$HOOK_DIR" python3 -m claude_hooks.module_resolver check "$file" 2>/dev/null)
+        status=$?
+        if [[ $status -eq 0 || ( $status -eq 1 && -n "$output" ) ]]; then
+            [[ -n "$output" ]] && echo "$output"
+            return $status
+        fi
+    fi
+
     # Extract imports
     local imports=$(grep -E "^import .* from ['\"]" "$file" 2>/dev/null)
 
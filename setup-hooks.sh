@@ -20,7 +20,7 @@ fi
 
 # Make hooks executable
 echo "🔧 Making hooks executable..."
-chmod +x "$REPO_PATH"/hooks/*.sh
+chmod +x "$REPO_PATH"/hooks/*.sh "$REPO_PATH"/hooks/*.py
 
 # Ask user for settings location
 echo
@@ -93,11 +93,12 @@ fi
 # Ask which hooks to install
 echo
 echo "Which hooks would you like to install?"
-echo "1) All hooks (recommended)"
-echo "2) Just notifications (response-notifier only)"
+echo "1) All hooks, each matched only to the tools it handles (recommended)"
+echo "2) Just notifications (response-notifier and tool-timer)"
 echo "3) Safety hooks only (dangerous-operation-validator)"
 echo "4) Custom selection"
-read -p "Choose option (1-4): " hooks_choice
+echo "5) All hooks via single dispatcher (one process per event, requires python3)"
+read -p "Choose option (1-5): " hooks_choice
 
 # Generate the configuration
 cat > /tmp/claude-hooks-config.json << EOF
@@ -113,6 +114,10 @@ case $hooks_choice in
       {
         "matcher": "*",
         "hooks": [
+          {
+            "type": "command",
+            "command": "$REPO_PATH/hooks/tool-timer.sh"
+          },
           {
             "type": "command",
             "command": "$REPO_PATH/hooks/agent-selector.sh"
@@ -128,6 +133,10 @@ case $hooks_choice in
       {
         "matcher": "*",
         "hooks": [
+          {
+            "type": "command",
+            "command": "$REPO_PATH/hooks/tool-timer.sh"
+          },
           {
             "type": "command",
             "command": "$REPO_PATH/hooks/agent-hierarchy-tracker.sh"
@@ -180,12 +189,29 @@ case $hooks_choice in
 EOF
         ;;
     2)
-        # Just notifications
+        # Just notifications, with the tool timer for their durations
         cat >> /tmp/claude-hooks-config.json << EOF
+    "PreToolUse": [
+      {
+        "matcher": "Bash",
+        "hooks": [
+          {
+            "type": "command",
+            "command": "$REPO_PATH/hooks/tool-timer.sh",
+            "timeout": 5
+          }
+        ]
+      }
+    ],
     "PostToolUse": [
       {
         "matcher": "Bash",
         "hooks": [
+          {
+            "type": "command",
+            "command": "$REPO_PATH/hooks/tool-timer.sh",
+            "timeout": 5
+          },
           {
             "type": "command",
             "command": "$REPO_PATH/hooks/response-notifier.sh",
@@ -201,7 +227,7 @@ EOF
         cat >> /tmp/claude-hooks-config.json << EOF
     "PreToolUse": [
       {
-        "matcher": "*",
+        "matcher": "Bash|Task|Write|MultiEdit",
         "hooks": [
           {
             "type": "command",
@@ -216,6 +242,31 @@ EOF
         echo "Custom selection not yet implemented. Please edit the configuration manually."
         exit 0
         ;;
+    5)
+        # One dispatcher entry per event
+        if ! command -v python3 &> /dev/null; then
+            echo "❌ python3 not found - choose option 1 instead"
+            exit 1
+        fi
+
+        separator=""
+        for event in PreToolUse PostToolUse SessionStart SubagentStop; do
+            cat >> /tmp/claude-hooks-config.json << EOF
+    $separator"$event": [
+      {
+        "matcher": "*",
+        "hooks": [
+          {
+            "type": "command",
+            "command": "$REPO_PATH/hooks/hook-dispatch.py $event"
+          }
+        ]
+      }
+    ]
+EOF
+            separator=","
+        done
+        ;;
 esac
 
 # Close the JSON
@@ -224,6 +275,17 @@ cat >> /tmp/claude-hooks-config.json << EOF
 }
 EOF
 
+# For all hooks, register each one only for the events and tools declared in
+# its header (claude_hooks/hook_settings.py); the list above is the fallback
+if [ "$hooks_choice" == "1" ] && command -v python3 &> /dev/null; then
+    if PYTHONPATH="$REPO_PATH/hooks" python3 -m claude_hooks.hook_settings generate \
+        --command "$REPO_PATH/hooks/{name}.sh" --skip pushover-notifier > /tmp/claude-hooks-generated.json; then
+        mv /tmp/claude-hooks-generated.json /tmp/claude-hooks-config.json
+    else
+        rm -f /tmp/claude-hooks-generated.json
+    fi
+fi
+
 # Write or display the configuration
 if [ "$backup_choice" == "2" ] && [ -f "$SETTINGS_PATH" ]; then
     echo "----------------------------------------"